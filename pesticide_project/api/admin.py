@@ -5,7 +5,7 @@ from django.utils import timezone
 from datetime import timedelta
 from django.http import HttpResponse
 from django.template.response import TemplateResponse
-from .models import PesticideLimit, LimitConditionCode, SearchLog, User, PasswordResetToken
+from .models import PesticideLimit, LimitConditionCode, MRLRelease, SearchLog, User, PasswordResetToken
 
 @admin.register(SearchLog)
 class SearchLogAdmin(admin.ModelAdmin):
@@ -16,6 +16,7 @@ class SearchLogAdmin(admin.ModelAdmin):
     ordering = ('-timestamp',)
     date_hierarchy = 'timestamp'
     list_per_page = 50
+    show_full_result_count = False  # 필터 적용 시 전체 COUNT(*) 추가 조회 방지
     
     def formatted_timestamp(self, obj):
         """한국 시간으로 포맷된 타임스탬프"""
@@ -23,8 +24,10 @@ class SearchLogAdmin(admin.ModelAdmin):
     formatted_timestamp.short_description = '검색 시간'
     
     def get_queryset(self, request):
-        """최근 1000개 로그만 표시 (성능 최적화)"""
-        # 슬라이스 대신 limit 사용하여 distinct 호환성 확보
+        """
+        전체 로그 조회 (timestamp 인덱스로 date_hierarchy/정렬 처리)
+        - 오래된 로그는 archive_search_logs 커맨드로 보관 후 삭제하여 테이블 크기 유지
+        """
         return super().get_queryset(request)
     
     def changelist_view(self, request, extra_context=None):
@@ -69,6 +72,13 @@ class PesticideLimitAdmin(admin.ModelAdmin):
 class LimitConditionCodeAdmin(admin.ModelAdmin):
     list_display = ('code', 'description')
 
+@admin.register(MRLRelease)
+class MRLReleaseAdmin(admin.ModelAdmin):
+    # 적용/롤백은 python manage.py mrl_release 로만 (pesticide_limits 교체와 함께 처리되어야 함)
+    list_display = ('id', 'label', 'status', 'row_count', 'created_at', 'activated_at')
+    list_filter = ('status',)
+    readonly_fields = ('label', 'source', 'status', 'row_count', 'summary', 'created_at', 'activated_at')
+
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = ('email', 'organization', 'is_active', 'is_staff', 'date_joined', 'last_login')
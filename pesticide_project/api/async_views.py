@@ -0,0 +1,113 @@
+# path of this code : pesticide_project/api/async_views.py
+# 외부 API 응답을 기다리는 뷰의 async 구현
+# - ASGI(uvicorn config.asgi:application)로 실행하면 PubChem 을 기다리는 동안 워커 스레드를 점유하지 않음
+# - ASGI 에서는 이벤트 루프마다 httpx.AsyncClient 하나를 재사용 (PubChem keep-alive 연결 재사용)
+#   WSGI(waitress/gunicorn)에서도 동작하지만 요청마다 이벤트 루프가 새로 만들어지므로 클라이언트도 요청마다 생성
+# - DRF 3.12 는 async 뷰를 지원하지 않아 Django 함수 뷰 + JsonResponse 로 작성 (응답 형식은 기존 DRF 액션과 동일)
+# - httpx 는 첫 요청에서 불러옴 (이 기능을 쓰지 않는 워커의 시작 시간에 포함되지 않도록)
+
+import asyncio
+import logging
+import re
+import weakref
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+logger = logging.getLogger('api')
+
+# PubChem 검색용 화합물명 변환 (괄호 표기와 다른 이름으로 등록된 성분)
+PUBCHEM_NAME_MAPPINGS = {
+    'Glufosinate(ammonium)': 'glufosinate-ammonium',
+    'Glufosinate ammonium': 'glufosinate-ammonium',
+}
+
+_clients = weakref.WeakKeyDictionary()  # 이벤트 루프 → httpx.AsyncClient
+
+
+def pubchem_compound_name(compound_name):
+    """화합물명을 PubChem 검색어로 - 매핑에 없으면 괄호 내용을 하이픈으로 바꾸고 소문자로"""
+    if compound_name in PUBCHEM_NAME_MAPPINGS:
+        return PUBCHEM_NAME_MAPPINGS[compound_name]
+    return re.sub(r'\(([^)]+)\)', r'-\1', compound_name).lower()
+
+
+def _new_client():
+    import httpx
+
+    return httpx.AsyncClient(timeout=getattr(settings, 'PUBCHEM_TIMEOUT', 10.0))
+
+
+@asynccontextmanager
+async def http_client(request):
+    """ASGI 면 이벤트 루프에 묶인 공유 클라이언트, 아니면 요청 동안만 쓰는 클라이언트"""
+    if isinstance(request, ASGIRequest):
+        loop = asyncio.get_running_loop()
+        client = _clients.get(loop)
+        if client is None:
+            client = _clients[loop] = _new_client()
+        yield client
+    else:
+        async with _new_client() as client:
+            yield client
+
+
+async def fetch_structure(client, compound_name):
+    """PubChem CID 조회 후 3D SDF (없으면 2D SDF) - (응답 dict, 상태코드)"""
+    base_url = getattr(settings, 'PUBCHEM_BASE_URL', 'https://pubchem.ncbi.nlm.nih.gov/rest/pug')
+    processed_name = pubchem_compound_name(compound_name)
+
+    cid_response = await client.get(f"{base_url}/compound/name/{processed_name}/cids/JSON")
+    if cid_response.status_code != 200:
+        return {'error': 'Compound not found'}, 404
+
+    cid = cid_response.json().get('IdentifierList', {}).get('CID', [None])[0]
+    if not cid:
+        return {'error': 'CID not found'}, 404
+
+    # 3D 가 없는 성분이 많아 2D 도 동시에 요청하고, 3D 가 있으면 2D 요청은 취소
+    sdf_2d = asyncio.ensure_future(client.get(f"{base_url}/compound/cid/{cid}/SDF"))
+    try:
+        sdf_3d = await client.get(f"{base_url}/compound/cid/{cid}/SDF", params={'record_type': '3d'})
+        if sdf_3d.status_code == 200:
+            return {'structure_data': sdf_3d.text, 'cid': cid, 'compound_name': compound_name}, 200
+
+        sdf_2d_response = await sdf_2d
+        if sdf_2d_response.status_code == 200:
+            return {
+                'structure_data': sdf_2d_response.text,
+                'cid': cid,
+                'compound_name': compound_name,
+                'is_2d': True,
+            }, 200
+        return {'error': 'Structure data not available'}, 404
+    finally:
+        if not sdf_2d.done():
+            sdf_2d.cancel()
+        elif not sdf_2d.cancelled():
+            sdf_2d.exception()  # 3D 요청이 실패해 2D 결과를 쓰지 않은 경우 예외 미확인 경고 방지
+
+
+async def structure3d(request):
+    """농약성분의 3D 구조 데이터를 PubChem 에서 프록시로 가져오기 (GET /api/pesticides/structure3d/)"""
+    # django.views.decorators.http 의 데코레이터는 Django 3.2 에서 async 뷰를 감쌀 수 없어 직접 확인
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    compound_name = request.GET.get('compound_name', '').strip()
+    if not compound_name:
+        return JsonResponse({'error': 'Compound name is required'}, status=400)
+
+    import httpx
+
+    try:
+        async with http_client(request) as client:
+            data, status_code = await fetch_structure(client, compound_name)
+    except httpx.HTTPError as e:
+        logger.warning(f"Error fetching 3D structure: {str(e)}")
+        return JsonResponse({'error': 'Failed to fetch structure data'}, status=500)
+    except Exception as e:
+        logger.error(f"Unexpected error in structure3d: {str(e)}")
+        return JsonResponse({'error': 'Internal server error'}, status=500)
+    return JsonResponse(data, status=status_code)
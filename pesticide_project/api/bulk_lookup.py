@@ -0,0 +1,87 @@
+# path of this code : pesticide_project/api/bulk_lookup.py
+# 여러 (농약, 식품) 쌍을 한 번에 조회 (POST /api/pesticides/bulk_lookup/)
+# - 단건 조회(PesticideLimitViewSet.list)와 같은 규칙: 직접 매칭 → FoodCategory 소분류(sub) → 대분류(main)
+# - 쌍마다 쿼리를 반복하지 않고 기준 1회 (+ 매칭 없는 농약명 확인 1회) 로 처리 (카테고리는 메모리 분류 맵)
+
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from . import food_categories
+from .models import PesticideLimit
+from .serializers import PESTICIDE_LIMIT_VALUES
+
+
+def pesticide_filter(terms):
+    """농약명 검색어들 중 하나라도 한글/영문명에 포함되는 기준 (단건 조회의 icontains 와 동일)"""
+    return reduce(or_, (
+        Q(pesticide_name_kr__icontains=term) | Q(pesticide_name_en__icontains=term) for term in terms
+    ))
+
+
+def pesticide_matches(term, pesticide_name_kr, pesticide_name_en):
+    term = term.lower()
+    return term in pesticide_name_kr.lower() or term in pesticide_name_en.lower()
+
+
+def resolve_pairs(pairs):
+    """
+    (농약, 식품) 쌍 목록을 조회
+    - 반환: 쌍 순서대로 {'matching_type': 'direct'|'sub'|'main'|None, 'matched_food', 'limits', 'pesticide_info'}
+      limits 는 serialize_pesticide_limits 에 바로 넘길 수 있는 .values() 행 목록
+      pesticide_info 는 매칭이 없을 때 안내 메시지용 (pesticide_name_kr, pesticide_name_en) 또는 None
+    """
+    if not pairs:
+        return []
+
+    pesticides = {pesticide for pesticide, _ in pairs}
+    candidates_by_food = {food: food_categories.candidates(food) for _, food in pairs}
+
+    # 직접 매칭 식품명 + 대체 조회에 쓸 소/대분류명을 한 번에 조회
+    food_names = {name.lower() for names in candidates_by_food.values() for name in names if name}
+
+    limits_by_food = {}
+    limits = (
+        PesticideLimit.objects.annotate(food_lower=Lower('food_name'))
+        .filter(food_lower__in=food_names)
+        .filter(pesticide_filter(pesticides))
+        .order_by('food_name', 'id')
+        .values(*PESTICIDE_LIMIT_VALUES, 'food_lower')
+    )
+    for limit in limits:
+        limits_by_food.setdefault(limit['food_lower'], []).append(limit)
+
+    def find(pesticide, food_name):
+        return [
+            limit for limit in limits_by_food.get(food_name.lower(), [])
+            if pesticide_matches(pesticide, limit['pesticide_name_kr'], limit['pesticide_name_en'])
+        ]
+
+    resolved = []
+    for pesticide, food in pairs:
+        result = {'matching_type': None, 'matched_food': None, 'limits': [], 'pesticide_info': None}
+        for matching_type, food_name in zip(('direct', 'sub', 'main'), candidates_by_food[food]):
+            matches = find(pesticide, food_name) if food_name else []
+            if matches:
+                result.update(matching_type=matching_type, matched_food=food_name, limits=matches)
+                break
+        resolved.append(result)
+
+    # 매칭이 없는 쌍의 안내 메시지에 쓸 농약 정식명 (단건 조회의 queryset.first() 에 해당)
+    unmatched = {pesticide for (pesticide, _), result in zip(pairs, resolved) if result['matching_type'] is None}
+    if unmatched:
+        names = list(
+            PesticideLimit.objects.filter(pesticide_filter(unmatched))
+            .values_list('pesticide_name_kr', 'pesticide_name_en')
+            .order_by('pesticide_name_kr', 'pesticide_name_en')
+            .distinct()
+        )
+        for (pesticide, _), result in zip(pairs, resolved):
+            if result['matching_type'] is None:
+                result['pesticide_info'] = next(
+                    (name for name in names if pesticide_matches(pesticide, *name)), None
+                )
+
+    return resolved
@@ -0,0 +1,378 @@
+# path of this code : pesticide_project/api/certificate_archive.py
+# 오래된 검정증명서 원본 PDF 를 월별 압축 팩 파일로 보관
+# 실행은 management command 로: python manage.py archive_certificate_files --months 12
+# - 팩 파일(YYYY-MM.pack): 파일마다 독립적으로 압축한 프레임을 이어붙인 파일
+# - 인덱스(YYYY-MM.pack.idx): {파일 이름: [offset, 압축 길이, 원래 크기]} JSON
+#   → 한 파일만 읽을 때 해당 구간만 읽어 압축 해제 (팩 전체를 풀지 않음)
+# - ContentAddressedStorage 는 원본 위치에 파일이 없으면 여기서 찾아 읽으므로
+#   original_file.open() 등 기존 읽기 경로는 그대로 동작
+# - 삭제된 항목은 인덱스에서만 빠지고, 팩 안의 공간은 --compact 로 회수
+#   정리된 데이터는 새 이름(YYYY-MM.<세대>.pack)에 쓰고 인덱스의 data 항목이 이를 가리킴
+#   → 인덱스 교체 전에 읽는 쪽은 이전 팩을, 교체 후에는 새 팩을 보므로 offset 이 어긋나지 않음
+
+import hashlib
+import json
+import logging
+import lzma
+import os
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from . import metrics
+
+logger = logging.getLogger('api')
+
+CODECS = ('xz', 'zstd')
+INDEX_VERSION = 1
+PACK_SUFFIX = '.pack'
+INDEX_SUFFIX = '.pack.idx'
+
+_index_cache = {}
+_index_cache_lock = threading.Lock()
+
+
+def get_archive_dir():
+    """팩 파일 저장 경로 (settings.CERTIFICATE_ARCHIVE_DIR 우선)"""
+    archive_dir = getattr(settings, 'CERTIFICATE_ARCHIVE_DIR', None)
+    if not archive_dir:
+        archive_dir = os.path.join(settings.MEDIA_ROOT, 'certificates', 'packs')
+    return str(archive_dir)
+
+
+def get_cutoff(months):
+    """보관 기준 시각 - 마지막 업로드가 이 시각 이전인 파일이 보관 대상"""
+    return timezone.now() - timedelta(days=30 * months)
+
+
+def pack_path(archive_dir, year, month):
+    return os.path.join(archive_dir, f"{year:04d}-{month:02d}{PACK_SUFFIX}")
+
+
+def index_path(pack_file):
+    return pack_file[:-len(PACK_SUFFIX)] + INDEX_SUFFIX
+
+
+def data_path(pack_file, index):
+    """인덱스가 가리키는 실제 데이터 파일 (data 항목이 없으면 팩 이름 그대로)"""
+    if index.get('data'):
+        return os.path.join(os.path.dirname(pack_file), index['data'])
+    return pack_file
+
+
+def generation_path(pack_file, generation):
+    """압축 정리 세대별 데이터 파일 (2024-03.pack → 2024-03.2.pack)"""
+    return f"{pack_file[:-len(PACK_SUFFIX)]}.{generation}{PACK_SUFFIX}"
+
+
+# --- 압축 ---
+
+def compress(data, codec):
+    if codec == 'xz':
+        return lzma.compress(data, preset=9 | lzma.PRESET_EXTREME)
+    if codec == 'zstd':
+        import zstandard  # zstd 보관을 쓸 때만 필요하므로 지연 import
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    raise ValueError(f"지원하지 않는 압축 형식: {codec}")
+
+
+def decompress(data, codec):
+    if codec == 'xz':
+        return lzma.decompress(data)
+    if codec == 'zstd':
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"지원하지 않는 압축 형식: {codec}")
+
+
+# --- 인덱스 ---
+
+def read_index(pack_file):
+    path = index_path(pack_file)
+    if not os.path.exists(path):
+        return {'version': INDEX_VERSION, 'codec': None, 'entries': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_index(pack_file, index):
+    """임시 파일에 쓴 뒤 교체 (읽는 쪽은 항상 완전한 인덱스를 봄)"""
+    path = index_path(pack_file)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _index_files(archive_dir):
+    try:
+        names = sorted(name for name in os.listdir(archive_dir) if name.endswith(INDEX_SUFFIX))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(archive_dir, name) for name in names]
+
+
+def load_entries(archive_dir=None, refresh=False):
+    """
+    모든 팩의 {파일 이름: (데이터 파일 경로, offset, 길이, 크기, codec, 팩 경로)}
+    - 인덱스 파일 목록/수정시각이 바뀐 경우에만 다시 읽음
+    """
+    archive_dir = archive_dir or get_archive_dir()
+    files = _index_files(archive_dir)
+    signature = tuple((path, os.stat(path).st_mtime_ns) for path in files if os.path.exists(path))
+
+    with _index_cache_lock:
+        cached = _index_cache.get(archive_dir)
+        if cached and cached[0] == signature and not refresh:
+            metrics.record_cache('certificate_archive_index', True)
+            return cached[1]
+    metrics.record_cache('certificate_archive_index', False)
+
+    entries = {}
+    for path in files:
+        pack_file = path[:-len(INDEX_SUFFIX)] + PACK_SUFFIX
+        try:
+            index = read_index(pack_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"팩 인덱스를 읽지 못함: {path}, 오류: {str(e)}")
+            continue
+        data_file = data_path(pack_file, index)
+        for name, (offset, length, size) in index['entries'].items():
+            entries[name] = (data_file, offset, length, size, index['codec'], pack_file)
+
+    with _index_cache_lock:
+        _index_cache[archive_dir] = (signature, entries)
+    return entries
+
+
+def lookup(name):
+    """팩에 보관된 파일이면 (데이터 파일 경로, offset, 길이, 크기, codec, 팩 경로), 아니면 None"""
+    return load_entries().get(name)
+
+
+def read_packed(name):
+    """
+    팩에서 한 파일만 읽어 압축 해제
+    - 압축 정리로 이전 데이터 파일이 지워졌으면 인덱스를 다시 읽어 재시도
+    - 해시 경로 이름이면 내용 해시도 확인 (다르면 같은 방법으로 재시도)
+    """
+    from .storage import digest_from_name
+
+    digest = digest_from_name(name)
+    for refresh in (False, True):
+        entry = load_entries(refresh=refresh).get(name)
+        if entry is None:
+            break
+        data_file, offset, length, size, codec, _ = entry
+        try:
+            with open(data_file, 'rb') as f:
+                f.seek(offset)
+                data = decompress(f.read(length), codec)
+        except FileNotFoundError:
+            logger.info(f"팩 데이터 파일이 교체됨, 인덱스 재확인: {name}")
+            continue
+        if not digest or hashlib.sha256(data).hexdigest() == digest:
+            return data
+        logger.warning(f"팩 데이터 해시 불일치, 인덱스 재확인: {name}")
+    raise FileNotFoundError(f"보관된 파일을 찾을 수 없음: {name}")
+
+
+def pack_lock(archive_dir):
+    """팩/인덱스를 수정하는 작업끼리 직렬화"""
+    return file_lock(os.path.join(archive_dir, '.lock'))
+
+
+@contextmanager
+def file_lock(lock_path):
+    """잠금 파일로 프로세스 간 직렬화 (fcntl 이 없는 환경에서는 잠금 없이 실행)"""
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    with open(lock_path, 'a') as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def discard(name):
+    """팩 인덱스에서 항목 제거 (참조하는 증명서가 없어 삭제되는 경우)"""
+    entry = lookup(name)
+    if entry is None:
+        return False
+    pack_file = entry[5]
+    with pack_lock(os.path.dirname(pack_file)):
+        index = read_index(pack_file)
+        if index['entries'].pop(name, None) is None:
+            return False
+        write_index(pack_file, index)
+    logger.info(f"팩 인덱스에서 제거: {name} ({os.path.basename(pack_file)})")
+    return True
+
+
+# --- 보관 / 압축 정리 ---
+
+def find_archive_candidates(months):
+    """
+    마지막 업로드가 기준 시각 이전이고 아직 원본 위치에 있는 파일
+    - 같은 파일을 여러 증명서가 참조하면 가장 최근 업로드 기준
+    - 반환: {(년, 월): [파일 이름, ...]}
+    """
+    from .models import CertificateOfAnalysis
+    from .search_log_retention import month_key
+    from .storage import get_certificate_storage
+
+    storage = get_certificate_storage()
+    rows = (
+        CertificateOfAnalysis.objects.exclude(original_file='')
+        .values('original_file')
+        .annotate(last_upload=Max('upload_date'))
+        .filter(last_upload__lt=get_cutoff(months))
+        .order_by('last_upload')
+    )
+    by_month = {}
+    for row in rows:
+        name = row['original_file']
+        if os.path.exists(storage.path(name)):
+            by_month.setdefault(month_key(row['last_upload']), []).append(name)
+    return by_month
+
+
+def append_to_pack(pack_file, names, codec, storage):
+    """
+    파일들을 팩 끝에 추가하고 인덱스 갱신, 그 뒤에 원본 파일 삭제
+    - 팩에 쓰고 fsync → 인덱스 교체 → 원본 삭제 순서라 중간에 중단되어도 파일을 잃지 않음
+    - 반환: (원래 크기 합계, 압축 크기 합계)
+    """
+    index = read_index(pack_file)
+    if index['codec'] and index['codec'] != codec:
+        codec = index['codec']  # 한 팩 안에서는 같은 형식 유지
+    index['codec'] = codec
+
+    original_bytes = packed_bytes = 0
+    added = []
+    with open(data_path(pack_file, index), 'ab') as f:
+        for name in names:
+            if name in index['entries']:
+                added.append(name)  # 이전 실행이 인덱스까지 기록한 뒤 중단된 경우
+                continue
+            with open(storage.path(name), 'rb') as source:
+                data = source.read()
+            frame = compress(data, codec)
+            offset = f.tell()
+            f.write(frame)
+            index['entries'][name] = [offset, len(frame), len(data)]
+            original_bytes += len(data)
+            packed_bytes += len(frame)
+            added.append(name)
+        f.flush()
+        os.fsync(f.fileno())
+
+    write_index(pack_file, index)
+    for name in added:
+        try:
+            os.remove(storage.path(name))
+        except FileNotFoundError:
+            pass
+    return original_bytes, packed_bytes
+
+
+def archive_certificate_files(months, codec='xz', archive_dir=None, dry_run=False):
+    """
+    마지막 업로드가 months 개월보다 오래된 원본 PDF 를 월별 팩으로 옮김
+    - 반환: {'files', 'original_bytes', 'packed_bytes', 'months': {(년, 월): 파일 수}}
+    """
+    from .storage import get_certificate_storage
+
+    if codec not in CODECS:
+        raise ValueError(f"지원하지 않는 압축 형식: {codec}")
+
+    storage = get_certificate_storage()
+    archive_dir = archive_dir or get_archive_dir()
+    candidates = find_archive_candidates(months)
+    stats = {
+        'files': sum(len(names) for names in candidates.values()),
+        'original_bytes': 0,
+        'packed_bytes': 0,
+        'months': {key: len(names) for key, names in candidates.items()},
+    }
+    if dry_run:
+        stats['original_bytes'] = sum(
+            os.path.getsize(storage.path(name)) for names in candidates.values() for name in names
+        )
+        return stats
+
+    with pack_lock(archive_dir):
+        for (year, month), names in sorted(candidates.items()):
+            original_bytes, packed_bytes = append_to_pack(pack_path(archive_dir, year, month), names, codec, storage)
+            stats['original_bytes'] += original_bytes
+            stats['packed_bytes'] += packed_bytes
+            logger.info(f"증명서 파일 보관: {year:04d}-{month:02d} {len(names)}개, {original_bytes:,} → {packed_bytes:,} bytes")
+
+    load_entries(archive_dir, refresh=True)
+    return stats
+
+
+def compact_packs(archive_dir=None):
+    """
+    인덱스에서 빠진(삭제된) 프레임을 제외하고 팩을 다시 씀
+    - 새 세대 데이터 파일에 쓰고 fsync → 그 파일을 가리키는 인덱스로 교체 → 이전 데이터 파일 삭제
+      (기존 데이터 파일을 제자리에서 바꾸지 않으므로 인덱스와 데이터가 어긋난 상태를 읽는 쪽이 볼 수 없음)
+    - 반환: 회수한 bytes
+    """
+    archive_dir = archive_dir or get_archive_dir()
+    reclaimed = 0
+    with pack_lock(archive_dir):
+        for path in _index_files(archive_dir):
+            pack_file = path[:-len(INDEX_SUFFIX)] + PACK_SUFFIX
+            index = read_index(pack_file)
+            old_data = data_path(pack_file, index)
+            _remove_stale_data_files(pack_file, old_data)
+            live_bytes = sum(length for _, length, _ in index['entries'].values())
+            old_size = os.path.getsize(old_data)
+            if live_bytes == old_size:
+                continue
+
+            generation = index.get('generation', 0) + 1
+            new_data = generation_path(pack_file, generation)
+            new_entries = {}
+            with open(old_data, 'rb') as source, open(new_data, 'wb') as target:
+                for name, (offset, length, size) in sorted(index['entries'].items(), key=lambda item: item[1][0]):
+                    source.seek(offset)
+                    new_entries[name] = [target.tell(), length, size]
+                    target.write(source.read(length))
+                target.flush()
+                os.fsync(target.fileno())
+            write_index(pack_file, dict(
+                index, entries=new_entries, data=os.path.basename(new_data), generation=generation,
+            ))
+            os.remove(old_data)
+            reclaimed += old_size - live_bytes
+            logger.info(f"팩 정리: {os.path.basename(pack_file)} {old_size:,} → {live_bytes:,} bytes")
+
+    load_entries(archive_dir, refresh=True)
+    return reclaimed
+
+
+def _remove_stale_data_files(pack_file, current):
+    """이전 정리가 중단되어 남은(인덱스가 가리키지 않는) 데이터 파일 삭제"""
+    stem = os.path.basename(pack_file)[:-len(PACK_SUFFIX)]
+    for filename in os.listdir(os.path.dirname(pack_file)):
+        path = os.path.join(os.path.dirname(pack_file), filename)
+        middle = filename[len(stem):-len(PACK_SUFFIX)]
+        is_data_file = filename == stem + PACK_SUFFIX or (
+            filename.startswith(stem + '.') and filename.endswith(PACK_SUFFIX) and middle[1:].isdigit()
+        )
+        if is_data_file and path != current:
+            os.remove(path)
+            logger.info(f"남은 팩 데이터 파일 삭제: {filename}")
@@ -1,24 +1,23 @@
+from django.db import transaction
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from .models import PesticideLimit
-import PyPDF2
 import re
 import logging
 import os
 import decimal
 from datetime import datetime
-from api.models import CertificateOfAnalysis, PesticideResult, FoodCategory
+from api.models import CertificateOfAnalysis, PesticideResult
+from api import food_categories, mrl_matrix
+from api.food_categories import FOOD_NAME_MAPPING
 from api.serializers import CertificateOfAnalysisSerializer, PesticideResultSerializer
+from api.stage_timing import attach_stage_timings, stage, timed
+from api.profiling import profile_view
+from api.storage import file_sha256 as compute_file_sha256, release_certificate_file
 
 logger = logging.getLogger(__name__)
 
-# 모듈 로드 시 로그
-print("=" * 60)
-print("Certificate Parser module loaded!")
-print(f"Logger name: {logger.name}")
-print("=" * 60)
-
-
+@timed('validate_structure')
 def validate_certificate_structure(text):
     """
     검정증명서 필수 구조 요소 검증
@@ -55,6 +54,7 @@ def validate_certificate_structure(text):
     return True, "유효한 검정증명서 구조"
 
 
+@timed('validate_issuer')
 def validate_issuer(text):
     """
     공인 발급기관 검증
@@ -136,12 +136,13 @@ def provide_detailed_feedback(structure_valid, structure_msg, issuer_valid, issu
     return feedback
 
 
-def process_plant_material_verification(pesticide_name, pesticide_name_for_db, detection_value, result, is_eco_friendly):
+def process_plant_material_verification(pesticide_name, pesticide_name_for_db, detection_value, result, is_eco_friendly,
+                                        eco_compliant):
     """
     작물체에 대한 특별 검증 로직
     - 표준 MRL: 무조건 "-"
     - 기록된 MRL과 검토의견이 모두 "-"인지 검증
-    - 검출량은 검증하지 않고 그대로 표시
+    - 검출량은 검증하지 않고 그대로 표시 (친환경 검정만 eco_compliant - 행렬 판정의 0.01 미만 여부 - 반영)
     """
     # 작물체의 경우 표준 MRL은 무조건 "-"
     standard_pesticide_name = pesticide_name_for_db
@@ -158,10 +159,9 @@ def process_plant_material_verification(pesticide_name, pesticide_name_for_db, d
     
     # 친환경 검정의 경우 작물체라도 검출량 검증 필요
     if is_eco_friendly:
-        eco_friendly_threshold = decimal.Decimal('0.01')
-        pdf_calculated_result = '적합' if detection_value < eco_friendly_threshold else '부적합'
+        pdf_calculated_result = '적합' if eco_compliant else '부적합'
         db_calculated_result = pdf_calculated_result
-        logger.info(f"작물체 + 친환경: 검출량 {detection_value} vs 기준 {eco_friendly_threshold}, 결과: {pdf_calculated_result}")
+        logger.info(f"작물체 + 친환경: 검출량 {detection_value} vs 기준 {mrl_matrix.ECO_FRIENDLY_THRESHOLD}, 결과: {pdf_calculated_result}")
     else:
         # 일반 검정의 작물체는 검출량 검증하지 않음 - 계산된 결과는 항상 "-"
         pdf_calculated_result = '-' if pdf_mrl_correct and pdf_opinion_correct else '확인불가'
@@ -171,8 +171,7 @@ def process_plant_material_verification(pesticide_name, pesticide_name_for_db, d
     # AI 판정: 작물체는 기본적으로 MRL과 검토의견이 모두 "-"이어야 통과
     # 친환경 검정의 경우 추가로 검출량도 기준에 맞아야 함
     if is_eco_friendly:
-        eco_detection_ok = detection_value < decimal.Decimal('0.01')
-        is_pdf_consistent = pdf_mrl_correct and pdf_opinion_correct and eco_detection_ok
+        is_pdf_consistent = pdf_mrl_correct and pdf_opinion_correct and eco_compliant
     else:
         is_pdf_consistent = pdf_mrl_correct and pdf_opinion_correct
     
@@ -249,6 +248,8 @@ def calculate_similarity(str1, str2):
 
 
 @csrf_exempt
+@profile_view()
+@attach_stage_timings
 def upload_certificate(request):
     """
     검정증명서 PDF 업로드 및 파싱 전체 처리 관리자
@@ -258,7 +259,6 @@ def upload_certificate(request):
     - 다른 함수들을 순서대로 호출하여 전체 과정을 관리
     - 최종 결과를 사용자에게 JSON 형태로 반환
     """
-    print(f"[CERTIFICATE UPLOAD] Request received from {request.META.get('REMOTE_ADDR', 'unknown')}")
     logger.info(f"Certificate upload request from {request.META.get('REMOTE_ADDR', 'unknown')}")
     
     if 'file' not in request.FILES:
@@ -315,26 +315,13 @@ def upload_certificate(request):
                     'certificate_id': existing_certificate.id,
                     'certificate_number': existing_certificate.certificate_number,
                     'sample_description': existing_certificate.sample_description,
-                    'pesticide_count': existing_certificate.pesticide_results.count()
+                    'pesticide_count': len(verification_result)  # 이미 조회한 결과 재사용 (COUNT 쿼리 생략)
                 }
             }, status=200)
         elif existing_certificate and overwrite:
-            # 덮어쓰기 옵션이 있으면 기존 증명서 삭제
-            logger.info(f"기존 증명서 삭제: {certificate_number} (덮어쓰기)")
-
-            # 기존 파일 경로 가져오기
-            old_file_path = existing_certificate.original_file.path if existing_certificate.original_file else None
-
-            # 기존 증명서 및 관련된 농약 검출 결과 삭제
-            existing_certificate.delete()
-
-            # 파일 시스템에서 파일 삭제 (필요한 경우)
-            if old_file_path and os.path.exists(old_file_path):
-                try:
-                    os.remove(old_file_path)
-                    logger.info(f"기존 파일 삭제 성공: {old_file_path}")
-                except Exception as e:
-                    logger.warning(f"기존 파일 삭제 실패: {old_file_path}, 오류: {str(e)}")
+            # 덮어쓰기: 기존 증명서는 새 증명서 저장과 같은 트랜잭션에서 삭제
+            # (검증 도중 품목 선택 요구 등으로 중단되면 기존 증명서가 그대로 남음)
+            logger.info(f"기존 증명서 교체 예정: {certificate_number} (덮어쓰기)")
 
         # 사용자가 품목을 선택했다면, 해당 품목으로 매핑 적용
         if selected_food:
@@ -352,14 +339,11 @@ def upload_certificate(request):
         # 작물체인 경우는 팝업을 보여주지 않음
         if sample_description and not selected_food and not skip_food_validation and not is_plant_material:
             # 기본 매핑 확인
-            FOOD_NAME_MAPPING = {
-                '깻잎': '들깻잎',
-            }
             mapped_food = FOOD_NAME_MAPPING.get(sample_description, sample_description)
             
             # 품목명이 DB에 있는지 확인 - PesticideLimit과 FoodCategory 모두 확인
             food_exists_in_limits = PesticideLimit.objects.filter(food_name__iexact=mapped_food).exists()
-            food_exists_in_categories = FoodCategory.objects.filter(food_name__iexact=mapped_food).exists()
+            food_exists_in_categories = food_categories.lookup(mapped_food) is not None
             
             logger.info(f"품목명 '{mapped_food}' 확인: PesticideLimit={food_exists_in_limits}, FoodCategory={food_exists_in_categories}")
             
@@ -369,7 +353,8 @@ def upload_certificate(request):
                 try:
                     import requests
                     api_url = f"http://localhost:8000/api/pesticides/find_similar_foods/?food={sample_description}"
-                    response = requests.get(api_url)
+                    with stage('similar_food_lookup'):
+                        response = requests.get(api_url)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -397,17 +382,18 @@ def upload_certificate(request):
         if sample_description:
             # 직접 매칭 확인
             direct_match = PesticideLimit.objects.filter(food_name__iexact=sample_description).exists()
-            category_match = FoodCategory.objects.filter(food_name__iexact=sample_description).first()
+            category_match = food_categories.lookup(sample_description)  # (소분류, 대분류), 쿼리 없음
             
             if not direct_match and category_match:
                 # PesticideLimit에는 없지만 FoodCategory에 있는 경우
+                sub_category, main_category = category_match
                 category_substitution_info = {
                     'original_food': sample_description,
-                    'main_category': category_match.main_category,
-                    'sub_category': category_match.sub_category,
+                    'main_category': main_category,
+                    'sub_category': sub_category,
                     'used_category_lookup': True
                 }
-                logger.info(f"카테고리 대체 조회 적용: {sample_description} → {category_match.sub_category}")
+                logger.info(f"카테고리 대체 조회 적용: {sample_description} → {sub_category}")
 
         # just for debugging
         logger.info(f"파싱 결과의 pesticide_results 키 존재: {'pesticide_results' in parsing_result}")
@@ -418,8 +404,11 @@ def upload_certificate(request):
             f"{'새 증명서' if not existing_certificate or overwrite else '기존 증명서'} 검증 완료: {certificate_number}, 결과 수: {len(verification_result)}")
         logger.info(f"검증 결과 샘플: {verification_result[:1] if verification_result else '없음'}")
 
-        # 결과 저장
-        saved_data = save_certificate_data(parsing_result, verification_result, pdf_file)
+        # 결과 저장 (덮어쓰기인 경우 기존 증명서 삭제와 한 트랜잭션)
+        with transaction.atomic():
+            if existing_certificate and overwrite:
+                replace_certificate(existing_certificate)
+            saved_data = save_certificate_data(parsing_result, verification_result, pdf_file)
 
         response_data = {
             'message': '검정증명서가 성공적으로 업로드되었습니다.',
@@ -445,6 +434,19 @@ def upload_certificate(request):
                         status=500)
 
 
+def replace_certificate(existing_certificate):
+    """
+    덮어쓰기 시 기존 증명서와 농약 검출 결과 삭제
+    - 호출하는 쪽의 transaction.atomic 안에서 실행
+    - 원본 파일은 커밋된 뒤, 다른 증명서(같은 내용으로 다시 올린 새 증명서 포함)가
+      참조하지 않을 때만 삭제 (롤백되면 기존 증명서와 파일이 모두 유지됨)
+    """
+    old_file_name = existing_certificate.original_file.name
+    logger.info(f"기존 증명서 삭제: {existing_certificate.certificate_number} (덮어쓰기)")
+    existing_certificate.delete()
+    transaction.on_commit(lambda: release_certificate_file(old_file_name))
+
+
 def parse_certificate_pdf(pdf_file):
     """
     pdfplumber를 사용한 PDF 파일 파싱 함수
@@ -469,7 +471,7 @@ def parse_certificate_pdf(pdf_file):
         logger.info("pdfplumber로 PDF 텍스트 추출 시작")
         text = ""
 
-        with pdfplumber.open(pdf_file) as pdf:
+        with stage('pdf_extract'), pdfplumber.open(pdf_file) as pdf:
             logger.info(f"PDF 총 페이지 수: {len(pdf.pages)}")
 
             for page_num, page in enumerate(pdf.pages):
@@ -480,81 +482,9 @@ def parse_certificate_pdf(pdf_file):
                 else:
                     logger.warning(f"페이지 {page_num + 1}에서 텍스트를 찾을 수 없음")
 
-        # 텍스트 추출 결과 검증
-        if not text or len(text.strip()) < 50:
-            logger.error("추출된 텍스트가 너무 짧거나 비어있음")
-            return None
-
-        # 강화된 PDF 검증 추가
-        logger.info("검정증명서 구조 및 발급기관 검증 시작")
-        
-        # 1. 구조 검증
-        structure_valid, structure_msg = validate_certificate_structure(text)
-        
-        # 2. 발급기관 검증
-        issuer_valid, issuer_msg = validate_issuer(text)
-        
-        # 3. 검증 결과 처리
-        if not structure_valid or not issuer_valid:
-            feedback = provide_detailed_feedback(
-                structure_valid, structure_msg, 
-                issuer_valid, issuer_msg, 
-                len(text.strip())
-            )
-            logger.error(f"PDF 검증 실패: {feedback['message']}")
-            logger.error(f"검증 세부사항: {feedback.get('details', [])}")
-            
-            # 검증 실패 정보를 포함한 특별한 응답 반환
-            return {
-                'validation_failed': True,
-                'feedback': feedback
-            }
-
-        logger.info(f"텍스트 추출 성공 - 총 {len(text)} 글자, {text.count(chr(10))} 줄")
-
-        # 원시 텍스트 출력 (디버깅용)
-        print("\n" + "=" * 60)
-        print("PDF 원시 텍스트 (pdfplumber로 추출)")
-        print("=" * 60)
-        print(text)
-        print("=" * 60 + " 텍스트 끝 " + "=" * 60)
-        print(f"추출 통계: {len(text)} 글자, {text.count(chr(10))} 줄")
-        print("=" * 60)
-
-        # 기본 정보 추출
-        logger.info("추출된 텍스트에서 정보 파싱 시작")
-
-        certificate_number = extract_certificate_number(text)
-        logger.info(f"증명서 번호 추출: {certificate_number}")
-
-        applicant_info = extract_applicant_info(text)
-        logger.info(f"신청인 정보 추출 완료")
-
-        test_info = extract_certificate_test_details(text)
-        logger.info(f"검정 정보 추출 완료")
-
-        pesticide_results = extract_pesticide_results(text)
-        logger.info(f"농약 결과 추출 완료: {len(pesticide_results)}건")
-
-        # 결과 구성
-        result = {
-            'certificate_number': certificate_number,
-            'applicant_name': applicant_info.get('name'),
-            'applicant_id_number': applicant_info.get('id_number'),
-            'applicant_address': applicant_info.get('address'),
-            'applicant_tel': applicant_info.get('tel'),
-            'analytical_purpose': test_info.get('analytical_purpose'),
-            'sample_description': test_info.get('sample_description'),
-            'producer_info': test_info.get('producer_info'),
-            'analyzed_items': test_info.get('analyzed_items'),
-            'sample_quantity': test_info.get('sample_quantity'),
-            'test_start_date': test_info.get('test_start_date'),
-            'test_end_date': test_info.get('test_end_date'),
-            'analytical_method': test_info.get('analytical_method'),
-            'pesticide_results': pesticide_results
-        }
-
-        logger.info("PDF 파싱 완료 - pdfplumber 방식으로 성공")
+        result = parse_certificate_text(text)
+        if result and not result.get('validation_failed'):
+            logger.info("PDF 파싱 완료 - pdfplumber 방식으로 성공")
         return result
 
     except ImportError:
@@ -569,6 +499,85 @@ def parse_certificate_pdf(pdf_file):
         return None
 
 
+def parse_certificate_text(text):
+    """
+    PDF에서 추출한 텍스트를 검정증명서 데이터로 변환
+    - 구조/발급기관 검증 후 각 영역별 추출 함수를 호출
+    - 검증 실패 시 {'validation_failed': True, 'feedback': ...} 반환
+    - PDF 없이 텍스트만으로 동작하므로 벤치마크/테스트에서 직접 호출 가능
+    """
+    # 텍스트 추출 결과 검증
+    if not text or len(text.strip()) < 50:
+        logger.error("추출된 텍스트가 너무 짧거나 비어있음")
+        return None
+
+    # 강화된 PDF 검증 추가
+    logger.info("검정증명서 구조 및 발급기관 검증 시작")
+    
+    # 1. 구조 검증
+    structure_valid, structure_msg = validate_certificate_structure(text)
+    
+    # 2. 발급기관 검증
+    issuer_valid, issuer_msg = validate_issuer(text)
+    
+    # 3. 검증 결과 처리
+    if not structure_valid or not issuer_valid:
+        feedback = provide_detailed_feedback(
+            structure_valid, structure_msg, 
+            issuer_valid, issuer_msg, 
+            len(text.strip())
+        )
+        logger.error(f"PDF 검증 실패: {feedback['message']}")
+        logger.error(f"검증 세부사항: {feedback.get('details', [])}")
+        
+        # 검증 실패 정보를 포함한 특별한 응답 반환
+        return {
+            'validation_failed': True,
+            'feedback': feedback
+        }
+
+    logger.info(f"텍스트 추출 성공 - 총 {len(text)} 글자, {text.count(chr(10))} 줄")
+
+    # 원시 텍스트는 DEBUG 레벨에서만 기록 (운영 로그에 증명서 전문이 남지 않도록)
+    logger.debug("PDF 원시 텍스트 (pdfplumber로 추출):\n%s", text)
+
+    # 기본 정보 추출
+    logger.info("추출된 텍스트에서 정보 파싱 시작")
+
+    certificate_number = extract_certificate_number(text)
+    logger.info(f"증명서 번호 추출: {certificate_number}")
+
+    applicant_info = extract_applicant_info(text)
+    logger.info(f"신청인 정보 추출 완료")
+
+    test_info = extract_certificate_test_details(text)
+    logger.info(f"검정 정보 추출 완료")
+
+    pesticide_results = extract_pesticide_results(text)
+    logger.info(f"농약 결과 추출 완료: {len(pesticide_results)}건")
+
+    # 결과 구성
+    result = {
+        'certificate_number': certificate_number,
+        'applicant_name': applicant_info.get('name'),
+        'applicant_id_number': applicant_info.get('id_number'),
+        'applicant_address': applicant_info.get('address'),
+        'applicant_tel': applicant_info.get('tel'),
+        'analytical_purpose': test_info.get('analytical_purpose'),
+        'sample_description': test_info.get('sample_description'),
+        'producer_info': test_info.get('producer_info'),
+        'analyzed_items': test_info.get('analyzed_items'),
+        'sample_quantity': test_info.get('sample_quantity'),
+        'test_start_date': test_info.get('test_start_date'),
+        'test_end_date': test_info.get('test_end_date'),
+        'analytical_method': test_info.get('analytical_method'),
+        'pesticide_results': pesticide_results
+    }
+
+    return result
+
+
+@timed()
 def extract_certificate_number(text):
     """
     텍스트에서 증명서 번호 추출
@@ -582,6 +591,7 @@ def extract_certificate_number(text):
     return None
 
 
+@timed()
 def extract_applicant_info(text):
     """
     신청인 정보 추출기
@@ -747,6 +757,7 @@ def extract_applicant_info(text):
     return info
 
 
+@timed()
 def extract_certificate_test_details(text):
     """
     검정증명서 PDF에서 추출한 텍스트에서 필요한 정보를 추출 - 개선된 버전
@@ -829,6 +840,7 @@ def extract_certificate_test_details(text):
     return result
 
 
+@timed()
 def extract_pesticide_results(text):
     """
     텍스트에서 농약 검출 결과 추출
@@ -1115,47 +1127,103 @@ def extract_pesticide_results(text):
     return unique_results
 
 
-def verify_pesticide_results(parsing_result):
+def resolve_standard_pesticide(pesticide_name, pesticide_name_for_db, matrix):
     """
-    파싱된 농약 검출 결과 검증 - 수정 (None 값 처리 강화)
+    DB 표준 영문명 찾기 - (표준명, 기록된 농약명과 표준명이 같은지, 정확 매칭 여부)
+    - 정확 매칭(대소문자 무시)은 MRL 행렬에서 조회 (쿼리 없음, 같은 이름이 여러 행이면 먼저 등록된 행의 표기)
+    - 없으면 부분 매칭(DB 농약명에 포함) → 퍼지 매칭(유사도 60% 초과) 순으로 DB 조회
+    - 모두 실패하면 DB 조회용 농약명을 그대로 사용 (행렬에 없으므로 PDF 값 / PLS 로 판정)
+    """
+    p = matrix.pesticide_id(pesticide_name_for_db)
+    if p >= 0 and matrix.pesticides[p].lower() == pesticide_name_for_db.lower():
+        standard_pesticide_name = matrix.pesticides[p]
+        pesticide_name_match = pesticide_name.lower() == standard_pesticide_name.lower()
+        logger.info(f"✅ [표준명 조회 성공] '{pesticide_name_for_db}' → 표준명: '{standard_pesticide_name}'")
+        if not pesticide_name_match:
+            logger.info(f"⚠️ [불일치 감지] 기록명: '{pesticide_name}' vs 표준명: '{standard_pesticide_name}'")
+        return standard_pesticide_name, pesticide_name_match, True
+
+    # 1단계: 부분 매칭 시도 (pesticide_name_for_db가 DB 농약명에 포함되는지 확인)
+    logger.info(f"❌ [표준명 조회 실패] '{pesticide_name_for_db}' 정확한 매칭 없음, 부분 매칭 시도")
+    partial_match = PesticideLimit.objects.filter(
+        pesticide_name_en__icontains=pesticide_name_for_db
+    ).first()
+    if partial_match:
+        logger.info(f"✨ [부분 매칭 성공] '{pesticide_name_for_db}' → 표준명: '{partial_match.pesticide_name_en}'")
+        return partial_match.pesticide_name_en, False, False  # 정확한 매칭은 아니므로 False
+
+    # 2단계: 퍼지 매칭 시도 - 모든 농약명을 가져와서 유사도 검사
+    best_match = None
+    highest_similarity = 0
+    for std_name in PesticideLimit.objects.values_list('pesticide_name_en', flat=True).distinct():
+        # 단순 문자열 유사도 계산 (Levenshtein 거리 기반)
+        similarity = calculate_similarity(pesticide_name_for_db.lower(), std_name.lower())
+        if similarity > highest_similarity and similarity > 0.6:  # 60% 이상 유사 (기준 완화)
+            highest_similarity = similarity
+            best_match = std_name
+    if best_match:
+        logger.info(f"✨ [퍼지 매칭 성공] '{pesticide_name_for_db}' → 표준명: '{best_match}' (유사도: {highest_similarity:.2f})")
+        return best_match, False, False
+
+    logger.info(f"💔 [퍼지 매칭 실패] 유사 농약명 찾지 못함, 기본값 사용: '{pesticide_name_for_db}'")
+    return pesticide_name_for_db, False, False
+
+
+def normalize_mrl(text):
+    """MRL 표시 문자열 → (수치, 특수기호 집합) - 예: '0.3†' → (0.3, {'†'})"""
+    symbols = re.findall(r'[†T]', text)
+    numbers = re.findall(r'\d+\.?\d*', text)
+    numeric_value = float(numbers[0]) if numbers else 0
+    return numeric_value, set(symbols)
+
+
+def is_pdf_mrl_accurate(pdf_mrl_text, db_mrl_text):
+    """연구원이 기록한 MRL 과 표준 MRL 이 일치하는지 (연구원 실수 감지)"""
+    pdf_numeric, pdf_symbols = normalize_mrl(pdf_mrl_text)
+    db_numeric, db_symbols = normalize_mrl(db_mrl_text)
+
+    # 1. 문자열이 완전히 일치하면 정확
+    if pdf_mrl_text == db_mrl_text:
+        logger.info(f"✅ MRL 완전 일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}'")
+        return True
+    # 2. 수치적으로 같고 특수기호도 같으면 정확 (형식만 다른 경우)
+    if abs(pdf_numeric - db_numeric) <= 0.001 and pdf_symbols == db_symbols:
+        logger.info(f"✅ MRL 수치+기호 일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}' → 형식만 다름")
+        return True
+    # 3. 수치는 같지만 특수기호가 다른 경우
+    if abs(pdf_numeric - db_numeric) <= 0.001:
+        logger.warning(f"🚨 MRL 특수기호 불일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}' → 연구원이 특수기호 누락/오류")
+        return False
+    # 4. 수치 자체가 다른 경우
+    logger.warning(f"🚨 MRL 값 불일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}' → 연구원 기록 오류")
+    return False
+
+
+def _prepare_verification(parsing_result, matrix):
+    """
+    증명서 한 건의 검증 입력 - (친환경 여부, 작물체 여부, 검출 행 목록)
+    - 검출 행: 검출량/PDF MRL 을 Decimal 로 바꾸고 표준명을 찾아 둠 (검출량을 읽을 수 없는 행은 제외)
     """
-
-    if not parsing_result or 'pesticide_results' not in parsing_result:
-        return []
-
-    # 기본 품목명 매핑 사전 (확실한 매핑만 유지)
-    FOOD_NAME_MAPPING = {
-        '깻잎': '들깻잎',
-        # 안전한 매핑만 유지, 작물체 등은 사용자 선택으로 처리
-    }
-
     # 친환경 검정인지 확인
-    is_eco_friendly = False
     analytical_purpose = parsing_result.get('analytical_purpose', '')
-    if analytical_purpose and '친환경' in analytical_purpose:
-        is_eco_friendly = True
+    is_eco_friendly = bool(analytical_purpose and '친환경' in analytical_purpose)
+    if is_eco_friendly:
         logger.info(f"친환경 검정 감지: {analytical_purpose}")
 
     # 작물체 여부 확인
     is_plant_material = parsing_result.get('is_plant_material', False)
     logger.info(f"검증 함수에서 is_plant_material 값: {is_plant_material}")
-    
-    verification_results = []
+
     sample_description = parsing_result.get('sample_description', '')
     mapped_sample_description = FOOD_NAME_MAPPING.get(sample_description, sample_description)
-
-    # 로그 추가
     if sample_description != mapped_sample_description:
         logger.info(f"품목명 매핑: '{sample_description}' → '{mapped_sample_description}'")
-
-    # 로그 추가
     logger.info(f"검정 품목: {sample_description}")
 
+    rows = []
     for result in parsing_result['pesticide_results']:
         pesticide_name = result['pesticide_name']  # 연구원이 기록한 원본 농약명 (표시용)
         pesticide_name_for_db = result.get('standard_pesticide_name_for_db', pesticide_name)  # DB 조회용
-        
-        logger.info(f"🔍 [표준명 추적 시작] 원본 농약명: '{pesticide_name}', DB 조회용: '{pesticide_name_for_db}'")
 
         # detection_value를 안전하게 처리
         try:
@@ -1171,455 +1239,158 @@ def verify_pesticide_results(parsing_result):
                 pdf_korea_mrl = decimal.Decimal(result['korea_mrl'])
             except (ValueError, TypeError, decimal.InvalidOperation):
                 logger.warning(f"PDF MRL 값 변환 실패: {result['korea_mrl']}")
-                pdf_korea_mrl = None
-
-        # 작물체 특별 처리
-        if is_plant_material:
-            logger.info(f"🌱 작물체 특별 처리 시작: {pesticide_name}")
-            verification_results.append(
-                process_plant_material_verification(
-                    pesticide_name, pesticide_name_for_db, detection_value, 
-                    result, is_eco_friendly
-                )
-            )
-            logger.info(f"🌱 작물체 특별 처리 완료: {pesticide_name}")
-            continue
-
-        # 일반 식품의 경우 기존 로직 사용
-        # 데이터베이스에서 정보 조회
-        db_pesticide_info = None
-        standard_pesticide_name = None
-        db_korea_mrl = None
-        db_korea_mrl_display = ""
-        pesticide_name_match = False
 
-        try:
-            # 1. 농약성분명으로 표준명 찾기 (DB 조회용 농약명 사용)
-            logger.info(f"📊 [DB 조회] 검색어: '{pesticide_name_for_db}'")
-            pesticide_info = PesticideLimit.objects.filter(
-                pesticide_name_en__iexact=pesticide_name_for_db
-            ).first()
-
-            if pesticide_info:
-                standard_pesticide_name = pesticide_info.pesticide_name_en
-                # 원본 농약명과 표준명을 비교하여 매칭 여부 결정
-                pesticide_name_match = pesticide_name.lower() == standard_pesticide_name.lower()
-                logger.info(f"✅ [DB 조회 성공] '{pesticide_name_for_db}' → 표준명: '{standard_pesticide_name}'")
-                logger.info(f"🔄 [매칭 검사] 원본: '{pesticide_name}' vs 표준명: '{standard_pesticide_name}' = {pesticide_name_match}")
-                if not pesticide_name_match:
-                    logger.info(f"⚠️ [불일치 감지] 기록명: '{pesticide_name}' vs 표준명: '{standard_pesticide_name}'")
-
-                # 2. 검정 품목을 기반으로 잔류허용기준 찾기
-                if sample_description:
-                    # 직접 매칭 시도
-                    direct_match = PesticideLimit.objects.filter(
-                        pesticide_name_en__iexact=standard_pesticide_name,
-                        food_name__iexact=mapped_sample_description
-                    ).first()
-
-                    # 매칭이 실패한 경우 유사 품목 검색 필요성 확인
-                    if not direct_match and sample_description != mapped_sample_description:
-                        # 매핑된 결과도 매칭 실패한 경우, 사용자 선택이 필요한 상황
-                        logger.info(f"품목명 매칭 실패: '{sample_description}' → '{mapped_sample_description}' 모두 DB에 없음")
-                        # 이 상황에서는 유사 품목 검색을 통해 사용자 선택을 요구해야 함
-                        # 하지만 현재 함수에서는 parsing_result만 반환하므로, 
-                        # upload_certificate에서 처리하도록 플래그 설정
-                        
-                    if direct_match:
-                        db_korea_mrl = direct_match.max_residue_limit
-                        condition_code = direct_match.condition_code.code if direct_match.condition_code else ''
-                        # 소수점 이하 불필요한 0 제거하여 표시
-                        if db_korea_mrl == int(db_korea_mrl):
-                            formatted_value = str(int(db_korea_mrl))
-                        else:
-                            formatted_value = f"{db_korea_mrl:.3f}".rstrip('0').rstrip('.')
-                        if condition_code:
-                            db_korea_mrl_display = f"{formatted_value}({condition_code})"
-                        else:
-                            db_korea_mrl_display = formatted_value
-                        logger.info(f"직접 매칭 성공: {standard_pesticide_name} + {sample_description} → {db_korea_mrl_display}")
-
-                    # 직접 매칭이 없는 경우에만 API를 호출하여 값을 가져옴
-                    if not direct_match:
-                        try:
-                            import requests
-                            from django.conf import settings
-                            from urllib.parse import quote
-
-                            host = 'localhost'
-                            port = '8000'
-                            # URL 인코딩 적용
-                            encoded_pesticide = quote(standard_pesticide_name)
-                            encoded_food = quote(mapped_sample_description)
-                            api_url = f"http://{host}:{port}/api/pesticides/?pesticide={encoded_pesticide}&food={encoded_food}"
-                            
-                            logger.info(f"API 호출 URL: {api_url}")
-                            response = requests.get(api_url)
-                            logger.info(f"API 응답 상태: {response.status_code}")
-
-                            if response.status_code == 200:
-                                data = response.json()
-                                logger.info(f"API 응답 데이터: {data}")
-                                if data and len(data) > 0:
-                                    db_korea_mrl = decimal.Decimal(data[0].get('max_residue_limit', 0))
-                                    db_korea_mrl_text = data[0].get('food_name', '')
-
-                                    condition_code = data[0].get('condition_code_symbol', '')
-                                    condition_desc = data[0].get('condition_code_description', '')
-
-                                    if condition_code:
-                                        # 소수점 이하 불필요한 0 제거하여 표시
-                                        if db_korea_mrl == int(db_korea_mrl):
-                                            formatted_value = str(int(db_korea_mrl))
-                                        else:
-                                            formatted_value = f"{db_korea_mrl:.3f}".rstrip('0').rstrip('.')
-                                        db_korea_mrl_display = f"{formatted_value}({condition_code})"
-                                    else:
-                                        # 소수점 이하 불필요한 0 제거하여 표시
-                                        if db_korea_mrl == int(db_korea_mrl):
-                                            formatted_value = str(int(db_korea_mrl))
-                                        else:
-                                            formatted_value = f"{db_korea_mrl:.3f}".rstrip('0').rstrip('.')
-                                        db_korea_mrl_display = formatted_value
-
-                                    logger.info(
-                                        f"API 호출 성공: {standard_pesticide_name} + {sample_description} → {db_korea_mrl_display}")
-                                else:
-                                    # API 결과가 없으면 PDF 값 또는 PLS 기본값 사용
-                                    if pdf_korea_mrl is not None:
-                                        db_korea_mrl = pdf_korea_mrl
-                                        db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                                        logger.info(f"API 결과 없음: PDF 값 사용 - {db_korea_mrl_display}")
-                                    else:
-                                        db_korea_mrl = decimal.Decimal('0.01')
-                                        db_korea_mrl_display = "PLS 0.01"
-                                        logger.info(f"API 결과 없음, PDF 값도 없음: PLS 적용")
-                            else:
-                                # API 호출 실패 시 처리
-                                if pdf_korea_mrl is not None:
-                                    db_korea_mrl = pdf_korea_mrl
-                                    db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                                    logger.info(f"API 호출 실패: PDF 값 사용 - {db_korea_mrl_display}")
-                                else:
-                                    db_korea_mrl = decimal.Decimal('0.01')
-                                    db_korea_mrl_display = "PLS 0.01"
-                                    logger.error(f"API 호출 실패({response.status_code}), PDF 값도 없음: PLS 적용")
-                        except Exception as api_error:
-                            # API 예외 발생 시 처리
-                            if pdf_korea_mrl is not None:
-                                db_korea_mrl = pdf_korea_mrl
-                                db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                                logger.error(f"API 호출 오류({str(api_error)}): PDF 값 사용 - {db_korea_mrl_display}")
-                            else:
-                                db_korea_mrl = decimal.Decimal('0.01')
-                                db_korea_mrl_display = "PLS 0.01"
-                                logger.error(f"API 호출 오류({str(api_error)}), PDF 값도 없음: PLS 적용")
-            else:
-                # 농약성분명을 찾지 못한 경우 - 부분 매칭 및 퍼지 매칭 시도
-                logger.info(f"❌ [DB 조회 실패] '{pesticide_name_for_db}' 정확한 매칭 없음")
-                logger.info(f"🔍 [부분 매칭 시작] 부분 문자열 검색 중...")
-                
-                # 1단계: 부분 매칭 시도 (pesticide_name_for_db가 DB 농약명에 포함되는지 확인)
-                partial_match = PesticideLimit.objects.filter(
-                    pesticide_name_en__icontains=pesticide_name_for_db
-                ).first()
-                
-                if partial_match:
-                    standard_pesticide_name = partial_match.pesticide_name_en
-                    pesticide_name_match = False  # 정확한 매칭은 아니므로 False
-                    logger.info(f"✨ [부분 매칭 성공] '{pesticide_name_for_db}' → 표준명: '{standard_pesticide_name}'")
-                    
-                    # 부분 매칭 성공 후 DB에서 MRL 조회
-                    if sample_description:
-                        direct_match = PesticideLimit.objects.filter(
-                            pesticide_name_en__iexact=standard_pesticide_name,
-                            food_name__iexact=mapped_sample_description
-                        ).first()
-                        
-                        if direct_match:
-                            db_korea_mrl = direct_match.max_residue_limit
-                            condition_code = direct_match.condition_code.code if direct_match.condition_code else ''
-                            # 소수점 이하 불필요한 0 제거하여 표시
-                            if db_korea_mrl == int(db_korea_mrl):
-                                formatted_value = str(int(db_korea_mrl))
-                            else:
-                                formatted_value = f"{db_korea_mrl:.3f}".rstrip('0').rstrip('.')
-                            if condition_code:
-                                db_korea_mrl_display = f"{formatted_value}({condition_code})"
-                            else:
-                                db_korea_mrl_display = formatted_value
-                            logger.info(f"부분 매칭 DB 조회 성공: {standard_pesticide_name} + {sample_description} → {db_korea_mrl_display}")
-                        else:
-                            # 직접 매칭 실패 시 PDF 값 사용
-                            if pdf_korea_mrl is not None:
-                                db_korea_mrl = pdf_korea_mrl
-                                db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                                logger.info(f"부분 매칭 DB 조회 실패, PDF 값 사용: {db_korea_mrl_display}")
-                            else:
-                                db_korea_mrl = decimal.Decimal('0.01')
-                                db_korea_mrl_display = "PLS 0.01"
-                                logger.info(f"부분 매칭 DB 조회 실패, PLS 적용")
-                    else:
-                        # sample_description이 없으면 PDF 값 사용
-                        if pdf_korea_mrl is not None:
-                            db_korea_mrl = pdf_korea_mrl
-                            db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                            logger.info(f"품목명 없음, PDF 값 사용: {db_korea_mrl_display}")
-                        else:
-                            db_korea_mrl = decimal.Decimal('0.01')
-                            db_korea_mrl_display = "PLS 0.01"
-                            logger.info(f"품목명 없음, PLS 적용")
-                else:
-                    # 2단계: 퍼지 매칭 시도
-                    logger.info(f"❌ [부분 매칭 실패] 퍼지 매칭 시도 중...")
-                    
-                    # 모든 농약명을 가져와서 유사도 검사
-                    all_pesticides = PesticideLimit.objects.values_list('pesticide_name_en', flat=True).distinct()
-                    best_match = None
-                    highest_similarity = 0
-                    
-                    for std_name in all_pesticides:
-                        # 단순 문자열 유사도 계산 (Levenshtein 거리 기반)
-                        similarity = calculate_similarity(pesticide_name_for_db.lower(), std_name.lower())
-                        if similarity > highest_similarity and similarity > 0.6:  # 60% 이상 유사 (기준 완화)
-                            highest_similarity = similarity
-                            best_match = std_name
-                    
-                    if best_match:
-                        standard_pesticide_name = best_match
-                        pesticide_name_match = False  # 정확한 매칭은 아니므로 False
-                        logger.info(f"✨ [퍼지 매칭 성공] '{pesticide_name_for_db}' → 표준명: '{best_match}' (유사도: {highest_similarity:.2f})")
-                        
-                        # 퍼지 매칭 성공 후 MRL 조회 시도
-                        # 1. 직접 매칭 시도
-                        direct_match = PesticideLimit.objects.filter(
-                            pesticide_name_en__iexact=standard_pesticide_name,
-                            food_name__iexact=mapped_sample_description
-                        ).first()
-                        
-                        if direct_match:
-                            db_korea_mrl = direct_match.max_residue_limit
-                            condition_code = direct_match.condition_code.code if direct_match.condition_code else ''
-                            # 소수점 이하 불필요한 0 제거하여 표시
-                            if db_korea_mrl == int(db_korea_mrl):
-                                formatted_value = str(int(db_korea_mrl))
-                            else:
-                                formatted_value = f"{db_korea_mrl:.3f}".rstrip('0').rstrip('.')
-                            if condition_code:
-                                db_korea_mrl_display = f"{formatted_value}({condition_code})"
-                            else:
-                                db_korea_mrl_display = formatted_value
-                            logger.info(f"퍼지 매칭 후 직접 매칭 성공: {standard_pesticide_name} + {sample_description} → {db_korea_mrl_display}")
-                        
-                        # 2. 직접 매칭이 없는 경우 API 호출
-                        if not direct_match:
-                            try:
-                                import requests
-                                from django.conf import settings
-                                from urllib.parse import quote
-
-                                host = 'localhost'
-                                port = '8000'
-                                # URL 인코딩 적용
-                                encoded_pesticide = quote(standard_pesticide_name)
-                                encoded_food = quote(mapped_sample_description)
-                                api_url = f"http://{host}:{port}/api/pesticides/?pesticide={encoded_pesticide}&food={encoded_food}"
-                                
-                                logger.info(f"퍼지 매칭 후 API 호출 URL: {api_url}")
-                                response = requests.get(api_url)
-                                logger.info(f"퍼지 매칭 후 API 응답 상태: {response.status_code}")
-
-                                if response.status_code == 200:
-                                    data = response.json()
-                                    logger.info(f"퍼지 매칭 후 API 응답 데이터: {data}")
-                                    if data and len(data) > 0:
-                                        db_korea_mrl = decimal.Decimal(data[0].get('max_residue_limit', 0))
-                                        db_korea_mrl_text = data[0].get('food_name', '')
-
-                                        condition_code = data[0].get('condition_code_symbol', '')
-                                        condition_desc = data[0].get('condition_code_description', '')
-
-                                        if condition_code:
-                                            # 소수점 이하 불필요한 0 제거하여 표시
-                                            if db_korea_mrl == int(db_korea_mrl):
-                                                formatted_value = str(int(db_korea_mrl))
-                                            else:
-                                                formatted_value = f"{db_korea_mrl:.3f}".rstrip('0').rstrip('.')
-                                            db_korea_mrl_display = f"{formatted_value}({condition_code})"
-                                        else:
-                                            # 소수점 이하 불필요한 0 제거하여 표시
-                                            if db_korea_mrl == int(db_korea_mrl):
-                                                formatted_value = str(int(db_korea_mrl))
-                                            else:
-                                                formatted_value = f"{db_korea_mrl:.3f}".rstrip('0').rstrip('.')
-                                            db_korea_mrl_display = formatted_value
-
-                                        logger.info(f"퍼지 매칭 후 API 호출 성공: {standard_pesticide_name} + {sample_description} → {db_korea_mrl_display}")
-                                    else:
-                                        # API 결과가 없으면 PDF 값 사용
-                                        if pdf_korea_mrl is not None:
-                                            db_korea_mrl = pdf_korea_mrl
-                                            db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                                            logger.info(f"퍼지 매칭 후 API 결과 없음: PDF 값 사용 - {db_korea_mrl_display}")
-                                        else:
-                                            db_korea_mrl = decimal.Decimal('0.01')
-                                            db_korea_mrl_display = "PLS 0.01"
-                                            logger.info(f"퍼지 매칭 후 API 결과 없음, PDF 값도 없음: PLS 적용")
-                                else:
-                                    # API 호출 실패 시 처리
-                                    if pdf_korea_mrl is not None:
-                                        db_korea_mrl = pdf_korea_mrl
-                                        db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                                        logger.info(f"퍼지 매칭 후 API 호출 실패: PDF 값 사용 - {db_korea_mrl_display}")
-                                    else:
-                                        db_korea_mrl = decimal.Decimal('0.01')
-                                        db_korea_mrl_display = "PLS 0.01"
-                                        logger.error(f"퍼지 매칭 후 API 호출 실패({response.status_code}), PDF 값도 없음: PLS 적용")
-                            except Exception as api_error:
-                                # API 예외 발생 시 처리
-                                if pdf_korea_mrl is not None:
-                                    db_korea_mrl = pdf_korea_mrl
-                                    db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                                    logger.error(f"퍼지 매칭 후 API 호출 오류({str(api_error)}): PDF 값 사용 - {db_korea_mrl_display}")
-                                else:
-                                    db_korea_mrl = decimal.Decimal('0.01')
-                                    db_korea_mrl_display = "PLS 0.01"
-                                    logger.error(f"퍼지 매칭 후 API 호출 오류({str(api_error)}), PDF 값도 없음: PLS 적용")
-                    else:
-                        standard_pesticide_name = pesticide_name_for_db  # DB 조회용 농약명 사용 (숫자 제거된 버전)
-                        pesticide_name_match = False
-                        logger.info(f"💔 [퍼지 매칭 실패] 유사 농약명 찾지 못함, 기본값 사용: '{pesticide_name_for_db}'")
-                        
-                        # 퍼지 매칭 실패 시에만 PDF 값 사용
-                        if pdf_korea_mrl is not None:
-                            db_korea_mrl = pdf_korea_mrl
-                            db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                            logger.info(f"농약성분명 매칭 실패, PDF 값 사용: {pdf_korea_mrl}")
-                        else:
-                            db_korea_mrl = decimal.Decimal('0.01')
-                            db_korea_mrl_display = "PLS 0.01"
-                            logger.info(f"농약성분명 매칭 실패, PLS 적용")
-
-        except Exception as e:
-            logger.error(f"검증 중 DB 조회 오류: {str(e)}")
-            # 이미 설정된 값들이 있으면 유지, 없으면 기본값 설정
-            if 'standard_pesticide_name' not in locals():
-                standard_pesticide_name = pesticide_name
-            if 'pesticide_name_match' not in locals():
-                pesticide_name_match = False
-
-            # 오류 발생 시 안전한 기본값 설정
-            if pdf_korea_mrl is not None:
-                db_korea_mrl = pdf_korea_mrl
-                db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
-                logger.info(f"오류 발생, PDF 값 사용: {pdf_korea_mrl}")
-            else:
-                db_korea_mrl = decimal.Decimal('0.01')
-                db_korea_mrl_display = "PLS 0.01"
-                logger.info(f"오류 발생, PLS 적용")
-
-        # 친환경 검정인 경우 처리 - None 체크 추가
-        if is_eco_friendly:
-            eco_friendly_threshold = decimal.Decimal('0.01')
-            pdf_calculated_result = '적합' if detection_value < eco_friendly_threshold else '부적합'
-            logger.info(f"친환경 기준 적용: 검출량 {detection_value} vs 기준 {eco_friendly_threshold}, 결과: {pdf_calculated_result}")
-        else:
-            # 일반 검정의 경우 - None 체크 강화
-            if pdf_korea_mrl is not None:
-                pdf_calculated_result = '적합' if detection_value <= pdf_korea_mrl else '부적합'
-            else:
-                pdf_calculated_result = '확인불가'
-                logger.warning("PDF MRL 값이 없어 PDF 계산 결과를 확인할 수 없음")
-
-        # DB MRL로 적합/부적합 계산 - 친환경 조건 반영
-        if is_eco_friendly:
-            # 친환경인증용은 무조건 0.01 미만이어야 적합
-            eco_friendly_threshold = decimal.Decimal('0.01')
-            db_calculated_result = '적합' if detection_value < eco_friendly_threshold else '부적합'
-            logger.info(f"친환경 기준 DB 계산: 검출량 {detection_value} vs 기준 {eco_friendly_threshold}, 결과: {db_calculated_result}")
-        elif db_korea_mrl is not None:
-            db_calculated_result = '적합' if detection_value <= db_korea_mrl else '부적합'
-        else:
-            db_calculated_result = '확인불가'
-            logger.warning("DB MRL 값이 없어 DB 계산 결과를 확인할 수 없음")
-
-        # PDF의 검토의견과 계산된 결과 비교
-        pdf_result = result.get('result_opinion', '확인불가')
-        
-        # AI 판정 로직: PDF 검토의견 일치 + MRL 값 정확성 검증
-        if pdf_calculated_result == '확인불가':
-            is_pdf_consistent = False
-        else:
-            # 1. 기본적으로 PDF 계산결과와 PDF 검토의견이 일치하는지 확인
-            basic_consistency = (pdf_calculated_result == pdf_result)
-            
-            # 2. 연구원이 기록한 MRL과 표준 MRL이 일치하는지 확인 (연구원 실수 감지)
-            mrl_accuracy = True
-            if pdf_korea_mrl is not None and db_korea_mrl is not None:
-                # PDF와 DB MRL 텍스트 준비
-                pdf_mrl_text = result.get('korea_mrl_text', str(pdf_korea_mrl)) if result.get('korea_mrl_text') else str(pdf_korea_mrl)
-                db_mrl_text = str(db_korea_mrl_display) if db_korea_mrl_display else str(db_korea_mrl)
-                
-                # 특수기호 정규화 함수
-                def normalize_mrl(text):
-                    import re
-                    # 특수기호 추출 (†, T 등)
-                    symbols = re.findall(r'[†T]', text)
-                    # 숫자 추출
-                    numbers = re.findall(r'\d+\.?\d*', text)
-                    numeric_value = float(numbers[0]) if numbers else 0
-                    return numeric_value, set(symbols)
-                
-                # PDF와 DB 값 정규화
-                pdf_numeric, pdf_symbols = normalize_mrl(pdf_mrl_text)
-                db_numeric, db_symbols = normalize_mrl(db_mrl_text)
-                
-                # 1. 문자열이 완전히 일치하면 정확
-                if pdf_mrl_text == db_mrl_text:
-                    mrl_accuracy = True
-                    logger.info(f"✅ MRL 완전 일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}'")
-                # 2. 수치적으로 같고 특수기호도 같으면 정확 (형식만 다른 경우)
-                elif abs(pdf_numeric - db_numeric) <= 0.001 and pdf_symbols == db_symbols:
-                    mrl_accuracy = True
-                    logger.info(f"✅ MRL 수치+기호 일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}' → 형식만 다름")
-                # 3. 수치는 같지만 특수기호가 다른 경우
-                elif abs(pdf_numeric - db_numeric) <= 0.001 and pdf_symbols != db_symbols:
-                    mrl_accuracy = False
-                    logger.warning(f"🚨 MRL 특수기호 불일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}' → 연구원이 특수기호 누락/오류")
-                # 4. 수치 자체가 다른 경우
-                else:
-                    mrl_accuracy = False
-                    logger.warning(f"🚨 MRL 값 불일치: PDF='{pdf_mrl_text}', DB='{db_mrl_text}' → 연구원 기록 오류")
-            
-            # 3. 최종 AI 판정: 두 조건 모두 만족해야 함
-            is_pdf_consistent = basic_consistency and mrl_accuracy
-            
-            logger.info(f"📊 AI 판정 상세: PDF 일치={basic_consistency}, MRL 정확성={mrl_accuracy}, 최종={is_pdf_consistent}")
+        # 작물체는 잔류허용기준을 쓰지 않으므로 표준명 조회 생략
+        standard_pesticide_name, pesticide_name_match, exact_match = pesticide_name_for_db, True, False
+        if not is_plant_material:
+            logger.info(f"🔍 [표준명 추적 시작] 원본 농약명: '{pesticide_name}', DB 조회용: '{pesticide_name_for_db}'")
+            try:
+                standard_pesticide_name, pesticide_name_match, exact_match = resolve_standard_pesticide(
+                    pesticide_name, pesticide_name_for_db, matrix)
+            except Exception as e:
+                logger.error(f"검증 중 DB 조회 오류: {str(e)}")
+                standard_pesticide_name, pesticide_name_match, exact_match = pesticide_name, False, False
 
-        # 최종 결과 로깅
-        logger.info(f"🎯 [최종 결과] 원본: '{pesticide_name}' → 표준명: '{standard_pesticide_name}' (매칭: {pesticide_name_match})")
-        
-        verification_results.append({
+        rows.append({
+            'result': result,
             'pesticide_name': pesticide_name,
+            'pesticide_name_for_db': pesticide_name_for_db,
             'standard_pesticide_name': standard_pesticide_name,
             'pesticide_name_match': pesticide_name_match,
+            'exact_match': exact_match,
             'detection_value': detection_value,
             'pdf_korea_mrl': pdf_korea_mrl,
-            'pdf_korea_mrl_text': result.get('korea_mrl_text', ''),
-            'db_korea_mrl': db_korea_mrl,
-            'db_korea_mrl_display': db_korea_mrl_display,
-            'export_country': result.get('export_country'),
-            'export_mrl': result.get('export_mrl'),
-            'pdf_result': pdf_result,
-            'pdf_calculated_result': pdf_calculated_result,
-            'db_calculated_result': db_calculated_result,
-            'is_pdf_consistent': is_pdf_consistent,
-            'is_eco_friendly': is_eco_friendly,
         })
+    return is_eco_friendly, is_plant_material, rows
+
+
+def _verified_row(row, evaluation, i, is_eco_friendly):
+    """행렬 판정 결과(evaluation 의 i 번째 행)로 검증 결과 한 행 구성"""
+    result = row['result']
+    detection_value = row['detection_value']
+    pdf_korea_mrl = row['pdf_korea_mrl']
+
+    # 표시용 기준: DB(직접 → 소분류 → 대분류) → PDF 값 → PLS 0.01 (판정도 같은 값으로 행렬에서 수행)
+    # 표준명을 정확히 찾았지만 품목명이 없으면 기준을 정할 수 없으므로 DB 계산 결과는 확인불가
+    # (친환경은 기준과 무관하게 판정 / 부분·퍼지 매칭은 기준 대신 PDF 값 → PLS)
+    if row['exact_match'] and not evaluation.food:
+        db_korea_mrl = None
+        db_korea_mrl_display = ""
+        logger.info(f"품목명 없음: DB 기준 확인불가")
+    elif evaluation.has_limit[i]:
+        db_korea_mrl = evaluation.limit(i)
+        db_korea_mrl_display = mrl_matrix.format_mrl(db_korea_mrl, evaluation.condition_code(i))
+        logger.info(f"기준 적용({mrl_matrix.MATCHING_TYPES[evaluation.sources[i]]}): "
+                    f"{row['standard_pesticide_name']} → {db_korea_mrl_display}")
+    elif pdf_korea_mrl is not None:
+        db_korea_mrl = pdf_korea_mrl
+        db_korea_mrl_display = result.get('korea_mrl_text', str(pdf_korea_mrl))
+        logger.info(f"DB 기준 없음: PDF 값 사용 - {db_korea_mrl_display}")
+    else:
+        db_korea_mrl = mrl_matrix.PLS_DEFAULT
+        db_korea_mrl_display = "PLS 0.01"
+        logger.info(f"DB 기준 없음, PDF 값도 없음: PLS 적용")
+
+    # DB MRL로 적합/부적합 계산 - 친환경은 기준과 무관하게 0.01 미만이어야 적합
+    if db_korea_mrl is None and not is_eco_friendly:
+        db_calculated_result = '확인불가'
+        logger.warning("DB MRL 값이 없어 DB 계산 결과를 확인할 수 없음")
+    else:
+        db_calculated_result = '적합' if evaluation.compliant[i] else '부적합'
+
+    if is_eco_friendly:
+        pdf_calculated_result = db_calculated_result  # 친환경 기준은 PDF 기록과 무관
+    elif pdf_korea_mrl is not None:
+        pdf_calculated_result = '적합' if detection_value <= pdf_korea_mrl else '부적합'
+    else:
+        pdf_calculated_result = '확인불가'
+        logger.warning("PDF MRL 값이 없어 PDF 계산 결과를 확인할 수 없음")
+
+    # PDF의 검토의견과 계산된 결과 비교
+    pdf_result = result.get('result_opinion', '확인불가')
+
+    # AI 판정 로직: PDF 검토의견 일치 + MRL 값 정확성 검증
+    if pdf_calculated_result == '확인불가':
+        is_pdf_consistent = False
+    else:
+        basic_consistency = (pdf_calculated_result == pdf_result)
+        mrl_accuracy = True
+        if pdf_korea_mrl is not None and db_korea_mrl is not None:
+            pdf_mrl_text = result.get('korea_mrl_text') or str(pdf_korea_mrl)
+            mrl_accuracy = is_pdf_mrl_accurate(pdf_mrl_text, str(db_korea_mrl_display or db_korea_mrl))
+        is_pdf_consistent = basic_consistency and mrl_accuracy
+        logger.info(f"📊 AI 판정 상세: PDF 일치={basic_consistency}, MRL 정확성={mrl_accuracy}, 최종={is_pdf_consistent}")
+
+    logger.info(f"🎯 [최종 결과] 원본: '{row['pesticide_name']}' → 표준명: '{row['standard_pesticide_name']}' "
+                f"(매칭: {row['pesticide_name_match']})")
+
+    return {
+        'pesticide_name': row['pesticide_name'],
+        'standard_pesticide_name': row['standard_pesticide_name'],
+        'pesticide_name_match': row['pesticide_name_match'],
+        'detection_value': detection_value,
+        'pdf_korea_mrl': pdf_korea_mrl,
+        'pdf_korea_mrl_text': result.get('korea_mrl_text', ''),
+        'db_korea_mrl': db_korea_mrl,
+        'db_korea_mrl_display': db_korea_mrl_display,
+        'export_country': result.get('export_country'),
+        'export_mrl': result.get('export_mrl'),
+        'pdf_result': pdf_result,
+        'pdf_calculated_result': pdf_calculated_result,
+        'db_calculated_result': db_calculated_result,
+        'is_pdf_consistent': is_pdf_consistent,
+        'is_eco_friendly': is_eco_friendly,
+    }
+
+
+def verify_certificates(parsing_results):
+    """
+    여러 증명서의 농약 검출 결과 검증 - 반환: 증명서 순서대로 verify_pesticide_results 결과 목록
+    - 표준명은 행마다 찾고, 적합/부적합 판정은 모든 검출 행을 MRL 행렬(evaluate_batch) 한 번으로 처리
+      (기준이 없으면 PDF 기록 MRL, 그것도 없으면 PLS 0.01 / 친환경 검정은 0.01 미만)
+    - 작물체만 있으면 잔류허용기준이 필요 없으므로 행렬을 만들지 않음
+    """
+    parsing_results = [parsing_result if parsing_result and 'pesticide_results' in parsing_result
+                       else {'pesticide_results': []} for parsing_result in parsing_results]
+    if all(parsing_result.get('is_plant_material') or not parsing_result['pesticide_results']
+           for parsing_result in parsing_results):
+        matrix = mrl_matrix.MRLMatrix.build(rows=[])
+    else:
+        matrix = mrl_matrix.get_matrix()
+
+    prepared = [_prepare_verification(parsing_result, matrix) for parsing_result in parsing_results]
+    with stage('mrl_matrix_evaluate'):
+        evaluations = matrix.evaluate_batch([
+            ([(row['standard_pesticide_name'], row['detection_value'], row['pdf_korea_mrl']) for row in rows],
+             parsing_result.get('sample_description', ''), is_eco_friendly)
+            for parsing_result, (is_eco_friendly, _, rows) in zip(parsing_results, prepared)
+        ])
+
+    verified = []
+    for (is_eco_friendly, is_plant_material, rows), evaluation in zip(prepared, evaluations):
+        if is_plant_material:
+            verified.append([
+                process_plant_material_verification(
+                    row['pesticide_name'], row['pesticide_name_for_db'], row['detection_value'], row['result'],
+                    is_eco_friendly, bool(evaluation.compliant[i]))
+                for i, row in enumerate(rows)
+            ])
+        else:
+            verified.append([_verified_row(row, evaluation, i, is_eco_friendly) for i, row in enumerate(rows)])
+    return verified
 
-    return verification_results
 
+@timed()
+def verify_pesticide_results(parsing_result):
+    """
+    파싱된 농약 검출 결과 검증 (증명서 한 건 - verify_certificates 참고)
+    """
+    if not parsing_result or 'pesticide_results' not in parsing_result:
+        return []
+    return verify_certificates([parsing_result])[0]
 
+
+@timed()
 def save_certificate_data(parsing_result, verification_result, pdf_file):
     """
     파싱 및 검증 결과를 데이터베이스에 저장 관리자
@@ -1632,11 +1403,10 @@ def save_certificate_data(parsing_result, verification_result, pdf_file):
         # 파일 정보 로깅 추가
         logger.info(f"Saving file: {pdf_file.name}, Size: {pdf_file.size} bytes")
 
-        # 저장 전 파일 경로 확인
-        from django.conf import settings
-        import os
-        expected_path = os.path.join(settings.MEDIA_ROOT, 'certificates', os.path.basename(pdf_file.name))
-        logger.info(f"Expected file path: {expected_path}")
+        # 원본 파일은 내용 해시 경로에 저장됨 (같은 내용이면 파일 쓰기 생략)
+        file_sha256 = compute_file_sha256(pdf_file)
+        pdf_file.sha256 = file_sha256  # 저장소(_save)가 파일을 다시 읽어 해시하지 않도록
+        logger.info(f"File SHA-256: {file_sha256}")
 
         # 검정증명서 정보 저장
         certificate = CertificateOfAnalysis(
@@ -1653,35 +1423,43 @@ def save_certificate_data(parsing_result, verification_result, pdf_file):
             test_start_date=parsing_result.get('test_start_date'),
             test_end_date=parsing_result.get('test_end_date'),
             analytical_method=parsing_result.get('analytical_method', '미상'),
-            original_file=pdf_file
+            original_file=pdf_file,
+            file_sha256=file_sha256,
+            original_filename=os.path.basename(pdf_file.name)[:255]
         )
-        certificate.save()
+
+        # 증명서와 농약 검출 결과를 한 트랜잭션으로 저장 (중간 실패 시 일부만 남지 않도록)
+        # - 결과 행은 bulk_create 로 한 번에 INSERT
+        # - 실패하거나 바깥 트랜잭션(덮어쓰기)이 롤백되면 save() 때 기록된 원본 파일만 참조 없이 남음
+        #   방금 기록/재사용된 파일은 같은 내용의 다른 업로드가 커밋 전일 수 있어 여기서 지우지 않고
+        #   CERTIFICATE_RELEASE_MIN_AGE 가 지난 뒤 python manage.py gc_certificate_files 가 정리
+        with transaction.atomic():
+            certificate.save()
+            PesticideResult.objects.bulk_create([
+                PesticideResult(
+                    certificate=certificate,
+                    pesticide_name=result['pesticide_name'],
+                    standard_pesticide_name=result['standard_pesticide_name'],
+                    pesticide_name_match=result['pesticide_name_match'],
+                    detection_value=result['detection_value'],
+                    pdf_korea_mrl=result['pdf_korea_mrl'],
+                    pdf_korea_mrl_text=result.get('pdf_korea_mrl_text', ''),
+                    db_korea_mrl=result['db_korea_mrl'],
+                    export_country=result['export_country'],
+                    export_mrl=result['export_mrl'],
+                    pdf_result=result['pdf_result'],
+                    pdf_calculated_result=result['pdf_calculated_result'],
+                    db_calculated_result=result['db_calculated_result'],
+                    is_pdf_consistent=result['is_pdf_consistent']
+                )
+                for result in verification_result
+            ])
 
         # 저장 후 파일 경로 확인
         actual_path = certificate.original_file.path
         logger.info(f"Actual saved file path: {actual_path}")
         logger.info(f"File exists: {os.path.exists(actual_path)}")
 
-        # 농약 검출 결과 정보 저장
-        for result in verification_result:
-            pesticide_result = PesticideResult(
-                certificate=certificate,
-                pesticide_name=result['pesticide_name'],
-                standard_pesticide_name=result['standard_pesticide_name'],
-                pesticide_name_match=result['pesticide_name_match'],
-                detection_value=result['detection_value'],
-                pdf_korea_mrl=result['pdf_korea_mrl'],
-                pdf_korea_mrl_text=result.get('pdf_korea_mrl_text', ''),
-                db_korea_mrl=result['db_korea_mrl'],
-                export_country=result['export_country'],
-                export_mrl=result['export_mrl'],
-                pdf_result=result['pdf_result'],
-                pdf_calculated_result=result['pdf_calculated_result'],
-                db_calculated_result=result['db_calculated_result'],
-                is_pdf_consistent=result['is_pdf_consistent']
-            )
-            pesticide_result.save()
-
         return {
             'certificate_id': certificate.id,
             'certificate_number': certificate.certificate_number,
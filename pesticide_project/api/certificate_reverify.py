@@ -0,0 +1,138 @@
+# path of this code : pesticide_project/api/certificate_reverify.py
+# 잔류허용기준 변경 후 저장된 검정증명서 결과 재검증 (python manage.py reverify_certificates)
+# - 릴리스 변경 목록(mrl_release.release_diff)의 (농약, 식품) 쌍에 해당하는 검출 결과만 찾아서 재검증
+#   · 농약: PesticideResult.standard_pesticide_name (DB 표준 영문명, UPPER() 인덱스)
+#   · 식품: CertificateOfAnalysis.sample_description (UPPER() 인덱스) - 품목명 매핑(깻잎 → 들깻잎)과
+#     카테고리 대체 조회(소분류/대분류 기준을 쓰는 품목, food_categories 분류 맵)까지 포함
+# - 대상 증명서는 업로드 때와 같은 규칙(verify_certificates)으로 BATCH_SIZE 건씩 묶어 다시 판정
+#   (적합/부적합은 MRL 행렬 evaluate_batch 한 번) 하고
+#   바뀐 결과(db_korea_mrl, db_calculated_result, is_pdf_consistent)만 bulk_update
+# - 작물체 검정은 잔류허용기준을 쓰지 않으므로 대상 아님
+
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.functions import Upper
+
+from . import food_categories
+from .certificate_parser import FOOD_NAME_MAPPING, verify_certificates
+from .models import CertificateOfAnalysis, PesticideResult
+
+logger = logging.getLogger('api')
+
+REVERIFIED_FIELDS = ('db_korea_mrl', 'db_calculated_result', 'is_pdf_consistent')
+BATCH_SIZE = 200  # 한 번에 불러와 재검증하는 증명서 수
+
+
+def affected_results(diff_entries):
+    """
+    변경 목록에 해당하는 검출 결과 [(결과 id, 증명서 id)]
+    - 증명서 품목이 변경된 식품 자체이거나, 변경된 식품을 소분류/대분류로 두는 품목이면 대상
+    """
+    changed_pairs = {(entry['pesticide_name_en'].lower(), entry['food_name'].lower()) for entry in diff_entries}
+    if not changed_pairs:
+        return []
+    changed_foods = {entry['food_name'].lower() for entry in diff_entries}
+    hierarchy = food_categories.get_hierarchy()
+
+    def candidates(sample_description):
+        mapped = FOOD_NAME_MAPPING.get(sample_description, sample_description)
+        return [name.lower() for name in food_categories.candidates(mapped) if name]
+
+    # 변경된 식품을 기준으로 쓰는 품목명 (분류 맵의 품목명은 소문자)
+    sample_foods = set(changed_foods)
+    sample_foods |= {food for food, parents in hierarchy.items()
+                     if changed_foods & {name.lower() for name in parents if name}}
+    sample_foods |= {original.lower() for original, mapped in FOOD_NAME_MAPPING.items() if mapped.lower() in sample_foods}
+
+    # 증명서/릴리스의 영문명·품목명 대소문자가 달라도 찾도록 UPPER() 로 비교 (UPPER() 인덱스 사용)
+    rows = (PesticideResult.objects
+            .annotate(pesticide_upper=Upper('standard_pesticide_name'),
+                      sample_upper=Upper('certificate__sample_description'))
+            .filter(pesticide_upper__in={pesticide.upper() for pesticide, _ in changed_pairs},
+                    sample_upper__in={food.upper() for food in sample_foods})
+            .exclude(certificate__sample_description__contains='작물체')
+            .values_list('id', 'certificate_id', 'standard_pesticide_name', 'certificate__sample_description'))
+    return [
+        (result_id, certificate_id)
+        for result_id, certificate_id, pesticide, sample_description in rows
+        if any((pesticide.lower(), food) in changed_pairs for food in candidates(sample_description))
+    ]
+
+
+def _parsing_result(certificate, results):
+    """저장된 증명서/검출 결과로 검증 입력 구성 (업로드 때의 parsing_result 와 같은 키)"""
+    return {
+        'certificate_number': certificate.certificate_number,
+        'applicant_name': certificate.applicant_name,
+        'analytical_purpose': certificate.analytical_purpose,
+        'sample_description': certificate.sample_description,
+        'is_plant_material': False,
+        'pesticide_results': [
+            {
+                'pesticide_name': result.pesticide_name,
+                'standard_pesticide_name_for_db': result.standard_pesticide_name or result.pesticide_name,
+                'detection_value': result.detection_value,
+                'korea_mrl': result.pdf_korea_mrl,
+                'korea_mrl_text': result.pdf_korea_mrl_text or '',
+                'result_opinion': result.pdf_result,
+                'export_country': result.export_country,
+                'export_mrl': result.export_mrl,
+            }
+            for result in results
+        ],
+    }
+
+
+def reverify_certificates(certificate_ids, dry_run=False):
+    """
+    증명서들을 다시 판정하고 바뀐 검출 결과만 저장
+    - 반환: {'certificates', 'results_updated', 'verdict_changed': [증명서 번호], 'skipped': [증명서 번호]}
+    """
+    stats = {'certificates': 0, 'results_updated': 0, 'verdict_changed': [], 'skipped': []}
+    certificate_ids = sorted(set(certificate_ids))
+    for start in range(0, len(certificate_ids), BATCH_SIZE):
+        certificates = (CertificateOfAnalysis.objects
+                        .filter(id__in=certificate_ids[start:start + BATCH_SIZE])
+                        .order_by('id'))
+        results_by_certificate = defaultdict(list)
+        for result in PesticideResult.objects.filter(certificate__in=certificates).order_by('id'):
+            results_by_certificate[result.certificate_id].append(result)
+
+        certificates = list(certificates)
+        verified_batch = verify_certificates([
+            _parsing_result(certificate, results_by_certificate[certificate.id]) for certificate in certificates
+        ])
+
+        updated = []
+        for certificate, verified in zip(certificates, verified_batch):
+            results = results_by_certificate[certificate.id]
+            stats['certificates'] += 1
+            if len(verified) != len(results):
+                # 검출량을 읽을 수 없는 행이 있으면 행 순서를 맞출 수 없으므로 건너뜀
+                logger.warning(f"재검증 건너뜀: {certificate.certificate_number} (결과 {len(results)}건, 검증 {len(verified)}건)")
+                stats['skipped'].append(certificate.certificate_number)
+                continue
+
+            verdict_before = all(result.db_calculated_result != '부적합' for result in results)
+            changed = []
+            for result, row in zip(results, verified):
+                if any(getattr(result, field) != row[field] for field in REVERIFIED_FIELDS):
+                    for field in REVERIFIED_FIELDS:
+                        setattr(result, field, row[field])
+                    changed.append(result)
+            if changed:
+                updated.extend(changed)
+                if verdict_before != all(result.db_calculated_result != '부적합' for result in results):
+                    stats['verdict_changed'].append(certificate.certificate_number)
+
+        stats['results_updated'] += len(updated)
+        if updated and not dry_run:
+            with transaction.atomic():
+                PesticideResult.objects.bulk_update(updated, REVERIFIED_FIELDS, batch_size=500)
+    logger.info(
+        f"검정증명서 재검증: {stats['certificates']}건, 결과 {stats['results_updated']}건 갱신"
+        f"{' (dry-run)' if dry_run else ''}, 판정 변경 {len(stats['verdict_changed'])}건"
+    )
+    return stats
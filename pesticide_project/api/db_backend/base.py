@@ -0,0 +1,103 @@
+# path of this code : pesticide_project/api/db_backend/base.py
+# PostgreSQL 백엔드 확장 (DATABASES ENGINE: 'api.db_backend')
+# - CONN_HEALTH_CHECKS: 재사용하는 연결이 살아 있는지 요청마다 첫 쿼리 전에 한 번 확인 (SELECT 1)
+#   Django 4.1 의 같은 이름 옵션을 3.2 에서 구현한 것 (4.1 이상으로 올리면 기본 백엔드로 대체 가능)
+# - POOL: {'MAX_SIZE', 'TIMEOUT', 'MAX_LIFETIME'} 이면 연결을 닫지 않고 프로세스 내 풀(api/db_pool.py)에 반납
+#   (CONN_MAX_AGE=0 과 함께 사용 - 요청이 끝날 때마다 풀에 반납되어 다른 스레드가 재사용)
+
+import psycopg2
+import psycopg2.extras
+from psycopg2 import extensions
+from django.db.backends.postgresql import base
+
+from api import db_pool, metrics
+
+
+def _is_usable(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except psycopg2.Error:
+        return False
+    return True
+
+
+def _connect(conn_params):
+    connection = base.Database.connect(**conn_params)
+    # 기본 백엔드의 get_new_connection 과 같이 jsonb 를 문자열 그대로 받음
+    psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+    return connection
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+        self.pool = None
+
+    @property
+    def health_checks_enabled(self):
+        return bool(self.settings_dict.get('CONN_HEALTH_CHECKS'))
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict.get('POOL')
+        if not options:
+            return super().get_new_connection(conn_params)
+
+        key = (self.alias, tuple(sorted((name, str(value)) for name, value in conn_params.items())))
+        self.pool = db_pool.get_pool(
+            key, lambda: _connect(conn_params),
+            max_size=options.get('MAX_SIZE', 10),
+            timeout=options.get('TIMEOUT', 5.0),
+            max_lifetime=options.get('MAX_LIFETIME'),
+            check=_is_usable if self.health_checks_enabled else None,
+        )
+        try:
+            connection = self.pool.getconn()
+        except db_pool.PoolExhausted as e:
+            raise base.Database.OperationalError(str(e)) from e
+
+        # 격리 수준은 기본 백엔드와 같은 규칙 (OPTIONS 에 있으면 그 값, 없으면 DB 기본값)
+        try:
+            self.isolation_level = self.settings_dict['OPTIONS']['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.pool is None or self.connection is None:
+            return super()._close()
+
+        connection = self.connection
+        # atomic 블록 안에서 닫히면 Django 가 self.connection 을 계속 들고 있으므로 풀에 돌려주지 않음
+        broken = bool(connection.closed) or self.in_atomic_block
+        if not broken and connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except psycopg2.Error:
+                broken = True
+        self.pool.putconn(connection, close=broken)
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True  # 방금 연결했거나 풀에서 확인된 연결
+
+    def ensure_connection(self):
+        if (self.connection is not None and self.health_checks_enabled
+                and not self.health_check_done and not self.in_atomic_block):
+            self.health_check_done = True
+            if not self.is_usable():
+                metrics.registry.inc('db_health_check_failures_total', alias=self.alias)
+                self.close()
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        # 요청 시작/종료 신호(close_old_connections)에서 호출됨
+        # - 이 안의 get_autocommit() 에서는 확인하지 않고, 다음 요청의 첫 쿼리 전에 다시 확인
+        self.health_check_done = True
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
@@ -0,0 +1,147 @@
+# path of this code : pesticide_project/api/db_pool.py
+# 프로세스 내 DB 연결 풀 (DB_POOL_MODE=pool, api/db_backend 에서 사용)
+# - 워커 프로세스마다 설정(DB 별칭)당 하나의 풀을 두고 스레드(waitress / gunicorn gthread)들이 공유
+# - 최대 max_size 개까지 연결, 모두 사용 중이면 timeout 초 동안 반납을 기다린 뒤 PoolExhausted
+# - 끊어졌거나 max_lifetime 초가 지난 연결, check() 에 실패한 연결은 닫고 새로 연결
+# - 연결 종류(psycopg2 등)에 대해서는 connect() 와 연결의 .closed / .close() 만 사용
+
+import logging
+import threading
+import time
+
+from . import metrics
+
+logger = logging.getLogger('api')
+
+
+class PoolExhausted(Exception):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, max_size=10, timeout=5.0, max_lifetime=None, check=None):
+        self._connect = connect
+        self.check = check  # 재사용 전에 연결 상태 확인 (conn → bool), None 이면 확인하지 않음
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self._idle = []  # [(연결, 생성 시각)] - 마지막에 반납된 연결부터 재사용
+        self._in_use = {}  # id(연결) → 생성 시각
+        self._size = 0  # 열려 있거나 여는 중인 연결 수 (사용 중 + 대기)
+        self._cond = threading.Condition()
+
+    def _expired(self, created_at):
+        return self.max_lifetime is not None and time.monotonic() - created_at >= self.max_lifetime
+
+    def _discard(self, conn):
+        """풀에서 연결을 제거하고 닫음 (self._cond 를 잡은 상태에서 호출)"""
+        self._size -= 1
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception:
+            logger.warning("풀 연결 종료 중 오류", exc_info=True)
+        metrics.registry.inc('db_pool_connections_total', result='discarded')
+
+    def _checkout(self, deadline):
+        """대기 중인 연결, 또는 새 연결을 열 자리를 확보했으면 None"""
+        with self._cond:
+            while True:
+                while self._idle:
+                    conn, created_at = self._idle.pop()
+                    if conn.closed or self._expired(created_at):
+                        self._discard(conn)
+                        continue
+                    self._in_use[id(conn)] = created_at
+                    return conn
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    metrics.registry.inc('db_pool_connections_total', result='exhausted')
+                    raise PoolExhausted(f"DB 연결 풀 초과 (최대 {self.max_size}개, {self.timeout}초 대기)")
+                self._cond.wait(remaining)
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = self._checkout(deadline)
+            if conn is None:
+                break
+            # 상태 확인은 잠금 밖에서 (네트워크 왕복 동안 다른 스레드를 막지 않도록)
+            if self.check is None or self.check(conn):
+                metrics.registry.inc('db_pool_connections_total', result='reused')
+                return conn
+            with self._cond:
+                self._in_use.pop(id(conn), None)
+                self._discard(conn)
+                self._cond.notify()
+
+        # 새 연결도 잠금 밖에서
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._in_use[id(conn)] = time.monotonic()
+        metrics.registry.inc('db_pool_connections_total', result='opened')
+        return conn
+
+    def putconn(self, conn, close=False):
+        """
+        연결 반납 - close=True 이거나 끊어진 / 수명이 지난 연결은 닫음
+        트랜잭션 정리(롤백)는 호출하는 쪽에서 반납 전에 처리
+        """
+        with self._cond:
+            created_at = self._in_use.pop(id(conn), None)
+            if created_at is None:
+                # 이 풀에서 꺼낸 연결이 아님 (closeall 이후 반납 등) - 그냥 닫음
+                if not conn.closed:
+                    conn.close()
+                return
+            if close or conn.closed or self._expired(created_at):
+                self._discard(conn)
+            else:
+                self._idle.append((conn, created_at))
+            self._cond.notify()
+
+    def closeall(self):
+        """대기 중인 연결을 모두 닫음 (사용 중인 연결은 반납될 때 닫힘)"""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            for conn, _ in idle:
+                self._discard(conn)
+            for key in list(self._in_use):
+                self._in_use.pop(key)
+                self._size -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {'size': self._size, 'idle': len(self._idle), 'in_use': len(self._in_use)}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, connect, **options):
+    """key(DB 별칭 + 접속 정보)별 풀 - 처음 요청될 때 생성"""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(connect, **options)
+        return pool
+
+
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.closeall()
@@ -0,0 +1,116 @@
+# path of this code : pesticide_project/api/food_categories.py
+# 식품 분류(FoodCategory) 적재와 메모리 계층 맵
+# - 분류 데이터는 api/data/food_categories.csv (main_category, sub_category, food_name) 에서 읽어 bulk_create
+#   (python manage.py import_food_categories)
+# - 검색(PesticideLimitViewSet.list / by_food / bulk_lookup)과 검증(upload_certificate, 재검증)이 같은 맵을 사용
+#   {식품명(소문자): (소분류, 대분류)} - 같은 품목이 여러 행이면 먼저 등록된 행 (기존 .first() 와 동일)
+#   → 카테고리 대체 조회에 쿼리 없음
+# - 증명서 품목명 매핑(FOOD_NAME_MAPPING)도 여기서 관리 - 검증(certificate_parser)과 MRL 행렬 판정이 함께 사용
+# - 맵은 프로세스마다 한 번 만들어 FOOD_CATEGORY_TTL(초) 동안 재사용,
+#   같은 프로세스에서 FoodCategory 가 저장/삭제되거나 적재하면 즉시 무효화 (signals.py)
+
+import csv
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from . import metrics
+from .models import FoodCategory
+
+logger = logging.getLogger('api')
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'food_categories.csv')
+CSV_COLUMNS = ('main_category', 'sub_category', 'food_name')
+
+# 기본 품목명 매핑 (확실한 매핑만 유지, 작물체 등은 사용자 선택으로 처리)
+FOOD_NAME_MAPPING = {
+    '깻잎': '들깻잎',
+}
+
+_hierarchy = None
+_built_at = 0.0
+_lock = threading.Lock()
+
+
+class FoodCategoryFileError(Exception):
+    pass
+
+
+def read_categories(path=DATA_FILE):
+    """분류 CSV → [{'main_category', 'sub_category', 'food_name'}] (sub_category 가 비어 있으면 None)"""
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in CSV_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise FoodCategoryFileError(f"{path}: 필수 열 누락 ({', '.join(missing)})")
+        rows = []
+        for line_number, row in enumerate(reader, start=2):
+            food_name = (row['food_name'] or '').strip()
+            main_category = (row['main_category'] or '').strip()
+            if not food_name or not main_category:
+                raise FoodCategoryFileError(f"{path}:{line_number}: food_name / main_category 가 비어 있습니다")
+            rows.append({
+                'main_category': main_category,
+                'sub_category': (row['sub_category'] or '').strip() or None,
+                'food_name': food_name,
+            })
+    return rows
+
+
+def import_categories(path=DATA_FILE):
+    """FoodCategory 전체를 파일 내용으로 교체 (한 트랜잭션) - 적재한 행 수"""
+    rows = read_categories(path)
+    with transaction.atomic():
+        FoodCategory.objects.all().delete()
+        FoodCategory.objects.bulk_create([FoodCategory(**row) for row in rows], batch_size=1000)
+        transaction.on_commit(invalidate)
+    logger.info(f"식품 분류 적재: {len(rows):,}행 ({path})")
+    return len(rows)
+
+
+def build_hierarchy():
+    hierarchy = {}
+    for food, sub, main in FoodCategory.objects.order_by('id').values_list('food_name', 'sub_category',
+                                                                            'main_category'):
+        hierarchy.setdefault(food.lower(), (sub or None, main or None))
+    return hierarchy
+
+
+def get_hierarchy():
+    """프로세스 공용 {식품명(소문자): (소분류, 대분류)} (없거나 FOOD_CATEGORY_TTL 이 지나면 다시 생성)"""
+    global _hierarchy, _built_at
+    with _lock:
+        now = time.monotonic()
+        if _hierarchy is None or now - _built_at >= getattr(settings, 'FOOD_CATEGORY_TTL', 300):
+            metrics.record_cache('food_categories', False)
+            _hierarchy = build_hierarchy()
+            _built_at = now
+        else:
+            metrics.record_cache('food_categories', True)
+        return _hierarchy
+
+
+def invalidate():
+    """다음 get_hierarchy() 에서 다시 생성 (FoodCategory 변경 시)"""
+    global _hierarchy
+    with _lock:
+        _hierarchy = None
+
+
+def lookup(food):
+    """품목의 (소분류, 대분류) - 분류에 없으면 None (대소문자 무시)"""
+    return get_hierarchy().get((food or '').lower())
+
+
+def candidates(food):
+    """[품목, 소분류, 대분류] - 잔류허용기준 대체 조회 우선순위 순 (분류에 없으면 None, 위치로 direct/sub/main 구분)"""
+    return [food, *(lookup(food) or (None, None))]
+
+
+def verification_candidates(sample_description):
+    """증명서 품목의 [매핑된 품목, 소분류, 대분류] - verify_pesticide_results 가 기준을 찾는 순서"""
+    return candidates(FOOD_NAME_MAPPING.get(sample_description, sample_description))
@@ -0,0 +1,90 @@
+# path of this code : pesticide_project/api/frontend.py
+# React 앱 진입 페이지(index.html) 서빙
+# - 템플릿 렌더링 없이 파일 내용을 메모리에 두고 그대로 응답 (gzip / brotli 압축본도 미리 만들어 둠)
+# - 배포로 파일이 바뀌면 수정 시각을 보고 다시 읽음 (워커 재시작 불필요)
+# - index.html 은 해시가 붙은 /static/ 파일을 가리키므로 브라우저가 매번 ETag 로 재검증하도록 no-cache
+#   (/static/ 파일 자체는 WhiteNoise 가 압축본 + 장기 캐시 헤더로 응답, config/settings/production.py)
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from . import metrics
+
+logger = logging.getLogger('api')
+
+_cache = {}  # 경로 → (수정 시각, {인코딩: 내용}, ETag)
+_lock = threading.Lock()
+
+
+def get_index_path():
+    return getattr(settings, 'REACT_INDEX_FILE', None) or os.path.join(settings.REACT_BUILD_DIR, 'index.html')
+
+
+def _compress(body):
+    encoded = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        encoded['br'] = brotli.compress(body)
+    return encoded
+
+
+def load_index(path):
+    """(인코딩별 내용, ETag) - 파일이 바뀌었을 때만 다시 읽고 압축"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        metrics.record_cache('frontend_index', True)
+        return cached[1], cached[2]
+    metrics.record_cache('frontend_index', False)
+    with _lock:
+        cached = _cache.get(path)
+        if not cached or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                body = f.read()
+            cached = _cache[path] = (mtime, _compress(body), f'"{hashlib.md5(body).hexdigest()}"')
+    return cached[1], cached[2]
+
+
+def _choose_encoding(request, encoded):
+    accepted = {
+        part.split(';')[0].strip().lower()
+        for part in request.META.get('HTTP_ACCEPT_ENCODING', '').split(',')
+    }
+    for encoding in ('br', 'gzip'):
+        if encoding in encoded and encoding in accepted:
+            return encoding
+    return 'identity'
+
+
+def index(request):
+    """React 앱 index.html (/, /statistics, /certificate-analysis)"""
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    path = get_index_path()
+    try:
+        encoded, etag = load_index(path)
+    except FileNotFoundError:
+        logger.error(f"React 빌드 파일이 없습니다: {path} (frontend 에서 npm run build 필요)")
+        return HttpResponse('Frontend build not found', status=503, content_type='text/plain')
+
+    if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        encoding = _choose_encoding(request, encoded)
+        response = HttpResponse(encoded[encoding], content_type='text/html; charset=utf-8')
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
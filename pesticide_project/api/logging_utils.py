@@ -0,0 +1,111 @@
+# path of this code : pesticide_project/api/logging_utils.py
+# 로깅 보조 클래스 모음
+# - QueueListenerHandler: 요청 스레드에서는 큐에 넣기만 하고, 포맷팅/출력은 별도 스레드에서 처리
+# - JsonFormatter: 요청 로그처럼 구조화된 레코드를 한 줄 JSON 으로 출력
+
+import atexit
+import json
+import logging
+import os
+import queue
+from logging.config import ConvertingList
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord 기본 속성 - 이 외의 속성은 extra 로 전달된 구조화 필드로 간주
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None)).keys()) | {'message', 'asctime'}
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+def _resolve_handlers(handlers):
+    """dictConfig 의 'cfg://handlers.xxx' 참조를 실제 핸들러 객체로 변환"""
+    if not isinstance(handlers, ConvertingList):
+        return list(handlers)
+    # ConvertingList 는 인덱스로 접근할 때 값이 변환됨
+    return [handlers[i] for i in range(len(handlers))]
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    QueueHandler + QueueListener 묶음 핸들러 (dictConfig 에서 바로 사용)
+
+    'handlers': {
+        'queue_console': {
+            '()': 'api.logging_utils.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console'],
+        },
+    }
+
+    - 대상 핸들러 이름이 이 핸들러 이름보다 알파벳 순으로 앞서야 함 (dictConfig 는 이름 순으로 생성)
+    - gunicorn preload 처럼 fork 되는 경우 자식 프로세스에서 리스너 스레드를 다시 시작
+    """
+
+    def __init__(self, handlers, respect_handler_level=True, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self._targets = _resolve_handlers(handlers)
+        self._respect_handler_level = respect_handler_level
+        self.listener = None
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _start_listener(self):
+        self.listener = QueueListener(
+            self.queue, *self._targets, respect_handler_level=self._respect_handler_level
+        )
+        self.listener.start()
+
+    def _stop_listener(self):
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+    def _restart_in_child(self):
+        # fork 된 자식에는 리스너 스레드가 없으므로 새 큐/스레드로 다시 시작
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._start_listener()
+
+    def prepare(self, record):
+        """
+        기본 구현은 여기서 format() 을 호출하므로 요청 스레드에서 포맷팅이 일어남
+        - 메시지 인자가 기본 타입뿐이면 레코드를 그대로 넘겨 포맷팅을 리스너 스레드로 미룸
+        - 변경 가능한 객체가 인자로 오면 지금 시점의 값으로 메시지만 확정
+        """
+        if record.args and not all(isinstance(arg, _PRIMITIVES) for arg in _iter_args(record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # 출력이 밀리는 경우 요청을 막지 않고 로그를 버림
+            pass
+
+
+def _iter_args(args):
+    if isinstance(args, dict):
+        return args.values()
+    return args
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    로그 레코드를 한 줄 JSON 으로 변환
+    - 기본 필드: time, level, logger, message
+    - logger.info(..., extra={...}) 로 전달된 필드를 그대로 포함
+    """
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
@@ -0,0 +1,63 @@
+# 검정증명서 원본 PDF 보관 커맨드
+# 오래된 원본 파일을 월별 압축 팩(YYYY-MM.pack + 인덱스)으로 옮김 - 읽기는 저장소가 팩에서 투명하게 처리
+# command : python manage.py archive_certificate_files --months 12 --dry-run
+#           python manage.py archive_certificate_files                    (cron 으로 매월 실행, 백업 전)
+#           python manage.py archive_certificate_files --compact          (삭제된 항목의 팩 공간 회수)
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api import certificate_archive as archive
+
+
+class Command(BaseCommand):
+    help = '오래된 검정증명서 원본 파일을 월별 압축 팩으로 보관합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=getattr(settings, 'CERTIFICATE_ARCHIVE_MONTHS', 12),
+            help='마지막 업로드가 이 개월 수보다 오래된 파일이 대상 (기본값: CERTIFICATE_ARCHIVE_MONTHS)'
+        )
+        parser.add_argument(
+            '--codec',
+            choices=archive.CODECS,
+            default=getattr(settings, 'CERTIFICATE_ARCHIVE_CODEC', 'xz'),
+            help='압축 형식 (xz: 표준 라이브러리, zstd: zstandard 필요)'
+        )
+        parser.add_argument('--archive-dir', default=None, help='팩 파일 저장 경로')
+        parser.add_argument('--dry-run', action='store_true', help='대상 파일 수와 크기만 확인하고 종료')
+        parser.add_argument('--compact', action='store_true', help='팩에서 삭제된 항목이 차지하는 공간 회수')
+
+    def handle(self, *args, **options):
+        if options['compact']:
+            reclaimed = archive.compact_packs(archive_dir=options['archive_dir'])
+            self.stdout.write(self.style.SUCCESS(f"팩 정리 완료: {reclaimed:,} bytes 회수"))
+            return
+
+        if options['months'] < 1:
+            raise CommandError('--months 는 1 이상이어야 합니다.')
+        if options['codec'] == 'zstd':
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise CommandError('zstd 형식은 zstandard 패키지가 필요합니다 (pip install zstandard).')
+
+        stats = archive.archive_certificate_files(
+            months=options['months'],
+            codec=options['codec'],
+            archive_dir=options['archive_dir'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"보관 대상: {stats['files']:,}개, {stats['original_bytes']:,} bytes")
+            return
+
+        for (year, month), count in sorted(stats['months'].items()):
+            self.stdout.write(f"  {year:04d}-{month:02d}: {count:,}개")
+
+        ratio = stats['packed_bytes'] / stats['original_bytes'] if stats['original_bytes'] else 1.0
+        self.stdout.write(self.style.SUCCESS(
+            f"보관 완료: {stats['files']:,}개, {stats['original_bytes']:,} → {stats['packed_bytes']:,} bytes ({ratio:.0%})"
+        ))
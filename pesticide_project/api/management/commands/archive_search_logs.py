@@ -0,0 +1,88 @@
+# 검색 로그(search_logs) 보관주기 관리 커맨드
+# 보관기간이 지난 로그를 월별 압축 파일(gzip JSONL 또는 Parquet)로 옮긴 뒤 배치 단위로 삭제
+# command : python manage.py archive_search_logs --days 180
+#           python manage.py archive_search_logs --convert-to-partitioned   (PostgreSQL, 1회성)
+#           python manage.py archive_search_logs --ensure-partitions 3       (cron 으로 매월 실행)
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api import search_log_retention as retention
+
+
+class Command(BaseCommand):
+    help = '보관기간이 지난 검색 로그를 월별 압축 파일로 보관하고 삭제합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=getattr(settings, 'SEARCH_LOG_RETENTION_DAYS', 180),
+            help='보관기간(일). 이보다 오래된 로그가 보관 대상 (기본값: SEARCH_LOG_RETENTION_DAYS)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=retention.ARCHIVE_FORMATS,
+            default='jsonl',
+            help='보관 파일 형식 (jsonl: gzip JSONL, parquet: pandas 필요)'
+        )
+        parser.add_argument('--batch-size', type=int, default=5000, help='한 번에 보관/삭제할 행 수')
+        parser.add_argument('--archive-dir', default=None, help='보관 파일 저장 경로')
+        parser.add_argument('--dry-run', action='store_true', help='대상 건수만 확인하고 종료')
+        parser.add_argument(
+            '--ensure-partitions',
+            type=int,
+            default=None,
+            metavar='MONTHS',
+            help='파티션 테이블인 경우 앞으로 MONTHS 개월치 월 파티션을 미리 생성'
+        )
+        parser.add_argument(
+            '--convert-to-partitioned',
+            action='store_true',
+            help='search_logs 를 월별 범위 파티션 테이블로 전환 (PostgreSQL 전용)'
+        )
+
+    def handle(self, *args, **options):
+        if options['convert_to_partitioned']:
+            try:
+                converted = retention.convert_to_partitioned()
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            if converted:
+                self.stdout.write(self.style.SUCCESS('search_logs 파티션 테이블 전환 완료'))
+            else:
+                self.stdout.write('이미 파티션 테이블입니다.')
+
+        if options['ensure_partitions'] is not None:
+            created = retention.ensure_monthly_partitions(options['ensure_partitions'])
+            if created:
+                self.stdout.write(f"월 파티션 확인: {', '.join(created)}")
+            else:
+                self.stdout.write('파티션 테이블이 아니므로 파티션 생성을 건너뜁니다.')
+
+        if options['convert_to_partitioned'] or options['ensure_partitions'] is not None:
+            return
+
+        if options['days'] < 1:
+            raise CommandError('--days 는 1 이상이어야 합니다.')
+
+        stats = retention.archive_search_logs(
+            days=options['days'],
+            fmt=options['format'],
+            batch_size=options['batch_size'],
+            archive_dir=options['archive_dir'],
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f"보관 대상: {stats['archived']:,}건 (기준: {stats['cutoff']:%Y-%m-%d %H:%M})")
+            return
+
+        for (year, month), count in sorted(stats['months'].items()):
+            self.stdout.write(f"  {year:04d}-{month:02d}: {count:,}건")
+        for name in stats['dropped_partitions']:
+            self.stdout.write(f"  파티션 제거: {name}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"보관 완료: {stats['archived']:,}건 보관, {stats['deleted']:,}건 삭제 "
+            f"(기준: {stats['cutoff']:%Y-%m-%d %H:%M})"
+        ))
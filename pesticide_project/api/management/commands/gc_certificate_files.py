@@ -0,0 +1,56 @@
+# 검정증명서 원본 파일 정리 커맨드 (내용 해시 저장소)
+# 어떤 증명서도 참조하지 않는 해시 파일과 압축 팩 항목을 삭제하고, 기존 파일명 저장 파일을 해시 경로로 옮김
+# command : python manage.py gc_certificate_files --dry-run
+#           python manage.py gc_certificate_files --min-age-hours 24      (cron 으로 주기 실행)
+#           python manage.py gc_certificate_files --migrate-legacy        (1회성, 배포 후)
+
+from django.core.management.base import BaseCommand, CommandError
+from api import storage
+
+
+class Command(BaseCommand):
+    help = '참조되지 않는 검정증명서 원본 파일을 삭제합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age-hours',
+            type=float,
+            default=1,
+            help='이 시간보다 오래된 파일만 삭제 (업로드 중인 파일 보호, 기본값: 1)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='삭제 대상만 출력하고 종료')
+        parser.add_argument(
+            '--migrate-legacy',
+            action='store_true',
+            help='업로드 파일명으로 저장된 기존 파일을 해시 경로로 옮긴 뒤 정리'
+        )
+
+    def handle(self, *args, **options):
+        if options['min_age_hours'] < 0:
+            raise CommandError('--min-age-hours 는 0 이상이어야 합니다.')
+
+        if options['migrate_legacy']:
+            migrated = storage.migrate_legacy_files(dry_run=options['dry_run'])
+            self.stdout.write(
+                f"기존 파일 전환{' 대상' if options['dry_run'] else ''}: {migrated['migrated']:,}건 "
+                f"(중복 {migrated['deduplicated']:,}건, 파일 없음 {migrated['missing']:,}건)"
+            )
+
+        stats = storage.collect_garbage(
+            min_age_seconds=options['min_age_hours'] * 3600,
+            dry_run=options['dry_run'],
+        )
+
+        if options['dry_run']:
+            for name in stats['names']:
+                self.stdout.write(f"  {name}")
+            self.stdout.write(
+                f"삭제 대상: {stats['deleted']:,}개, {stats['freed_bytes']:,} bytes "
+                f"(검사 {stats['scanned']:,}개, 참조 중 {stats['referenced']:,}개)"
+            )
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"정리 완료: {stats['deleted']:,}개 삭제, {stats['freed_bytes']:,} bytes 확보 "
+            f"(검사 {stats['scanned']:,}개, 참조 중 {stats['referenced']:,}개)"
+        ))
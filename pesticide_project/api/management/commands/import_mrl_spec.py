@@ -0,0 +1,83 @@
+# path of this code : pesticide_project/api/management/commands/import_mrl_spec.py
+# 잔류허용기준 스펙 CSV 를 새 릴리스로 적재하고 검증 후 pesticide_limits 에 적용 (convert_csv_to_json + loaddata 대체)
+# command : python manage.py import_mrl_spec api/management/commands/3차가공_pesticide_spec_20241114.csv
+#           python manage.py import_mrl_spec spec.csv --dry-run       (CSV 검증만)
+#           python manage.py import_mrl_spec spec.csv --stage-only    (릴리스 적재/비교만, 적용은 mrl_release activate)
+#           python manage.py import_mrl_spec spec.csv --direct --method bulk --chunk-size 2000
+#             (릴리스 없이 pesticide_limits 에 바로 적재 - 초기 데이터 구성용, 릴리스가 하나라도 있으면 거부)
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import mrl_import, mrl_release
+
+
+class Command(BaseCommand):
+    help = '잔류허용기준 스펙 CSV 검증 → 릴리스 적재 → 현재 데이터와 비교 → pesticide_limits 에 적용'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='잔류허용기준 스펙 CSV 경로')
+        parser.add_argument('--label', default=None, help='릴리스명 (기본값: CSV 파일명)')
+        parser.add_argument('--method', choices=('auto', 'copy', 'bulk'), default='auto',
+                            help='auto: PostgreSQL 이면 COPY, 아니면 bulk_create')
+        parser.add_argument('--chunk-size', type=int, default=mrl_import.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='CSV 검증만 하고 적재하지 않음')
+        parser.add_argument('--stage-only', action='store_true', help='릴리스로 적재/비교만 하고 적용하지 않음')
+        parser.add_argument('--force', action='store_true', help='삭제 비율 검사 없이 적용')
+        parser.add_argument('--direct', action='store_true', help='릴리스 없이 pesticide_limits 를 바로 교체 (릴리스가 없을 때만)')
+        parser.add_argument('--append', action='store_true', help='--direct 와 함께: 기존 데이터를 지우지 않고 추가')
+
+    def handle(self, *args, **options):
+        try:
+            df = mrl_import.read_mrl_csv(options['csv_file'])
+        except FileNotFoundError:
+            raise CommandError(f"CSV 파일이 없습니다: {options['csv_file']}")
+        except mrl_import.MRLSpecError as e:
+            for error in e.errors:
+                self.stderr.write(
+                    f"  행 {error['row_number']}: {error['reason']} - "
+                    f"{error['pesticide_name_kr']} / {error['food_name']} ({error['value']!r})"
+                )
+            raise CommandError(f"{e} - 위의 행들을 수정한 후 다시 실행해주세요 (적재하지 않음)")
+
+        self.stdout.write(f"검증 완료: {len(df):,}행")
+        if options['dry_run']:
+            return
+        try:
+            if options['direct']:
+                self.load_direct(df, options)
+            else:
+                self.load_release(df, options)
+        except (ValueError, mrl_release.MRLReleaseError) as e:
+            raise CommandError(str(e))
+
+    def load_direct(self, df, options):
+        result = mrl_import.load_limits(
+            df, method=options['method'], chunk_size=options['chunk_size'], replace=not options['append'],
+        )
+        if result['condition_codes_created']:
+            self.stdout.write(f"제한조건 코드 추가: {', '.join(result['condition_codes_created'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"잔류허용기준 {result['rows']:,}행 적재 ({result['method']}, 기존 {result['deleted']:,}행 삭제) - "
+            f"{result['seconds']:.2f}s, {result['rows_per_second']:,.0f} rows/s"
+        ))
+
+    def load_release(self, df, options):
+        release = mrl_release.stage_release(
+            df, options['label'] or os.path.basename(options['csv_file']), source=options['csv_file'],
+            method=options['method'], chunk_size=options['chunk_size'],
+        )
+        self.stdout.write(f"릴리스 #{release.pk} 적재: {release.row_count:,}행")
+        if options['stage_only']:
+            summary = mrl_release.validate_release(release, max_removed_ratio=float('inf'))
+            self.stdout.write(self.format_summary(summary))
+            self.stdout.write(f"적용: python manage.py mrl_release activate {release.pk}")
+            return
+        summary = mrl_release.activate_release(release, force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f"릴리스 #{release.pk} 적용 - {self.format_summary(summary)}"))
+
+    @staticmethod
+    def format_summary(summary):
+        return (f"현재 {summary['live_rows']:,}행 → {summary['rows']:,}행 "
+                f"(추가 {summary['added']:,}, 변경 {summary['changed']:,}, 삭제 {summary['removed']:,})")
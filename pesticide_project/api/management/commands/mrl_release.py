@@ -0,0 +1,94 @@
+# path of this code : pesticide_project/api/management/commands/mrl_release.py
+# 잔류허용기준 릴리스 목록 / 비교 / 적용 / 롤백 (릴리스 적재는 import_mrl_spec)
+# command : python manage.py mrl_release list
+#           python manage.py mrl_release diff [12] [--base 9] [--csv diff.csv]
+#             (릴리스 12(기본값: 사용 중) 와 --base(기본값: 직전 버전) 사이의 추가/변경/삭제 쌍)
+#           python manage.py mrl_release activate 12 [--force]
+#           python manage.py mrl_release rollback
+
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import mrl_release
+from api.models import MRLRelease
+
+
+class Command(BaseCommand):
+    help = '잔류허용기준 릴리스 목록 / 두 릴리스 비교 / 적용 / 직전 버전으로 롤백'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=('list', 'diff', 'activate', 'rollback'))
+        parser.add_argument('release_id', nargs='?', type=int, help='activate / diff 할 릴리스 id')
+        parser.add_argument('--base', type=int, default=None, help='diff 기준 릴리스 id (기본값: 직전 버전)')
+        parser.add_argument('--csv', default=None, help='diff 결과를 CSV 로 저장')
+        parser.add_argument('--force', action='store_true', help='삭제 비율 검사 없이 적용')
+        parser.add_argument('--limit', type=int, default=20, help='list 에 표시할 릴리스 수')
+
+    def handle(self, *args, **options):
+        action = options['action']
+        try:
+            if action == 'list':
+                self.list_releases(options['limit'])
+            elif action == 'diff':
+                self.diff_releases(options['release_id'], options['base'], options['csv'])
+            elif action == 'activate':
+                if options['release_id'] is None:
+                    raise CommandError('적용할 릴리스 id 를 지정해주세요')
+                release = self.get_release(options['release_id'])
+                summary = mrl_release.activate_release(release, force=options['force'])
+                self.stdout.write(self.style.SUCCESS(
+                    f"릴리스 #{release.pk} 적용 - 추가 {summary['added']:,}, 변경 {summary['changed']:,}, "
+                    f"삭제 {summary['removed']:,}"
+                ))
+            else:
+                release = mrl_release.rollback_release()
+                self.stdout.write(self.style.SUCCESS(f"릴리스 #{release.pk} {release.label} 로 되돌림"))
+        except mrl_release.MRLReleaseError as e:
+            raise CommandError(str(e))
+
+    def list_releases(self, limit):
+        for release in MRLRelease.objects.order_by('-pk')[:limit]:
+            activated = f"{release.activated_at:%Y-%m-%d %H:%M}" if release.activated_at else '-'
+            self.stdout.write(
+                f"#{release.pk:<5} {release.get_status_display():<6} {release.row_count:>7,}행  "
+                f"적용 {activated:<16}  {release.label}"
+            )
+
+    @staticmethod
+    def get_release(release_id):
+        try:
+            return MRLRelease.objects.get(pk=release_id)
+        except MRLRelease.DoesNotExist:
+            raise CommandError(f"릴리스 #{release_id} 가 없습니다")
+
+    def diff_releases(self, release_id, base_id, csv_path):
+        release = self.get_release(release_id) if release_id else mrl_release.active_release()
+        if release is None:
+            raise CommandError('사용 중인 릴리스가 없습니다 - 비교할 릴리스 id 를 지정해주세요')
+        base = self.get_release(base_id) if base_id else mrl_release.previous_release(release)
+        if base is None:
+            raise CommandError(f"릴리스 #{release.pk} 의 직전 버전이 없습니다 - --base 로 지정해주세요")
+
+        entries = mrl_release.release_diff(base, release)
+        if csv_path:
+            with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=list(mrl_release.DIFF_FIELDS))
+                writer.writeheader()
+                writer.writerows(entries)
+        else:
+            for entry in entries:
+                old = self.format_limit(entry['old_limit'], entry['old_condition_code'])
+                new = self.format_limit(entry['new_limit'], entry['new_condition_code'])
+                self.stdout.write(f"{entry['change']:<8} {entry['pesticide_name_kr']} / {entry['food_name']}: {old} → {new}")
+        counts = {change: sum(1 for entry in entries if entry['change'] == change)
+                  for change in ('added', 'changed', 'removed')}
+        self.stdout.write(
+            f"#{base.pk} → #{release.pk}: 추가 {counts['added']:,}, 변경 {counts['changed']:,}, 삭제 {counts['removed']:,}"
+        )
+
+    @staticmethod
+    def format_limit(limit, condition_code):
+        if limit is None:
+            return '-'
+        return f"{limit}({condition_code})" if condition_code else str(limit)
@@ -0,0 +1,56 @@
+# path of this code : pesticide_project/api/management/commands/reverify_certificates.py
+# 잔류허용기준 릴리스 변경 후 영향을 받는 검정증명서만 재검증 (api/certificate_reverify.py)
+# command : python manage.py reverify_certificates                 (직전 버전 → 사용 중인 릴리스 변경분)
+#           python manage.py reverify_certificates --base 9 --release 12 --dry-run
+#           python manage.py reverify_certificates --all            (작물체를 제외한 모든 증명서)
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import certificate_reverify, mrl_release
+from api.models import CertificateOfAnalysis, MRLRelease
+
+
+class Command(BaseCommand):
+    help = '잔류허용기준이 바뀐 (농약, 식품) 쌍이 포함된 검정증명서의 DB 기준 판정을 다시 계산'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--release', type=int, default=None, help='새 릴리스 id (기본값: 사용 중인 릴리스)')
+        parser.add_argument('--base', type=int, default=None, help='이전 릴리스 id (기본값: 직전 버전)')
+        parser.add_argument('--all', action='store_true', help='변경 목록과 관계없이 모든 증명서 재검증')
+        parser.add_argument('--dry-run', action='store_true', help='바뀔 결과 수만 확인하고 저장하지 않음')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            certificate_ids = list(CertificateOfAnalysis.objects
+                                   .exclude(sample_description__contains='작물체')
+                                   .values_list('id', flat=True))
+        else:
+            entries = mrl_release.release_diff(*self.releases(options))
+            affected = certificate_reverify.affected_results(entries)
+            certificate_ids = {certificate_id for _, certificate_id in affected}
+            self.stdout.write(f"변경된 쌍 {len(entries):,}건 → 대상 검출 결과 {len(affected):,}건, 증명서 {len(certificate_ids):,}건")
+
+        stats = certificate_reverify.reverify_certificates(certificate_ids, dry_run=options['dry_run'])
+        if stats['skipped']:
+            self.stderr.write(f"건너뜀 (검출량 확인 불가): {', '.join(map(str, stats['skipped']))}")
+        if stats['verdict_changed']:
+            self.stdout.write(f"판정이 바뀐 증명서: {', '.join(map(str, stats['verdict_changed']))}")
+        self.stdout.write(self.style.SUCCESS(
+            f"증명서 {stats['certificates']:,}건 재검증, 검출 결과 {stats['results_updated']:,}건 "
+            f"{'변경 예정 (dry-run)' if options['dry_run'] else '갱신'}"
+        ))
+
+    def releases(self, options):
+        def get(release_id):
+            try:
+                return MRLRelease.objects.get(pk=release_id)
+            except MRLRelease.DoesNotExist:
+                raise CommandError(f"릴리스 #{release_id} 가 없습니다")
+
+        release = get(options['release']) if options['release'] else mrl_release.active_release()
+        if release is None:
+            raise CommandError('사용 중인 릴리스가 없습니다 - import_mrl_spec 으로 릴리스를 적용한 뒤 실행해주세요')
+        base = get(options['base']) if options['base'] else mrl_release.previous_release(release)
+        if base is None:
+            raise CommandError(f"릴리스 #{release.pk} 의 직전 버전이 없습니다 - --base 로 지정해주세요")
+        return base, release
@@ -0,0 +1,397 @@
+# path of this code : pesticide_project/api/metrics.py
+# 프로세스 내 메트릭 레지스트리 (Prometheus 텍스트 형식으로 노출)
+# - 라우트별 응답시간 히스토그램, 요청당 DB 쿼리 수/시간, 캐시 적중률
+# - gunicorn 처럼 워커가 여러 개인 경우 METRICS_MULTIPROC_DIR 에 워커별 스냅샷을 기록하고
+#   /metrics 요청 시 모든 워커의 스냅샷을 합산하여 출력
+# - 스냅샷 파일 이름은 프로세스 시작마다 고유(metrics-<pid>-<시작 시각>.json) - PID 가 재사용되어도 덮어쓰지 않음
+# - 종료하는 워커(gunicorn worker_exit)와 죽은 프로세스의 스냅샷은 누적 파일(metrics-exited.json)에 합쳐
+#   워커가 재시작되어도 합산 카운터가 줄지 않음
+
+import asyncio
+import contextvars
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger('api')
+
+# 응답시간(초) 버킷 - 자동완성(수 ms) ~ 증명서 업로드(수 초)까지 포함
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 요청당 DB 쿼리 수 버킷
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500)
+
+HELP = {
+    'http_request_duration_seconds': '라우트별 요청 처리 시간',
+    'http_requests_total': '라우트별 요청 수',
+    'db_queries_per_request': '요청당 DB 쿼리 수',
+    'db_query_duration_seconds': '요청당 DB 쿼리 시간 합계',
+    'cache_requests_total': '캐시 조회 수 (result=hit|miss)',
+    'certificate_stage_duration_seconds': '검정증명서 처리 단계별 소요 시간',
+    'certificate_file_writes_total': '검정증명서 원본 파일 저장 수 (result=stored|deduplicated)',
+    'db_pool_connections_total': 'DB 연결 풀 이벤트 수 (result=opened|reused|discarded|exhausted)',
+    'db_health_check_failures_total': '재사용 DB 연결 상태 확인 실패 수',
+}
+
+
+class MetricsRegistry:
+    """
+    스레드 안전한 카운터/히스토그램 저장소
+    - 카운터: {(name, labels): value}
+    - 히스토그램: {(name, labels): [버킷별 개수..., +Inf 개수, 합계, 개수]}
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._buckets = {}
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect_left(buckets, value)
+        with self._lock:
+            state = self._histograms.get(key)
+            if state is None:
+                state = self._histograms[key] = [0] * (len(buckets) + 3)
+                self._buckets[name] = buckets
+            state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self):
+        """JSON 으로 저장 가능한 현재 값"""
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(labels), list(state)] for (name, labels), state in self._histograms.items()],
+                'buckets': {name: list(buckets) for name, buckets in self._buckets.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._buckets.clear()
+
+
+registry = MetricsRegistry()
+
+_flush_lock = threading.Lock()
+_last_flush = [0.0]
+_retired = [False]
+# 프로세스별 시작 시각 - preload 후 fork 된 워커는 PID 가 달라 처음 기록할 때 새로 정해짐
+_started = {}
+
+SNAPSHOT_PATTERN = 'metrics-*.json'
+ACCUMULATED_FILE = 'metrics-exited.json'
+
+
+def get_multiproc_dir():
+    return getattr(settings, 'METRICS_MULTIPROC_DIR', None) or os.environ.get('METRICS_MULTIPROC_DIR')
+
+
+def snapshot_path(directory):
+    """현재 프로세스의 스냅샷 파일 경로"""
+    pid = os.getpid()
+    started = _started.setdefault(pid, time.time_ns())
+    return os.path.join(directory, f"metrics-{pid}-{started}.json")
+
+
+def snapshot_pid(path):
+    """스냅샷 파일 이름의 PID (누적 파일 등 워커 스냅샷이 아니면 None)"""
+    parts = os.path.basename(path)[:-len('.json')].split('-')
+    if len(parts) != 3 or not (parts[1].isdigit() and parts[2].isdigit()):
+        return None
+    return int(parts[1])
+
+
+@contextmanager
+def _directory_lock(directory, exclusive):
+    """누적 파일 갱신(배타)과 스냅샷 읽기(공유)를 직렬화 (fcntl 이 없는 환경에서는 잠금 없이 실행)"""
+    with open(os.path.join(directory, 'metrics.lock'), 'a') as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def flush(force=False):
+    """
+    멀티프로세스 모드에서 현재 워커의 스냅샷을 파일로 기록
+    - METRICS_FLUSH_INTERVAL(초) 간격으로만 기록 (force=True 이면 즉시)
+    - 임시 파일에 쓴 뒤 rename 하므로 읽는 쪽이 반쯤 쓰인 파일을 보지 않음
+    """
+    directory = get_multiproc_dir()
+    if not directory or _retired[0]:
+        return
+    now = time.monotonic()
+    interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0)
+    if not force and now - _last_flush[0] < interval:
+        return
+    if not _flush_lock.acquire(blocking=force):  # 주기 기록은 다른 스레드가 기록 중이면 건너뜀
+        return
+    try:
+        _last_flush[0] = now
+        os.makedirs(directory, exist_ok=True)
+        _write_json(snapshot_path(directory), registry.snapshot())
+    except OSError as e:
+        logger.warning(f"메트릭 스냅샷 기록 실패: {e}")
+    finally:
+        _flush_lock.release()
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _read_snapshots(paths):
+    snapshots = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue  # 다른 워커가 교체 중인 파일은 건너뜀
+    return snapshots
+
+
+def retire(paths, directory):
+    """
+    끝난 프로세스의 스냅샷을 누적 파일에 합친 뒤 삭제
+    - 누적 파일 교체와 스냅샷 삭제 사이를 collect 가 보지 않도록 배타 잠금 안에서 처리
+    """
+    if not paths:
+        return
+    with _directory_lock(directory, exclusive=True):
+        accumulated = os.path.join(directory, ACCUMULATED_FILE)
+        paths = [path for path in paths if os.path.exists(path)]
+        counters, histograms, buckets = _merge(_read_snapshots([accumulated] + paths))
+        _write_json(accumulated, {
+            'counters': [[name, list(labels), value] for (name, labels), value in counters.items()],
+            'histograms': [[name, list(labels), state] for (name, labels), state in histograms.items()],
+            'buckets': {name: list(bounds) for name, bounds in buckets.items()},
+        })
+        for path in paths:
+            os.remove(path)
+
+
+def retire_process():
+    """
+    워커 종료 시 호출 (config/gunicorn.py worker_exit)
+    - 마지막 값까지 기록한 뒤 누적 파일에 합침 - 이후 flush 는 기록하지 않음
+    """
+    directory = get_multiproc_dir()
+    if not directory or _retired[0]:
+        return
+    flush(force=True)
+    _retired[0] = True
+    try:
+        retire([snapshot_path(directory)], directory)
+    except OSError as e:
+        logger.warning(f"메트릭 스냅샷 누적 실패: {e}")
+
+
+def retire_dead_processes(directory):
+    """
+    살아 있지 않은 프로세스의 스냅샷을 누적 파일에 합침 (config/gunicorn.py on_starting)
+    - 강제 종료(timeout, OOM)로 worker_exit 가 호출되지 않은 워커의 값도 보존
+    """
+    dead = []
+    for path in glob.glob(os.path.join(directory, SNAPSHOT_PATTERN)):
+        pid = snapshot_pid(path)
+        if pid is None:
+            continue
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            dead.append(path)
+        except PermissionError:
+            continue
+    retire(dead, directory)
+
+
+def collect():
+    """모든 워커의 스냅샷을 합산 (멀티프로세스 모드가 아니면 현재 프로세스 값만)"""
+    directory = get_multiproc_dir()
+    if not directory:
+        return [registry.snapshot()]
+
+    flush(force=True)
+    os.makedirs(directory, exist_ok=True)
+    with _directory_lock(directory, exclusive=False):
+        return _read_snapshots(sorted(glob.glob(os.path.join(directory, SNAPSHOT_PATTERN))))
+
+
+def _merge(snapshots):
+    counters, histograms, buckets = {}, {}, {}
+    for snapshot in snapshots:
+        buckets.update({name: tuple(value) for name, value in snapshot['buckets'].items()})
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, state in snapshot['histograms']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            merged = histograms.get(key)
+            histograms[key] = list(state) if merged is None else [a + b for a, b in zip(merged, state)]
+    return counters, histograms, buckets
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = []
+    for key, value in pairs:
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        escaped.append(f'{key}="{value}"')
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render_prometheus(snapshots=None):
+    """Prometheus text exposition format (0.0.4)"""
+    counters, histograms, buckets = _merge(collect() if snapshots is None else snapshots)
+    lines = []
+
+    for name in sorted({key[0] for key in counters}):
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} counter")
+        for (metric, labels), value in sorted(counters.items()):
+            if metric == name:
+                lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+
+    for name in sorted({key[0] for key in histograms}):
+        bounds = buckets[name]
+        lines.append(f"# HELP {name} {HELP.get(name, name)}")
+        lines.append(f"# TYPE {name} histogram")
+        for (metric, labels), state in sorted(histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(bounds, state):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            cumulative += state[len(bounds)]
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(state[-2])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {state[-1]}")
+
+    return '\n'.join(lines) + '\n'
+
+
+def record_cache(cache_name, hit):
+    """캐시 적중/미적중 기록 - 적중률은 hit / (hit + miss)"""
+    registry.inc('cache_requests_total', cache=cache_name, result='hit' if hit else 'miss')
+
+
+class _QueryTimer:
+    """요청 중 실행된 쿼리 수/시간 집계 (count_queries 가 현재 요청의 타이머로 호출)"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+# 현재 요청의 타이머 - contextvar 라 sync_to_async 로 넘어간 ORM 호출에서도 같은 요청의 타이머가 보임
+# (Django 3.2 ASGI 에서는 동시 요청들이 같은 스레드/같은 연결에서 쿼리를 실행하므로 연결 단위로는 요청을 구분할 수 없음)
+_query_timer = contextvars.ContextVar('metrics_query_timer', default=None)
+
+
+def count_queries(execute, sql, params, many, context):
+    """연결마다 한 번 설치되는 execute_wrapper - 요청 밖(관리 명령 등)의 쿼리는 집계하지 않음"""
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_counter(connection):
+    """새 DB 연결에 count_queries 설치 (connection_created 신호, signals.py)"""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+class MetricsMiddleware:
+    """
+    요청별 메트릭 수집 미들웨어 (MIDDLEWARE 가장 앞에 두어야 전체 처리 시간이 잡힘)
+    - route 라벨은 URL 패턴(resolver_match.route) 기준이라 검색어마다 라벨이 늘어나지 않음
+    - WSGI(동기) / ASGI(비동기) 체인 모두 지원 - ASGI 에서는 코루틴으로 동작해 async 뷰 요청이 직렬화되지 않음
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(self.get_response):
+            # Django 가 이 미들웨어를 코루틴으로 인식하도록 (MiddlewareMixin 과 같은 방식)
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = _QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        timer = _QueryTimer()
+        token = _query_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    @staticmethod
+    def record(request, response, duration, timer):
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else 'unmatched'
+        status_class = f"{response.status_code // 100}xx"
+
+        registry.inc('http_requests_total', route=route, method=request.method, status=status_class)
+        registry.observe('http_request_duration_seconds', duration, route=route, method=request.method)
+        registry.observe('db_queries_per_request', timer.count, buckets=QUERY_COUNT_BUCKETS, route=route)
+        registry.observe('db_query_duration_seconds', timer.duration, route=route)
+        flush()
@@ -1,6 +1,8 @@
+import asyncio
 import logging
+import random
 import time
-from django.utils.deprecation import MiddlewareMixin
+from django.conf import settings
 
 
 class AutocompleteFilter(logging.Filter):
@@ -15,74 +17,79 @@ class AutocompleteFilter(logging.Filter):
                 return False
         return True
 
-# 미들웨어가 로드될 때 즉시 로그 출력
-print("=" * 60)
-print("RequestLoggingMiddleware is being loaded!")
-print("=" * 60)
 
 logger = logging.getLogger('api')
+request_logger = logging.getLogger('api.requests')
 
-class RequestLoggingMiddleware(MiddlewareMixin):
+
+def get_sample_rate(path, sample_rates):
+    """
+    경로별 로그 샘플링 비율 (가장 긴 prefix 우선, 기본값 1.0)
+    - 예: {'/api/pesticides/autocomplete/': 0.05} → autocomplete 요청은 5%만 기록
     """
-    모든 HTTP 요청을 로깅하는 미들웨어
+    rate = 1.0
+    matched = -1
+    for prefix, prefix_rate in sample_rates.items():
+        if path.startswith(prefix) and len(prefix) > matched:
+            rate = prefix_rate
+            matched = len(prefix)
+    return rate
+
+
+class RequestLoggingMiddleware:
     """
+    모든 HTTP 요청을 요청당 한 건의 구조화 로그로 기록하는 미들웨어
+    - 'api.requests' 로거로 method/path/route/status/duration_ms 등을 extra 필드로 전달
+    - 포맷팅과 출력은 QueueListenerHandler 가 별도 스레드에서 처리 (settings.LOGGING 참고)
+    - settings.REQUEST_LOG_SAMPLE_RATES 로 경로별 샘플링 (autocomplete 등 빈번한 요청)
+    - 5xx 응답은 샘플링과 관계없이 항상 기록
+    - WSGI(동기) / ASGI(비동기) 체인 모두 지원
+    """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
-        super().__init__(get_response)
         self.get_response = get_response
-        # 미들웨어 초기화 시 로그
-        print(f"RequestLoggingMiddleware initialized with logger: {logger.name}")
-        logger.info("RequestLoggingMiddleware initialized!")
-    
+        self.sample_rates = getattr(settings, 'REQUEST_LOG_SAMPLE_RATES', {})
+        if asyncio.iscoroutinefunction(self.get_response):
+            # ASGI 에서는 코루틴으로 동작 (MiddlewareMixin 과 같은 방식) - 동기 어댑터로 요청이 직렬화되지 않음
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
     def __call__(self, request):
-        # autocomplete 요청은 로깅하지 않음
-        skip_logging = 'autocomplete' in request.path
-        
-        if not skip_logging:
-            # __call__ 메소드에서도 로깅
-            print(f"[MIDDLEWARE __call__] Processing: {request.method} {request.path}")
-        
-        # 요청 시작 시간 기록
-        request._start_time = time.time()
-        
-        if not skip_logging:
-            # 요청 정보 로깅
-            msg = f"Request: {request.method} {request.path} from {request.META.get('REMOTE_ADDR', 'unknown')}"
-            print(f"[REQUEST] {msg}")
-            logger.info(msg)
-        
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
         response = self.get_response(request)
-        
-        if not skip_logging:
-            # 응답 로깅
-            if hasattr(request, '_start_time'):
-                duration = time.time() - request._start_time
-                msg = f"Response: {request.method} {request.path} - Status: {response.status_code} - Duration: {duration:.3f}s"
-                print(f"[RESPONSE] {msg}")
-                logger.info(msg)
-        
+        self.log(request, response, (time.perf_counter() - start) * 1000)
         return response
-    
-    def process_request(self, request):
-        # 요청 시작 시간 기록
-        request._start_time = time.time()
-        
-        # 요청 정보 로깅 - print와 logger 둘 다 사용
-        msg = f"Request: {request.method} {request.path} from {request.META.get('REMOTE_ADDR', 'unknown')}"
-        print(f"[REQUEST process_request] {msg}")  # 강제로 stdout에 출력
-        logger.info(msg)
-        return None
-    
-    def process_response(self, request, response):
-        # 응답 시간 계산
-        if hasattr(request, '_start_time'):
-            duration = time.time() - request._start_time
-            msg = f"Response: {request.method} {request.path} - Status: {response.status_code} - Duration: {duration:.3f}s"
-            print(f"[RESPONSE] {msg}")  # 강제로 stdout에 출력
-            logger.info(msg)
-        
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.log(request, response, (time.perf_counter() - start) * 1000)
         return response
-    
+
+    def log(self, request, response, duration_ms):
+        sample_rate = get_sample_rate(request.path, self.sample_rates)
+        if response.status_code < 500 and (sample_rate <= 0 or random.random() >= sample_rate):
+            return
+
+        if request_logger.isEnabledFor(logging.INFO):
+            match = getattr(request, 'resolver_match', None)
+            request_logger.info(
+                '%s %s %s %.1fms', request.method, request.path, response.status_code, duration_ms,
+                extra={
+                    'method': request.method,
+                    'path': request.path,
+                    'route': match.route if match else None,
+                    'status': response.status_code,
+                    'duration_ms': round(duration_ms, 2),
+                    'remote_addr': request.META.get('REMOTE_ADDR'),
+                    'sample_rate': sample_rate,
+                }
+            )
+
     def process_exception(self, request, exception):
         # 예외 발생 시 로깅
         logger.error(f"Exception in {request.method} {request.path}: {str(exception)}", exc_info=True)
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_auto_20250722_2343'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='searchlog',
+            index=models.Index(fields=['timestamp'], name='search_logs_timesta_0d84c7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchlog',
+            index=models.Index(fields=['results_count', 'timestamp'], name='search_logs_results_e3dcb2_idx'),
+        ),
+    ]
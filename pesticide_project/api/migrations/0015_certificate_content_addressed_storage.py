@@ -0,0 +1,29 @@
+# Generated by Django 3.2.25 on 2026-10-19 12:01
+
+import api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_searchlog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificateofanalysis',
+            name='file_sha256',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64, verbose_name='원본파일 SHA-256'),
+        ),
+        migrations.AddField(
+            model_name='certificateofanalysis',
+            name='original_filename',
+            field=models.CharField(blank=True, default='', max_length=255, verbose_name='업로드 파일명'),
+        ),
+        migrations.AlterField(
+            model_name='certificateofanalysis',
+            name='original_file',
+            field=models.FileField(storage=api.storage.get_certificate_storage, upload_to='certificates/', verbose_name='원본파일'),
+        ),
+    ]
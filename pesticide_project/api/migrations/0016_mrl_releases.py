@@ -0,0 +1,52 @@
+# Generated by Django 3.2.25 on 2026-10-19 12:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_certificate_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MRLRelease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('label', models.CharField(max_length=100, verbose_name='릴리스명')),
+                ('source', models.CharField(blank=True, default='', max_length=255, verbose_name='원본 파일')),
+                ('status', models.CharField(choices=[('staged', '적재됨'), ('active', '사용 중'), ('retired', '이전 버전'), ('rolled_back', '롤백됨')], db_index=True, default='staged', max_length=20, verbose_name='상태')),
+                ('row_count', models.IntegerField(default=0, verbose_name='행 수')),
+                ('summary', models.JSONField(blank=True, default=dict, verbose_name='이전 버전 대비 변경 요약')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='적재일시')),
+                ('activated_at', models.DateTimeField(blank=True, null=True, verbose_name='적용일시')),
+            ],
+            options={
+                'verbose_name': '잔류허용기준 릴리스',
+                'verbose_name_plural': '잔류허용기준 릴리스',
+                'db_table': 'mrl_releases',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MRLReleaseLimit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pesticide_name_kr', models.CharField(max_length=100)),
+                ('pesticide_name_en', models.CharField(max_length=100)),
+                ('food_name', models.CharField(max_length=100)),
+                ('max_residue_limit', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('condition_code', models.CharField(blank=True, max_length=3, null=True)),
+                ('release', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='limits', to='api.mrlrelease')),
+            ],
+            options={
+                'db_table': 'mrl_release_limits',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mrlreleaselimit',
+            index=models.Index(fields=['release', 'pesticide_name_kr', 'food_name'], name='mrl_release_release_f618a0_idx'),
+        ),
+    ]
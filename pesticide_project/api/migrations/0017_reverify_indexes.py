@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-19 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_mrl_releases'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificateofanalysis',
+            index=models.Index(fields=['sample_description'], name='certificate_sample__418abf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pesticideresult',
+            index=models.Index(fields=['standard_pesticide_name'], name='pesticide_r_standar_c64284_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# 대소문자 무시 검색(__iexact / __icontains)용 인덱스 - DB 종류별로 다르게 생성
+# - PostgreSQL: iexact 는 UPPER("col"::text) = UPPER(%s) 이므로 UPPER() 함수 인덱스,
+#   icontains 는 UPPER("col"::text) LIKE UPPER('%x%') 이므로 UPPER() 에 pg_trgm GIN 인덱스
+#   (검색어가 3글자 미만이면 trigram 을 만들 수 없어 순차 탐색이 그대로 쓰일 수 있음)
+# - SQLite: iexact 는 LIKE 로 처리되고 COLLATE NOCASE 인덱스로 범위 탐색 가능, icontains 는 인덱스 불가
+# - Django 3.2 의 Meta.indexes 로는 함수 식에 opclass 를 지정할 수 없어 SQL 로 생성 (모델 상태에는 없음)
+# - 실행 계획 확인: python -m benchmarks.run --only explain.
+
+from django.db import migrations
+
+POSTGRESQL_INDEXES = (
+    # (인덱스 이름, 모델, 정의)
+    ('pesticide_limit_food_upper_idx', 'PesticideLimit', '(UPPER(food_name))'),
+    ('pesticide_limit_en_food_upper_idx', 'PesticideLimit', '(UPPER(pesticide_name_en), UPPER(food_name))'),
+    ('pesticide_limit_kr_trgm_idx', 'PesticideLimit', 'USING gin (UPPER(pesticide_name_kr) gin_trgm_ops)'),
+    ('pesticide_limit_en_trgm_idx', 'PesticideLimit', 'USING gin (UPPER(pesticide_name_en) gin_trgm_ops)'),
+    ('pesticide_limit_food_trgm_idx', 'PesticideLimit', 'USING gin (UPPER(food_name) gin_trgm_ops)'),
+    ('pesticide_detail_kor_nm_trgm_idx', 'PesticideDetail', 'USING gin (UPPER(prdlst_kor_nm) gin_trgm_ops)'),
+    ('pesticide_detail_crops_trgm_idx', 'PesticideDetail', 'USING gin (UPPER(crops_nm) gin_trgm_ops)'),
+)
+SQLITE_INDEXES = (
+    ('pesticide_limit_food_nocase_idx', 'PesticideLimit', '(food_name COLLATE NOCASE)'),
+    ('pesticide_limit_en_food_nocase_idx', 'PesticideLimit',
+     '(pesticide_name_en COLLATE NOCASE, food_name COLLATE NOCASE)'),
+)
+
+
+def _indexes(vendor):
+    return {'postgresql': POSTGRESQL_INDEXES, 'sqlite': SQLITE_INDEXES}.get(vendor, ())
+
+
+def create_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, model_name, definition in _indexes(vendor):
+        table = apps.get_model('api', model_name)._meta.db_table
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} {definition}')
+
+
+def drop_indexes(apps, schema_editor):
+    # pg_trgm 확장은 다른 객체가 쓸 수 있으므로 남겨 둠
+    for name, _, _ in _indexes(schema_editor.connection.vendor):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_reverify_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2.25 on 2026-10-19 13:25
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_case_insensitive_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='certificateofanalysis',
+            name='certificate_sample__418abf_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='pesticideresult',
+            name='pesticide_r_standar_c64284_idx',
+        ),
+        migrations.AddIndex(
+            model_name='certificateofanalysis',
+            index=models.Index(django.db.models.functions.text.Upper('sample_description'), name='certificate_sample_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pesticideresult',
+            index=models.Index(django.db.models.functions.text.Upper('standard_pesticide_name'), name='pesticide_result_std_upper_idx'),
+        ),
+    ]
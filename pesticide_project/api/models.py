@@ -1,10 +1,13 @@
 # path of this code : pesticide_project/api/models.py
 
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
 import uuid
 
+from .storage import get_certificate_storage
+
 
 class LimitConditionCode(models.Model):
     code = models.CharField(max_length=3, primary_key=True)
@@ -38,6 +41,7 @@ class PesticideLimit(models.Model):
         db_table = 'pesticide_limits'
         verbose_name = '농약 잔류허용기준'
         verbose_name_plural = '농약 잔류허용기준'
+        # __iexact / __icontains 용 대소문자 무시 인덱스는 DB 종류별로 migrations/0018 에서 생성
         indexes = [
             models.Index(fields=['pesticide_name_kr', 'food_name']),
             models.Index(fields=['pesticide_name_en', 'food_name'])
@@ -82,6 +86,7 @@ class PesticideDetail(models.Model):
     eclgy_toxcty = models.CharField(max_length=100)  # 생태독성
 
     class Meta:
+        # __icontains 용 pg_trgm 인덱스는 migrations/0018 에서 생성 (PostgreSQL)
         indexes = [
             models.Index(fields=['prdlst_kor_nm']),
             models.Index(fields=['crops_nm']),
@@ -101,6 +106,10 @@ class SearchLog(models.Model):
         ordering = ['-timestamp']  # 최신 검색이 먼저 나오도록
         verbose_name = '검색 로그'
         verbose_name_plural = '검색 로그'
+        indexes = [
+            models.Index(fields=['timestamp']),  # 관리자 date_hierarchy, 보관주기 정리
+            models.Index(fields=['results_count', 'timestamp']),  # 결과 수 필터 + 최신순 정렬
+        ]
 
     def __str__(self):
         return f"{self.search_term} ({self.results_count} results) - {self.timestamp}"
@@ -222,7 +231,10 @@ class CertificateOfAnalysis(models.Model):
     test_end_date = models.DateField(null=True, blank=True, verbose_name='검정종료일')
     analytical_method = models.TextField(null=True, blank=True, verbose_name='검정방법')
 
-    original_file = models.FileField(upload_to='certificates/', verbose_name='원본파일')
+    # 내용 해시 경로(certificates/ab/cd/<sha256>.pdf)에 저장 - 같은 PDF 는 여러 증명서가 공유
+    original_file = models.FileField(upload_to='certificates/', storage=get_certificate_storage, verbose_name='원본파일')
+    file_sha256 = models.CharField(max_length=64, blank=True, default='', db_index=True, verbose_name='원본파일 SHA-256')
+    original_filename = models.CharField(max_length=255, blank=True, default='', verbose_name='업로드 파일명')
     upload_date = models.DateTimeField(default=timezone.now, verbose_name='업로드일시')
 
     class Meta:
@@ -230,6 +242,10 @@ class CertificateOfAnalysis(models.Model):
         verbose_name = '검정증명서'
         verbose_name_plural = '검정증명서'
         ordering = ['-upload_date']
+        indexes = [
+            # 잔류허용기준 변경 시 재검증 대상 조회 (대소문자 무시 - UPPER(sample_description) IN (...))
+            models.Index(Upper('sample_description'), name='certificate_sample_upper_idx'),
+        ]
 
     def __str__(self):
         return f"{self.certificate_number} - {self.sample_description}"
@@ -337,6 +353,62 @@ class PesticideResult(models.Model):
         db_table = 'pesticide_results'
         verbose_name = '농약 검출 결과'
         verbose_name_plural = '농약 검출 결과'
+        indexes = [
+            # 잔류허용기준 변경 시 재검증 대상 조회 (대소문자 무시 - UPPER(standard_pesticide_name) IN (...))
+            models.Index(Upper('standard_pesticide_name'), name='pesticide_result_std_upper_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.certificate.certificate_number} - {self.pesticide_name} ({self.detection_value}mg/kg)"
\ No newline at end of file
+        return f"{self.certificate.certificate_number} - {self.pesticide_name} ({self.detection_value}mg/kg)"
+
+# ==================== 잔류허용기준 릴리스 (api/mrl_release.py) ====================
+
+class MRLRelease(models.Model):
+    """
+    잔류허용기준 데이터 버전 - 스펙 CSV 한 번 적재 단위
+    - staged: 적재/검증만 된 상태, active: 현재 pesticide_limits 내용, retired: 이전 버전 (롤백 대상)
+    """
+    STATUS_STAGED = 'staged'
+    STATUS_ACTIVE = 'active'
+    STATUS_RETIRED = 'retired'
+    STATUS_ROLLED_BACK = 'rolled_back'
+    STATUS_CHOICES = [
+        (STATUS_STAGED, '적재됨'),
+        (STATUS_ACTIVE, '사용 중'),
+        (STATUS_RETIRED, '이전 버전'),
+        (STATUS_ROLLED_BACK, '롤백됨'),
+    ]
+
+    label = models.CharField(max_length=100, verbose_name='릴리스명')
+    source = models.CharField(max_length=255, blank=True, default='', verbose_name='원본 파일')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_STAGED, db_index=True,
+                              verbose_name='상태')
+    row_count = models.IntegerField(default=0, verbose_name='행 수')
+    summary = models.JSONField(default=dict, blank=True, verbose_name='이전 버전 대비 변경 요약')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='적재일시')
+    activated_at = models.DateTimeField(null=True, blank=True, verbose_name='적용일시')
+
+    class Meta:
+        db_table = 'mrl_releases'
+        verbose_name = '잔류허용기준 릴리스'
+        verbose_name_plural = '잔류허용기준 릴리스'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"#{self.pk} {self.label} ({self.get_status_display()}, {self.row_count}행)"
+
+
+class MRLReleaseLimit(models.Model):
+    """릴리스별 잔류허용기준 스냅샷 (적용 시 pesticide_limits 로 복사)"""
+    release = models.ForeignKey(MRLRelease, on_delete=models.CASCADE, related_name='limits')
+    pesticide_name_kr = models.CharField(max_length=100)
+    pesticide_name_en = models.CharField(max_length=100)
+    food_name = models.CharField(max_length=100)
+    max_residue_limit = models.DecimalField(max_digits=10, decimal_places=3)
+    condition_code = models.CharField(max_length=3, null=True, blank=True)
+
+    class Meta:
+        db_table = 'mrl_release_limits'
+        indexes = [
+            models.Index(fields=['release', 'pesticide_name_kr', 'food_name']),
+        ]
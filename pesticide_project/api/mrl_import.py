@@ -0,0 +1,175 @@
+# path of this code : pesticide_project/api/mrl_import.py
+# 잔류허용기준(MRL) 스펙 CSV → pesticide_limits 직접 적재 (python manage.py import_mrl_spec)
+# - 검증은 pandas 열 단위 연산으로 한 번에 처리 (#VALUE! / 빈 값 / 숫자가 아닌 값 / 필수 열 누락 / 중복 쌍)
+#   오류가 하나라도 있으면 아무것도 적재하지 않고 CSV 행 번호와 함께 오류 목록 반환
+# - 제한조건 코드(LimitConditionCode)를 먼저 채운 뒤 (외래 키) 잔류허용기준을 적재
+# - PostgreSQL 은 COPY, 그 외(SQLite 등)는 bulk_create 를 chunk_size 개씩
+# - 모델 save() / 신호를 거치지 않으므로 적재 후 MRL 행렬을 직접 무효화
+# - 이전 방식(convert_csv_to_json → loaddata)은 행마다 iterrows + 모델 저장이라 수 분 걸림
+
+import io
+import logging
+import time
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger('api')
+
+# CSV 열 이름 → PesticideLimit 필드
+CSV_COLUMNS = {
+    '농약명(한글)': 'pesticide_name_kr',
+    '농약명(영어)': 'pesticide_name_en',
+    '식품명': 'food_name',
+    'max_residue_limit': 'max_residue_limit',
+    'condition_code': 'condition_code',
+}
+LIMIT_FIELDS = ('pesticide_name_kr', 'pesticide_name_en', 'food_name', 'max_residue_limit', 'condition_code')
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class MRLSpecError(Exception):
+    """CSV 검증 실패 - errors 는 [{'row_number', 'pesticide_name_kr', 'food_name', 'value', 'reason'}]"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__(f"잔류허용기준 CSV 오류 {len(errors)}건")
+
+
+def read_mrl_csv(source):
+    """
+    CSV 를 읽어 검증된 DataFrame(LIMIT_FIELDS 열) 반환 - 오류가 있으면 MRLSpecError
+    - max_residue_limit 은 소수 셋째 자리까지의 문자열, condition_code 는 없으면 None
+    """
+    import pandas as pd  # 적재할 때만 필요하므로 지연 import
+
+    df = pd.read_csv(source, dtype=str, keep_default_na=False)
+    missing = [column for column in CSV_COLUMNS if column not in df.columns]
+    if missing:
+        raise MRLSpecError([{
+            'row_number': 1, 'pesticide_name_kr': '', 'food_name': '',
+            'value': ', '.join(missing), 'reason': '필수 열 누락',
+        }])
+
+    df = df[list(CSV_COLUMNS)].rename(columns=CSV_COLUMNS)
+    for column in LIMIT_FIELDS:
+        df[column] = df[column].str.strip()
+
+    numeric = pd.to_numeric(df['max_residue_limit'], errors='coerce')
+    reasons = pd.Series('', index=df.index)
+    reasons[numeric.isna()] = '잔류허용기준 값이 숫자가 아님'
+    reasons[df['max_residue_limit'].str.upper() == '#VALUE!'] = '엑셀 수식 오류(#VALUE!)'
+    reasons[df['max_residue_limit'] == ''] = '잔류허용기준 값 없음'
+    reasons[numeric < 0] = '잔류허용기준 값이 음수'
+    for column, label in (('pesticide_name_kr', '농약명(한글)'), ('pesticide_name_en', '농약명(영어)'), ('food_name', '식품명')):
+        reasons[df[column] == ''] = f"{label} 없음"
+    duplicated = df.duplicated(['pesticide_name_kr', 'food_name'], keep='first') & (reasons == '')
+    reasons[duplicated] = '같은 농약/식품 쌍이 이미 있음'
+
+    invalid = reasons != ''
+    if invalid.any():
+        rows = df[invalid]
+        raise MRLSpecError([
+            {
+                'row_number': index + 2,  # 엑셀 행 번호 (헤더 1행 + 0부터 시작하는 index)
+                'pesticide_name_kr': row.pesticide_name_kr,
+                'food_name': row.food_name,
+                'value': row.max_residue_limit,
+                'reason': reason,
+            }
+            for index, row, reason in zip(rows.index, rows.itertuples(index=False), reasons[invalid])
+        ])
+
+    df['max_residue_limit'] = numeric.round(3).map('{:.3f}'.format)
+    df['condition_code'] = df['condition_code'].astype(object).where(df['condition_code'] != '', None)
+    return df.reset_index(drop=True)
+
+
+def upsert_condition_codes(codes):
+    """CSV 에 있는 제한조건 코드 중 DB 에 없는 것만 추가 (기존 설명은 유지) - 추가한 코드 목록"""
+    from .models import LimitConditionCode
+
+    existing = set(LimitConditionCode.objects.values_list('code', flat=True))
+    new_codes = sorted(set(codes) - existing)
+    LimitConditionCode.objects.bulk_create(
+        [LimitConditionCode(code=code, description=f'Condition {code}') for code in new_codes],
+        ignore_conflicts=True,
+    )
+    return new_codes
+
+
+def copy_rows(df, table, columns):
+    """PostgreSQL COPY 로 DataFrame 의 columns 열을 한 번에 적재 (None 은 NULL)"""
+    buffer = io.StringIO()
+    df[list(columns)].to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _delete_limits(table):
+    """기존 잔류허용기준 전체 삭제 (pesticide_limits 를 참조하는 외래 키가 없어 행마다 신호를 보낼 필요 없음)"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {connection.ops.quote_name(table)}")
+        return cursor.rowcount
+
+
+def _bulk_create_limits(df, model, created_at, chunk_size):
+    for start in range(0, len(df), chunk_size):
+        model.objects.bulk_create([
+            model(
+                pesticide_name_kr=row.pesticide_name_kr,
+                pesticide_name_en=row.pesticide_name_en,
+                food_name=row.food_name,
+                max_residue_limit=Decimal(row.max_residue_limit),
+                condition_code_id=row.condition_code,
+                created_at=created_at,
+            )
+            for row in df.iloc[start:start + chunk_size].itertuples(index=False)
+        ], batch_size=chunk_size)
+
+
+def load_limits(df, method='auto', chunk_size=DEFAULT_CHUNK_SIZE, replace=True):
+    """
+    검증된 DataFrame 을 pesticide_limits 에 적재 (한 트랜잭션)
+    - method: auto(PostgreSQL 이면 copy) / copy / bulk
+    - replace: 기존 잔류허용기준을 모두 지우고 적재 (False 면 추가만)
+    - 릴리스(mrl_release)를 한 번이라도 적재했으면 거부 - 릴리스 기록과 pesticide_limits 가 어긋나
+      롤백 시 직접 적재한 내용이 사라지므로 이후에는 릴리스로만 교체
+    - 반환: {'rows', 'condition_codes_created', 'deleted', 'method', 'seconds', 'rows_per_second'}
+    """
+    from . import mrl_matrix
+    from .models import MRLRelease, PesticideLimit
+
+    if method == 'auto':
+        method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+    if method == 'copy' and connection.vendor != 'postgresql':
+        raise ValueError('COPY 는 PostgreSQL 에서만 사용할 수 있습니다')
+
+    start = time.perf_counter()
+    created_at = timezone.now()
+    with transaction.atomic():
+        if MRLRelease.objects.exists():
+            raise ValueError('잔류허용기준 릴리스로 관리 중이므로 직접 적재할 수 없습니다 - '
+                             '--direct 없이 릴리스로 적재해주세요 (python manage.py import_mrl_spec <csv>)')
+        new_codes = upsert_condition_codes(df['condition_code'].dropna().unique())
+        deleted = _delete_limits(PesticideLimit._meta.db_table) if replace else 0
+        if method == 'copy':
+            copy_rows(df.assign(created_at=created_at.isoformat()), PesticideLimit._meta.db_table,
+                      LIMIT_FIELDS + ('created_at',))
+        else:
+            _bulk_create_limits(df, PesticideLimit, created_at, chunk_size)
+    transaction.on_commit(mrl_matrix.invalidate)
+    seconds = time.perf_counter() - start
+
+    logger.info(f"잔류허용기준 적재: {len(df):,}행 ({method}), {seconds:.2f}s")
+    return {
+        'rows': len(df),
+        'condition_codes_created': new_codes,
+        'deleted': deleted,
+        'method': method,
+        'seconds': seconds,
+        'rows_per_second': len(df) / seconds if seconds else 0.0,
+    }
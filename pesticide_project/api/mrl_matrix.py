@@ -0,0 +1,358 @@
+# path of this code : pesticide_project/api/mrl_matrix.py
+# 농약 × 식품 잔류허용기준(MRL) 행렬과 벡터화된 적합/부적합 판정
+# - PesticideLimit 전체를 (농약 id, 식품 id) 2차원 배열로 보관: 값(0.001 단위 정수), 존재 마스크, 조건코드
+# - evaluate(detections, food) 로 증명서 한 건, evaluate_batch(...) 로 여러 건을 한 번에 판정
+#   업로드 검증과 재검증(certificate_parser.verify_certificates)의 적합/부적합 판정이 이 경로를 사용
+#   · 기준: 품목명 매핑(깻잎 → 들깻잎) 후 직접 기준 → FoodCategory 소분류 → 대분류 순 (food_categories)
+#   · 일반: 검출량 <= MRL 이면 적합 (기준이 없으면 검출 행의 대체 기준(PDF 기록 MRL), 그것도 없으면 PLS 0.01)
+#   · 친환경: 검출량 < 0.01 이면 적합 (작물체 친환경 검정 포함)
+# - 비교는 0.001 단위 정수로 수행 (Decimal 과 같은 결과, 부동소수점 오차 없음)
+# - 행렬은 프로세스마다 한 번 만들어 MRL_MATRIX_TTL(초) 동안 재사용,
+#   같은 프로세스에서 PesticideLimit 이 저장/삭제되면 즉시 무효화 (signals.py)
+#   다른 프로세스가 새 잔류허용기준 릴리스를 적용하면 MRL_RELEASE_CHECK_INTERVAL 초 안에 다시 생성 (mrl_release.py)
+
+import decimal
+import logging
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from . import food_categories, metrics
+from .models import MRLRelease, PesticideLimit
+
+logger = logging.getLogger('api')
+
+SCALE = 1000  # PesticideLimit.max_residue_limit 는 소수점 3자리
+PLS_DEFAULT = decimal.Decimal('0.01')
+ECO_FRIENDLY_THRESHOLD = decimal.Decimal('0.01')
+NO_CONDITION = -1
+MATCHING_TYPES = ('direct', 'sub', 'main')  # evaluate 의 기준 단계 (단건 조회 matching_type 과 같은 이름)
+
+_matrix = None
+_built_at = 0.0
+_release_id = None  # 행렬을 만들 때의 활성 릴리스 id
+_release_checked_at = 0.0
+_lock = threading.Lock()
+
+
+def to_scaled(value, rounding):
+    """Decimal 값을 0.001 단위 정수로 (rounding: ROUND_CEILING / ROUND_FLOOR)"""
+    return int((decimal.Decimal(str(value)) * SCALE).to_integral_value(rounding=rounding))
+
+
+def from_scaled(value):
+    """0.001 단위 정수 → Decimal (DB DecimalField 와 같은 소수점 3자리)"""
+    return decimal.Decimal(int(value)).scaleb(-3)
+
+
+def format_mrl(value, condition_code=''):
+    """MRL 표시 문자열 - 불필요한 소수점 0 제거 + 조건코드 (verify_pesticide_results 와 같은 형식)"""
+    if value == int(value):
+        formatted = str(int(value))
+    else:
+        formatted = f"{value:.3f}".rstrip('0').rstrip('.')
+    return f"{formatted}({condition_code})" if condition_code else formatted
+
+
+def judge(ceil_scaled, floor_scaled, limit_scaled, eco_friendly):
+    """
+    적합 여부 배열 (True = 적합)
+    - 검출량 <= 기준  ⇔ ceil(검출량 × 1000) <= 기준 × 1000   (기준이 정수이므로 정확)
+    - 검출량 <  0.01  ⇔ floor(검출량 × 1000) < 10
+    """
+    eco_threshold = int(ECO_FRIENDLY_THRESHOLD * SCALE)
+    return np.where(eco_friendly, floor_scaled < eco_threshold, ceil_scaled <= limit_scaled)
+
+
+class MRLMatrix:
+    """
+    PesticideLimit 의 밀집 행렬 표현
+    - pesticides / pesticides_kr / foods: id → 표준명 (pesticide_name_en, pesticide_name_kr, food_name)
+    - values: int64[농약, 식품] (0.001 단위), present: bool 마스크, conditions: int16 (condition_codes 인덱스, 없으면 -1)
+    - 같은 (농약, 식품) 이 여러 행이면 먼저 등록된 행 사용 (검증 로직의 .first() 와 동일)
+    """
+
+    def __init__(self, pesticides, pesticide_index, foods, food_index, values, present, conditions, condition_codes,
+                 pesticides_kr=None):
+        self.pesticides = pesticides
+        self.pesticides_kr = pesticides_kr or list(pesticides)
+        # 한글명 순서 (식품별 역조회 결과 정렬용)
+        self.kr_order = np.asarray(sorted(range(len(pesticides)), key=lambda i: self.pesticides_kr[i]), dtype=np.int64)
+        self.pesticide_index = pesticide_index
+        self.foods = foods
+        self.food_index = food_index
+        self.values = values
+        self.present = present
+        self.conditions = conditions
+        self.condition_codes = condition_codes
+
+    @classmethod
+    def build(cls, rows=None):
+        """rows: (pesticide_name_en, pesticide_name_kr, food_name, max_residue_limit, condition_code) 목록"""
+        if rows is None:
+            rows = PesticideLimit.objects.order_by('id').values_list(
+                'pesticide_name_en', 'pesticide_name_kr', 'food_name', 'max_residue_limit', 'condition_code_id'
+            )
+
+        pesticides, pesticides_kr, pesticide_index = [], [], {}
+        foods, food_index = [], {}
+        condition_codes, condition_index = [], {}
+        cells, seen = [], set()
+        for name_en, name_kr, food, limit, code in rows:
+            key = name_en.lower()
+            if key not in pesticide_index:
+                pesticide_index[key] = len(pesticides)
+                pesticides.append(name_en)
+                pesticides_kr.append(name_kr)
+            p = pesticide_index[key]
+            # 한글명으로도 찾을 수 있도록 (영문명과 겹치지 않는 경우만)
+            pesticide_index.setdefault(name_kr.lower(), p)
+
+            food_key = food.lower()
+            if food_key not in food_index:
+                food_index[food_key] = len(foods)
+                foods.append(food)
+            f = food_index[food_key]
+            if (p, f) in seen:
+                continue
+            seen.add((p, f))
+            if code and code not in condition_index:
+                condition_index[code] = len(condition_codes)
+                condition_codes.append(code)
+            cells.append((p, f, to_scaled(limit, decimal.ROUND_HALF_EVEN), condition_index[code] if code else NO_CONDITION))
+
+        shape = (len(pesticides), len(foods))
+        values = np.zeros(shape, dtype=np.int64)
+        present = np.zeros(shape, dtype=bool)
+        conditions = np.full(shape, NO_CONDITION, dtype=np.int16)
+        if cells:
+            p_ids, f_ids, scaled, codes = (np.asarray(column) for column in zip(*cells))
+            values[p_ids, f_ids] = scaled
+            conditions[p_ids, f_ids] = codes
+            present[p_ids, f_ids] = True
+
+        return cls(pesticides, pesticide_index, foods, food_index, values, present, conditions, condition_codes,
+                   pesticides_kr)
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes + self.present.nbytes + self.conditions.nbytes
+
+    def pesticide_id(self, name):
+        return self.pesticide_index.get((name or '').lower(), -1)
+
+    def food_id(self, name):
+        return self.food_index.get((name or '').lower(), -1)
+
+    def limit(self, pesticide, food):
+        """(MRL Decimal, 조건코드) 또는 기준이 없으면 None"""
+        p, f = self.pesticide_id(pesticide), self.food_id(food)
+        if p < 0 or f < 0 or not self.present[p, f]:
+            return None
+        code = self.conditions[p, f]
+        return (from_scaled(self.values[p, f]),
+                self.condition_codes[code] if code != NO_CONDITION else '')
+
+    def food_limits(self, food_names):
+        """
+        식품별 역조회 - 농약마다 food_names 중 처음으로 기준이 있는 식품의 값 사용
+        - food_names: [직접 품목, 소분류, 대분류] 처럼 우선순위 순서 (없는 이름/None 은 건너뜀)
+        - 반환: (농약 id 배열(한글명 순), 적용된 food_names 위치 배열, 값 배열, 조건코드 배열)
+        """
+        n = len(self.pesticides)
+        source = np.full(n, -1, dtype=np.int64)
+        values = np.zeros(n, dtype=np.int64)
+        conditions = np.full(n, NO_CONDITION, dtype=np.int16)
+        for position, name in enumerate(food_names):
+            f = self.food_id(name)
+            if f < 0:
+                continue
+            fill = (source < 0) & self.present[:, f]
+            source[fill] = position
+            values[fill] = self.values[fill, f]
+            conditions[fill] = self.conditions[fill, f]
+
+        order = self.kr_order[source[self.kr_order] >= 0]
+        return order, source[order], values[order], conditions[order]
+
+    def evaluate(self, detections, food, eco_friendly=False):
+        """
+        증명서 한 건 판정
+        - detections: [(농약명, 검출량), ...] 또는 [(농약명, 검출량, 대체 기준), ...]
+          (농약명은 영문/한글 표준명, 대소문자 무시 / 대체 기준은 DB 기준이 없을 때 PLS 대신 쓸 값, None 이면 PLS)
+        - 반환: Evaluation
+        """
+        return self.evaluate_batch([(detections, food, eco_friendly)])[0]
+
+    def evaluate_batch(self, certificates):
+        """
+        여러 증명서를 한 번에 판정 - 모든 검출 행을 이어붙여 배열 연산 1회로 처리
+        - certificates: [(detections, food, eco_friendly), ...]
+        - 반환: 증명서 순서대로 Evaluation 목록
+        """
+        names, p_ids, f_ids, eco, ceil_scaled, floor_scaled, detection_values, bounds = [], [], [], [], [], [], [], []
+        fallbacks = []
+        for detections, food, eco_friendly in certificates:
+            start = len(p_ids)
+            # [매핑된 품목, 소분류, 대분류] 식품 id (없으면 -1)
+            # (빈 행렬이면 분류 맵을 만들지 않음 - 작물체만 검증하는 경우)
+            f = ([self.food_id(name) for name in food_categories.verification_candidates(food)]
+                 if self.foods else [-1, -1, -1])
+            for name, value, *fallback in detections:
+                value = decimal.Decimal(str(value))
+                fallback = fallback[0] if fallback else None
+                fallbacks.append(-1 if fallback is None else to_scaled(fallback, decimal.ROUND_HALF_EVEN))
+                names.append(name)
+                detection_values.append(value)
+                p_ids.append(self.pesticide_id(name))
+                f_ids.append(f)
+                eco.append(bool(eco_friendly))
+                ceil_scaled.append(to_scaled(value, decimal.ROUND_CEILING))
+                floor_scaled.append(to_scaled(value, decimal.ROUND_FLOOR))
+            bounds.append((start, len(p_ids), food))
+
+        p_ids = np.asarray(p_ids, dtype=np.int64)
+        f_ids = np.asarray(f_ids, dtype=np.int64).reshape(len(p_ids), 3)
+        has_limit = np.zeros(len(p_ids), dtype=bool)
+        sources = np.full(len(p_ids), -1, dtype=np.int8)
+        fallbacks = np.asarray(fallbacks, dtype=np.int64)
+        uses_fallback = fallbacks >= 0
+        limits = np.where(uses_fallback, fallbacks, int(PLS_DEFAULT * SCALE))
+        conditions = np.full(len(p_ids), NO_CONDITION, dtype=np.int16)
+        if self.values.size:
+            # 직접 → 소분류 → 대분류 순으로 아직 기준을 찾지 못한 행만 채움
+            for level in range(3):
+                known = (p_ids >= 0) & (f_ids[:, level] >= 0) & ~has_limit
+                safe_p, safe_f = np.where(known, p_ids, 0), np.where(known, f_ids[:, level], 0)
+                hit = known & self.present[safe_p, safe_f]
+                limits[hit] = self.values[safe_p[hit], safe_f[hit]]
+                conditions[hit] = self.conditions[safe_p[hit], safe_f[hit]]
+                sources[hit] = level
+                has_limit |= hit
+        uses_fallback &= ~has_limit
+
+        compliant = judge(
+            np.asarray(ceil_scaled, dtype=np.int64), np.asarray(floor_scaled, dtype=np.int64),
+            limits, np.asarray(eco, dtype=bool),
+        )
+
+        return [
+            Evaluation(self, food, names[start:end], detection_values[start:end], p_ids[start:end],
+                       limits[start:end], has_limit[start:end], conditions[start:end], compliant[start:end],
+                       eco[start] if end > start else False, sources[start:end], uses_fallback[start:end])
+            for start, end, food in bounds
+        ]
+
+
+class Evaluation:
+    """evaluate() 결과 - 배열은 검출 행 순서와 같음"""
+
+    def __init__(self, matrix, food, names, detection_values, pesticide_ids, limits, has_limit, conditions,
+                 compliant, eco_friendly, sources=None, uses_fallback=None):
+        self.matrix = matrix
+        self.food = food
+        self.names = names
+        self.detection_values = detection_values
+        self.pesticide_ids = pesticide_ids
+        self.limits = limits
+        self.has_limit = has_limit
+        self.conditions = conditions
+        self.compliant = compliant
+        self.eco_friendly = eco_friendly
+        # 기준을 찾은 단계 (0: 직접, 1: 소분류, 2: 대분류, -1: 없음)
+        self.sources = sources if sources is not None else np.where(has_limit, 0, -1)
+        # DB 기준 없이 대체 기준(PDF 기록 MRL)으로 판정한 행
+        self.uses_fallback = uses_fallback if uses_fallback is not None else np.zeros(len(names), dtype=bool)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def all_compliant(self):
+        return bool(self.compliant.all())
+
+    def limit(self, i):
+        """i 번째 행의 판정 기준 (Decimal)"""
+        return from_scaled(self.limits[i])
+
+    def condition_code(self, i):
+        """i 번째 행 기준의 조건코드 (없으면 '')"""
+        code = self.conditions[i]
+        return self.matrix.condition_codes[code] if code != NO_CONDITION else ''
+
+    def rows(self):
+        """행별 결과 dict (verify_pesticide_results 결과와 같은 키 이름 사용)"""
+        rows = []
+        for i, name in enumerate(self.names):
+            p = int(self.pesticide_ids[i])
+            limit, code = self.limit(i), self.condition_code(i)
+            if self.has_limit[i]:
+                source, display = 'db', format_mrl(limit, code)
+            elif self.uses_fallback[i]:
+                source, display = 'pdf', format_mrl(limit)
+            else:
+                source, display = 'pls', 'PLS 0.01'
+            rows.append({
+                'pesticide_name': name,
+                'standard_pesticide_name': self.matrix.pesticides[p] if p >= 0 else None,
+                'detection_value': self.detection_values[i],
+                'db_korea_mrl': limit,
+                'db_korea_mrl_display': display,
+                'condition_code': code,
+                'mrl_source': source,
+                'matching_type': MATCHING_TYPES[self.sources[i]] if self.has_limit[i] else None,
+                'db_calculated_result': '적합' if self.compliant[i] else '부적합',
+                'is_eco_friendly': self.eco_friendly,
+            })
+        return rows
+
+
+def _active_release_id():
+    return MRLRelease.objects.filter(status=MRLRelease.STATUS_ACTIVE).values_list('id', flat=True).first()
+
+
+def _is_fresh(now):
+    """행렬을 그대로 써도 되는지 - TTL 이내이고, 확인 주기마다 활성 릴리스가 바뀌지 않았는지 조회"""
+    global _release_checked_at
+    if _matrix is None or now - _built_at >= getattr(settings, 'MRL_MATRIX_TTL', 300):
+        return False
+    if now - _release_checked_at < getattr(settings, 'MRL_RELEASE_CHECK_INTERVAL', 5):
+        return True
+    _release_checked_at = now
+    return _active_release_id() == _release_id
+
+
+def get_matrix():
+    """프로세스 공용 행렬 (없거나 MRL_MATRIX_TTL 이 지났거나 활성 릴리스가 바뀌면 다시 생성)"""
+    global _matrix, _built_at, _release_id, _release_checked_at
+    with _lock:
+        if _is_fresh(time.monotonic()):
+            metrics.record_cache('mrl_matrix', True)
+            return _matrix
+        metrics.record_cache('mrl_matrix', False)
+        start = time.perf_counter()
+        _release_id = _active_release_id()
+        _matrix = MRLMatrix.build()
+        _built_at = _release_checked_at = time.monotonic()
+        logger.info(
+            f"MRL 행렬 생성: 농약 {len(_matrix.pesticides)} × 식품 {len(_matrix.foods)}, "
+            f"{_matrix.nbytes:,} bytes, {time.perf_counter() - start:.3f}s"
+        )
+        return _matrix
+
+
+def invalidate():
+    """다음 get_matrix() 에서 다시 생성 (PesticideLimit 변경 시)"""
+    global _matrix
+    with _lock:
+        _matrix = None
+
+
+def evaluate(detections, food, eco_friendly=False):
+    return get_matrix().evaluate(detections, food, eco_friendly)
+
+
+def evaluate_batch(certificates):
+    return get_matrix().evaluate_batch(certificates)
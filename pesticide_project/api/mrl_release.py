@@ -0,0 +1,228 @@
+# path of this code : pesticide_project/api/mrl_release.py
+# 잔류허용기준 릴리스(버전) 관리 - 검색/검정 중단 없이 pesticide_limits 교체
+# - stage_release: 새 스펙을 mrl_release_limits 에 릴리스 id 로 적재 (pesticide_limits 는 그대로)
+# - validate_release: 행 수, 현재 데이터 대비 추가/변경/삭제 쌍 수 확인
+#   (삭제 비율이 MRL_RELEASE_MAX_REMOVED_RATIO 를 넘거나 비어 있으면 적용 거부)
+# - activate_release: 한 트랜잭션에서 pesticide_limits 를 비우고 릴리스 내용을 복사
+#   → 커밋 전까지 다른 연결은 이전 데이터 전체를, 커밋 후에는 새 데이터 전체를 봄 (중간 상태 없음)
+#   인덱스는 pesticide_limits 에 그대로 있어 같은 트랜잭션에서 함께 갱신됨
+# - 커밋 후 이 프로세스의 MRL 행렬을 바로 무효화, 다른 워커는 활성 릴리스 id 가 바뀐 것을
+#   MRL_RELEASE_CHECK_INTERVAL 초 안에 확인하고 다시 생성 (mrl_matrix.get_matrix)
+# - rollback_release: 직전 버전(retired)을 다시 적용 (릴리스 스냅샷은 삭제하지 않으므로 여러 단계 되돌리기 가능)
+# - 처음 릴리스를 적용할 때 기존 pesticide_limits 내용을 릴리스로 보관해 두어 첫 적용도 롤백 가능
+# - 릴리스를 하나라도 적재한 뒤에는 mrl_import.load_limits(import_mrl_spec --direct) 로 직접 교체할 수 없음
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import mrl_import
+from .models import MRLRelease, MRLReleaseLimit, PesticideLimit
+
+logger = logging.getLogger('api')
+
+RELEASE_LIMIT_FIELDS = ('release_id',) + mrl_import.LIMIT_FIELDS
+DIFF_FIELDS = ('change', 'pesticide_name_kr', 'pesticide_name_en', 'food_name', 'old_limit', 'new_limit',
+               'old_condition_code', 'new_condition_code')
+
+
+class MRLReleaseError(Exception):
+    pass
+
+
+def active_release():
+    return MRLRelease.objects.filter(status=MRLRelease.STATUS_ACTIVE).first()
+
+
+def active_release_id():
+    return MRLRelease.objects.filter(status=MRLRelease.STATUS_ACTIVE).values_list('id', flat=True).first()
+
+
+def live_limits():
+    """현재 pesticide_limits - {(농약명 한글, 식품명): (농약명 영어, 기준, 조건코드)}"""
+    return {
+        (kr, food): (en, limit, code)
+        for kr, food, en, limit, code in PesticideLimit.objects.values_list(
+            'pesticide_name_kr', 'food_name', 'pesticide_name_en', 'max_residue_limit', 'condition_code_id')
+    }
+
+
+def release_limits(release):
+    """릴리스 스냅샷 - live_limits() 와 같은 형식"""
+    return {
+        (kr, food): (en, limit, code)
+        for kr, food, en, limit, code in MRLReleaseLimit.objects.filter(release=release).values_list(
+            'pesticide_name_kr', 'food_name', 'pesticide_name_en', 'max_residue_limit', 'condition_code')
+    }
+
+
+def diff_limits(old, new):
+    """두 스냅샷 비교 - {'added': [키], 'changed': [키], 'removed': [키]} (키는 (농약명 한글, 식품명), 정렬됨)"""
+    return {
+        'added': sorted(new.keys() - old.keys()),
+        'changed': sorted(key for key in new.keys() & old.keys() if new[key] != old[key]),
+        'removed': sorted(old.keys() - new.keys()),
+    }
+
+
+def release_diff(old_release, new_release):
+    """
+    두 릴리스 사이의 (농약, 식품) 쌍 변경 목록 - None 이면 현재 pesticide_limits 와 비교
+    - [{'change': added/changed/removed, 'pesticide_name_kr', 'pesticide_name_en', 'food_name',
+        'old_limit', 'new_limit', 'old_condition_code', 'new_condition_code'}]  (change, 농약명, 식품명 순)
+    """
+    old = release_limits(old_release) if old_release is not None else live_limits()
+    new = release_limits(new_release) if new_release is not None else live_limits()
+    entries = []
+    for change, keys in diff_limits(old, new).items():
+        for key in keys:
+            old_en, old_limit, old_code = old.get(key, (None, None, None))
+            new_en, new_limit, new_code = new.get(key, (None, None, None))
+            entries.append({
+                'change': change,
+                'pesticide_name_kr': key[0],
+                'pesticide_name_en': new_en or old_en,
+                'food_name': key[1],
+                'old_limit': old_limit,
+                'new_limit': new_limit,
+                'old_condition_code': old_code,
+                'new_condition_code': new_code,
+            })
+    return entries
+
+
+def previous_release(release):
+    """release 직전에 사용하던 릴리스 (retired/rolled_back 중 적용 시각이 가장 늦은 것)"""
+    return (MRLRelease.objects
+            .filter(status__in=[MRLRelease.STATUS_RETIRED, MRLRelease.STATUS_ROLLED_BACK],
+                    activated_at__lt=release.activated_at)
+            .order_by('-activated_at', '-pk').first())
+
+
+def stage_release(df, label, source='', method='auto', chunk_size=mrl_import.DEFAULT_CHUNK_SIZE):
+    """검증된 스펙 DataFrame(mrl_import.read_mrl_csv)을 새 릴리스로 적재 - pesticide_limits 는 바꾸지 않음"""
+    if method == 'auto':
+        method = 'copy' if connection.vendor == 'postgresql' else 'bulk'
+    with transaction.atomic():
+        release = MRLRelease.objects.create(label=label, source=source, row_count=len(df))
+        if method == 'copy':
+            mrl_import.copy_rows(df.assign(release_id=release.pk), MRLReleaseLimit._meta.db_table,
+                                 RELEASE_LIMIT_FIELDS)
+        else:
+            for start in range(0, len(df), chunk_size):
+                MRLReleaseLimit.objects.bulk_create([
+                    MRLReleaseLimit(release=release, **row._asdict())
+                    for row in df.iloc[start:start + chunk_size].itertuples(index=False)
+                ], batch_size=chunk_size)
+    logger.info(f"잔류허용기준 릴리스 적재: #{release.pk} {label} ({len(df):,}행, {method})")
+    return release
+
+
+def snapshot_live(label):
+    """현재 pesticide_limits 내용을 retired 릴리스로 보관 (첫 적용 전 롤백 지점)"""
+    release = MRLRelease.objects.create(label=label, status=MRLRelease.STATUS_RETIRED, activated_at=timezone.now())
+    columns = ', '.join(mrl_import.LIMIT_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {MRLReleaseLimit._meta.db_table} (release_id, {columns}) "
+            f"SELECT %s, {columns} FROM {PesticideLimit._meta.db_table} ORDER BY id",
+            [release.pk],
+        )
+    release.row_count = MRLReleaseLimit.objects.filter(release=release).count()
+    release.save(update_fields=['row_count'])
+    return release
+
+
+def validate_release(release, max_removed_ratio=None):
+    """
+    현재 pesticide_limits 대비 변경 요약 - 적용하면 안 되는 릴리스면 MRLReleaseError
+    - 반환: {'rows', 'live_rows', 'added', 'changed', 'removed'} (개수)
+    """
+    if max_removed_ratio is None:
+        max_removed_ratio = getattr(settings, 'MRL_RELEASE_MAX_REMOVED_RATIO', 0.1)
+    live = live_limits()
+    diff = diff_limits(live, release_limits(release))
+    summary = {'rows': release.row_count, 'live_rows': len(live)}
+    summary.update({kind: len(keys) for kind, keys in diff.items()})
+
+    if release.row_count == 0:
+        raise MRLReleaseError(f"릴리스 #{release.pk} 에 잔류허용기준이 없습니다")
+    if live and summary['removed'] > len(live) * max_removed_ratio:
+        raise MRLReleaseError(
+            f"릴리스 #{release.pk} 적용 시 현재 기준 {summary['removed']:,}건이 삭제됩니다 "
+            f"(현재 {len(live):,}건의 {max_removed_ratio:.0%} 초과) - 확인 후 --force 로 적용"
+        )
+    return summary
+
+
+def _after_swap():
+    from . import mrl_matrix  # numpy 를 이 기능을 쓸 때만 불러옴
+
+    mrl_matrix.invalidate()
+    if connection.vendor == 'postgresql':
+        # 전체 교체 후 통계를 바로 갱신해 실행 계획이 이전 분포를 쓰지 않도록
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {PesticideLimit._meta.db_table}")
+
+
+def activate_release(release, force=False):
+    """
+    릴리스를 pesticide_limits 에 적용 (한 트랜잭션) - 변경 요약 반환
+    - 이전 활성 릴리스는 retired (rollback_release 대상)
+    - force: 삭제 비율 검사 생략 (빈 릴리스는 항상 거부)
+    """
+    start = time.perf_counter()
+    with transaction.atomic():
+        release = MRLRelease.objects.select_for_update().get(pk=release.pk)
+        if release.status == MRLRelease.STATUS_ACTIVE:
+            raise MRLReleaseError(f"릴리스 #{release.pk} 는 이미 사용 중입니다")
+        summary = validate_release(release, max_removed_ratio=float('inf') if force else None)
+
+        previous = active_release()
+        if previous is None and PesticideLimit.objects.exists():
+            snapshot_live(f"릴리스 적용 전 데이터 ({timezone.localtime():%Y-%m-%d %H:%M})")
+
+        codes = MRLReleaseLimit.objects.filter(release=release, condition_code__isnull=False)
+        mrl_import.upsert_condition_codes(codes.values_list('condition_code', flat=True).distinct())
+
+        table = PesticideLimit._meta.db_table
+        columns = ', '.join(mrl_import.LIMIT_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}, created_at) "
+                f"SELECT {columns}, %s FROM {MRLReleaseLimit._meta.db_table} WHERE release_id = %s ORDER BY id",
+                [connection.ops.adapt_datetimefield_value(timezone.now()), release.pk],
+            )
+
+        if previous is not None:
+            previous.status = MRLRelease.STATUS_RETIRED
+            previous.save(update_fields=['status'])
+        release.status = MRLRelease.STATUS_ACTIVE
+        release.activated_at = timezone.now()
+        release.summary = summary
+        release.save(update_fields=['status', 'activated_at', 'summary'])
+        transaction.on_commit(_after_swap)
+
+    logger.info(
+        f"잔류허용기준 릴리스 적용: #{release.pk} {release.label} - 추가 {summary['added']:,}, "
+        f"변경 {summary['changed']:,}, 삭제 {summary['removed']:,} ({time.perf_counter() - start:.2f}s)"
+    )
+    return summary
+
+
+def rollback_release():
+    """현재 릴리스를 rolled_back 으로 바꾸고 직전 버전을 다시 적용 - 다시 적용한 릴리스 반환"""
+    with transaction.atomic():
+        current = active_release()
+        previous = (MRLRelease.objects.filter(status=MRLRelease.STATUS_RETIRED)
+                    .order_by('-activated_at', '-pk').first())
+        if previous is None:
+            raise MRLReleaseError('되돌릴 이전 릴리스가 없습니다')
+        activate_release(previous, force=True)
+        if current is not None:
+            MRLRelease.objects.filter(pk=current.pk).update(status=MRLRelease.STATUS_ROLLED_BACK)
+    return previous
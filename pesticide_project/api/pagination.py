@@ -0,0 +1,79 @@
+# path of this code : pesticide_project/api/pagination.py
+# 결과가 많은 조회(getAllFoods 등)의 페이지 / 스트리밍 응답
+# - 커서 페이지: ?page_size=100 또는 ?cursor=... 를 주면 {next, previous, results} 형식
+# - 스트리밍: ?stream=ndjson (행마다 JSON 한 줄) / ?stream=json (JSON 배열을 나눠서 전송)
+#   .iterator() 로 CHUNK_SIZE 행씩 읽어 바로 내보내므로 메모리 사용량이 결과 크기와 무관
+# - 파라미터가 없으면 기존과 같이 전체 배열 응답 (기존 클라이언트 호환)
+
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'json': 'application/json; charset=utf-8',
+}
+CHUNK_SIZE = 500
+
+
+class PesticideLimitCursorPagination(CursorPagination):
+    """식품명 순 커서 페이지 (같은 식품명은 id 순)"""
+    ordering = ('food_name', 'id')
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+def wants_pagination(request):
+    return 'cursor' in request.query_params or 'page_size' in request.query_params
+
+
+def get_stream_format(request):
+    stream = request.query_params.get('stream', '').lower()
+    return stream if stream in STREAM_FORMATS else None
+
+
+def _encode(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+
+
+def _iter_chunks(queryset, serialize):
+    """CHUNK_SIZE 행씩 serialize(rows) 결과(dict 목록)를 내보냄"""
+    rows = []
+    for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+        rows.append(row)
+        if len(rows) >= CHUNK_SIZE:
+            yield serialize(rows)
+            rows = []
+    if rows:
+        yield serialize(rows)
+
+
+def _ndjson(queryset, serialize):
+    for items in _iter_chunks(queryset, serialize):
+        yield ''.join(_encode(item) + '\n' for item in items).encode('utf-8')
+
+
+def _json_array(queryset, serialize):
+    yield b'['
+    first = True
+    for items in _iter_chunks(queryset, serialize):
+        if not items:
+            continue
+        body = ','.join(_encode(item) for item in items)
+        yield (body if first else ',' + body).encode('utf-8')
+        first = False
+    yield b']'
+
+
+def stream_queryset(queryset, serialize, fmt):
+    """
+    queryset 을 스트리밍 응답으로
+    - serialize: 모델 객체 목록 → dict 목록 (예: lambda rows: serializer_class(rows, many=True).data)
+    """
+    generator = _ndjson(queryset, serialize) if fmt == 'ndjson' else _json_array(queryset, serialize)
+    response = StreamingHttpResponse(generator, content_type=STREAM_FORMATS[fmt])
+    response['X-Accel-Buffering'] = 'no'  # nginx 가 전체 응답을 모았다가 보내지 않도록
+    return response
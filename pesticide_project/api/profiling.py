@@ -0,0 +1,218 @@
+# path of this code : pesticide_project/api/profiling.py
+# 요청 단위 프로파일링 (운영 환경의 실제 입력으로 느린 요청 분석용)
+# - 관리자(is_staff) 요청에 헤더 'X-Profile: 1' 또는 쿼리 '?_profile=1' 이 있으면 해당 요청만 프로파일링
+#   · 1 / cprofile : cProfile 결과를 .prof 로 저장 (snakeviz, flameprof, pstats 로 확인)
+#   · sample       : 스택 샘플링 결과를 .folded 로 저장 (flamegraph.pl, speedscope 로 확인)
+# - 결과 파일은 MEDIA_ROOT/profiles 에 저장되고 응답 헤더 X-Profile-Url 로 다운로드 경로 안내
+# - 관리자가 아니면 플래그를 무시하고 평소처럼 처리
+
+import cProfile
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, JsonResponse
+
+logger = logging.getLogger('api')
+
+_FILENAME_RE = re.compile(r'^[\w.-]+\.(prof|folded)$')
+
+# cProfile 은 프로세스당 하나만 활성화할 수 있으므로 동시에 한 요청만 프로파일링
+_profile_lock = threading.Lock()
+
+
+def get_profile_dir():
+    return getattr(settings, 'PROFILE_DIR', None) or os.path.join(settings.MEDIA_ROOT or '', 'profiles')
+
+
+def get_profile_mode(request):
+    """요청에서 프로파일링 모드 추출 (요청하지 않았으면 None)"""
+    value = request.META.get('HTTP_X_PROFILE') or request.GET.get('_profile')
+    if not value:
+        return None
+    value = value.strip().lower()
+    if value in ('1', 'true', 'cprofile'):
+        return 'cprofile'
+    if value == 'sample':
+        return 'sample'
+    return None
+
+
+def is_staff_request(request):
+    """
+    세션 로그인 또는 Authorization: Token <key> 로 인증된 관리자인지 확인
+    - DRF 뷰가 아닌 일반 Django 뷰(upload_certificate 등)에서도 토큰 인증을 확인하기 위함
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+
+    auth = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(auth) != 2 or auth[0].lower() != 'token':
+        return False
+    from rest_framework.authtoken.models import Token
+    token = Token.objects.select_related('user').filter(key=auth[1]).first()
+    return bool(token and token.user.is_active and token.user.is_staff)
+
+
+class StackSampler:
+    """
+    대상 스레드의 호출 스택을 일정 간격으로 수집하는 샘플링 프로파일러
+    - 결과는 flamegraph 용 folded 형식 ('a;b;c 개수' 한 줄씩)
+    - cProfile 과 달리 함수 호출마다 비용이 들지 않아 실제 소요 시간 분포에 가까움
+    - GIL 전환 간격(기본 5ms) 때문에 CPU 를 계속 쓰는 구간은 설정값보다 드물게 수집됨
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.samples = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _cleanup_old_profiles(directory):
+    """PROFILE_MAX_FILES 개를 넘으면 오래된 파일부터 삭제"""
+    max_files = getattr(settings, 'PROFILE_MAX_FILES', 50)
+    entries = sorted(
+        (entry for entry in os.scandir(directory) if _FILENAME_RE.match(entry.name)),
+        key=lambda entry: entry.stat().st_mtime,
+    )
+    for entry in entries[:max(len(entries) - max_files, 0)]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def _find_request(args):
+    # 함수 뷰는 (request, ...), ViewSet 메서드는 (self, request, ...)
+    for arg in args[:2]:
+        if hasattr(arg, 'META'):
+            return arg
+    return None
+
+
+def profile_view(name=None):
+    """
+    뷰 함수 / ViewSet 액션용 프로파일링 데코레이터
+    - 프로파일링 대상이 아닌 요청은 플래그 확인 외에 추가 비용 없음
+    """
+    def decorator(view):
+        profile_name = name or view.__name__
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            mode = get_profile_mode(request) if request is not None else None
+            if mode is None or not is_staff_request(request):
+                return view(*args, **kwargs)
+
+            if not _profile_lock.acquire(blocking=False):
+                logger.info(f"다른 요청을 프로파일링 중이므로 건너뜀: {profile_name}")
+                return view(*args, **kwargs)
+            try:
+                return _run_profiled(view, args, kwargs, profile_name, mode)
+            finally:
+                _profile_lock.release()
+        return wrapper
+    return decorator
+
+
+def _run_profiled(view, args, kwargs, profile_name, mode):
+    start = time.perf_counter()
+    if mode == 'sample':
+        sampler = StackSampler(getattr(settings, 'PROFILE_SAMPLE_INTERVAL', 0.001))
+        sampler.start()
+        try:
+            response = view(*args, **kwargs)
+        finally:
+            sampler.stop()
+    else:
+        profiler = cProfile.Profile()
+        response = profiler.runcall(view, *args, **kwargs)
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    directory = get_profile_dir()
+    filename = f"{profile_name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    filename += '.folded' if mode == 'sample' else '.prof'
+    try:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, filename)
+        if mode == 'sample':
+            sampler.dump(path)
+        else:
+            profiler.dump_stats(path)
+        _cleanup_old_profiles(directory)
+    except OSError as e:
+        logger.warning(f"프로파일 저장 실패: {e}")
+        return response
+
+    logger.info(f"프로파일 저장: {filename} ({duration_ms:.1f}ms)")
+    response['X-Profile-Id'] = filename
+    response['X-Profile-Url'] = f"/api/profiles/{filename}"
+    return response
+
+
+def profile_list(request):
+    """저장된 프로파일 목록 (관리자 전용, 최신순 / 권한이 없으면 존재 자체를 숨기기 위해 404)"""
+    if not is_staff_request(request):
+        return HttpResponse(status=404)
+    directory = get_profile_dir()
+    if not os.path.isdir(directory):
+        return JsonResponse({'profiles': []})
+
+    entries = sorted(
+        (entry for entry in os.scandir(directory) if _FILENAME_RE.match(entry.name)),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    return JsonResponse({'profiles': [
+        {
+            'name': entry.name,
+            'size': entry.stat().st_size,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(entry.stat().st_mtime)),
+            'url': f"/api/profiles/{entry.name}",
+        }
+        for entry in entries
+    ]})
+
+
+def profile_download(request, name):
+    """프로파일 파일 다운로드 (관리자 전용)"""
+    if not is_staff_request(request) or not _FILENAME_RE.match(name):
+        return HttpResponse(status=404)
+    path = os.path.join(get_profile_dir(), name)
+    if not os.path.isfile(path):
+        return HttpResponse(status=404)
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=name)
@@ -0,0 +1,342 @@
+# path of this code : pesticide_project/api/search_log_retention.py
+# search_logs 테이블 보관주기 관리 (오래된 로그를 월별 압축 파일로 보관 후 삭제)
+# 실행은 management command 로: python manage.py archive_search_logs --days 180
+# - 보관 파일: <보관 경로>/search_logs-YYYY-MM/part-<배치 첫 id>-<배치 마지막 id>.jsonl.gz (또는 .parquet)
+#   배치마다 월별 part 파일을 새로 씀 (기존 파일을 다시 읽거나 고쳐 쓰지 않음)
+#   읽을 때는 월 디렉토리의 part 파일 전체 (예: pandas.read_parquet('search_logs-2025-01'))
+# - 파일 기록 후 행 삭제 전에 중단되면 다음 실행이 같은 배치(.search_logs-pending.json)를 같은 part 이름으로
+#   다시 기록한 뒤 삭제하므로 보관 파일에 중복 행이 생기지 않음
+
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import SearchLog
+
+logger = logging.getLogger('api')
+
+TABLE = SearchLog._meta.db_table
+
+# 보관 파일에 기록할 컬럼 (모델 필드 순서와 동일)
+ARCHIVE_FIELDS = [
+    'id', 'search_term', 'pesticide_term', 'food_term',
+    'timestamp', 'ip_address', 'user_agent', 'results_count',
+]
+
+ARCHIVE_FORMATS = ('jsonl', 'parquet')
+
+
+def get_archive_dir():
+    """보관 파일 저장 경로 (settings.SEARCH_LOG_ARCHIVE_DIR 우선)"""
+    archive_dir = getattr(settings, 'SEARCH_LOG_ARCHIVE_DIR', None)
+    if not archive_dir:
+        archive_dir = os.path.join(settings.BASE_DIR, 'backups', 'search_logs')
+    return str(archive_dir)
+
+
+def get_cutoff(days):
+    """보관 기준 시각 - 이 시각 이전의 로그가 보관 대상"""
+    return timezone.now() - timedelta(days=days)
+
+
+def month_key(timestamp):
+    """로그 시각을 서버 시간대(Asia/Seoul) 기준 (년, 월)로 변환"""
+    local = timezone.localtime(timestamp)
+    return local.year, local.month
+
+
+def month_bounds(year, month):
+    """해당 월의 [시작, 다음달 시작) 구간 (aware datetime)"""
+    tz = timezone.get_default_timezone()
+    start = timezone.make_aware(datetime(year, month, 1), tz)
+    if month == 12:
+        end = timezone.make_aware(datetime(year + 1, 1, 1), tz)
+    else:
+        end = timezone.make_aware(datetime(year, month + 1, 1), tz)
+    return start, end
+
+
+def month_dir(archive_dir, year, month):
+    return os.path.join(archive_dir, f"{TABLE}-{year:04d}-{month:02d}")
+
+
+def archive_path(archive_dir, year, month, fmt, first_id, last_id):
+    """배치 하나의 월별 part 파일 경로 (같은 배치는 항상 같은 경로)"""
+    extension = 'jsonl.gz' if fmt == 'jsonl' else 'parquet'
+    return os.path.join(month_dir(archive_dir, year, month), f"part-{first_id:012d}-{last_id:012d}.{extension}")
+
+
+def pending_path(archive_dir):
+    return os.path.join(archive_dir, f".{TABLE}-pending.json")
+
+
+def _serialize_row(row):
+    row = dict(row)
+    row['timestamp'] = row['timestamp'].isoformat()
+    return row
+
+
+def _write_jsonl(path, rows):
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(_serialize_row(row), ensure_ascii=False))
+            f.write('\n')
+
+
+def _write_parquet(path, rows):
+    import pandas as pd  # 보관 작업에서만 필요하므로 지연 import
+
+    frame = pd.DataFrame([_serialize_row(row) for row in rows], columns=ARCHIVE_FIELDS)
+    frame.to_parquet(path, index=False, compression='gzip')
+
+
+def _write_atomic(write, path, rows):
+    # 임시 파일에 쓴 뒤 rename - 중단되어도 반쯤 쓰인 part 파일이 남지 않음
+    tmp_path = path + '.tmp'
+    try:
+        write(tmp_path, rows)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_archive_rows(archive_dir, rows, fmt='jsonl'):
+    """
+    로그 행들(한 배치, id 순)을 월별 part 파일로 기록
+    - 반환값: {(년, 월): 기록한 행 수}
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"지원하지 않는 보관 형식: {fmt}")
+
+    by_month = {}
+    for row in rows:
+        by_month.setdefault(month_key(row['timestamp']), []).append(row)
+
+    first_id, last_id = rows[0]['id'], rows[-1]['id']
+    write = _write_jsonl if fmt == 'jsonl' else _write_parquet
+    for (year, month), month_rows in sorted(by_month.items()):
+        os.makedirs(month_dir(archive_dir, year, month), exist_ok=True)
+        _write_atomic(write, archive_path(archive_dir, year, month, fmt, first_id, last_id), month_rows)
+
+    return {key: len(value) for key, value in by_month.items()}
+
+
+def _archive_batch(archive_dir, rows, fmt, stats):
+    """
+    배치 하나를 기록하고 같은 id 를 삭제
+    - 기록 전에 배치 id 를 pending 파일에 남기고 삭제가 커밋된 뒤 지움 (중단 시 resume_pending 이 이어서 처리)
+    """
+    ids = [row['id'] for row in rows]
+    path = pending_path(archive_dir)
+    with open(path + '.tmp', 'w') as f:
+        json.dump({'format': fmt, 'ids': ids}, f)
+    os.replace(path + '.tmp', path)
+
+    written = write_archive_rows(archive_dir, rows, fmt)
+    for key, count in written.items():
+        stats['months'][key] = stats['months'].get(key, 0) + count
+
+    with transaction.atomic():
+        deleted, _ = SearchLog.objects.filter(id__in=ids).delete()
+    os.remove(path)
+    stats['archived'] += len(rows)
+    stats['deleted'] += deleted
+
+
+def resume_pending(archive_dir, stats):
+    """
+    이전 실행이 파일 기록 후 삭제 전에 중단된 배치를 마저 처리
+    - 남은 행을 같은 part 경로에 다시 기록(덮어쓰기)하므로 보관 파일에 중복이 생기지 않음
+    - 이미 삭제까지 끝난 배치면 pending 파일만 정리
+    """
+    path = pending_path(archive_dir)
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        pending = json.load(f)
+    rows = list(SearchLog.objects.filter(id__in=pending['ids']).order_by('id').values(*ARCHIVE_FIELDS))
+    if rows:
+        logger.warning(f"중단된 검색 로그 보관 배치 재처리: {len(rows)}건")
+        _archive_batch(archive_dir, rows, pending['format'], stats)
+    else:
+        os.remove(path)
+
+
+def archive_search_logs(days, fmt='jsonl', batch_size=5000, archive_dir=None, dry_run=False):
+    """
+    보관주기가 지난 검색 로그를 월별 압축 파일로 옮기고 배치 단위로 삭제
+    - 배치마다 파일 기록 → 같은 배치의 id 삭제 순서로 진행 (중단되어도 유실/중복 없음)
+    - 파티션 테이블이면 통째로 기한이 지난 월 파티션은 DETACH/DROP 으로 정리
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"지원하지 않는 보관 형식: {fmt}")
+    archive_dir = archive_dir or get_archive_dir()
+    cutoff = get_cutoff(days)
+    stats = {'cutoff': cutoff, 'archived': 0, 'deleted': 0, 'months': {}, 'dropped_partitions': []}
+
+    queryset = SearchLog.objects.filter(timestamp__lt=cutoff).order_by('id')
+    if dry_run:
+        stats['archived'] = queryset.count()
+        return stats
+
+    os.makedirs(archive_dir, exist_ok=True)
+    resume_pending(archive_dir, stats)
+
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).values(*ARCHIVE_FIELDS)[:batch_size])
+        if not rows:
+            break
+        _archive_batch(archive_dir, rows, fmt, stats)
+        last_id = rows[-1]['id']
+        logger.info(f"검색 로그 보관: {len(rows)}건 (누적 {stats['archived']}건)")
+
+    if is_partitioned():
+        stats['dropped_partitions'] = drop_expired_partitions(cutoff)
+
+    return stats
+
+
+# ==================== PostgreSQL 월별 파티셔닝 ====================
+
+def is_partitioned():
+    """search_logs 가 PostgreSQL 범위 파티션 테이블인지 확인"""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [TABLE]
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_name(year, month):
+    return f"{TABLE}_{year:04d}{month:02d}"
+
+
+def _iter_months(start, end):
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _add_months(year, month, count):
+    index = year * 12 + (month - 1) + count
+    return index // 12, index % 12 + 1
+
+
+def _create_month_partition(cursor, year, month):
+    start, end = month_bounds(year, month)
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(year, month)}" '
+        f'PARTITION OF "{TABLE}" FOR VALUES FROM (%s) TO (%s)',
+        [start, end]
+    )
+
+
+def ensure_monthly_partitions(months_ahead=3):
+    """현재 월부터 months_ahead 개월 뒤까지 월 파티션을 미리 생성"""
+    if not is_partitioned():
+        return []
+    current = month_key(timezone.now())
+    months = list(_iter_months(current, _add_months(current[0], current[1], months_ahead)))
+    with connection.cursor() as cursor:
+        for year, month in months:
+            _create_month_partition(cursor, year, month)
+    return [partition_name(year, month) for year, month in months]
+
+
+def drop_expired_partitions(cutoff):
+    """
+    보관 기준보다 완전히 과거인 월 파티션 제거
+    - 행 삭제 대신 DETACH + DROP 으로 처리 (VACUUM 부담 없음)
+    - 데이터가 남아있는 파티션은 건드리지 않음 (보관이 끝난 파티션만 대상)
+    """
+    dropped = []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s ORDER BY c.relname",
+            [TABLE]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+        prefix = f"{TABLE}_"
+        for name in names:
+            suffix = name[len(prefix):]
+            if not suffix.isdigit() or len(suffix) != 6:
+                continue  # default 파티션 등은 제외
+            year, month = int(suffix[:4]), int(suffix[4:])
+            _, end = month_bounds(year, month)
+            if end > cutoff:
+                continue
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM "{name}")')
+            if cursor.fetchone()[0]:
+                continue
+            cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+            cursor.execute(f'DROP TABLE "{name}"')
+            dropped.append(name)
+            logger.info(f"만료된 검색 로그 파티션 제거: {name}")
+    return dropped
+
+
+def convert_to_partitioned(months_ahead=3):
+    """
+    기존 search_logs 테이블을 timestamp 기준 월별 범위 파티션 테이블로 전환 (PostgreSQL 전용, 1회성)
+    - 전체 과정을 하나의 트랜잭션에서 수행하므로 실패 시 원래 테이블이 그대로 유지됨
+    - 파티션 키가 PK 에 포함되어야 하므로 PK 는 (id, timestamp) 로 변경됨
+    - id 시퀀스는 새 테이블로 소유권을 옮겨 그대로 사용
+    """
+    if connection.vendor != 'postgresql':
+        raise RuntimeError('파티셔닝은 PostgreSQL 에서만 지원됩니다.')
+    if is_partitioned():
+        return False
+
+    legacy = f"{TABLE}_legacy"
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+            sequence = cursor.fetchone()[0]
+
+            cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{legacy}"')
+            cursor.execute(
+                f'CREATE TABLE "{TABLE}" (LIKE "{legacy}" INCLUDING DEFAULTS) '
+                f'PARTITION BY RANGE ("timestamp")'
+            )
+            cursor.execute(
+                f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_part_pkey" PRIMARY KEY ("id", "timestamp")'
+            )
+
+            cursor.execute(f'SELECT MIN("timestamp") FROM "{legacy}"')
+            oldest = cursor.fetchone()[0] or timezone.now()
+            current = month_key(timezone.now())
+            last = _add_months(current[0], current[1], months_ahead)
+            for year, month in _iter_months(month_key(oldest), last):
+                _create_month_partition(cursor, year, month)
+            cursor.execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+            cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{legacy}"')
+            if sequence:
+                cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY "{TABLE}"."id"')
+            cursor.execute(f'DROP TABLE "{legacy}"')
+
+        # 기존 테이블이 제거되어 인덱스 이름이 비었으므로 모델 정의대로 다시 생성
+        with connection.schema_editor(atomic=False) as editor:
+            for index in SearchLog._meta.indexes:
+                editor.add_index(SearchLog, index)
+
+    logger.info(f"{TABLE} 테이블을 월별 파티션 테이블로 전환 완료")
+    return True
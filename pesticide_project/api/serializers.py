@@ -29,6 +29,65 @@ class PesticideLimitSerializer(serializers.ModelSerializer):
         return self.context.get('original_food_name', None)
 
 
+# 조회 전용 빠른 경로 - PesticideLimitSerializer 와 같은 JSON 을 .values() 결과(dict)에서 직접 생성
+# (필드마다 DRF Field 를 거치는 비용이 수백 행 응답에서 대부분을 차지함)
+PESTICIDE_LIMIT_VALUES = (
+    'id', 'pesticide_name_kr', 'pesticide_name_en', 'food_name', 'max_residue_limit',
+    'condition_code', 'condition_code__description',
+)
+_max_residue_limit_field = serializers.DecimalField(max_digits=10, decimal_places=3)
+
+
+def pesticide_limit_values(queryset):
+    """PesticideLimit queryset → serialize_pesticide_limits 용 .values() (limit_condition_codes 는 LEFT JOIN)"""
+    return queryset.values(*PESTICIDE_LIMIT_VALUES)
+
+
+def serialize_pesticide_limits(rows, matching_type=None, original_food_name=None):
+    """
+    pesticide_limit_values() 행 목록을 PesticideLimitSerializer(many=True).data 와 같은 dict 목록으로
+    - 조건코드가 없으면 condition_code_description / condition_code_symbol 키 자체가 없음 (ModelSerializer 와 동일)
+    - matching_type / original_food_name 은 소/대분류로 대체 매칭된 경우에만 포함
+    """
+    to_decimal = _max_residue_limit_field.to_representation
+    data = []
+    for row in rows:
+        item = {
+            'id': row['id'],
+            'pesticide_name_kr': row['pesticide_name_kr'],
+            'pesticide_name_en': row['pesticide_name_en'],
+            'food_name': row['food_name'],
+            'max_residue_limit': to_decimal(row['max_residue_limit']),
+            'condition_code': row['condition_code'],
+        }
+        if row['condition_code'] is not None:
+            description = row['condition_code__description']
+            item['condition_code_description'] = None if description is None else str(description)
+            item['condition_code_symbol'] = row['condition_code']
+        if matching_type is not None:
+            item['matching_type'] = matching_type
+        if original_food_name is not None:
+            item['original_food_name'] = original_food_name
+        data.append(item)
+    return data
+
+
+# 일괄 조회 요청 시리얼라이저 (POST /api/pesticides/bulk_lookup/)
+class BulkLookupPairSerializer(serializers.Serializer):
+    pesticide = serializers.CharField(max_length=100, trim_whitespace=True)
+    food = serializers.CharField(max_length=100, trim_whitespace=True)
+
+
+class BulkLookupSerializer(serializers.Serializer):
+    pairs = BulkLookupPairSerializer(many=True, allow_empty=False)
+
+    def validate_pairs(self, value):
+        max_pairs = self.context.get('max_pairs')
+        if max_pairs and len(value) > max_pairs:
+            raise serializers.ValidationError(f"한 번에 최대 {max_pairs}개까지 조회할 수 있습니다.")
+        return value
+
+
 # 회원가입 시리얼라이저
 class UserSignupSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
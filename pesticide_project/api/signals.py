@@ -1,57 +1,138 @@
 # api/signals.py
 
-from django.db.models.signals import post_save
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import SearchLog
+from .models import SearchLog, PesticideLimit, FoodCategory
 import logging
 
 logger = logging.getLogger(__name__)
 
+SEARCH_LOG_ADMIN_URL = 'https://findpest.kr/api/admin/api/searchlog/'
+
+
+def is_external(log):
+    """로컬(127.0.0.1)이 아닌 IP 에서 온 검색인지"""
+    return bool(log.ip_address) and log.ip_address != '127.0.0.1'
+
+
+def send_search_notification(subject, headline, search_info, log, links=()):
+    """
+    외부 사용자 검색 알림 메일 전송 (단건 검색 / 일괄 조회 공용)
+    - search_info: '=== 검색 정보 ===' 구역 내용, log: 사용자 정보(IP, User Agent)를 가져올 검색 로그
+    - 받는 사람은 SEARCH_NOTIFY_RECIPIENTS (비어 있으면 보내지 않음)
+    """
+    recipients = getattr(settings, 'SEARCH_NOTIFY_RECIPIENTS', [])
+    if not recipients:
+        return
+    link_lines = '\n'.join([f"관리자 페이지: {SEARCH_LOG_ADMIN_URL}", *links])
+    message = f"""
+{headline}
+
+{search_info}
+
+=== 사용자 정보 ===
+IP 주소: {log.ip_address}
+User Agent: {log.user_agent or 'N/A'}
+
+=== 링크 ===
+{link_lines}
+
+---
+FindPest 모니터링 시스템
+    """.strip()
+
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=recipients,
+        fail_silently=False,
+    )
+
+
 @receiver(post_save, sender=SearchLog)
 def notify_external_search(sender, instance, created, **kwargs):
     """
     외부 사용자(127.0.0.1이 아닌 IP)가 검색할 때 이메일 알림 전송
     """
-    if created and instance.ip_address and instance.ip_address != '127.0.0.1':
+    if created and is_external(instance):
         try:
-            # 이메일 제목
-            subject = f'[FindPest] 외부 사용자 검색 알림 - {instance.search_term}'
-            
-            # 이메일 내용
-            message = f"""
-외부 사용자가 FindPest에서 검색을 수행했습니다.
-
+            search_info = f"""
 === 검색 정보 ===
 검색어: {instance.search_term}
 농약명: {instance.pesticide_term or 'N/A'}
 식품명: {instance.food_term or 'N/A'}
 결과 수: {instance.results_count}개
 검색 시간: {instance.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-
-=== 사용자 정보 ===
-IP 주소: {instance.ip_address}
-User Agent: {instance.user_agent or 'N/A'}
-
-=== 링크 ===
-관리자 페이지: https://findpest.kr/api/admin/api/searchlog/
-검색 로그 상세: https://findpest.kr/api/admin/api/searchlog/{instance.id}/change/
-
----
-FindPest 모니터링 시스템
             """.strip()
-            
-            # 이메일 전송
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=['kingleo.kim@gmail.com'],
-                fail_silently=False,
+
+            send_search_notification(
+                subject=f'[FindPest] 외부 사용자 검색 알림 - {instance.search_term}',
+                headline='외부 사용자가 FindPest에서 검색을 수행했습니다.',
+                search_info=search_info,
+                log=instance,
+                links=[f"검색 로그 상세: {SEARCH_LOG_ADMIN_URL}{instance.id}/change/"],
             )
-            
+
             logger.info(f"External search notification sent for IP: {instance.ip_address}, Search: {instance.search_term}")
-            
+
         except Exception as e:
-            logger.error(f"Failed to send external search notification: {str(e)}")
\ No newline at end of file
+            logger.error(f"Failed to send external search notification: {str(e)}")
+
+def notify_external_bulk_search(search_logs):
+    """
+    일괄 조회(bulk_create 로 저장되어 post_save 가 없음)의 외부 사용자 알림
+    - 검색 건마다가 아니라 요청당 1통으로 묶어서 전송
+    """
+    external = [log for log in search_logs if is_external(log)]
+    if not external:
+        return
+    first = external[0]
+    try:
+        lines = '\n'.join(
+            f"- 농약명: {log.pesticide_term or 'N/A'}, 식품명: {log.food_term or 'N/A'}, 결과 수: {log.results_count}개"
+            for log in external
+        )
+        send_search_notification(
+            subject=f'[FindPest] 외부 사용자 일괄 조회 알림 - {len(external)}건',
+            headline='외부 사용자가 FindPest에서 일괄 조회를 수행했습니다.',
+            search_info=f"=== 검색 정보 ({len(external)}건) ===\n{lines}",
+            log=first,
+        )
+
+        logger.info(f"External bulk search notification sent for IP: {first.ip_address}, Searches: {len(external)}")
+
+    except Exception as e:
+        logger.error(f"Failed to send external bulk search notification: {str(e)}")
+
+
+@receiver(post_save, sender=PesticideLimit)
+@receiver(post_delete, sender=PesticideLimit)
+def invalidate_mrl_matrix(sender, **kwargs):
+    """
+    잔류허용기준이 바뀌면 MRL 행렬을 다시 만들도록 표시
+    - bulk_create / update() / 다른 프로세스의 변경은 신호가 없으므로 MRL_MATRIX_TTL 이 지나야 반영
+    """
+    from . import mrl_matrix  # numpy 를 서버 시작 시 불러오지 않도록 지연 import
+    mrl_matrix.invalidate()
+
+
+@receiver(post_save, sender=FoodCategory)
+@receiver(post_delete, sender=FoodCategory)
+def invalidate_food_categories(sender, **kwargs):
+    """
+    식품 분류가 바뀌면 분류 맵을 다시 만들도록 표시
+    - import_food_categories 는 적재 후 직접 무효화, 다른 프로세스의 변경은 FOOD_CATEGORY_TTL 이 지나야 반영
+    """
+    from . import food_categories
+    food_categories.invalidate()
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    """요청별 DB 쿼리 수/시간 집계용 execute_wrapper 설치 (MetricsMiddleware)"""
+    from . import metrics
+    metrics.install_query_counter(connection)
@@ -0,0 +1,109 @@
+# path of this code : pesticide_project/api/stage_timing.py
+# 단계별 처리 시간 측정 (검정증명서 파이프라인용)
+# - with stage('pdf_extract'): ...  또는  @timed('verify_pesticide_results')
+# - 측정값은 메트릭 레지스트리(certificate_stage_duration_seconds)에 항상 기록
+# - collect_stages() 블록 안에서는 요청 단위로 단계별 합계/횟수를 모아 응답에 첨부 가능
+
+import contextvars
+import functools
+import json
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from . import metrics
+
+_current = contextvars.ContextVar('stage_timings', default=None)
+
+
+class StageTimings:
+    """한 요청 동안의 단계별 누적 시간(ms)과 호출 횟수 (처음 실행된 순서 유지)"""
+
+    def __init__(self):
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    def add(self, name, seconds):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {'count': 0, 'total_ms': 0.0}
+        entry['count'] += 1
+        entry['total_ms'] += seconds * 1000
+
+    def as_dict(self):
+        stages = {
+            name: {'count': entry['count'], 'total_ms': round(entry['total_ms'], 2)}
+            for name, entry in self.stages.items()
+        }
+        return {
+            'total_ms': round((time.perf_counter() - self._start) * 1000, 2),
+            'stages': stages,
+        }
+
+    def server_timing_header(self):
+        """브라우저 개발자도구에서 볼 수 있는 Server-Timing 헤더 값"""
+        return ', '.join(
+            f"{name};dur={entry['total_ms']:.1f}" for name, entry in self.stages.items()
+        )
+
+
+@contextmanager
+def stage(name):
+    """코드 블록의 실행 시간을 단계 이름으로 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.registry.observe('certificate_stage_duration_seconds', elapsed, stage=name)
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, elapsed)
+
+
+def timed(name=None):
+    """함수 전체를 하나의 단계로 기록하는 데코레이터 (이름 생략 시 함수명)"""
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def collect_stages():
+    """블록 안에서 실행된 단계들을 StageTimings 로 수집"""
+    timings = StageTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def attach_stage_timings(view):
+    """
+    뷰 실행 중 단계별 시간을 수집하고, DEBUG 모드에서는 JSON 응답에 stage_timings 로 첨부
+    - 운영(DEBUG=False)에서는 메트릭 기록만 하고 응답은 그대로 반환
+    """
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with collect_stages() as timings:
+            response = view(request, *args, **kwargs)
+
+        if settings.DEBUG and response.get('Content-Type', '').startswith('application/json'):
+            try:
+                data = json.loads(response.content)
+            except ValueError:
+                return response
+            if isinstance(data, dict):
+                data['stage_timings'] = timings.as_dict()
+                response.content = json.dumps(data, ensure_ascii=False).encode('utf-8')
+            response['Server-Timing'] = timings.server_timing_header()
+        return response
+    return wrapper
@@ -0,0 +1,305 @@
+# path of this code : pesticide_project/api/storage.py
+# 검정증명서 PDF 내용 주소(content-addressed) 저장소
+# - 파일 이름 대신 SHA-256 해시로 저장: certificates/ab/cd/abcd...ef.pdf (앞 4자리로 2단계 샤딩)
+# - 같은 내용의 PDF 는 한 번만 기록 (재업로드/덮어쓰기 시 쓰기 생략)
+# - 여러 증명서가 같은 파일을 참조할 수 있으므로 삭제는 release_certificate_file() 로
+#   참조하는 증명서가 없을 때만 수행 (참조 수는 CertificateOfAnalysis.original_file 로 계산)
+# - 저장(중복 확인)과 삭제(참조 확인)는 해시 디렉토리 잠금으로 직렬화하고, 중복 저장은 파일 수정 시각을 갱신
+#   → 저장 후 아직 커밋되지 않은 업로드가 참조할 파일은 CERTIFICATE_RELEASE_MIN_AGE(초) 동안 삭제하지 않음
+# - 오래된 파일은 월별 압축 팩으로 옮겨질 수 있음 (certificate_archive) - 읽기/존재 확인/삭제는 팩까지 포함
+# - 남은 고아 파일 정리, 기존 파일명 저장 파일의 해시 경로 전환은 python manage.py gc_certificate_files
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+from . import certificate_archive, metrics
+
+logger = logging.getLogger('api')
+
+CHUNK_SIZE = 64 * 1024
+HASHED_NAME_RE = re.compile(r'^(?P<prefix>.+/)?[0-9a-f]{2}/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})(\.\w+)?$')
+
+
+def file_sha256(content):
+    """업로드 파일(또는 File 객체)의 SHA-256 - 읽은 뒤 위치를 처음으로 되돌림"""
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks(CHUNK_SIZE) if hasattr(content, 'chunks') else iter(lambda: content.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def digest_lock(storage, name):
+    """
+    같은 해시 파일의 저장(중복 확인)과 삭제(참조 확인)를 프로세스 간 직렬화
+    - 잠금 파일은 해시 앞 2자리별 하나 (<MEDIA_ROOT>/.locks/ab.lock, 해시 경로가 아닌 기존 파일명은 legacy.lock)
+    """
+    digest = digest_from_name(name)
+    return certificate_archive.file_lock(storage.path(os.path.join('.locks', f"{digest[:2] if digest else 'legacy'}.lock")))
+
+
+def hashed_name(digest, name):
+    """원래 이름의 디렉토리/확장자를 유지한 해시 경로 (certificates/x.pdf → certificates/ab/cd/<digest>.pdf)"""
+    directory = os.path.dirname(name)
+    extension = os.path.splitext(name)[1].lower()
+    return os.path.join(directory, digest[:2], digest[2:4], digest + extension).replace('\\', '/')
+
+
+def digest_from_name(name):
+    match = HASHED_NAME_RE.match(name or '')
+    return match.group('digest') if match else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    SHA-256 해시 경로에 저장하는 FileSystemStorage
+    - 이미 같은 해시 파일이 있으면 쓰지 않고 수정 시각만 갱신한 뒤 그 이름을 반환
+    - 임시 파일에 쓴 뒤 os.replace 로 옮기므로 같은 파일을 동시에 올려도 안전
+    - 원본 위치에 없으면 압축 팩(certificate_archive)에서 찾아 읽음
+    """
+
+    def _open(self, name, mode='rb'):
+        if os.path.exists(self.path(name)):
+            return super()._open(name, mode)
+        try:
+            return ContentFile(certificate_archive.read_packed(name), name=name)
+        except FileNotFoundError:
+            return super()._open(name, mode)  # 원래와 같은 오류 발생
+
+    def exists(self, name):
+        if super().exists(name):
+            return True
+        return certificate_archive.lookup(name) is not None
+
+    def size(self, name):
+        if super().exists(name):
+            return super().size(name)
+        entry = certificate_archive.lookup(name)
+        if entry is None:
+            return super().size(name)
+        return entry[3]
+
+    def delete(self, name):
+        super().delete(name)
+        certificate_archive.discard(name)
+
+    def get_available_name(self, name, max_length=None):
+        # 이름 충돌은 _save 에서 해시로 판단 (같은 이름 = 같은 내용)
+        return name
+
+    def _save(self, name, content):
+        # 호출하는 쪽에서 이미 계산한 해시(content.sha256)가 있으면 다시 읽지 않음
+        digest = getattr(content, 'sha256', None) or file_sha256(content)
+        name = hashed_name(digest, name)
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+
+        with digest_lock(self, name):
+            if os.path.exists(full_path):
+                # 다시 쓰인 파일로 표시 - 이 업로드가 커밋되기 전에 release/GC 가 지우지 않도록
+                os.utime(full_path)
+                metrics.registry.inc('certificate_file_writes_total', result='deduplicated')
+                logger.info(f"동일한 내용의 파일이 이미 있어 저장 생략: {name}")
+                return name
+
+            # 압축 팩에만 있는 내용도 원본 위치에 다시 기록 (위와 같은 삭제 보호를 받도록)
+            os.makedirs(directory, exist_ok=True)
+            if self.directory_permissions_mode is not None:
+                os.chmod(directory, self.directory_permissions_mode)
+
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    content.seek(0)
+                    for chunk in content.chunks(CHUNK_SIZE):
+                        f.write(chunk)
+                os.chmod(tmp_path, self.file_permissions_mode if self.file_permissions_mode is not None else 0o644)
+                os.replace(tmp_path, full_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        metrics.registry.inc('certificate_file_writes_total', result='stored')
+        return name
+
+
+def _modified_within(path, seconds):
+    """원본 위치의 파일이 최근 seconds 안에 기록/재사용되었는지 (파일이 없으면 False)"""
+    try:
+        return os.stat(path).st_mtime > time.time() - seconds
+    except FileNotFoundError:
+        return False
+
+
+def get_certificate_storage():
+    """
+    CertificateOfAnalysis.original_file 의 storage (마이그레이션에는 함수 경로만 기록됨)
+    - location/base_url 을 지정하지 않아 MEDIA_ROOT/MEDIA_URL 변경이 그대로 반영됨
+    """
+    return ContentAddressedStorage()
+
+
+def release_certificate_file(name, min_age_seconds=None):
+    """
+    더 이상 참조하는 증명서가 없으면 파일 삭제
+    - 증명서 삭제/교체가 커밋된 뒤(transaction.on_commit) 또는 저장이 롤백된 뒤 호출
+    - min_age_seconds(기본 CERTIFICATE_RELEASE_MIN_AGE) 안에 기록되거나 중복 저장으로 다시 쓰인 파일은 유지
+      (같은 내용을 저장한 다른 업로드가 아직 커밋 전일 수 있음) - 참조가 없으면 gc_certificate_files 가 정리
+    """
+    from .models import CertificateOfAnalysis
+
+    if not name:
+        return False
+    if min_age_seconds is None:
+        min_age_seconds = getattr(settings, 'CERTIFICATE_RELEASE_MIN_AGE', 600)
+
+    storage = get_certificate_storage()
+    path = storage.path(name)
+    with digest_lock(storage, name):
+        if CertificateOfAnalysis.objects.filter(original_file=name).exists():
+            logger.info(f"다른 증명서가 참조 중이므로 파일 유지: {name}")
+            return False
+        if _modified_within(path, min_age_seconds):
+            logger.info(f"최근 저장된 파일이므로 유지 (참조가 없으면 gc_certificate_files 가 정리): {name}")
+            return False
+        try:
+            storage.delete(name)
+        except OSError as e:
+            logger.warning(f"파일 삭제 실패: {name}, 오류: {str(e)}")
+            return False
+    logger.info(f"참조가 없는 파일 삭제: {name}")
+    return True
+
+
+def iter_stored_files(storage, directory='certificates'):
+    """해시 경로에 저장된 파일 이름 목록 (임시 파일 제외)"""
+    root = storage.path(directory)
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            name = os.path.relpath(os.path.join(dirpath, filename), storage.path('')).replace(os.sep, '/')
+            if digest_from_name(name):
+                yield name
+
+
+def collect_garbage(min_age_seconds=3600, dry_run=False):
+    """
+    어떤 증명서도 참조하지 않는 해시 파일과 압축 팩 항목 삭제
+    - 저장 실패 / 덮어쓰기 롤백으로 참조 없이 남은 업로드 파일은 여기서만 정리됨 (save_certificate_data)
+    - 업로드 중(트랜잭션 커밋 전)인 파일을 지우지 않도록 min_age_seconds 보다 오래된 파일만 대상
+    - 팩 항목은 인덱스에서만 빠지고(freed_bytes 는 압축 크기) 공간은 archive_certificate_files --compact 로 회수
+      팩의 인덱스가 min_age_seconds 안에 갱신되었거나 같은 이름의 원본 파일이 다시 기록된 항목은 유지
+    - 반환: {'scanned', 'referenced', 'deleted', 'freed_bytes', 'names'}
+    """
+    from .models import CertificateOfAnalysis
+
+    storage = get_certificate_storage()
+    referenced = set(CertificateOfAnalysis.objects.exclude(original_file='').values_list('original_file', flat=True))
+    cutoff = time.time() - min_age_seconds
+    stats = {'scanned': 0, 'referenced': 0, 'deleted': 0, 'freed_bytes': 0, 'names': []}
+    loose = set()
+
+    for name in iter_stored_files(storage):
+        loose.add(name)
+        stats['scanned'] += 1
+        if name in referenced:
+            stats['referenced'] += 1
+            continue
+        path = storage.path(name)
+        # 확인과 삭제 사이에 같은 내용이 다시 저장(수정 시각 갱신)되지 않도록 저장과 같은 잠금 사용
+        with digest_lock(storage, name):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime > cutoff:
+                continue
+            stats['names'].append(name)
+            stats['freed_bytes'] += stat.st_size
+            stats['deleted'] += 1
+            if not dry_run:
+                storage.delete(name)
+
+    # 원본 위치에 없는 팩 항목 (원본 파일이 있으면 위에서 함께 처리됨)
+    for name, entry in sorted(certificate_archive.load_entries().items()):
+        if name in loose:
+            continue
+        stats['scanned'] += 1
+        if name in referenced:
+            stats['referenced'] += 1
+            continue
+        pack_file, length = entry[5], entry[2]
+        with digest_lock(storage, name):
+            if os.path.exists(storage.path(name)):
+                continue  # 같은 내용이 방금 다시 저장됨
+            try:
+                if os.stat(certificate_archive.index_path(pack_file)).st_mtime > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            stats['names'].append(name)
+            stats['freed_bytes'] += length
+            stats['deleted'] += 1
+            if not dry_run:
+                certificate_archive.discard(name)
+
+    if not dry_run:
+        logger.info(f"증명서 파일 정리: {stats['deleted']}개 삭제, {stats['freed_bytes']:,} bytes")
+    return stats
+
+
+def migrate_legacy_files(dry_run=False):
+    """
+    업로드 파일명으로 저장된 기존 파일(certificates/<이름>.pdf)을 해시 경로로 옮김
+    - 같은 내용의 파일은 하나만 남기고, 증명서의 original_file / file_sha256 / original_filename 갱신
+    - 반환: {'migrated', 'missing', 'deduplicated'}
+    """
+    from .models import CertificateOfAnalysis
+
+    storage = get_certificate_storage()
+    stats = {'migrated': 0, 'missing': 0, 'deduplicated': 0}
+    legacy = CertificateOfAnalysis.objects.exclude(original_file='').only('id', 'original_file', 'original_filename')
+
+    for certificate in legacy.iterator():
+        old_name = certificate.original_file.name
+        if digest_from_name(old_name):
+            continue
+        if not storage.exists(old_name):
+            stats['missing'] += 1
+            logger.warning(f"원본 파일 없음: {old_name} (증명서 id={certificate.id})")
+            continue
+        if dry_run:
+            stats['migrated'] += 1
+            continue
+
+        with storage.open(old_name, 'rb') as f:
+            digest = f.sha256 = file_sha256(f)
+            new_name = hashed_name(digest, old_name)
+            if storage.exists(new_name):
+                stats['deduplicated'] += 1
+            else:
+                storage._save(old_name, f)
+        CertificateOfAnalysis.objects.filter(pk=certificate.pk).update(
+            original_file=new_name,
+            file_sha256=digest,
+            original_filename=certificate.original_filename or os.path.basename(old_name),
+        )
+        # 기존 파일명은 여러 증명서가 같은 이름을 가리킬 수 있으므로 참조가 없을 때만 삭제
+        # (새 업로드는 해시 경로에만 저장되므로 기존 파일명에는 최근 저장 보호가 필요 없음)
+        release_certificate_file(old_name, min_age_seconds=0)
+        stats['migrated'] += 1
+
+    return stats
@@ -0,0 +1,96 @@
+# pesticide_project/api/tests/test_async_middleware.py
+# MetricsMiddleware / RequestLoggingMiddleware 의 ASGI 동작 테스트 - async 뷰 동시 요청이 직렬화되지 않는지, 메트릭/로그 기록
+# command : python manage.py test api.tests.test_async_middleware --settings=config.settings.test
+
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.http import HttpResponse
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import path
+
+from api import metrics
+from api.metrics import MetricsMiddleware
+from api.middleware import RequestLoggingMiddleware
+from api.models import PesticideLimit
+
+DELAY = 0.2
+CONCURRENCY = 4
+
+
+async def slow_view(request):
+    await asyncio.sleep(DELAY)
+    return HttpResponse('ok')
+
+
+async def query_view(request):
+    count = await sync_to_async(PesticideLimit.objects.count)()
+    return HttpResponse(str(count))
+
+
+urlpatterns = [
+    path('slow/', slow_view),
+    path('query/', query_view),
+]
+
+MIDDLEWARE = ['api.metrics.MetricsMiddleware', 'api.middleware.RequestLoggingMiddleware']
+
+
+@override_settings(ROOT_URLCONF=__name__, MIDDLEWARE=MIDDLEWARE, METRICS_MULTIPROC_DIR='',
+                   REQUEST_LOG_SAMPLE_RATES={})
+class AsyncMiddlewareTests(TestCase):
+    def setUp(self):
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+
+    def histogram(self, name, **labels):
+        for metric, metric_labels, state in metrics.registry.snapshot()['histograms']:
+            if metric == name and dict(metric_labels) == labels:
+                return state
+        return None
+
+    def test_middleware_is_coroutine_in_async_chain(self):
+        async def view(request):
+            return HttpResponse()
+
+        for middleware_class in (MetricsMiddleware, RequestLoggingMiddleware):
+            self.assertTrue(asyncio.iscoroutinefunction(middleware_class(view)))
+            self.assertFalse(asyncio.iscoroutinefunction(middleware_class(lambda request: HttpResponse())))
+
+    def test_concurrent_async_requests_are_not_serialized(self):
+        client = AsyncClient()
+
+        async def run():
+            start = time.perf_counter()
+            responses = await asyncio.gather(*[client.get('/slow/') for _ in range(CONCURRENCY)])
+            return responses, time.perf_counter() - start
+
+        with self.assertLogs('api.requests', level='INFO') as logs:
+            responses, elapsed = async_to_sync(run)()
+
+        self.assertEqual([response.status_code for response in responses], [200] * CONCURRENCY)
+        # 동기 미들웨어가 끼면 요청이 하나씩 처리되어 DELAY * CONCURRENCY 이상 걸림
+        self.assertLess(elapsed, DELAY * CONCURRENCY * 0.75)
+        self.assertEqual(len(logs.records), CONCURRENCY)
+        self.assertEqual({record.route for record in logs.records}, {'slow/'})
+        self.assertEqual(self.histogram('http_request_duration_seconds', route='slow/', method='GET')[-1],
+                         CONCURRENCY)
+
+    def test_concurrent_requests_count_only_their_own_queries(self):
+        client = AsyncClient()
+
+        async def run():
+            return await asyncio.gather(*[client.get('/query/') for _ in range(CONCURRENCY)])
+
+        responses = async_to_sync(run)()
+        self.assertEqual([response.status_code for response in responses], [200] * CONCURRENCY)
+        state = self.histogram('db_queries_per_request', route='query/')
+        self.assertEqual(state[-1], CONCURRENCY)  # 요청 수
+        self.assertEqual(state[-2], CONCURRENCY)  # 쿼리 수 합계 (요청당 1개)
+        self.assertEqual(state[metrics.QUERY_COUNT_BUCKETS.index(1)], CONCURRENCY)  # 모두 le=1 버킷
+
+    def test_queries_outside_requests_are_not_counted(self):
+        PesticideLimit.objects.count()
+        self.assertIsNone(self.histogram('db_queries_per_request', route='query/'))
+        self.assertIsNone(metrics._query_timer.get())
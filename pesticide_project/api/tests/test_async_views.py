@@ -0,0 +1,110 @@
+# pesticide_project/api/tests/test_async_views.py
+# async 뷰(api/async_views.py) 테스트 - 로컬 가짜 PubChem 서버로 CID/SDF 조회, 2D 대체, 연결 재사용 확인
+# command : python manage.py test api.tests.test_async_views --settings=config.settings.test
+
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import TestCase, override_settings
+
+from api import async_views
+
+# Django 3.2 의 AsyncClient.get 은 data 인자를 query string 으로 넘기지 않아 URL 에 직접 붙임
+URL = '/api/pesticides/structure3d/'
+CIDS = {'glufosinate-ammonium': 53249, 'imidacloprid': 86287518}
+SDF_3D = {86287518: 'imidacloprid 3d sdf'}
+SDF_2D = {53249: 'glufosinate 2d sdf', 86287518: 'imidacloprid 2d sdf'}
+
+
+class FakePubChemHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive (클라이언트 연결 재사용 확인용)
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address))
+        path, _, query = self.path.partition('?')
+        parts = path.strip('/').split('/')
+        body, status = b'', 404
+        if parts[:2] == ['compound', 'name'] and parts[2] in CIDS:
+            body, status = json.dumps({'IdentifierList': {'CID': [CIDS[parts[2]]]}}).encode(), 200
+        elif parts[:2] == ['compound', 'cid']:
+            table = SDF_3D if query == 'record_type=3d' else SDF_2D
+            if int(parts[2]) in table:
+                body, status = table[int(parts[2])].encode(), 200
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Structure3DTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakePubChemHandler)
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.settings_override = override_settings(PUBCHEM_BASE_URL=f"http://127.0.0.1:{cls.server.server_port}")
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.server.requests.clear()
+
+    async def test_returns_3d_structure(self):
+        response = await self.async_client.get(f"{URL}?compound_name=Imidacloprid")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'structure_data': 'imidacloprid 3d sdf', 'cid': 86287518, 'compound_name': 'Imidacloprid',
+        })
+
+    async def test_falls_back_to_2d_structure(self):
+        response = await self.async_client.get(f"{URL}?compound_name=Glufosinate%28ammonium%29")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['structure_data'], 'glufosinate 2d sdf')
+        self.assertTrue(response.json()['is_2d'])
+
+    async def test_unknown_compound_and_missing_name(self):
+        response = await self.async_client.get(f"{URL}?compound_name=Nothingfos")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'Compound not found'})
+        response = await self.async_client.get(URL)
+        self.assertEqual(response.status_code, 400)
+
+    async def test_reuses_connections_between_requests(self):
+        for _ in range(3):
+            response = await self.async_client.get(f"{URL}?compound_name=Imidacloprid")
+            self.assertEqual(response.status_code, 200)
+        paths = [path for path, _ in self.server.requests]
+        self.assertGreaterEqual(paths.count('/compound/name/imidacloprid/cids/JSON'), 3)
+        # 같은 클라이언트(루프별 공유)가 keep-alive 연결을 재사용하므로 요청 수보다 연결 수가 적음
+        self.assertLess(len({address for _, address in self.server.requests}), len(self.server.requests))
+
+    async def test_upstream_down_returns_500(self):
+        with override_settings(PUBCHEM_BASE_URL='http://127.0.0.1:9'):
+            response = await self.async_client.get(f"{URL}?compound_name=Imidacloprid")
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {'error': 'Failed to fetch structure data'})
+
+    def test_sync_wsgi_client_still_works(self):
+        # WSGI(테스트 Client) 에서는 요청마다 클라이언트를 만들어 사용
+        response = self.client.get(URL, {'compound_name': 'Imidacloprid'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['cid'], 86287518)
+        self.assertEqual(self.client.post(URL).status_code, 405)
+
+    def test_compound_name_mapping(self):
+        self.assertEqual(async_views.pubchem_compound_name('Glufosinate ammonium'), 'glufosinate-ammonium')
+        self.assertEqual(async_views.pubchem_compound_name('Fenpropathrin(F)'), 'fenpropathrin-f')
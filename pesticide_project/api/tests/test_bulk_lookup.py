@@ -0,0 +1,123 @@
+# pesticide_project/api/tests/test_bulk_lookup.py
+# 일괄 조회(POST /api/pesticides/bulk_lookup/) 테스트 - 단건 조회와 결과 일치, 게스트 차감, 쿼리 수
+# command : python manage.py test api.tests.test_bulk_lookup --settings=config.settings.test
+
+import logging
+from decimal import Decimal
+from unittest import mock
+
+from django.core import mail
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api import food_categories
+from api.models import FoodCategory, GuestSession, PesticideLimit, SearchLog, User
+from benchmarks.seed import seed_dataset
+
+URL = '/api/pesticides/bulk_lookup/'
+
+
+class BulkLookupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(scale=0.02)
+        cls.user = User.objects.create_user(
+            username='bulk', email='bulk@example.com', password='pw', organization='test'
+        )
+        cls.pesticide = cls.dataset['pesticides_kr'][0]
+        # 소분류에는 기준이 없고 대분류에만 있는 품목 (main 대체 조회)
+        FoodCategory.objects.create(food_name='대분류품목', main_category='대분류기준', sub_category='기준없는소분류')
+        PesticideLimit.objects.create(
+            pesticide_name_kr=cls.pesticide, pesticide_name_en=cls.dataset['pesticides'][0],
+            food_name='대분류기준', max_residue_limit=Decimal('0.5'),
+        )
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        food_categories.invalidate()
+        self.addCleanup(food_categories.invalidate)
+        patcher = mock.patch('builtins.print')  # 단건 조회의 검색 로그 print() 출력 생략
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def pairs(self):
+        return [
+            (self.pesticide, '부추'),                                   # direct
+            (self.pesticide, self.dataset['category_only_foods'][0]),  # sub
+            (self.pesticide, '대분류품목'),                             # main
+            (self.pesticide, '없는품목'),                               # no_match
+            (self.dataset['pesticides'][1].upper(), '고추'),            # 영문명, 대소문자 무시
+        ]
+
+    def bulk(self, pairs, client=None):
+        return (client or self.client).post(
+            URL, {'pairs': [{'pesticide': p, 'food': f} for p, f in pairs]}, format='json'
+        )
+
+    def test_results_match_single_lookup(self):
+        response = self.bulk(self.pairs())
+        self.assertEqual(response.status_code, 200)
+        items = response.json()['results']
+        self.assertEqual([item['matching_type'] for item in items], ['direct', 'sub', 'main', None, 'direct'])
+
+        for (pesticide, food), item in zip(self.pairs(), items):
+            single = self.client.get('/api/pesticides/', {'pesticide': pesticide, 'food': food})
+            if item['matching_type'] is None:
+                self.assertEqual(single.status_code, 404)
+                expected = single.json()
+                for key in ('error', 'error_type', 'message', 'pesticide_name_kr', 'pesticide_name_en'):
+                    self.assertEqual(item[key], expected[key])
+            else:
+                self.assertEqual(single.status_code, 200)
+                self.assertEqual(item['results'], single.json())
+
+    def test_logs_in_bulk_like_single_lookup(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bulk(self.pairs())
+        # 단건 조회와 같이 직접 매칭과 매칭 없음만 기록
+        self.assertEqual(
+            sorted(SearchLog.objects.values_list('food_term', 'results_count')),
+            sorted([('부추', 1), ('없는품목', 0), ('고추', 1)]),
+        )
+
+    def test_external_ip_gets_one_notification_per_request(self):
+        self.client.post(
+            URL, {'pairs': [{'pesticide': p, 'food': f} for p, f in self.pairs()]},
+            format='json', REMOTE_ADDR='203.0.113.5'
+        )
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('3건', mail.outbox[0].subject)
+
+    def test_guest_quota_charged_once_per_matched_pair(self):
+        guest = APIClient()
+        pairs = self.pairs() * 2  # 매칭 8쌍, 게스트 한도 5회
+        response = self.bulk(pairs, client=guest)
+        self.assertEqual(response.status_code, 200)
+        items = response.json()['results']
+        self.assertEqual(sum(1 for item in items if item.get('error') == 'query_limit_exceeded'), 3)
+        self.assertEqual(GuestSession.objects.get().query_count, 5)
+
+        self.assertEqual(self.bulk(pairs, client=guest).status_code, 429)
+
+    def test_query_count_does_not_grow_with_pairs(self):
+        counts = []
+        food_categories.get_hierarchy()  # 분류 맵은 프로세스에서 한 번만 생성
+        for pairs in (self.pairs()[:1], self.pairs() * 10):
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(self.bulk(pairs).status_code, 200)
+            counts.append(len(captured.captured_queries))
+        # 기준 + 매칭 없는 농약명 + 로그 bulk insert (카테고리는 메모리 분류 맵)
+        self.assertLessEqual(counts[1], 3)
+        self.assertLessEqual(counts[0], counts[1])
+
+    def test_rejects_invalid_requests(self):
+        self.assertEqual(self.client.post(URL, {'pairs': []}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(URL, {'pairs': [{'pesticide': 'x'}]}, format='json').status_code, 400)
+        with self.settings(BULK_LOOKUP_MAX_PAIRS=2):
+            self.assertEqual(self.bulk(self.pairs()).status_code, 400)
@@ -0,0 +1,106 @@
+# pesticide_project/api/tests/test_by_food.py
+# 식품별 역조회(GET /api/pesticides/by_food/) 테스트 - 소/대분류 상속, 페이지, compact 형식, 게스트 차감과 검색 로그
+# command : python manage.py test api.tests.test_by_food --settings=config.settings.test
+
+import logging
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api import food_categories, mrl_matrix
+from api.models import FoodCategory, GuestSession, PesticideLimit, SearchLog, User
+from benchmarks.seed import seed_dataset
+
+URL = '/api/pesticides/by_food/'
+
+
+class ByFoodTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(scale=0.02)
+        cls.user = User.objects.create_user(
+            username='byfood', email='byfood@example.com', password='pw', organization='test'
+        )
+        cls.food = cls.dataset['category_only_foods'][0]
+        cls.category = FoodCategory.objects.get(food_name=cls.food)
+        # 이 품목 자체에 기준이 있는 농약 1건 (소분류 기준보다 우선)
+        cls.direct = PesticideLimit.objects.create(
+            pesticide_name_kr=cls.dataset['pesticides_kr'][0], pesticide_name_en=cls.dataset['pesticides'][0],
+            food_name=cls.food, max_residue_limit=Decimal('3.0'),
+        )
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        mrl_matrix.invalidate()
+        self.addCleanup(mrl_matrix.invalidate)
+        food_categories.invalidate()
+        self.addCleanup(food_categories.invalidate)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def expected(self):
+        """농약별로 직접 → 소분류 → 대분류 순으로 ORM 에서 직접 계산"""
+        expected = {}
+        for matching_type, food in (('direct', self.food), ('sub', self.category.sub_category),
+                                    ('main', self.category.main_category)):
+            for limit in PesticideLimit.objects.filter(food_name__iexact=food).order_by('id'):
+                expected.setdefault(limit.pesticide_name_en, (matching_type, f"{limit.max_residue_limit:.3f}"))
+        return expected
+
+    def test_inherits_from_sub_and_main_category(self):
+        response = self.client.get(URL, {'food': self.food, 'page_size': 500})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['sub_category'], self.category.sub_category)
+
+        actual = {row['pesticide_name_en']: (row['matching_type'], row['max_residue_limit']) for row in data['results']}
+        self.assertEqual(actual, self.expected())
+        self.assertEqual(actual[self.direct.pesticide_name_en], ('direct', '3.000'))
+        names = [row['pesticide_name_kr'] for row in data['results']]
+        self.assertEqual(names, sorted(names))
+
+    def test_pagination_and_compact_output(self):
+        full = self.client.get(URL, {'food': self.food, 'page_size': 500}).json()
+        first = self.client.get(URL, {'food': self.food, 'page_size': 10, 'compact': 'true'}).json()
+        second = self.client.get(URL, {'food': self.food, 'page_size': 10, 'page': 2, 'compact': 'true'}).json()
+
+        self.assertEqual(first['count'], full['count'])
+        self.assertTrue(first['has_next'])
+        rows = [dict(zip(first['columns'], row)) for row in first['rows'] + second['rows']]
+        self.assertEqual(rows, full['results'][:20])
+
+    def test_unknown_food_and_validation(self):
+        self.assertEqual(self.client.get(URL, {'food': '없는품목'}).status_code, 404)
+        self.assertEqual(self.client.get(URL).status_code, 400)
+        self.assertEqual(self.client.get(URL, {'food': self.food, 'page': 'x'}).status_code, 400)
+
+    def test_guest_charged_for_every_page(self):
+        guest = APIClient()
+        guest.get(URL, {'food': self.food, 'page_size': 10})
+        guest.get(URL, {'food': self.food, 'page_size': 10, 'page': 2})
+        guest.get(URL, {'food': '없는품목'})  # 결과가 없으면 차감하지 않음
+        self.assertEqual(GuestSession.objects.get().query_count, 2)
+
+        for page in range(3, 6):
+            guest.get(URL, {'food': self.food, 'page_size': 10, 'page': page})
+        self.assertEqual(guest.get(URL, {'food': self.food, 'page': 6}).status_code, 429)
+
+    def test_lookups_are_logged(self):
+        count = self.client.get(URL, {'food': self.food}).json()['count']
+        self.client.get(URL, {'food': '없는품목'})
+
+        logs = SearchLog.objects.order_by('id')
+        self.assertEqual(
+            [(log.search_term, log.pesticide_term, log.food_term, log.results_count) for log in logs],
+            [(f"식품: {self.food}", None, self.food, count), ('식품: 없는품목', None, '없는품목', 0)],
+        )
+
+    def test_query_count(self):
+        # 분류 맵과 행렬이 이미 메모리에 있으면 검색 로그 저장만
+        mrl_matrix.get_matrix()
+        food_categories.get_hierarchy()
+        with self.assertNumQueries(1):
+            self.client.get(URL, {'food': self.food})
@@ -0,0 +1,143 @@
+# pesticide_project/api/tests/test_certificate_archive.py
+# 검정증명서 원본 PDF 압축 팩 보관 / 팩에서 읽기 / 삭제 및 팩 정리 / 참조 없는 팩 항목 GC 테스트
+# command : python manage.py test api.tests.test_certificate_archive --settings=config.settings.test
+
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api import certificate_archive as archive
+from api import storage
+from api.models import CertificateOfAnalysis
+
+OLD_PDF = b'%PDF-1.4 ' + b'old certificate body ' * 200
+RECENT_PDF = b'%PDF-1.4 recent'
+
+
+class CertificateArchiveTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+        self.old = self.certificate('OLD-1', OLD_PDF, days_ago=500)
+        self.recent = self.certificate('NEW-1', RECENT_PDF, days_ago=10)
+
+    def certificate(self, number, content, days_ago):
+        return CertificateOfAnalysis.objects.create(
+            certificate_number=number,
+            upload_date=timezone.now() - timedelta(days=days_ago),
+            original_file=SimpleUploadedFile(f"{number}.pdf", content, content_type='application/pdf'),
+        )
+
+    def archive(self, *args):
+        call_command('archive_certificate_files', '--months', '12', *args, stdout=io.StringIO())
+
+    def loose_exists(self, certificate):
+        return os.path.exists(os.path.join(self.media_root, certificate.original_file.name))
+
+    def test_old_files_move_to_pack_and_stay_readable(self):
+        self.archive()
+
+        self.assertFalse(self.loose_exists(self.old))
+        self.assertTrue(self.loose_exists(self.recent))
+        packs = os.listdir(archive.get_archive_dir())
+        month = timezone.localtime(self.old.upload_date).strftime('%Y-%m')
+        self.assertIn(f"{month}.pack", packs)
+        self.assertIn(f"{month}.pack.idx", packs)
+
+        certificate = CertificateOfAnalysis.objects.get(pk=self.old.pk)
+        self.assertTrue(certificate.original_file.storage.exists(certificate.original_file.name))
+        self.assertEqual(certificate.original_file.size, len(OLD_PDF))
+        with certificate.original_file.open('rb') as f:
+            self.assertEqual(f.read(), OLD_PDF)
+        self.assertLess(os.path.getsize(os.path.join(archive.get_archive_dir(), f"{month}.pack")), len(OLD_PDF))
+
+    def test_dry_run_moves_nothing(self):
+        self.archive('--dry-run')
+        self.assertTrue(self.loose_exists(self.old))
+        self.assertIsNone(archive.lookup(self.old.original_file.name))
+
+    def test_reupload_of_archived_content_restores_loose_file(self):
+        # 원본 위치에 다시 기록해야 커밋 전 업로드가 최근 저장 보호(CERTIFICATE_RELEASE_MIN_AGE)를 받음
+        self.archive()
+        duplicate = self.certificate('OLD-2', OLD_PDF, days_ago=0)
+        self.assertEqual(duplicate.original_file.name, self.old.original_file.name)
+        self.assertTrue(self.loose_exists(duplicate))
+        with duplicate.original_file.open('rb') as f:
+            self.assertEqual(f.read(), OLD_PDF)
+
+    def test_release_removes_index_entry_and_compact_reclaims_space(self):
+        other = self.certificate('OLD-3', b'%PDF-1.4 another old one', days_ago=500)
+        self.archive()
+        name = self.old.original_file.name
+
+        self.old.delete()
+        self.assertTrue(storage.release_certificate_file(name))
+        self.assertIsNone(archive.lookup(name))
+        self.assertFalse(storage.get_certificate_storage().exists(name))
+
+        self.assertGreater(archive.compact_packs(), 0)
+        with CertificateOfAnalysis.objects.get(pk=other.pk).original_file.open('rb') as f:
+            self.assertEqual(f.read(), b'%PDF-1.4 another old one')
+
+    def test_compact_writes_new_pack_before_swapping_index(self):
+        other = self.certificate('OLD-3', b'%PDF-1.4 another old one', days_ago=500)
+        self.archive()
+        CertificateOfAnalysis.objects.filter(pk=self.old.pk).delete()
+        self.assertTrue(storage.release_certificate_file(self.old.original_file.name))
+        name = other.original_file.name
+        stale_entries = dict(archive.load_entries())
+        month = timezone.localtime(other.upload_date).strftime('%Y-%m')
+
+        archive.compact_packs()
+
+        # 정리된 데이터는 새 세대 파일에 있고 이전 팩은 인덱스 교체 후 삭제됨
+        self.assertEqual(sorted(os.listdir(archive.get_archive_dir())), ['.lock', f"{month}.1.pack", f"{month}.pack.idx"])
+        self.assertEqual(archive.lookup(name)[0], os.path.join(archive.get_archive_dir(), f"{month}.1.pack"))
+
+        # 교체 전에 인덱스를 읽은 쪽은 이전 팩이 없어진 것을 보고 인덱스를 다시 읽음
+        load_entries = archive.load_entries
+        with mock.patch.object(archive, 'load_entries',
+                               side_effect=lambda refresh=False: load_entries() if refresh else stale_entries):
+            self.assertEqual(archive.read_packed(name), b'%PDF-1.4 another old one')
+
+        # 다음 정리 이후 추가 보관도 새 세대 파일에 이어 씀
+        self.assertEqual(archive.compact_packs(), 0)
+        later = self.certificate('OLD-4', b'%PDF-1.4 archived later', days_ago=500)
+        self.archive()
+        with CertificateOfAnalysis.objects.get(pk=later.pk).original_file.open('rb') as f:
+            self.assertEqual(f.read(), b'%PDF-1.4 archived later')
+        self.assertNotIn(f"{month}.pack", os.listdir(archive.get_archive_dir()))
+
+    def test_gc_discards_unreferenced_packed_entries(self):
+        other = self.certificate('OLD-3', b'%PDF-1.4 another old one', days_ago=500)
+        self.archive()
+        name = self.old.original_file.name
+        CertificateOfAnalysis.objects.filter(pk=self.old.pk).delete()  # 커밋 후 정리(on_commit)가 실행되지 않은 상태
+
+        # 팩 인덱스가 최근에 갱신되었으면 유지
+        self.assertEqual(storage.collect_garbage()['names'], [])
+
+        stats = storage.collect_garbage(min_age_seconds=0, dry_run=True)
+        self.assertEqual(stats['names'], [name])
+        self.assertEqual(stats['freed_bytes'], archive.lookup(name)[2])
+        self.assertEqual((stats['scanned'], stats['referenced']), (3, 2))
+        self.assertIsNotNone(archive.lookup(name))
+
+        self.assertEqual(storage.collect_garbage(min_age_seconds=0)['names'], [name])
+        self.assertIsNone(archive.lookup(name))
+        self.assertIsNotNone(archive.lookup(other.original_file.name))
+        self.assertGreater(archive.compact_packs(), 0)
@@ -0,0 +1,136 @@
+# pesticide_project/api/tests/test_certificate_reverify.py
+# 릴리스 변경 목록(release_diff)과 변경된 (농약, 식품) 쌍에 해당하는 검정증명서만 재검증하는지 테스트
+# command : python manage.py test api.tests.test_certificate_reverify --settings=config.settings.test
+
+import io
+import logging
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase
+
+from api import certificate_reverify, food_categories, mrl_import, mrl_matrix, mrl_release
+from api.models import CertificateOfAnalysis, FoodCategory, PesticideResult
+
+HEADER = '농약명(한글),농약명(영어),식품명,잔류허용기준(mg/kg),max_residue_limit,condition_code\n'
+RELEASE_1 = HEADER + (
+    '가스가마이신,Kasugamycin,고추,0.3,0.3,\n'
+    '가스가마이신,Kasugamycin,엽채류,0.5,0.5,\n'
+    '아세타미프리드,Acetamiprid,부추,3.0,3,\n'
+)
+RELEASE_2 = HEADER + (
+    '가스가마이신,Kasugamycin,고추,0.1,0.1,\n'
+    '가스가마이신,Kasugamycin,엽채류,0.05,0.05,\n'
+    '아세타미프리드,Acetamiprid,부추,3.0,3,\n'
+    '아세타미프리드,Acetamiprid,배추,2.0,2,\n'
+)
+
+
+def activate(csv, label):
+    release = mrl_release.stage_release(mrl_import.read_mrl_csv(io.StringIO(csv)), label)
+    mrl_release.activate_release(release, force=True)
+    release.refresh_from_db()
+    return release
+
+
+def certificate(number, sample_description, pesticide, detection_value, pdf_mrl):
+    cert = CertificateOfAnalysis.objects.create(
+        certificate_number=number, sample_description=sample_description, analytical_purpose='출하전',
+        original_file=ContentFile(b'%PDF-1.4', name=f'{number}.pdf'),
+    )
+    PesticideResult.objects.create(
+        certificate=cert, pesticide_name=pesticide, standard_pesticide_name=pesticide,
+        detection_value=Decimal(detection_value), pdf_korea_mrl=Decimal(pdf_mrl), pdf_korea_mrl_text=pdf_mrl,
+        db_korea_mrl=Decimal(pdf_mrl), pdf_result='적합', pdf_calculated_result='적합',
+        db_calculated_result='적합', is_pdf_consistent=True,
+    )
+    return cert
+
+
+class CertificateReverifyTests(TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        mrl_matrix.invalidate()
+        self.addCleanup(mrl_matrix.invalidate)
+        food_categories.invalidate()
+        self.addCleanup(food_categories.invalidate)
+        # 카테고리 대체 조회는 프로세스 안에서 처리 - HTTP 호출이 있으면 실패
+        patcher = mock.patch('requests.get', side_effect=AssertionError('HTTP 호출 없이 재검증해야 함'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        FoodCategory.objects.create(food_name='상추', sub_category='엽채류', main_category='채소류')
+        self.r1 = activate(RELEASE_1, 'r1')
+        self.r2 = activate(RELEASE_2, 'r2')
+        self.pepper = certificate('C-1', '고추', 'Kasugamycin', '0.2', '0.3')
+        self.lettuce = certificate('C-2', '상추', 'Kasugamycin', '0.1', '0.5')
+        self.chives = certificate('C-3', '부추', 'Acetamiprid', '1.0', '3.0')
+        self.plant = certificate('C-4', '고추(작물체)', 'Kasugamycin', '0.2', '0.3')
+
+    def test_release_diff_entries(self):
+        entries = mrl_release.release_diff(self.r1, self.r2)
+        self.assertEqual(
+            [(entry['change'], entry['pesticide_name_kr'], entry['food_name']) for entry in entries],
+            [('added', '아세타미프리드', '배추'), ('changed', '가스가마이신', '고추'), ('changed', '가스가마이신', '엽채류')],
+        )
+        self.assertEqual(entries[1]['old_limit'], Decimal('0.300'))
+        self.assertEqual(entries[1]['new_limit'], Decimal('0.100'))
+        self.assertEqual(entries[1]['pesticide_name_en'], 'Kasugamycin')
+        self.assertEqual(mrl_release.previous_release(self.r2), self.r1)
+
+    def test_affected_results_include_category_fallback_only(self):
+        affected = certificate_reverify.affected_results(mrl_release.release_diff(self.r1, self.r2))
+        self.assertEqual({certificate_id for _, certificate_id in affected}, {self.pepper.id, self.lettuce.id})
+
+    def test_affected_results_ignore_name_case(self):
+        # 증명서의 표준 영문명/품목명 대소문자가 릴리스·분류 맵과 달라도 대상
+        FoodCategory.objects.create(food_name='Kale', sub_category='엽채류', main_category='채소류')
+        food_categories.invalidate()
+        upper = certificate('C-5', '고추', 'KASUGAMYCIN', '0.2', '0.3')
+        kale = certificate('C-6', 'KALE', 'kasugamycin', '0.1', '0.5')
+
+        affected = certificate_reverify.affected_results(mrl_release.release_diff(self.r1, self.r2))
+        self.assertEqual({certificate_id for _, certificate_id in affected},
+                         {self.pepper.id, self.lettuce.id, upper.id, kale.id})
+
+    def test_reverify_updates_changed_results(self):
+        stats = certificate_reverify.reverify_certificates([self.pepper.id, self.chives.id])
+        self.assertEqual(stats['certificates'], 2)
+        self.assertEqual(stats['results_updated'], 1)
+        self.assertEqual(stats['verdict_changed'], ['C-1'])
+
+        pepper = self.pepper.pesticide_results.get()
+        self.assertEqual(pepper.db_korea_mrl, Decimal('0.100'))
+        self.assertEqual(pepper.db_calculated_result, '부적합')
+        self.assertEqual(self.chives.pesticide_results.get().db_calculated_result, '적합')
+
+    def test_category_fallback_uses_new_release_value(self):
+        # 상추는 직접 기준이 없고 소분류(엽채류) 기준 0.5 → 0.05 로 변경
+        stats = certificate_reverify.reverify_certificates([self.lettuce.id])
+        self.assertEqual(stats['results_updated'], 1)
+        self.assertEqual(stats['verdict_changed'], ['C-2'])
+        lettuce = self.lettuce.pesticide_results.get()
+        self.assertEqual(lettuce.db_korea_mrl, Decimal('0.050'))
+        self.assertEqual(lettuce.db_calculated_result, '부적합')
+
+    def test_dry_run_does_not_save(self):
+        stats = certificate_reverify.reverify_certificates([self.pepper.id], dry_run=True)
+        self.assertEqual(stats['results_updated'], 1)
+        self.assertEqual(self.pepper.pesticide_results.get().db_korea_mrl, Decimal('0.300'))
+
+    def test_command_uses_previous_release_by_default(self):
+        out = io.StringIO()
+        call_command('reverify_certificates', stdout=out)
+        self.assertIn('증명서 2건 재검증', out.getvalue())
+        self.assertIn('C-1, C-2', out.getvalue())
+        self.assertEqual(self.pepper.pesticide_results.get().db_calculated_result, '부적합')
+        self.assertEqual(self.lettuce.pesticide_results.get().db_korea_mrl, Decimal('0.050'))
+        self.assertEqual(self.plant.pesticide_results.get().db_korea_mrl, Decimal('0.300'))
+
+        out = io.StringIO()
+        call_command('mrl_release', 'diff', stdout=out)
+        self.assertIn(f'#{self.r1.pk} → #{self.r2.pk}: 추가 1, 변경 2, 삭제 0', out.getvalue())
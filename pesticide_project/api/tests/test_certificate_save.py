@@ -0,0 +1,147 @@
+# pesticide_project/api/tests/test_certificate_save.py
+# 검정증명서 저장 / 덮어쓰기의 원자성 테스트
+# command : python manage.py test api.tests.test_certificate_save --settings=config.settings.test
+
+import logging
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from api import certificate_parser as parser
+from api import storage
+from api.models import CertificateOfAnalysis, PesticideResult
+from benchmarks.bench_parser import load_text_fixtures
+from benchmarks.seed import seed_dataset
+
+
+class CertificateSaveAtomicityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_dataset(scale=0.02)
+        cls.text = load_text_fixtures()['many_detections']
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+    def pdf_file(self, content=b'%PDF-1.4 test'):
+        return SimpleUploadedFile('test.pdf', content, content_type='application/pdf')
+
+    def stored_files(self):
+        directory = os.path.join(self.media_root, 'certificates')
+        return sorted(
+            os.path.relpath(os.path.join(dirpath, filename), self.media_root).replace(os.sep, '/')
+            for dirpath, _, filenames in os.walk(directory)
+            for filename in filenames
+        )
+
+    def make_old(self, name):
+        past = time.time() - 7200
+        os.utime(os.path.join(self.media_root, name), (past, past))
+
+    def verified(self):
+        parsing_result = parser.parse_certificate_text(self.text)
+        parsing_result['is_plant_material'] = False
+        return parsing_result, parser.verify_pesticide_results(parsing_result)
+
+    def test_save_creates_certificate_and_all_results(self):
+        parsing_result, verification = self.verified()
+        saved = parser.save_certificate_data(parsing_result, verification, self.pdf_file())
+        self.assertEqual(saved['pesticide_count'], len(verification))
+        self.assertEqual(PesticideResult.objects.filter(certificate_id=saved['certificate_id']).count(), len(verification))
+
+    def test_failure_midway_leaves_no_partial_certificate(self):
+        parsing_result, verification = self.verified()
+        del verification[-1]['is_pdf_consistent']  # 마지막 행 구성 중 오류 발생
+
+        with self.captureOnCommitCallbacks(execute=True), self.assertRaises(KeyError):
+            parser.save_certificate_data(parsing_result, verification, self.pdf_file())
+
+        self.assertFalse(CertificateOfAnalysis.objects.exists())
+        self.assertFalse(PesticideResult.objects.exists())
+        # 방금 기록된 파일은 같은 내용의 다른 업로드가 커밋 전일 수 있어 바로 지우지 않고 gc_certificate_files 가 정리
+        orphan = self.stored_files()
+        self.assertEqual(len(orphan), 1)
+        self.assertEqual(storage.collect_garbage(min_age_seconds=0)['names'], orphan)
+        self.assertEqual(self.stored_files(), [])
+
+    def upload(self, content=b'%PDF-1.4 test', **data):
+        parsing_result = parser.parse_certificate_text(self.text)
+        with mock.patch.object(parser, 'parse_certificate_pdf', return_value=parsing_result):
+            return self.client.post('/api/certificates/upload/', dict(data, file=self.pdf_file(content)))
+
+    def test_overwrite_failure_keeps_existing_certificate(self):
+        self.assertEqual(self.upload().status_code, 201)
+        original = CertificateOfAnalysis.objects.get()
+        files_before = self.stored_files()
+
+        with mock.patch.object(PesticideResult.objects, 'bulk_create', side_effect=RuntimeError('db error')), \
+                self.assertLogs('django.request', 'ERROR'):
+            response = self.upload(overwrite='true')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(CertificateOfAnalysis.objects.get().pk, original.pk)
+        self.assertEqual(original.pesticide_results.count(), 35)
+        self.assertEqual(self.stored_files(), files_before)
+
+    def test_overwrite_rollback_with_new_content_leaves_file_for_gc(self):
+        self.assertEqual(self.upload().status_code, 201)
+        original = CertificateOfAnalysis.objects.get()
+        real_save = parser.save_certificate_data
+
+        def save_then_fail(*args):
+            real_save(*args)  # 새 증명서 저장까지는 성공한 뒤 바깥 트랜잭션에서 오류
+            raise RuntimeError('after save')
+
+        # 바깥(덮어쓰기) 트랜잭션이 롤백되면 on_commit 정리는 실행되지 않음
+        with self.captureOnCommitCallbacks(execute=True) as callbacks, \
+                mock.patch.object(parser, 'save_certificate_data', side_effect=save_then_fail), \
+                self.assertLogs('django.request', 'ERROR'):
+            response = self.upload(content=b'%PDF-1.4 corrected', overwrite='true')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(CertificateOfAnalysis.objects.get().pk, original.pk)
+        orphan = [name for name in self.stored_files() if name != original.original_file.name]
+        self.assertEqual(len(orphan), 1)
+
+        self.assertEqual(storage.collect_garbage(min_age_seconds=0)['names'], orphan)
+        self.assertEqual(self.stored_files(), [original.original_file.name])
+
+    def test_overwrite_with_same_content_keeps_shared_file(self):
+        self.assertEqual(self.upload().status_code, 201)
+        original = CertificateOfAnalysis.objects.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(overwrite='true')
+
+        self.assertEqual(response.status_code, 201)
+        replacement = CertificateOfAnalysis.objects.get()
+        self.assertNotEqual(replacement.pk, original.pk)
+        self.assertEqual(replacement.original_file.name, original.original_file.name)
+        self.assertEqual(self.stored_files(), [original.original_file.name])
+
+    def test_overwrite_with_new_content_removes_old_file_after_commit(self):
+        self.assertEqual(self.upload().status_code, 201)
+        old_file = CertificateOfAnalysis.objects.get().original_file.name
+        self.make_old(old_file)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(content=b'%PDF-1.4 corrected', overwrite='true')
+
+        self.assertEqual(response.status_code, 201)
+        replacement = CertificateOfAnalysis.objects.get()
+        self.assertEqual(self.stored_files(), [replacement.original_file.name])
+        self.assertNotIn(old_file, self.stored_files())
@@ -0,0 +1,141 @@
+# pesticide_project/api/tests/test_certificate_storage.py
+# 검정증명서 원본 파일 내용 해시 저장소 / 참조 수 기반 삭제 / gc_certificate_files 테스트
+# command : python manage.py test api.tests.test_certificate_storage --settings=config.settings.test
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api import storage
+from api.models import CertificateOfAnalysis
+
+
+class CertificateStorageTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = media_root
+
+    def certificate(self, number, content=b'%PDF-1.4 same'):
+        return CertificateOfAnalysis.objects.create(
+            certificate_number=number,
+            original_file=SimpleUploadedFile(f"{number}.pdf", content, content_type='application/pdf'),
+        )
+
+    def make_old(self, name):
+        past = time.time() - 7200
+        os.utime(os.path.join(self.media_root, name), (past, past))
+
+    def test_same_content_is_stored_once_in_sharded_path(self):
+        first = self.certificate('A-1')
+        second = self.certificate('A-2')
+
+        digest = hashlib.sha256(b'%PDF-1.4 same').hexdigest()
+        expected = f"certificates/{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+        self.assertEqual(first.original_file.name, expected)
+        self.assertEqual(second.original_file.name, expected)
+        self.assertEqual(list(storage.iter_stored_files(storage.get_certificate_storage())), [expected])
+
+    def test_release_keeps_file_while_referenced(self):
+        first = self.certificate('A-1')
+        second = self.certificate('A-2')
+        name = first.original_file.name
+
+        first.delete()
+        self.assertFalse(storage.release_certificate_file(name))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+
+        second.delete()
+        self.make_old(name)
+        self.assertTrue(storage.release_certificate_file(name))
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, name)))
+
+    def test_release_keeps_recently_stored_file(self):
+        certificate = self.certificate('A-1')
+        name = certificate.original_file.name
+        certificate.delete()
+
+        self.assertFalse(storage.release_certificate_file(name))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+        self.assertTrue(storage.release_certificate_file(name, min_age_seconds=0))
+
+    def test_release_keeps_file_reused_by_uncommitted_upload(self):
+        certificate = self.certificate('A-1')
+        name = certificate.original_file.name
+        self.make_old(name)
+        certificate.delete()
+
+        # 같은 내용을 올린 다른 업로드가 파일 저장(중복 생략)까지 하고 아직 커밋하지 않은 상태
+        self.assertEqual(storage.get_certificate_storage().save('certificates/B-1.pdf',
+                                                                ContentFile(b'%PDF-1.4 same')), name)
+        self.assertFalse(storage.release_certificate_file(name))
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, name)))
+        self.assertEqual(storage.collect_garbage()['deleted'], 0)
+
+    def test_save_reuses_precomputed_digest(self):
+        content = ContentFile(b'%PDF-1.4 x')
+        content.sha256 = hashlib.sha256(b'%PDF-1.4 x').hexdigest()
+        with mock.patch.object(storage, 'file_sha256', side_effect=AssertionError('해시를 다시 계산함')):
+            name = storage.get_certificate_storage().save('certificates/x.pdf', content)
+        self.assertEqual(storage.digest_from_name(name), content.sha256)
+
+    def test_gc_deletes_only_old_unreferenced_files(self):
+        kept = self.certificate('A-1')
+        orphan = self.certificate('A-2', content=b'%PDF-1.4 orphan')
+        recent = self.certificate('A-3', content=b'%PDF-1.4 recent')
+        for certificate in (kept, orphan):
+            self.make_old(certificate.original_file.name)
+        orphan.delete()
+        recent.delete()
+
+        out = io.StringIO()
+        call_command('gc_certificate_files', '--dry-run', stdout=out)
+        self.assertIn(orphan.original_file.name, out.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, orphan.original_file.name)))
+
+        call_command('gc_certificate_files', stdout=io.StringIO())
+        self.assertEqual(
+            sorted(storage.iter_stored_files(storage.get_certificate_storage())),
+            sorted([kept.original_file.name, recent.original_file.name]),
+        )
+
+    def test_migrate_legacy_files_moves_to_hashed_path(self):
+        legacy_storage = storage.get_certificate_storage()
+        for name in ('certificates/a.pdf', 'certificates/b.pdf'):
+            path = legacy_storage.path(name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(b'%PDF-1.4 legacy')
+        CertificateOfAnalysis.objects.bulk_create([
+            CertificateOfAnalysis(certificate_number='L-1', original_file='certificates/a.pdf'),
+            CertificateOfAnalysis(certificate_number='L-2', original_file='certificates/b.pdf'),
+        ])
+
+        stats = storage.migrate_legacy_files()
+
+        self.assertEqual(stats['migrated'], 2)
+        self.assertEqual(stats['deduplicated'], 1)
+        digest = hashlib.sha256(b'%PDF-1.4 legacy').hexdigest()
+        for certificate in CertificateOfAnalysis.objects.all():
+            self.assertEqual(certificate.file_sha256, digest)
+            self.assertTrue(certificate.original_file.name.endswith(f"{digest}.pdf"))
+            self.assertIn(certificate.original_filename, ('a.pdf', 'b.pdf'))
+        self.assertEqual(len(os.listdir(legacy_storage.path('certificates'))), 1)  # 샤딩 디렉토리만 남음
+
+    def test_save_writes_through_temporary_file(self):
+        name = storage.get_certificate_storage().save('certificates/x.pdf', ContentFile(b'%PDF-1.4 x'))
+        directory = os.path.dirname(os.path.join(self.media_root, name))
+        self.assertEqual(os.listdir(directory), [os.path.basename(name)])
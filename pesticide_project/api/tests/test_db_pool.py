@@ -0,0 +1,140 @@
+# pesticide_project/api/tests/test_db_pool.py
+# DB 연결 풀(api/db_pool.py)과 PostgreSQL 백엔드 확장(api/db_backend) 테스트
+# - 실제 PostgreSQL 없이 가짜 연결 객체로 풀 / 상태 확인 / 반납 규칙만 확인
+# command : python manage.py test api.tests.test_db_pool --settings=config.settings.test
+
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+from psycopg2 import extensions
+
+from api import db_pool
+from api.db_backend.base import DatabaseWrapper
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = 0
+        self.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+        self.rolled_back = False
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        self.rolled_back = True
+        self.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def get_transaction_status(self):
+        return self.transaction_status
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def make_pool(self, **options):
+        self.opened = []
+
+        def connect():
+            conn = FakeConnection()
+            self.opened.append(conn)
+            return conn
+        return db_pool.ConnectionPool(connect, **options)
+
+    def test_reuses_returned_connections(self):
+        pool = self.make_pool(max_size=2)
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(len(self.opened), 1)
+        self.assertEqual(pool.stats(), {'size': 1, 'idle': 0, 'in_use': 1})
+
+    def test_broken_expired_and_failed_check_connections_are_replaced(self):
+        pool = self.make_pool(max_size=1, check=lambda conn: not getattr(conn, 'stale', False))
+        conn = pool.getconn()
+        pool.putconn(conn, close=True)
+        self.assertTrue(conn.closed)
+
+        conn = pool.getconn()
+        conn.stale = True
+        pool.putconn(conn)
+        replacement = pool.getconn()
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['size'], 1)
+
+        pool.max_lifetime = 0
+        pool.putconn(replacement)
+        self.assertTrue(replacement.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_waits_for_a_returned_connection_then_times_out(self):
+        pool = self.make_pool(max_size=1, timeout=2.0)
+        conn = pool.getconn()
+        threading.Timer(0.05, pool.putconn, args=(conn,)).start()
+        self.assertIs(pool.getconn(), conn)
+
+        pool.timeout = 0.01
+        with self.assertRaises(db_pool.PoolExhausted):
+            pool.getconn()
+
+    def test_failed_connect_releases_the_slot(self):
+        pool = db_pool.ConnectionPool(mock.Mock(side_effect=OSError), max_size=1, timeout=0.01)
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                pool.getconn()
+        self.assertEqual(pool.stats()['size'], 0)
+
+
+class PooledBackendTests(SimpleTestCase):
+
+    def make_wrapper(self, **settings):
+        settings_dict = {
+            'ENGINE': 'api.db_backend', 'NAME': 'pesticide_db', 'USER': '', 'PASSWORD': '', 'HOST': '',
+            'PORT': '', 'OPTIONS': {}, 'AUTOCOMMIT': True, 'CONN_MAX_AGE': 0, 'TIME_ZONE': None,
+            'ATOMIC_REQUESTS': False, 'TEST': {},
+        }
+        settings_dict.update(settings)
+        return DatabaseWrapper(settings_dict, alias='pool-test')
+
+    def test_close_rolls_back_and_returns_connection_to_pool(self):
+        wrapper = self.make_wrapper()
+        wrapper.pool = pool = db_pool.ConnectionPool(FakeConnection, max_size=1)
+        conn = wrapper.connection = pool.getconn()
+        conn.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+
+        wrapper.close()
+        self.assertTrue(conn.rolled_back)
+        self.assertFalse(conn.closed)
+        self.assertIsNone(wrapper.connection)
+        self.assertEqual(pool.stats(), {'size': 1, 'idle': 1, 'in_use': 0})
+
+    def test_close_inside_atomic_block_discards_connection(self):
+        wrapper = self.make_wrapper()
+        wrapper.pool = pool = db_pool.ConnectionPool(FakeConnection, max_size=1)
+        conn = wrapper.connection = pool.getconn()
+        wrapper.in_atomic_block = True
+
+        wrapper.close()
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_health_check_runs_once_per_request(self):
+        wrapper = self.make_wrapper(CONN_HEALTH_CHECKS=True)
+        wrapper.connection = FakeConnection()
+        wrapper.autocommit = True
+        with mock.patch.object(DatabaseWrapper, 'is_usable', return_value=True) as is_usable:
+            wrapper.close_if_unusable_or_obsolete()  # 요청 시작
+            self.assertEqual(is_usable.call_count, 0)
+            wrapper.ensure_connection()
+            wrapper.ensure_connection()
+            self.assertEqual(is_usable.call_count, 1)
+
+        wrapper.close_if_unusable_or_obsolete()  # 다음 요청
+        stale = wrapper.connection
+        with mock.patch.object(DatabaseWrapper, 'is_usable', return_value=False), \
+                mock.patch.object(DatabaseWrapper, 'connect') as connect:
+            wrapper.ensure_connection()
+        self.assertTrue(stale.closed)
+        connect.assert_called_once()
@@ -0,0 +1,78 @@
+# pesticide_project/api/tests/test_fast_serializer.py
+# 조회 전용 빠른 직렬화(serialize_pesticide_limits) 테스트 - PesticideLimitSerializer 와 JSON 이 완전히 같은지
+# command : python manage.py test api.tests.test_fast_serializer --settings=config.settings.test
+
+import json
+import logging
+from decimal import Decimal
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api import food_categories
+from api.models import FoodCategory, LimitConditionCode, PesticideLimit, User
+from api.serializers import PesticideLimitSerializer, pesticide_limit_values, serialize_pesticide_limits
+from benchmarks.seed import seed_dataset
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+class FastSerializerParityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(scale=0.02)
+        # 조건코드 없음 / 소수 자릿수가 다른 값 (DecimalField 표현 확인)
+        PesticideLimit.objects.create(
+            pesticide_name_kr='무조건농약', pesticide_name_en='Nocondfos', food_name='부추',
+            max_residue_limit=Decimal('2'),
+        )
+        PesticideLimit.objects.create(
+            pesticide_name_kr='무조건농약', pesticide_name_en='Nocondfos', food_name='고추',
+            max_residue_limit=Decimal('0.0005'), condition_code=LimitConditionCode.objects.first(),
+        )
+        cls.user = User.objects.create_user(
+            username='fast', email='fast@example.com', password='pw', organization='test'
+        )
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        food_categories.invalidate()
+        self.addCleanup(food_categories.invalidate)
+
+    def test_all_rows_render_identically(self):
+        queryset = PesticideLimit.objects.select_related('condition_code').order_by('id')
+        expected = PesticideLimitSerializer(queryset, many=True).data
+        actual = serialize_pesticide_limits(pesticide_limit_values(queryset))
+        self.assertEqual(render(actual), render(expected))
+        self.assertTrue(any('condition_code_symbol' not in row for row in actual))
+
+    def test_category_matches_include_matching_type(self):
+        limits = list(PesticideLimit.objects.select_related('condition_code').order_by('id')[:5])
+        for limit in limits:
+            limit.matching_type = 'sub'
+            limit.original_food_name = '청양고추'
+        expected = PesticideLimitSerializer(limits, many=True).data
+        actual = serialize_pesticide_limits(
+            pesticide_limit_values(PesticideLimit.objects.order_by('id')[:5]), 'sub', '청양고추'
+        )
+        self.assertEqual(render(actual), render(expected))
+
+    def test_list_endpoint_uses_the_same_format(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        pesticide = self.dataset['pesticides_kr'][0]
+        category = FoodCategory.objects.get(food_name=self.dataset['category_only_foods'][0])
+
+        direct = client.get('/api/pesticides/', {'pesticide': pesticide, 'food': '부추'})
+        queryset = PesticideLimit.objects.filter(pesticide_name_kr__icontains=pesticide, food_name__iexact='부추')
+        self.assertEqual(direct.json(), json.loads(render(PesticideLimitSerializer(queryset, many=True).data)))
+
+        fallback = client.get('/api/pesticides/', {'pesticide': pesticide, 'food': category.food_name})
+        self.assertEqual(fallback.status_code, 200)
+        self.assertIn(fallback.json()[0]['matching_type'], ('sub', 'main'))
+        self.assertEqual(fallback.json()[0]['original_food_name'], category.food_name)
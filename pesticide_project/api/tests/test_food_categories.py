@@ -0,0 +1,67 @@
+# pesticide_project/api/tests/test_food_categories.py
+# 식품 분류 CSV 적재(bulk_create)와 메모리 분류 맵 테스트 - 대체 조회에 쿼리가 없는지, 변경 시 무효화되는지
+# command : python manage.py test api.tests.test_food_categories --settings=config.settings.test
+
+import io
+import logging
+import os
+import tempfile
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from api import food_categories
+from api.models import FoodCategory
+
+
+class FoodCategoryTests(TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        food_categories.invalidate()
+        self.addCleanup(food_categories.invalidate)
+
+    def write_csv(self, content):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_import_bundled_file(self):
+        FoodCategory.objects.create(food_name='이전품목', main_category='이전분류')
+        out = io.StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_food_categories', stdout=out)
+
+        rows = food_categories.read_categories()
+        self.assertEqual(FoodCategory.objects.count(), len(rows))
+        self.assertIn(f'{len(rows):,}행', out.getvalue())
+        self.assertFalse(FoodCategory.objects.filter(food_name='이전품목').exists())
+        self.assertEqual(food_categories.lookup('갈파래'), ('해조류', '조류'))
+        self.assertEqual(food_categories.lookup('귀리'), (None, '곡류'))
+        # 여러 분류에 있는 품목은 먼저 등록된 행 사용
+        self.assertEqual(food_categories.lookup('완두'), (None, '두류'))
+
+    def test_lookup_uses_memory_map(self):
+        FoodCategory.objects.create(food_name='Kale', sub_category='엽채류', main_category='채소류')
+        food_categories.get_hierarchy()
+        with self.assertNumQueries(0):
+            self.assertEqual(food_categories.lookup('kale'), ('엽채류', '채소류'))
+            self.assertEqual(food_categories.candidates('KALE'), ['KALE', '엽채류', '채소류'])
+            self.assertEqual(food_categories.candidates('없는품목'), ['없는품목', None, None])
+
+    def test_save_and_delete_invalidate_map(self):
+        self.assertIsNone(food_categories.lookup('상추'))
+        category = FoodCategory.objects.create(food_name='상추', sub_category='엽채류', main_category='채소류')
+        self.assertEqual(food_categories.lookup('상추'), ('엽채류', '채소류'))
+        category.delete()
+        self.assertIsNone(food_categories.lookup('상추'))
+
+    def test_invalid_file_is_rejected(self):
+        FoodCategory.objects.create(food_name='상추', sub_category='엽채류', main_category='채소류')
+        for content in ('food_name,main_category\n상추,채소류\n', 'main_category,sub_category,food_name\n,,상추\n'):
+            with self.assertRaises(CommandError):
+                call_command('import_food_categories', file=self.write_csv(content), stdout=io.StringIO())
+        self.assertEqual(FoodCategory.objects.count(), 1)
@@ -0,0 +1,160 @@
+# pesticide_project/api/tests/test_logging.py
+# 로깅 테스트 - JsonFormatter, QueueListenerHandler(리스너 스레드 포맷팅), 요청 로그 경로별 샘플링 (5xx 는 항상 기록)
+# command : python manage.py test api.tests.test_logging --settings=config.settings.test
+
+import json
+import logging
+import sys
+from unittest import mock
+
+from django.http import HttpResponse, HttpResponseServerError
+from django.test import SimpleTestCase, override_settings
+from django.urls import path
+
+from api.logging_utils import JsonFormatter, QueueListenerHandler
+from api.middleware import get_sample_rate
+
+
+def ok_view(request):
+    return HttpResponse('ok')
+
+
+def error_view(request):
+    return HttpResponseServerError('error')
+
+
+urlpatterns = [
+    path('api/ok/', ok_view),
+    path('api/error/', error_view),
+]
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.messages = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.messages.append(self.format(record))
+
+
+def make_record(msg='%s %s', args=('GET', '/api/'), exc_info=None, **extra):
+    record = logging.LogRecord('api.requests', logging.INFO, __file__, 1, msg, args, exc_info)
+    record.__dict__.update(extra)
+    return record
+
+
+class JsonFormatterTests(SimpleTestCase):
+
+    def test_includes_base_and_extra_fields_on_one_line(self):
+        record = make_record(status=200, duration_ms=1.5, route='api/', _private='x', obj=object)
+        line = JsonFormatter().format(record)
+
+        self.assertNotIn('\n', line)
+        payload = json.loads(line)
+        self.assertEqual(payload['level'], 'INFO')
+        self.assertEqual(payload['logger'], 'api.requests')
+        self.assertEqual(payload['message'], 'GET /api/')
+        self.assertEqual((payload['status'], payload['duration_ms'], payload['route']), (200, 1.5, 'api/'))
+        self.assertEqual(payload['obj'], str(object))  # JSON 으로 바꿀 수 없는 값은 문자열
+        self.assertNotIn('_private', payload)
+        self.assertNotIn('args', payload)  # LogRecord 기본 속성은 제외
+
+    def test_exception_is_formatted(self):
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            record = make_record(exc_info=sys.exc_info())
+        payload = json.loads(JsonFormatter().format(record))
+        self.assertIn('ValueError: boom', payload['exc_info'])
+
+    def test_korean_is_not_escaped(self):
+        self.assertIn('검색', JsonFormatter().format(make_record(msg='검색', args=())))
+
+
+class QueueListenerHandlerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.target = ListHandler()
+        self.target.setFormatter(logging.Formatter('%(message)s'))
+        self.handler = QueueListenerHandler([self.target])
+        self.addCleanup(self.handler._stop_listener)
+
+    def test_records_are_formatted_by_listener_thread(self):
+        self.handler.handle(make_record())
+        self.handler._stop_listener()  # 큐를 비운 뒤 리스너 종료
+
+        self.assertEqual(self.target.messages, ['GET /api/'])
+        # 기본 타입 인자는 그대로 넘겨 포맷팅을 리스너 스레드로 미룸
+        self.assertEqual(self.target.records[0].args, ('GET', '/api/'))
+
+    def test_mutable_args_are_frozen_at_enqueue_time(self):
+        items = ['a']
+        self.handler.handle(make_record(msg='%s', args=(items,)))
+        items.append('b')
+        self.handler._stop_listener()
+
+        self.assertEqual(self.target.messages, ["['a']"])
+        self.assertIsNone(self.target.records[0].args)
+
+    def test_full_queue_drops_records_without_blocking(self):
+        handler = QueueListenerHandler([self.target], queue_size=1)
+        handler._stop_listener()
+        handler.handle(make_record())
+        handler.handle(make_record())  # 큐가 가득 차도 예외/대기 없음
+        self.assertEqual(handler.queue.qsize(), 1)
+
+    def test_handler_level_respected(self):
+        self.target.setLevel(logging.WARNING)
+        self.handler.handle(make_record())
+        self.handler._stop_listener()
+        self.assertEqual(self.target.records, [])
+
+
+class SampleRateTests(SimpleTestCase):
+
+    def test_longest_prefix_wins(self):
+        rates = {'/api/': 0.5, '/api/pesticides/autocomplete/': 0.05}
+        self.assertEqual(get_sample_rate('/api/pesticides/autocomplete/', rates), 0.05)
+        self.assertEqual(get_sample_rate('/api/pesticides/', rates), 0.5)
+        self.assertEqual(get_sample_rate('/metrics', rates), 1.0)
+
+
+@override_settings(ROOT_URLCONF=__name__, MIDDLEWARE=['api.middleware.RequestLoggingMiddleware'])
+class RequestLoggingMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        # 500 응답에 대한 django.request 오류 로그는 이 테스트 대상이 아님
+        django_request = logging.getLogger('django.request')
+        self.addCleanup(django_request.setLevel, django_request.level)
+        django_request.setLevel(logging.CRITICAL)
+
+    @override_settings(REQUEST_LOG_SAMPLE_RATES={'/api/': 0})
+    def test_rate_zero_drops_success_but_always_logs_5xx(self):
+        with self.assertLogs('api.requests', 'INFO') as logs:
+            self.assertEqual(self.client.get('/api/ok/').status_code, 200)
+            self.assertEqual(self.client.get('/api/error/').status_code, 500)
+
+        [record] = logs.records
+        self.assertEqual((record.path, record.status, record.route), ('/api/error/', 500, 'api/error/'))
+        self.assertEqual(record.sample_rate, 0)
+        self.assertEqual(record.method, 'GET')
+        self.assertGreaterEqual(record.duration_ms, 0)
+
+    @override_settings(REQUEST_LOG_SAMPLE_RATES={})
+    def test_default_rate_logs_every_request(self):
+        with self.assertLogs('api.requests', 'INFO') as logs:
+            self.client.get('/api/ok/')
+            self.client.get('/api/error/')
+        self.assertEqual([record.status for record in logs.records], [200, 500])
+
+    @override_settings(REQUEST_LOG_SAMPLE_RATES={'/api/ok/': 0.25})
+    def test_partial_rate_uses_random_draw(self):
+        with self.assertLogs('api.requests', 'INFO') as logs, \
+                mock.patch('api.middleware.random.random', side_effect=[0.1, 0.9]):
+            self.client.get('/api/ok/')  # 0.1 < 0.25 → 기록
+            self.client.get('/api/ok/')  # 0.9 >= 0.25 → 생략
+            self.client.get('/api/error/')  # 5xx 는 추첨 없이 기록
+        self.assertEqual([(record.status, record.sample_rate) for record in logs.records], [(200, 0.25), (500, 1.0)])
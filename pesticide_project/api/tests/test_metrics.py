@@ -0,0 +1,178 @@
+# pesticide_project/api/tests/test_metrics.py
+# 메트릭 레지스트리 테스트 - 히스토그램 버킷, 워커별 스냅샷 합산, 종료 워커 누적, Prometheus 텍스트 출력, 캐시 적중 기록
+# command : python manage.py test api.tests.test_metrics --settings=config.settings.test
+
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api import food_categories, metrics
+from api.metrics import MetricsRegistry
+
+
+class HistogramTests(SimpleTestCase):
+
+    def test_values_fall_into_le_buckets(self):
+        registry = MetricsRegistry()
+        buckets = (0.1, 0.5, 1.0)
+        for value in (0.05, 0.1, 0.3, 1.0, 2.0):
+            registry.observe('latency', value, buckets=buckets, route='r')
+
+        [[name, labels, state]] = registry.snapshot()['histograms']
+        self.assertEqual((name, labels), ('latency', [('route', 'r')]))
+        # [le=0.1, le=0.5, le=1.0, +Inf, 합계, 개수] - 경계값은 해당 버킷에 포함 (Prometheus le 의미)
+        self.assertEqual(state[:4], [2, 1, 1, 1])
+        self.assertAlmostEqual(state[4], 3.45)
+        self.assertEqual(state[5], 5)
+        self.assertEqual(registry.snapshot()['buckets'], {'latency': [0.1, 0.5, 1.0]})
+
+
+class MultiprocessMergeTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        settings_override = override_settings(METRICS_MULTIPROC_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+
+        self.addCleanup(metrics._retired.__setitem__, 0, False)
+
+    def write_worker(self, pid, registry, started=1):
+        path = os.path.join(self.directory, f"metrics-{pid}-{started}.json")
+        with open(path, 'w') as f:
+            json.dump(registry.snapshot(), f)
+        return path
+
+    def requests_total(self, snapshots=None):
+        counters, _, _ = metrics._merge(metrics.collect() if snapshots is None else snapshots)
+        return sum(value for (name, _), value in counters.items() if name == 'http_requests_total')
+
+    def test_collect_merges_worker_snapshots(self):
+        for pid, (count, value) in {101: (2, 0.02), 102: (3, 0.2)}.items():
+            worker = MetricsRegistry()
+            worker.inc('http_requests_total', count, route='api/', method='GET', status='2xx')
+            worker.observe('http_request_duration_seconds', value, route='api/', method='GET')
+            self.write_worker(pid, worker)
+        with open(os.path.join(self.directory, 'metrics-103-1.json'), 'w') as f:
+            f.write('{"counters": ')  # 교체 중인(반쯤 쓰인) 파일은 건너뜀
+        with open(os.path.join(self.directory, 'other.json'), 'w') as f:
+            f.write('{}')
+        metrics.registry.inc('http_requests_total', route='api/', method='GET', status='5xx')
+
+        # 현재 프로세스 스냅샷도 파일로 기록된 뒤 합산
+        counters, histograms, _ = metrics._merge(metrics.collect())
+        self.assertTrue(os.path.exists(metrics.snapshot_path(self.directory)))
+        labels = (('method', 'GET'), ('route', 'api/'))
+        self.assertEqual(counters[('http_requests_total', labels + (('status', '2xx'),))], 5)
+        self.assertEqual(counters[('http_requests_total', labels + (('status', '5xx'),))], 1)
+        state = histograms[('http_request_duration_seconds', labels)]
+        self.assertEqual(state[-1], 2)
+        self.assertAlmostEqual(state[-2], 0.22)
+        self.assertEqual(state[metrics.LATENCY_BUCKETS.index(0.025)], 1)
+        self.assertEqual(state[metrics.LATENCY_BUCKETS.index(0.25)], 1)
+
+
+    def test_reused_pid_does_not_overwrite_previous_snapshot(self):
+        for started in (1, 2):
+            worker = MetricsRegistry()
+            worker.inc('http_requests_total', 3, route='api/', method='GET', status='2xx')
+            self.write_worker(101, worker, started)
+        self.assertEqual(self.requests_total(), 6)
+
+    def test_exiting_worker_is_folded_into_accumulated_file(self):
+        previous = MetricsRegistry()
+        previous.inc('http_requests_total', 2, route='api/', method='GET', status='2xx')
+        self.write_worker(101, previous)
+        with mock.patch('os.kill', side_effect=ProcessLookupError):
+            metrics.retire_dead_processes(self.directory)
+
+        metrics.registry.inc('http_requests_total', 5, route='api/', method='GET', status='2xx')
+        metrics.flush(force=True)
+        metrics.retire_process()
+
+        # 마지막 flush 이후 값까지 합쳐지고 워커 스냅샷은 삭제됨 - 이후 기록하지 않음
+        self.assertEqual(sorted(os.listdir(self.directory)), [metrics.ACCUMULATED_FILE, 'metrics.lock'])
+        metrics.registry.inc('http_requests_total', route='api/', method='GET', status='2xx')
+        metrics.flush(force=True)
+        self.assertEqual(self.requests_total(), 7)
+
+    def test_live_processes_are_not_folded(self):
+        worker = MetricsRegistry()
+        worker.inc('http_requests_total', route='api/', method='GET', status='2xx')
+        path = self.write_worker(os.getpid(), worker, started=0)
+        metrics.retire_dead_processes(self.directory)
+        self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, metrics.ACCUMULATED_FILE)))
+
+
+class RenderPrometheusTests(SimpleTestCase):
+
+    def test_render_counters_and_cumulative_histograms(self):
+        registry = MetricsRegistry()
+        registry.inc('cache_requests_total', 3, cache='mrl_matrix', result='hit')
+        registry.observe('db_queries_per_request', 1, buckets=(0, 1, 5), route='a"b')
+        registry.observe('db_queries_per_request', 7, buckets=(0, 1, 5), route='a"b')
+
+        self.assertEqual(metrics.render_prometheus([registry.snapshot()]), '\n'.join([
+            '# HELP cache_requests_total 캐시 조회 수 (result=hit|miss)',
+            '# TYPE cache_requests_total counter',
+            'cache_requests_total{cache="mrl_matrix",result="hit"} 3',
+            '# HELP db_queries_per_request 요청당 DB 쿼리 수',
+            '# TYPE db_queries_per_request histogram',
+            'db_queries_per_request_bucket{route="a\\"b",le="0"} 0',
+            'db_queries_per_request_bucket{route="a\\"b",le="1"} 1',
+            'db_queries_per_request_bucket{route="a\\"b",le="5"} 1',
+            'db_queries_per_request_bucket{route="a\\"b",le="+Inf"} 2',
+            'db_queries_per_request_sum{route="a\\"b"} 8',
+            'db_queries_per_request_count{route="a\\"b"} 2',
+        ]) + '\n')
+
+    def test_render_merges_snapshots(self):
+        snapshots = []
+        for _ in range(2):
+            registry = MetricsRegistry()
+            registry.inc('http_requests_total', route='r', method='GET', status='2xx')
+            snapshots.append(registry.snapshot())
+        self.assertIn('http_requests_total{method="GET",route="r",status="2xx"} 2',
+                      metrics.render_prometheus(snapshots))
+
+
+@override_settings(METRICS_MULTIPROC_DIR='')
+class CacheMetricsTests(TestCase):
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+        food_categories.invalidate()
+        self.addCleanup(food_categories.invalidate)
+
+    def cache_counts(self, cache_name):
+        counts = {}
+        for name, labels, value in metrics.registry.snapshot()['counters']:
+            labels = dict(labels)
+            if name == 'cache_requests_total' and labels['cache'] == cache_name:
+                counts[labels['result']] = value
+        return counts
+
+    def test_food_category_map_records_hits_and_misses(self):
+        food_categories.get_hierarchy()
+        food_categories.get_hierarchy()
+        food_categories.lookup('사과')
+        self.assertEqual(self.cache_counts('food_categories'), {'miss': 1, 'hit': 2})
+
+        food_categories.invalidate()
+        food_categories.get_hierarchy()
+        self.assertEqual(self.cache_counts('food_categories'), {'miss': 2, 'hit': 2})
+
+    def test_metrics_endpoint_renders_cache_counters(self):
+        food_categories.get_hierarchy()
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('cache_requests_total{cache="food_categories",result="miss"} 1', response.content.decode())
@@ -0,0 +1,112 @@
+# pesticide_project/api/tests/test_mrl_import.py
+# 잔류허용기준 CSV 적재 테스트 - 벡터화 검증(#VALUE! 등), 제한조건 코드 선적재, bulk_create 적재, 명령어 출력
+# command : python manage.py test api.tests.test_mrl_import --settings=config.settings.test
+
+import io
+import logging
+import os
+import tempfile
+from decimal import Decimal
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from api import mrl_import
+from api.models import LimitConditionCode, MRLRelease, PesticideLimit
+
+HEADER = '농약명(한글),농약명(영어),식품명,잔류허용기준(mg/kg),max_residue_limit,condition_code\n'
+VALID_CSV = HEADER + (
+    '가스가마이신,Kasugamycin,감자,0.05,0.05,\n'
+    '가스가마이신,Kasugamycin,고추, 0.3†,0.3,†\n'
+    '아세타미프리드,Acetamiprid,부추,3.0E,3,E\n'
+)
+SPEC_CSV = os.path.join(os.path.dirname(mrl_import.__file__), 'management', 'commands', '3차가공_pesticide_spec_20241114.csv')
+
+
+class ReadMRLCsvTests(TestCase):
+
+    def test_normalizes_values(self):
+        df = mrl_import.read_mrl_csv(io.StringIO(VALID_CSV))
+        self.assertEqual(list(df['max_residue_limit']), ['0.050', '0.300', '3.000'])
+        self.assertEqual(list(df['condition_code']), [None, '†', 'E'])
+
+    def test_reports_every_invalid_row(self):
+        csv = HEADER + (
+            '가스가마이신,Kasugamycin,감자,0.05,0.05,\n'
+            '가스가마이신,Kasugamycin,고추,#VALUE!,#VALUE!,\n'
+            '가스가마이신,Kasugamycin,부추,,,\n'
+            ',Kasugamycin,배,0.1,0.1,\n'
+            '가스가마이신,Kasugamycin,감자,0.07,0.07,\n'
+        )
+        with self.assertRaises(mrl_import.MRLSpecError) as raised:
+            mrl_import.read_mrl_csv(io.StringIO(csv))
+        self.assertEqual(
+            [(error['row_number'], error['reason']) for error in raised.exception.errors],
+            [(3, '엑셀 수식 오류(#VALUE!)'), (4, '잔류허용기준 값 없음'), (5, '농약명(한글) 없음'),
+             (6, '같은 농약/식품 쌍이 이미 있음')],
+        )
+
+    def test_missing_column(self):
+        with self.assertRaises(mrl_import.MRLSpecError) as raised:
+            mrl_import.read_mrl_csv(io.StringIO('농약명(한글),식품명\n가스가마이신,감자\n'))
+        self.assertEqual(raised.exception.errors[0]['reason'], '필수 열 누락')
+
+    def test_bundled_spec_is_valid(self):
+        df = mrl_import.read_mrl_csv(SPEC_CSV)
+        self.assertGreater(len(df), 10000)
+
+
+class LoadLimitsTests(TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        LimitConditionCode.objects.create(code='E', description='기존 설명')
+        PesticideLimit.objects.create(
+            pesticide_name_kr='이전농약', pesticide_name_en='Old', food_name='감자', max_residue_limit=1,
+        )
+
+    def test_replaces_limits_and_adds_missing_codes(self):
+        result = mrl_import.load_limits(mrl_import.read_mrl_csv(io.StringIO(VALID_CSV)), chunk_size=2)
+        self.assertEqual((result['rows'], result['deleted'], result['method']), (3, 1, 'bulk'))
+        self.assertEqual(result['condition_codes_created'], ['†'])
+        self.assertEqual(LimitConditionCode.objects.get(code='E').description, '기존 설명')
+
+        limits = {(limit.food_name, limit.max_residue_limit, limit.condition_code_id)
+                  for limit in PesticideLimit.objects.all()}
+        self.assertEqual(limits, {('감자', Decimal('0.050'), None), ('고추', Decimal('0.300'), '†'),
+                                  ('부추', Decimal('3.000'), 'E')})
+
+    def test_append_and_copy_requires_postgresql(self):
+        df = mrl_import.read_mrl_csv(io.StringIO(VALID_CSV))
+        mrl_import.load_limits(df, replace=False)
+        self.assertEqual(PesticideLimit.objects.count(), 4)
+        with self.assertRaises(ValueError):
+            mrl_import.load_limits(df, method='copy')
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('import_mrl_spec', SPEC_CSV, '--direct', stdout=out)
+        self.assertIn('rows/s', out.getvalue())
+        self.assertGreater(PesticideLimit.objects.count(), 10000)
+        self.assertFalse(PesticideLimit.objects.filter(food_name='감자', pesticide_name_kr='이전농약').exists())
+
+    def test_direct_load_is_refused_once_releases_exist(self):
+        MRLRelease.objects.create(label='staged')
+        df = mrl_import.read_mrl_csv(io.StringIO(VALID_CSV))
+        with self.assertRaises(ValueError):
+            mrl_import.load_limits(df)
+        with self.assertRaisesMessage(CommandError, '릴리스로 관리 중'):
+            call_command('import_mrl_spec', SPEC_CSV, '--direct', stdout=io.StringIO())
+        self.assertEqual(list(PesticideLimit.objects.values_list('pesticide_name_kr', flat=True)), ['이전농약'])
+        self.assertFalse(LimitConditionCode.objects.filter(code='†').exists())
+
+    def test_command_rejects_invalid_csv_without_loading(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False) as f:
+            f.write(HEADER + '가스가마이신,Kasugamycin,고추,#VALUE!,#VALUE!,\n')
+        self.addCleanup(os.remove, f.name)
+        err = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('import_mrl_spec', f.name, stderr=err)
+        self.assertIn('행 2', err.getvalue())
+        self.assertEqual(PesticideLimit.objects.count(), 1)
@@ -0,0 +1,180 @@
+# pesticide_project/api/tests/test_mrl_matrix.py
+# MRL 행렬과 벡터화 판정 테스트 - 업로드 검증(verify_pesticide_results)이 행렬로 판정하고 결과가 일치하는지
+# command : python manage.py test api.tests.test_mrl_matrix --settings=config.settings.test
+
+import logging
+import shutil
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from api import certificate_parser as parser
+from api import food_categories, mrl_matrix
+from api.models import CertificateOfAnalysis, LimitConditionCode, PesticideLimit
+from benchmarks.bench_parser import load_text_fixtures
+from benchmarks.seed import CATEGORY_TREE, seed_dataset
+
+
+class MRLMatrixTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(scale=0.02)
+        cls.parsing_result = parser.parse_certificate_text(load_text_fixtures()['many_detections'])
+        cls.parsing_result['is_plant_material'] = False
+        # 픽스처 농약 중 합성 데이터에 없는 것도 기준을 두어 모든 행이 표준명 정확 매칭이 되도록
+        # (DB 에 없는 농약은 검증 로직만 부분/퍼지 매칭과 PDF 값 대체를 하므로 행렬과 비교 대상이 아님)
+        sub_categories = [sub for subs in CATEGORY_TREE.values() for sub in subs]
+        PesticideLimit.objects.bulk_create([
+            PesticideLimit(pesticide_name_kr='플로니카미드', pesticide_name_en='Flonicamid', food_name=food,
+                           max_residue_limit=Decimal('2.0'))
+            for food in ['고추'] + sub_categories
+        ])
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        mrl_matrix.invalidate()
+        self.addCleanup(mrl_matrix.invalidate)
+        food_categories.invalidate()
+        self.addCleanup(food_categories.invalidate)
+        # 검증 로직의 기준 조회는 모두 프로세스 안에서 처리되어야 함
+        patcher = mock.patch('requests.get', side_effect=AssertionError('HTTP 호출 없이 검증해야 함'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def detections(self, parsing_result=None):
+        parsing_result = parsing_result or self.parsing_result
+        return [
+            (row.get('standard_pesticide_name_for_db', row['pesticide_name']), row['detection_value'])
+            for row in parsing_result['pesticide_results']
+        ]
+
+    def assertSameRows(self, evaluation, expected):
+        """행렬 판정과 verify_pesticide_results 의 DB 기준 판정이 모든 행에서 같은지"""
+        self.assertEqual(len(evaluation), len(expected))
+        fields = ('standard_pesticide_name', 'db_korea_mrl', 'db_korea_mrl_display', 'db_calculated_result')
+        self.assertEqual(
+            [tuple(row[field] for field in fields) for row in evaluation.rows()],
+            [tuple(row[field] for field in fields) for row in expected],
+        )
+
+    def test_matches_verify_pesticide_results(self):
+        # 픽스처는 친환경 검정 (검정목적: 친환경인증)
+        expected = parser.verify_pesticide_results(self.parsing_result)
+        evaluation = mrl_matrix.evaluate(self.detections(), self.parsing_result['sample_description'], eco_friendly=True)
+        self.assertSameRows(evaluation, expected)
+
+    def test_general_purpose_matches_verify_pesticide_results(self):
+        parsing_result = dict(self.parsing_result, analytical_purpose='참고용')
+        expected = parser.verify_pesticide_results(parsing_result)
+        evaluation = mrl_matrix.evaluate(self.detections(), parsing_result['sample_description'])
+        self.assertIn('부적합', [row['db_calculated_result'] for row in expected])  # 기준 초과 행 포함
+        self.assertSameRows(evaluation, expected)
+
+    def test_category_only_food_matches_verify_pesticide_results(self):
+        food = self.dataset['category_only_foods'][0]
+        parsing_result = dict(self.parsing_result, analytical_purpose='참고용', sample_description=food)
+        expected = parser.verify_pesticide_results(parsing_result)
+        evaluation = mrl_matrix.evaluate(self.detections(), food)
+        self.assertSameRows(evaluation, expected)
+        # 품목 자체 기준은 없고 모두 소분류 기준 (PLS 로 떨어지는 행 없음)
+        self.assertEqual({row['matching_type'] for row in evaluation.rows()}, {'sub'})
+
+    def test_mapped_food_name_matches_verify_pesticide_results(self):
+        # '깻잎' 기준은 없고 매핑된 '들깻잎' 기준으로 판정
+        pesticide_en = self.dataset['pesticides'][0]
+        self.assertFalse(PesticideLimit.objects.filter(food_name='깻잎').exists())
+        limit = PesticideLimit.objects.get(pesticide_name_en=pesticide_en, food_name='들깻잎')
+        parsing_result = {
+            'analytical_purpose': '참고용', 'sample_description': '깻잎', 'is_plant_material': False,
+            'pesticide_results': [{'pesticide_name': pesticide_en, 'detection_value': '0.2', 'korea_mrl': None,
+                                   'korea_mrl_text': '', 'result_opinion': '적합'}],
+        }
+        expected = parser.verify_pesticide_results(parsing_result)
+        evaluation = mrl_matrix.evaluate(self.detections(parsing_result), '깻잎')
+        self.assertSameRows(evaluation, expected)
+        self.assertEqual(evaluation.rows()[0]['db_korea_mrl'], limit.max_residue_limit)
+        self.assertEqual(evaluation.rows()[0]['matching_type'], 'direct')
+
+    def test_verifier_judges_through_matrix(self):
+        with mock.patch.object(mrl_matrix.MRLMatrix, 'evaluate_batch', autospec=True,
+                               side_effect=mrl_matrix.MRLMatrix.evaluate_batch) as evaluate_batch:
+            parser.verify_certificates([self.parsing_result, dict(self.parsing_result, analytical_purpose='참고용')])
+        evaluate_batch.assert_called_once()  # 두 증명서의 모든 검출 행을 한 번에 판정
+
+    def test_uploaded_certificate_agrees_with_matrix(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        parsing_result = dict(self.parsing_result, analytical_purpose='참고용')
+        pdf_file = SimpleUploadedFile('test.pdf', b'%PDF-1.4 test', content_type='application/pdf')
+        with override_settings(MEDIA_ROOT=media_root), \
+                mock.patch.object(parser, 'parse_certificate_pdf', return_value=parsing_result):
+            response = self.client.post('/api/certificates/upload/', {'file': pdf_file})
+        self.assertEqual(response.status_code, 201)
+
+        certificate = CertificateOfAnalysis.objects.get()
+        saved = list(certificate.pesticide_results.order_by('id'))
+        evaluation = mrl_matrix.evaluate(
+            [(result.standard_pesticide_name, result.detection_value) for result in saved],
+            certificate.sample_description,
+        )
+        self.assertEqual(
+            [(result.db_korea_mrl, result.db_calculated_result) for result in saved],
+            [(row['db_korea_mrl'], row['db_calculated_result']) for row in evaluation.rows()],
+        )
+        self.assertIn('부적합', [result.db_calculated_result for result in saved])
+
+    def test_fallback_limit_replaces_pls_only_without_db_limit(self):
+        PesticideLimit.objects.create(
+            pesticide_name_kr='경계농약', pesticide_name_en='Boundaryzole', food_name='경계품목',
+            max_residue_limit=Decimal('0.05'),
+        )
+        evaluation = mrl_matrix.evaluate(
+            [('Boundaryzole', '0.2', Decimal('0.3')), ('Unknownfos', '0.2', Decimal('0.3')),
+             ('Unknownfos', '0.2', None)],
+            '경계품목',
+        )
+        self.assertEqual(evaluation.compliant.tolist(), [False, True, False])
+        self.assertEqual([row['mrl_source'] for row in evaluation.rows()], ['db', 'pdf', 'pls'])
+        self.assertEqual(evaluation.limit(1), Decimal('0.300'))
+
+    def test_boundaries_are_exact(self):
+        PesticideLimit.objects.create(
+            pesticide_name_kr='경계농약', pesticide_name_en='Boundaryzole', food_name='경계품목',
+            max_residue_limit=Decimal('0.05'), condition_code=LimitConditionCode.objects.first(),
+        )
+        evaluation = mrl_matrix.evaluate(
+            [('boundaryzole', '0.05'), ('경계농약', '0.0500001'), ('Boundaryzole', 0.049), ('Unknownfos', '0.01')],
+            '경계품목',
+        )
+        self.assertEqual(evaluation.compliant.tolist(), [True, False, True, True])
+        self.assertEqual(evaluation.has_limit.tolist(), [True, True, True, False])
+        self.assertEqual(evaluation.rows()[3]['db_korea_mrl_display'], 'PLS 0.01')
+        self.assertTrue(evaluation.rows()[0]['db_korea_mrl_display'].startswith('0.05('))
+
+        eco = mrl_matrix.evaluate([('Boundaryzole', '0.0099'), ('Boundaryzole', '0.01')], '경계품목', eco_friendly=True)
+        self.assertEqual(eco.compliant.tolist(), [True, False])
+
+    def test_batch_equals_individual_evaluations(self):
+        certificates = [
+            (self.detections(), self.parsing_result['sample_description'], False),
+            (self.detections()[:3], '없는품목', False),
+            ([], '부추', False),
+            (self.detections()[:5], self.parsing_result['sample_description'], True),
+        ]
+        batch = mrl_matrix.evaluate_batch(certificates)
+        for evaluation, (detections, food, eco) in zip(batch, certificates):
+            self.assertEqual(evaluation.rows(), mrl_matrix.evaluate(detections, food, eco).rows())
+
+    def test_saving_a_limit_invalidates_the_matrix(self):
+        matrix = mrl_matrix.get_matrix()
+        self.assertIs(mrl_matrix.get_matrix(), matrix)
+        PesticideLimit.objects.create(
+            pesticide_name_kr='새농약', pesticide_name_en='Newfos', food_name='부추', max_residue_limit=Decimal('1.0'),
+        )
+        self.assertIsNot(mrl_matrix.get_matrix(), matrix)
+        self.assertEqual(mrl_matrix.get_matrix().limit('Newfos', '부추'), (Decimal('1'), ''))
@@ -0,0 +1,124 @@
+# pesticide_project/api/tests/test_mrl_release.py
+# 잔류허용기준 릴리스 테스트 - 적재(staged) 후 적용 시 pesticide_limits 일괄 교체, 삭제 비율 검사, 롤백, MRL 행렬 갱신
+# command : python manage.py test api.tests.test_mrl_release --settings=config.settings.test
+
+import io
+import logging
+import os
+import tempfile
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api import mrl_import, mrl_matrix, mrl_release
+from api.models import LimitConditionCode, MRLRelease, PesticideLimit
+
+HEADER = '농약명(한글),농약명(영어),식품명,잔류허용기준(mg/kg),max_residue_limit,condition_code\n'
+RELEASE_1 = HEADER + (
+    '가스가마이신,Kasugamycin,감자,0.05,0.05,\n'
+    '가스가마이신,Kasugamycin,고추,0.3,0.3,\n'
+    '아세타미프리드,Acetamiprid,부추,3.0,3,\n'
+)
+RELEASE_2 = HEADER + (
+    '가스가마이신,Kasugamycin,감자,0.05,0.05,\n'
+    '가스가마이신,Kasugamycin,고추,0.5T,0.5,T\n'
+    '아세타미프리드,Acetamiprid,부추,3.0,3,\n'
+    '아세타미프리드,Acetamiprid,배추,2.0,2,\n'
+)
+
+
+def stage(csv, label):
+    return mrl_release.stage_release(mrl_import.read_mrl_csv(io.StringIO(csv)), label)
+
+
+def live():
+    return {(limit.food_name, limit.max_residue_limit, limit.condition_code_id)
+            for limit in PesticideLimit.objects.filter(pesticide_name_kr='가스가마이신')}
+
+
+class MRLReleaseTests(TestCase):
+
+    def setUp(self):
+        logging.disable(logging.INFO)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        mrl_matrix.invalidate()
+        self.addCleanup(mrl_matrix.invalidate)
+        PesticideLimit.objects.create(
+            pesticide_name_kr='가스가마이신', pesticide_name_en='Kasugamycin', food_name='감자', max_residue_limit=1,
+        )
+
+    def test_staging_does_not_touch_live_table(self):
+        release = stage(RELEASE_1, 'r1')
+        self.assertEqual(release.status, MRLRelease.STATUS_STAGED)
+        self.assertEqual(release.limits.count(), 3)
+        self.assertEqual(live(), {('감자', Decimal('1.000'), None)})
+
+    def test_activate_swaps_and_keeps_previous_data(self):
+        summary = mrl_release.activate_release(stage(RELEASE_1, 'r1'))
+        self.assertEqual(summary, {'rows': 3, 'live_rows': 1, 'added': 2, 'changed': 1, 'removed': 0})
+        self.assertEqual(live(), {('감자', Decimal('0.050'), None), ('고추', Decimal('0.300'), None)})
+
+        # 첫 적용 전 데이터는 retired 릴리스로 보관
+        snapshot = MRLRelease.objects.get(status=MRLRelease.STATUS_RETIRED)
+        self.assertEqual(snapshot.row_count, 1)
+
+        mrl_release.activate_release(stage(RELEASE_2, 'r2'))
+        self.assertIn(('고추', Decimal('0.500'), 'T'), live())
+        self.assertTrue(LimitConditionCode.objects.filter(code='T').exists())
+        self.assertEqual(list(MRLRelease.objects.order_by('pk').values_list('status', flat=True)),
+                         [MRLRelease.STATUS_RETIRED, MRLRelease.STATUS_RETIRED, MRLRelease.STATUS_ACTIVE])
+
+    def test_rollback_restores_previous_release(self):
+        mrl_release.activate_release(stage(RELEASE_1, 'r1'))
+        mrl_release.activate_release(stage(RELEASE_2, 'r2'))
+
+        self.assertEqual(mrl_release.rollback_release().label, 'r1')
+        self.assertEqual(live(), {('감자', Decimal('0.050'), None), ('고추', Decimal('0.300'), None)})
+        self.assertEqual(MRLRelease.objects.get(label='r2').status, MRLRelease.STATUS_ROLLED_BACK)
+
+        mrl_release.rollback_release()  # 첫 적용 전 데이터까지 되돌리기
+        self.assertEqual(live(), {('감자', Decimal('1.000'), None)})
+        with self.assertRaises(mrl_release.MRLReleaseError):
+            mrl_release.rollback_release()
+
+    def test_rejects_release_that_removes_too_much(self):
+        mrl_release.activate_release(stage(RELEASE_2, 'r2'))
+        partial = stage(HEADER + '가스가마이신,Kasugamycin,감자,0.05,0.05,\n', 'partial')
+        with self.assertRaises(mrl_release.MRLReleaseError):
+            mrl_release.activate_release(partial)
+        self.assertEqual(PesticideLimit.objects.count(), 4)
+
+        mrl_release.activate_release(partial, force=True)
+        self.assertEqual(PesticideLimit.objects.count(), 1)
+
+    @override_settings(MRL_RELEASE_CHECK_INTERVAL=0)
+    def test_matrix_rebuilds_when_another_process_activates(self):
+        mrl_release.activate_release(stage(RELEASE_1, 'r1'))
+        matrix = mrl_matrix.get_matrix()
+        self.assertIs(mrl_matrix.get_matrix(), matrix)
+
+        # 다른 프로세스의 적용을 흉내: 이 프로세스의 행렬은 무효화하지 않고 활성 릴리스만 바꿈
+        release = stage(RELEASE_2, 'r2')
+        MRLRelease.objects.filter(status=MRLRelease.STATUS_ACTIVE).update(status=MRLRelease.STATUS_RETIRED)
+        MRLRelease.objects.filter(pk=release.pk).update(status=MRLRelease.STATUS_ACTIVE)
+        self.assertIsNot(mrl_matrix.get_matrix(), matrix)
+
+    def test_commands(self):
+        out = io.StringIO()
+        call_command('mrl_release', 'list', stdout=out)
+        release = stage(RELEASE_1, 'r1')
+        call_command('mrl_release', 'activate', str(release.pk), stdout=out)
+        call_command('mrl_release', 'rollback', stdout=out)
+        self.assertIn('되돌림', out.getvalue())
+        self.assertEqual(live(), {('감자', Decimal('1.000'), None)})
+
+    def test_import_command_stage_only(self):
+        out = io.StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', encoding='utf-8', delete=False) as f:
+            f.write(RELEASE_2)
+        self.addCleanup(os.remove, f.name)
+        call_command('import_mrl_spec', f.name, '--stage-only', stdout=out)
+        self.assertIn('추가 3, 변경 1, 삭제 0', out.getvalue())
+        self.assertEqual(MRLRelease.objects.get().status, MRLRelease.STATUS_STAGED)
+        self.assertEqual(live(), {('감자', Decimal('1.000'), None)})
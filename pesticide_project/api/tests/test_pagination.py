@@ -0,0 +1,79 @@
+# pesticide_project/api/tests/test_pagination.py
+# getAllFoods 커서 페이지 / NDJSON·JSON 스트리밍 응답 테스트 - 기존 전체 배열 응답과 내용 일치
+# command : python manage.py test api.tests.test_pagination --settings=config.settings.test
+
+import json
+import logging
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api import pagination
+from api.models import PesticideLimit, User
+
+URL = '/api/pesticides/'
+PARAMS = {'pesticide': 'Pagifos', 'getAllFoods': 'true'}
+
+
+class GetAllFoodsPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='pager', email='pager@example.com', password='pw', organization='test'
+        )
+        # 같은 식품명 중복 포함 (커서 순서가 id 로 결정되는지 확인)
+        PesticideLimit.objects.bulk_create([
+            PesticideLimit(pesticide_name_kr='페이지농약', pesticide_name_en='Pagifos',
+                           food_name=f'식품{index % 40:02d}', max_residue_limit=Decimal('0.05'))
+            for index in range(57)
+        ])
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def full(self):
+        response = self.client.get(URL, PARAMS)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_default_response_is_unchanged_array(self):
+        data = self.full()
+        self.assertIsInstance(data, list)
+        self.assertEqual(len(data), 57)
+
+    def test_cursor_pages_cover_full_result(self):
+        pages, params = [], dict(PARAMS, page_size=10)
+        response = self.client.get(URL, params).json()
+        while True:
+            pages.extend(response['results'])
+            if not response['next']:
+                break
+            response = self.client.get(response['next']).json()
+        self.assertEqual(pages, self.full())
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(pagination.PesticideLimitCursorPagination, 'max_page_size', 5):
+            data = self.client.get(URL, dict(PARAMS, page_size=1000)).json()
+        self.assertEqual(len(data['results']), 5)
+
+    def test_streaming_formats_match_full_result(self):
+        expected = self.full()
+        with mock.patch.object(pagination, 'CHUNK_SIZE', 7):
+            ndjson = self.client.get(URL, dict(PARAMS, stream='ndjson'))
+            array = self.client.get(URL, dict(PARAMS, stream='json'))
+
+        self.assertTrue(ndjson.streaming)
+        self.assertEqual(ndjson['Content-Type'], pagination.STREAM_FORMATS['ndjson'])
+        lines = b''.join(ndjson.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines], expected)
+        self.assertEqual(json.loads(b''.join(array.streaming_content)), expected)
+
+    def test_empty_stream_is_valid_json(self):
+        response = self.client.get(URL, {'pesticide': '없는농약', 'getAllFoods': 'true', 'stream': 'json'})
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [])
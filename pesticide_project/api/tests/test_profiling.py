@@ -0,0 +1,143 @@
+# pesticide_project/api/tests/test_profiling.py
+# 요청 프로파일링 테스트 - 관리자 요청만 프로파일링, 결과 목록/다운로드는 관리자 전용, 파일명 검증, 오래된 파일 정리
+# command : python manage.py test api.tests.test_profiling --settings=config.settings.test
+
+import os
+import shutil
+import tempfile
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import path
+from rest_framework.authtoken.models import Token
+
+from api import profiling
+from api.models import User
+
+
+@profiling.profile_view('sample_view')
+def sample_view(request):
+    return HttpResponse('ok')
+
+
+urlpatterns = [
+    path('api/sample/', sample_view),
+    path('api/profiles/', profiling.profile_list),
+    path('api/profiles/<str:name>', profiling.profile_download),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ProfilingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            username='staff', email='staff@example.com', password='pw', organization='test', is_staff=True
+        )
+        cls.staff_token = Token.objects.create(user=cls.staff)
+        cls.user = User.objects.create_user(
+            username='user', email='user@example.com', password='pw', organization='test'
+        )
+        cls.user_token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.directory = os.path.join(self.root, 'profiles')
+        settings_override = override_settings(PROFILE_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def auth(self, token):
+        return {'HTTP_AUTHORIZATION': f"Token {token.key}"}
+
+    def profile(self, mode='1', **extra):
+        with self.assertLogs('api', 'INFO'):
+            response = self.client.get('/api/sample/', HTTP_X_PROFILE=mode, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_staff_token_request_is_profiled(self):
+        response = self.profile(**self.auth(self.staff_token))
+
+        name = response['X-Profile-Id']
+        self.assertRegex(name, r'^sample_view-\d{8}-\d{6}-[0-9a-f]{8}\.prof$')
+        self.assertEqual(response['X-Profile-Url'], f"/api/profiles/{name}")
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, name)))
+
+    def test_sample_mode_writes_folded_stacks(self):
+        self.client.force_login(self.staff)
+        response = self.profile(mode='sample')
+        self.assertTrue(response['X-Profile-Id'].endswith('.folded'))
+
+    def test_flag_is_ignored_for_anonymous_and_non_staff(self):
+        for extra in ({}, self.auth(self.user_token), {'HTTP_AUTHORIZATION': 'Token invalid'}):
+            response = self.client.get('/api/sample/', HTTP_X_PROFILE='1', **extra)
+            self.assertEqual(response.content, b'ok')
+            self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertFalse(os.path.exists(self.directory))
+
+    def test_unknown_mode_or_no_flag_is_not_profiled(self):
+        for extra in ({'HTTP_X_PROFILE': 'yes'}, {}):
+            response = self.client.get('/api/sample/', **self.auth(self.staff_token), **extra)
+            self.assertFalse(response.has_header('X-Profile-Id'))
+
+    def test_concurrent_profile_is_skipped(self):
+        profiling._profile_lock.acquire()
+        try:
+            with self.assertLogs('api', 'INFO') as logs:
+                response = self.client.get('/api/sample/?_profile=1', **self.auth(self.staff_token))
+        finally:
+            profiling._profile_lock.release()
+        self.assertEqual(response.content, b'ok')
+        self.assertFalse(response.has_header('X-Profile-Id'))
+        self.assertIn('건너뜀', logs.output[0])
+
+    @override_settings(PROFILE_MAX_FILES=2)
+    def test_old_profiles_are_cleaned_up(self):
+        names = []
+        for index in range(3):
+            names.append(self.profile(**self.auth(self.staff_token))['X-Profile-Id'])
+            path_ = os.path.join(self.directory, names[-1])
+            os.utime(path_, (1000 + index, 1000 + index))  # 생성 순서대로 mtime 지정
+        self.assertEqual(sorted(os.listdir(self.directory)), sorted(names[1:]))
+
+    def test_list_and_download_for_staff(self):
+        name = self.profile(**self.auth(self.staff_token))['X-Profile-Id']
+
+        response = self.client.get('/api/profiles/', **self.auth(self.staff_token))
+        [entry] = response.json()['profiles']
+        self.assertEqual((entry['name'], entry['url']), (name, f"/api/profiles/{name}"))
+        self.assertEqual(entry['size'], os.path.getsize(os.path.join(self.directory, name)))
+
+        response = self.client.get(f"/api/profiles/{name}", **self.auth(self.staff_token))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('attachment', response['Content-Disposition'])
+        with open(os.path.join(self.directory, name), 'rb') as f:
+            self.assertEqual(b''.join(response.streaming_content), f.read())
+
+    def test_list_without_directory_is_empty(self):
+        response = self.client.get('/api/profiles/', **self.auth(self.staff_token))
+        self.assertEqual(response.json(), {'profiles': []})
+
+    def test_list_and_download_are_hidden_from_non_staff(self):
+        name = self.profile(**self.auth(self.staff_token))['X-Profile-Id']
+        with self.assertLogs('django.request', 'WARNING'):  # 404 경고 로그는 확인 대상이 아님
+            for extra in ({}, self.auth(self.user_token)):
+                self.assertEqual(self.client.get('/api/profiles/', **extra).status_code, 404)
+                self.assertEqual(self.client.get(f"/api/profiles/{name}", **extra).status_code, 404)
+
+    def test_download_rejects_invalid_names(self):
+        os.makedirs(self.directory)
+        for filename in ('notes.txt', '.prof'):
+            with open(os.path.join(self.directory, filename), 'w') as f:
+                f.write('x')
+        with open(os.path.join(self.root, 'secret.prof'), 'w') as f:
+            f.write('secret')
+
+        request = RequestFactory().get('/api/profiles/', **self.auth(self.staff_token))
+        for name in ('notes.txt', '../secret.prof', '..', 'missing.prof'):
+            self.assertEqual(profiling.profile_download(request, name).status_code, 404, name)
+        # 파일명 규칙에 맞지 않는 파일은 목록에도 없음
+        self.assertEqual(profiling.profile_list(request).content, b'{"profiles": []}')
@@ -0,0 +1,192 @@
+# pesticide_project/api/tests/test_query_counts.py
+# API 엔드포인트 / 증명서 파이프라인의 DB 쿼리 수 상한 테스트 (N+1 회귀 방지)
+# command : python manage.py test api.tests.test_query_counts --settings=config.settings.test
+# - 같은 테스트를 데이터셋 규모별(Small/Medium/Large)로 실행하여 쿼리 수가 데이터 크기에 따라 늘지 않는지 확인
+# - 검출 농약 수(n)에 비례하는 함수는 n 별 상한을 함께 고정
+# - 상한을 올려야 하는 변경이라면 이유를 커밋 메시지에 남길 것
+
+import logging
+import re
+from contextlib import contextmanager
+from unittest import mock
+
+import requests
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api import certificate_parser as parser
+from api import food_categories
+from api.models import CertificateOfAnalysis, User
+from benchmarks.bench_parser import load_text_fixtures
+from benchmarks.seed import seed_dataset
+
+RESULT_COUNTS = (1, 5, 35)
+SAVEPOINT_RE = re.compile(r'^(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b')
+
+
+class QueryCountMixin:
+    scale = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(scale=cls.scale)
+        cls.user = User.objects.create_user(
+            username='querycount', email='querycount@example.com', password='pw', organization='test'
+        )
+        cls.fixtures = load_text_fixtures()
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        food_categories.invalidate()  # 다른 테스트 클래스의 분류 맵을 쓰지 않도록
+        self.addCleanup(food_categories.invalidate)
+        # 품목/기준 조회 실패 시 호출되는 localhost HTTP 대체 조회는 네트워크 없이 실패시킴
+        patcher = mock.patch('requests.get', side_effect=requests.ConnectionError)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.pesticide = self.dataset['pesticides_kr'][0]
+
+    @contextmanager
+    def assertMaxQueries(self, limit):
+        with CaptureQueriesContext(connection) as captured:
+            yield captured
+        # TestCase 트랜잭션 안에서만 생기는 SAVEPOINT 문은 제외
+        queries = [query['sql'] for query in captured.captured_queries if not SAVEPOINT_RE.match(query['sql'])]
+        if len(queries) > limit:
+            listing = '\n'.join(f"{i}. {sql}" for i, sql in enumerate(queries, 1))
+            self.fail(f"쿼리 {len(queries)}개 실행 (상한 {limit}개)\n{listing}")
+
+    def get(self, path, params, expected_status=200):
+        with mock.patch('builtins.print'):  # 뷰의 검색 로그 print() 출력 생략
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, expected_status)
+        return response
+
+    def parsing_result(self, fixture='many_detections', count=None):
+        result = parser.parse_certificate_text(self.fixtures[fixture])
+        result['is_plant_material'] = '작물체' in (result.get('sample_description') or '')
+        if count is not None:
+            result['pesticide_results'] = result['pesticide_results'][:count]
+        return result
+
+    # --- 검색 / 자동완성 엔드포인트 (데이터 규모와 무관하게 일정해야 함) ---
+
+    def test_list_direct_match(self):
+        # exists, exists, 조회, count, SearchLog insert
+        with self.assertMaxQueries(5):
+            self.get('/api/pesticides/', {'pesticide': self.pesticide, 'food': '부추'})
+
+    def test_list_category_fallback(self):
+        food = self.dataset['category_only_foods'][0]
+        with self.assertMaxQueries(5):
+            self.get('/api/pesticides/', {'pesticide': self.pesticide, 'food': food})
+
+    def test_list_no_match(self):
+        with self.assertMaxQueries(5):
+            self.get('/api/pesticides/', {'pesticide': self.pesticide, 'food': '없는품목'}, expected_status=404)
+
+    def test_list_all_foods(self):
+        with self.assertMaxQueries(1):
+            self.get('/api/pesticides/', {'pesticide': self.pesticide, 'getAllFoods': 'true'})
+
+    def test_list_guest(self):
+        # 게스트는 세션 생성 + GuestSession 조회/증가가 추가됨
+        self.client.force_authenticate(user=None)
+        with self.assertMaxQueries(12):
+            self.get('/api/pesticides/', {'pesticide': self.pesticide, 'food': '부추'})
+
+    def test_autocomplete(self):
+        # 첫 요청은 세션 생성(존재 확인, insert, 저장) 포함
+        with self.assertMaxQueries(4):
+            self.get('/api/pesticides/autocomplete/', {'query': self.pesticide[:2]})
+
+    def test_food_autocomplete(self):
+        with self.assertMaxQueries(4):
+            self.get('/api/pesticides/food_autocomplete/', {'query': '고'})
+
+    def test_find_similar_foods_exact(self):
+        with self.assertMaxQueries(1):
+            self.get('/api/pesticides/find_similar_foods/', {'food': '부추'})
+
+    def test_find_similar_foods_fuzzy(self):
+        # 정확 매칭 1 + 부분 매칭 1 + 글자별 1 + 2글자 이상 키워드별 1 (입력 길이에 비례, 데이터 규모와는 무관)
+        food = '청양고추가루'
+        with self.assertMaxQueries(2 + len(food) + 1):
+            self.get('/api/pesticides/find_similar_foods/', {'food': food})
+
+    def test_get_detail(self):
+        with self.assertMaxQueries(1):
+            self.get('/api/pesticides/detail/', {'pesticide': self.pesticide, 'food': '고'})
+
+    # --- 증명서 파이프라인 (검출 농약 수 n 에 따른 상한) ---
+
+    def test_verify_pesticide_results(self):
+        # 현재 농약별 표준명 조회 + 기준 조회 (행당 2개)
+        for count in RESULT_COUNTS:
+            with self.subTest(results=count):
+                parsing_result = self.parsing_result(count=count)
+                with self.assertMaxQueries(2 * count + 1):
+                    verification = parser.verify_pesticide_results(parsing_result)
+                self.assertEqual(len(verification), count)
+
+    def test_verify_plant_material_needs_no_queries(self):
+        with self.assertMaxQueries(0):
+            parser.verify_pesticide_results(self.parsing_result('plant_material'))
+
+    def test_save_certificate_data(self):
+        # 증명서 insert 1 + 결과 bulk insert 1 (결과 행 수와 무관)
+        for count in RESULT_COUNTS:
+            with self.subTest(results=count):
+                parsing_result = self.parsing_result(count=count)
+                parsing_result['certificate_number'] = f"QC-{count}"
+                verification = parser.verify_pesticide_results(parsing_result)
+                pdf_file = SimpleUploadedFile('qc.pdf', b'%PDF-1.4 test', content_type='application/pdf')
+                with self.assertMaxQueries(2):
+                    parser.save_certificate_data(parsing_result, verification, pdf_file)
+
+    def upload(self, fixture='many_detections', **data):
+        pdf_file = SimpleUploadedFile('qc.pdf', b'%PDF-1.4 test', content_type='application/pdf')
+        with mock.patch.object(parser, 'parse_certificate_pdf', return_value=parser.parse_certificate_text(self.fixtures[fixture])):
+            return self.client.post('/api/certificates/upload/', dict(data, file=pdf_file))
+
+    def test_upload_new_certificate(self):
+        count = len(self.parsing_result()['pesticide_results'])
+        # 기존 증명서 조회 1 + 품목 확인 2 + 검증(2n+1) + 카테고리 확인 2 + 저장 2
+        with self.assertMaxQueries(1 + 2 + (2 * count + 1) + 2 + 2):
+            response = self.upload()
+        self.assertEqual(response.status_code, 201)
+
+    def test_upload_existing_certificate(self):
+        self.upload()
+        # 이미 있는 증명서는 결과 행 수와 관계없이 일정 (증명서 조회 + 결과 조회 + 직렬화용 결과 조회)
+        with self.assertMaxQueries(3):
+            response = self.upload()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['saved_data']['pesticide_count'], 35)
+
+    def test_upload_overwrite(self):
+        self.upload()
+        count = len(self.parsing_result()['pesticide_results'])
+        # 삭제(증명서 조회, 결과 조회/삭제, 증명서 삭제) + 신규 업로드와 동일
+        with self.assertMaxQueries(1 + 3 + 2 + (2 * count + 1) + 2 + 2):
+            response = self.upload(overwrite='true')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(CertificateOfAnalysis.objects.count(), 1)
+
+
+class SmallDatasetQueryCountTests(QueryCountMixin, TestCase):
+    scale = 0.02
+
+
+class MediumDatasetQueryCountTests(QueryCountMixin, TestCase):
+    scale = 0.1
+
+
+class LargeDatasetQueryCountTests(QueryCountMixin, TestCase):
+    scale = 0.3
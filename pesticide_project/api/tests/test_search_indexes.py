@@ -0,0 +1,37 @@
+# pesticide_project/api/tests/test_search_indexes.py
+# 대소문자 무시 검색 인덱스(migrations/0018) 실행 계획 테스트 - 핫 쿼리가 인덱스를 써야 하는 DB 에서 순차 탐색하지 않는지
+# command : python manage.py test api.tests.test_search_indexes --settings=config.settings.test
+
+from django.db import connection
+from django.test import TestCase
+
+from benchmarks import bench_explain
+from benchmarks.seed import seed_dataset
+
+
+class SearchIndexPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(scale=0.05)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_hot_queries_use_indexes(self):
+        checked = 0
+        for name, queryset, index_vendors in bench_explain.build_queries(self.dataset):
+            if connection.vendor not in index_vendors:
+                continue
+            plan = bench_explain.explain(queryset)
+            with self.subTest(query=name):
+                self.assertTrue(bench_explain.uses_index(plan, queryset.model._meta.db_table), plan)
+            checked += 1
+        self.assertGreater(checked, 0)
+
+    def test_uses_index_detects_full_scan(self):
+        table = 'pesticide_limits'
+        if connection.vendor == 'postgresql':
+            self.assertFalse(bench_explain.uses_index(f'Seq Scan on {table}  (cost=0.00..1.00)', table))
+        else:
+            self.assertFalse(bench_explain.uses_index(f'2 0 0 SCAN {table} USING COVERING INDEX x', table))
+            self.assertTrue(bench_explain.uses_index(f'3 0 0 SEARCH {table} USING INDEX x (food_name>?)', table))
@@ -0,0 +1,136 @@
+# pesticide_project/api/tests/test_search_log_retention.py
+# 검색 로그 보관주기 테스트 - 기준 시각, 배치별 월 part 파일, 보관한 id 만 삭제, dry-run, 중단 후 재실행 시 중복 없음
+# command : python manage.py test api.tests.test_search_log_retention --settings=config.settings.test
+
+import gzip
+import importlib.util
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api import search_log_retention as retention
+from api.models import SearchLog
+
+
+class SearchLogRetentionTests(TestCase):
+
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.archive_dir, ignore_errors=True)
+        tz = timezone.get_default_timezone()
+        # 보관 대상: 2025-01 2건, 2025-02 1건 / 유지: 최근 1건
+        self.expired = [
+            self.log('a', timezone.make_aware(datetime(2025, 1, 5, 9), tz)),
+            self.log('b', timezone.make_aware(datetime(2025, 1, 31, 23, 30), tz)),  # 서버 시간대 기준 1월
+            self.log('c', timezone.make_aware(datetime(2025, 2, 1, 0, 30), tz)),
+        ]
+        self.recent = self.log('d', timezone.now() - timedelta(days=10))
+
+    def log(self, term, timestamp):
+        log = SearchLog.objects.create(search_term=term, ip_address='10.0.0.1', results_count=1)
+        SearchLog.objects.filter(pk=log.pk).update(timestamp=timestamp)  # auto_now_add 대신 지정 시각
+        return log
+
+    def archive(self, **kwargs):
+        with mock.patch.object(retention, 'is_partitioned', return_value=False):
+            return retention.archive_search_logs(days=180, archive_dir=self.archive_dir, **kwargs)
+
+    def parts(self, year, month):
+        directory = retention.month_dir(self.archive_dir, year, month)
+        return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+    def read_jsonl(self, year, month):
+        rows = []
+        directory = retention.month_dir(self.archive_dir, year, month)
+        for name in self.parts(year, month):
+            with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as f:
+                rows.extend(json.loads(line) for line in f)
+        return rows
+
+    def test_cutoff_selects_only_logs_older_than_retention(self):
+        self.assertEqual(retention.get_cutoff(180).date(), (timezone.now() - timedelta(days=180)).date())
+        stats = self.archive()
+        self.assertEqual(stats['archived'], 3)
+        self.assertEqual(list(SearchLog.objects.values_list('id', flat=True)), [self.recent.id])
+
+    def test_batches_write_one_part_per_month_and_delete_archived_ids(self):
+        stats = self.archive(batch_size=2)
+
+        # 배치 1: a, b (1월) / 배치 2: c (2월)
+        a, b, c = self.expired
+        self.assertEqual(self.parts(2025, 1), [f"part-{a.id:012d}-{b.id:012d}.jsonl.gz"])
+        self.assertEqual(self.parts(2025, 2), [f"part-{c.id:012d}-{c.id:012d}.jsonl.gz"])
+        self.assertEqual([row['id'] for row in self.read_jsonl(2025, 1)], [a.id, b.id])
+        self.assertEqual([row['search_term'] for row in self.read_jsonl(2025, 2)], ['c'])
+        self.assertEqual(stats['months'], {(2025, 1): 2, (2025, 2): 1})
+        self.assertEqual(stats['deleted'], 3)
+        self.assertFalse(SearchLog.objects.filter(id__in=[log.id for log in self.expired]).exists())
+        self.assertTrue(SearchLog.objects.filter(id=self.recent.id).exists())
+
+    def test_later_batches_do_not_rewrite_earlier_parts(self):
+        self.archive(batch_size=1)
+        a, b, _ = self.expired
+        self.assertEqual(self.parts(2025, 1), [f"part-{a.id:012d}-{a.id:012d}.jsonl.gz",
+                                               f"part-{b.id:012d}-{b.id:012d}.jsonl.gz"])
+
+    def test_dry_run_counts_without_writing_or_deleting(self):
+        stats = self.archive(dry_run=True)
+        self.assertEqual(stats['archived'], 3)
+        self.assertEqual(stats['deleted'], 0)
+        self.assertEqual(os.listdir(self.archive_dir), [])
+        self.assertEqual(SearchLog.objects.count(), 4)
+
+    def test_rerun_after_crash_between_write_and_delete_has_no_duplicates(self):
+        real_atomic = retention.transaction.atomic
+
+        def fail_second_batch(*args, **kwargs):
+            if self.parts(2025, 2):  # 2월 part 까지 기록된 뒤(두 번째 배치) 삭제 직전에 중단
+                raise RuntimeError('중단')
+            return real_atomic(*args, **kwargs)
+
+        with mock.patch.object(retention.transaction, 'atomic', side_effect=fail_second_batch), \
+                self.assertRaises(RuntimeError):
+            self.archive(batch_size=2)
+        self.assertTrue(os.path.exists(retention.pending_path(self.archive_dir)))
+        self.assertTrue(SearchLog.objects.filter(id=self.expired[2].id).exists())
+
+        with self.assertLogs('api', 'WARNING'):
+            stats = self.archive(batch_size=2)
+
+        self.assertEqual(stats['archived'], 1)
+        self.assertEqual([row['search_term'] for row in self.read_jsonl(2025, 2)], ['c'])
+        self.assertEqual(len(self.read_jsonl(2025, 1)), 2)
+        self.assertFalse(os.path.exists(retention.pending_path(self.archive_dir)))
+        self.assertEqual(list(SearchLog.objects.values_list('id', flat=True)), [self.recent.id])
+
+    def test_pending_batch_already_deleted_is_cleared(self):
+        with open(retention.pending_path(self.archive_dir), 'w') as f:
+            json.dump({'format': 'jsonl', 'ids': [999999]}, f)
+        stats = self.archive()
+        self.assertEqual(stats['archived'], 3)
+        self.assertFalse(os.path.exists(retention.pending_path(self.archive_dir)))
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'parquet 엔진(pyarrow) 필요')
+    def test_parquet_parts_read_back_as_month_dataset(self):
+        import pandas as pd
+
+        self.archive(fmt='parquet', batch_size=1)
+        self.assertEqual(len(self.parts(2025, 1)), 2)
+        frame = pd.read_parquet(retention.month_dir(self.archive_dir, 2025, 1))
+        self.assertEqual(sorted(frame['search_term']), ['a', 'b'])
+
+    def test_command_reports_months(self):
+        out = io.StringIO()
+        with mock.patch.object(retention, 'is_partitioned', return_value=False):
+            call_command('archive_search_logs', '--days', '180', '--archive-dir', self.archive_dir, stdout=out)
+        self.assertIn('2025-01: 2건', out.getvalue())
+        self.assertIn('3건 보관', out.getvalue())
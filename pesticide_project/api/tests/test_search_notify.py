@@ -0,0 +1,57 @@
+# pesticide_project/api/tests/test_search_notify.py
+# 외부 사용자 검색 알림 메일 테스트 - 단건/일괄 조회 본문, 로컬 IP 제외, 수신자 설정(SEARCH_NOTIFY_RECIPIENTS)
+# command : python manage.py test api.tests.test_search_notify --settings=config.settings.test
+
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from api.models import SearchLog
+from api.signals import notify_external_bulk_search
+
+
+@override_settings(SEARCH_NOTIFY_RECIPIENTS=['admin@example.com', 'ops@example.com'])
+class SearchNotificationTests(TestCase):
+
+    def log(self, ip_address='10.0.0.1', **fields):
+        fields.setdefault('search_term', '사과 - 농약A')
+        return SearchLog(ip_address=ip_address, user_agent='test-agent', results_count=1, **fields)
+
+    def test_external_search_sends_to_configured_recipients(self):
+        log = self.log(pesticide_term='농약A', food_term='사과')
+        log.save()
+
+        [message] = mail.outbox
+        self.assertEqual(message.to, ['admin@example.com', 'ops@example.com'])
+        self.assertEqual(message.subject, '[FindPest] 외부 사용자 검색 알림 - 사과 - 농약A')
+        self.assertIn('외부 사용자가 FindPest에서 검색을 수행했습니다.', message.body)
+        self.assertIn('농약명: 농약A', message.body)
+        self.assertIn('IP 주소: 10.0.0.1', message.body)
+        self.assertIn(f"/api/admin/api/searchlog/{log.id}/change/", message.body)
+
+    def test_local_search_is_not_notified(self):
+        self.log(ip_address='127.0.0.1').save()
+        self.log(ip_address='').save()
+        notify_external_bulk_search([self.log(ip_address='127.0.0.1')])
+        self.assertEqual(mail.outbox, [])
+
+    def test_bulk_search_sends_one_mail_for_external_logs(self):
+        logs = [
+            self.log(pesticide_term='농약A', food_term='사과'),
+            self.log(ip_address='127.0.0.1', pesticide_term='농약B', food_term='배'),
+            self.log(pesticide_term='농약C', food_term=None),
+        ]
+        notify_external_bulk_search(logs)
+
+        [message] = mail.outbox
+        self.assertEqual(message.to, ['admin@example.com', 'ops@example.com'])
+        self.assertEqual(message.subject, '[FindPest] 외부 사용자 일괄 조회 알림 - 2건')
+        self.assertIn('=== 검색 정보 (2건) ===', message.body)
+        self.assertIn('- 농약명: 농약C, 식품명: N/A, 결과 수: 1개', message.body)
+        self.assertNotIn('농약B', message.body)
+        self.assertNotIn('/change/', message.body)
+
+    @override_settings(SEARCH_NOTIFY_RECIPIENTS=[])
+    def test_empty_recipients_disable_notifications(self):
+        self.log().save()
+        notify_external_bulk_search([self.log()])
+        self.assertEqual(mail.outbox, [])
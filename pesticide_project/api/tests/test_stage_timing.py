@@ -0,0 +1,129 @@
+# pesticide_project/api/tests/test_stage_timing.py
+# 단계별 처리 시간 테스트 - stage/timed 메트릭 기록, 요청 단위 수집, DEBUG 에서만 stage_timings·Server-Timing 첨부
+# command : python manage.py test api.tests.test_stage_timing --settings=config.settings.test
+
+import json
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from api import metrics
+from api.stage_timing import attach_stage_timings, collect_stages, stage, timed
+
+
+@timed()
+def parse_step():
+    return 'parsed'
+
+
+@timed('verify')
+def verify_step():
+    return 'verified'
+
+
+@attach_stage_timings
+def json_view(request):
+    parse_step()
+    with stage('pdf_extract'):
+        pass
+    with stage('pdf_extract'):
+        pass
+    return JsonResponse({'success': True})
+
+
+@attach_stage_timings
+def list_view(request):
+    parse_step()
+    return JsonResponse([1, 2], safe=False)
+
+
+@attach_stage_timings
+def text_view(request):
+    parse_step()
+    return HttpResponse('ok')
+
+
+@override_settings(METRICS_MULTIPROC_DIR='')
+class StageTests(SimpleTestCase):
+
+    def setUp(self):
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+
+    def stage_count(self, name):
+        for metric, labels, state in metrics.registry.snapshot()['histograms']:
+            if metric == 'certificate_stage_duration_seconds' and dict(labels) == {'stage': name}:
+                return state[-1]
+        return 0
+
+    def test_stage_records_metric_even_outside_collection(self):
+        with stage('pdf_extract'):
+            pass
+        self.assertEqual(self.stage_count('pdf_extract'), 1)
+
+    def test_stage_records_when_block_raises(self):
+        with collect_stages() as timings, self.assertRaises(ValueError):
+            with stage('pdf_extract'):
+                raise ValueError('boom')
+        self.assertEqual(self.stage_count('pdf_extract'), 1)
+        self.assertEqual(timings.stages['pdf_extract']['count'], 1)
+
+    def test_timed_uses_function_name_unless_given(self):
+        with collect_stages() as timings:
+            self.assertEqual(parse_step(), 'parsed')
+            self.assertEqual(verify_step(), 'verified')
+            parse_step()
+
+        self.assertEqual(parse_step.__name__, 'parse_step')  # functools.wraps
+        self.assertEqual(list(timings.stages), ['parse_step', 'verify'])  # 처음 실행된 순서
+        self.assertEqual(timings.stages['parse_step']['count'], 2)
+        self.assertEqual(self.stage_count('verify'), 1)
+
+    def test_collection_ends_with_block(self):
+        with collect_stages() as timings:
+            pass
+        parse_step()
+        self.assertEqual(timings.stages, {})
+        self.assertEqual(self.stage_count('parse_step'), 1)
+
+
+@override_settings(METRICS_MULTIPROC_DIR='')
+class AttachStageTimingsTests(SimpleTestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().post('/api/certificates/upload/')
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+
+    @override_settings(DEBUG=False)
+    def test_production_response_is_unchanged(self):
+        response = json_view(self.request)
+        self.assertEqual(json.loads(response.content), {'success': True})
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(DEBUG=True)
+    def test_debug_attaches_stage_timings_and_server_timing(self):
+        response = json_view(self.request)
+
+        data = json.loads(response.content)
+        self.assertTrue(data['success'])
+        stages = data['stage_timings']['stages']
+        self.assertEqual(list(stages), ['parse_step', 'pdf_extract'])
+        self.assertEqual(stages['pdf_extract']['count'], 2)
+        self.assertGreaterEqual(data['stage_timings']['total_ms'], 0)
+
+        header = response['Server-Timing'].split(', ')
+        self.assertEqual([item.split(';')[0] for item in header], ['parse_step', 'pdf_extract'])
+        self.assertTrue(all(item.split(';')[1].startswith('dur=') for item in header))
+
+    @override_settings(DEBUG=True)
+    def test_debug_non_dict_json_gets_header_only(self):
+        response = list_view(self.request)
+        self.assertEqual(json.loads(response.content), [1, 2])
+        self.assertTrue(response['Server-Timing'].startswith('parse_step;dur='))
+
+    @override_settings(DEBUG=True)
+    def test_debug_non_json_response_is_unchanged(self):
+        response = text_view(self.request)
+        self.assertEqual(response.content, b'ok')
+        self.assertFalse(response.has_header('Server-Timing'))
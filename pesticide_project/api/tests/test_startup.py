@@ -0,0 +1,25 @@
+# pesticide_project/api/tests/test_startup.py
+# 워커 시작 시 import 예산 테스트 - URLconf 를 불러와도 무거운 파서/외부 API 모듈은 import 되지 않고 첫 사용 시 불러오는지 확인
+# command : python manage.py test api.tests.test_startup --settings=config.settings.test
+
+from django.test import SimpleTestCase
+from django.urls import resolve
+
+from benchmarks.bench_startup import IMPORT_BUDGET_MODULES, loaded_heavy_modules
+
+
+class StartupImportTests(SimpleTestCase):
+
+    def test_urlconf_does_not_import_heavy_modules(self):
+        # 이 프로세스는 다른 테스트가 이미 불러왔을 수 있어 새 프로세스에서 확인
+        self.assertEqual(loaded_heavy_modules(), [], f"시작 시 import 되면 안 되는 모듈: {IMPORT_BUDGET_MODULES}")
+
+    def test_lazy_upload_view_keeps_csrf_exempt(self):
+        match = resolve('/api/certificates/upload/')
+        self.assertTrue(match.func.csrf_exempt)
+        self.assertEqual(match.url_name, 'upload-certificate')
+
+    def test_lazy_upload_view_dispatches_to_parser(self):
+        response = self.client.post('/api/certificates/upload/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': '파일을 업로드해주세요.'})
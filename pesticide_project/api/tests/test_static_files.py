@@ -0,0 +1,103 @@
+# pesticide_project/api/tests/test_static_files.py
+# 정적 파일 서빙 테스트 - collectstatic 압축본 + 캐시 헤더(WhiteNoise), 메모리 index.html(api/frontend.py)
+# command : python manage.py test api.tests.test_static_files --settings=config.settings.test
+
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+INDEX_HTML = b'<!doctype html><html><head><script defer src="/static/js/main.1a2b3c4d.js"></script></head></html>'
+
+
+class StaticFilesTests(SimpleTestCase):
+
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.static_root)
+        os.makedirs(os.path.join(self.source, 'js'))
+        with open(os.path.join(self.source, 'js', 'main.1a2b3c4d.js'), 'w') as f:
+            f.write('console.log("findpest");\n' * 200)
+        with open(os.path.join(self.source, 'robots.txt'), 'w') as f:
+            f.write('User-agent: *\n')
+
+        # 앱(admin 등) 정적 파일은 제외하고 테스트 파일만 수집
+        settings_override = override_settings(
+            STATICFILES_DIRS=[self.source], STATIC_ROOT=self.static_root,
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_collectstatic_writes_hashed_and_compressed_files(self):
+        files = os.listdir(os.path.join(self.static_root, 'js'))
+        self.assertIn('main.1a2b3c4d.js.gz', files)
+        self.assertTrue(any(name.startswith('main.1a2b3c4d.') and name.endswith('.js') and name != 'main.1a2b3c4d.js'
+                            for name in files))
+
+    def test_serves_precompressed_file_with_immutable_cache(self):
+        response = self.client.get('/static/js/main.1a2b3c4d.js', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertTrue(body.startswith(b'console.log("findpest");'))
+
+    def test_unhashed_file_gets_short_cache(self):
+        response = self.client.get('/static/robots.txt')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'max-age=3600, public')
+
+
+class FrontendIndexTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'index.html')
+        with open(self.path, 'wb') as f:
+            f.write(INDEX_HTML)
+        settings_override = override_settings(REACT_INDEX_FILE=self.path)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_serves_index_from_memory_with_revalidation(self):
+        for url in ('/', '/statistics', '/certificate-analysis/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, INDEX_HTML)
+            self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_gzip_when_accepted(self):
+        response = self.client.get('/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), INDEX_HTML)
+
+    def test_reloads_after_deploy(self):
+        etag = self.client.get('/')['ETag']
+        with open(self.path, 'wb') as f:
+            f.write(INDEX_HTML.replace(b'1a2b3c4d', b'5e6f7a8b'))
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        response = self.client.get('/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'5e6f7a8b', response.content)
+
+    def test_missing_build_returns_503(self):
+        logging.disable(logging.ERROR)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        with override_settings(REACT_INDEX_FILE=self.path + '.missing'):
+            response = self.client.get('/')
+        self.assertEqual(response.status_code, 503)
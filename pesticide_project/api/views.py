@@ -7,7 +7,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.exceptions import ValidationError
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import login, logout
-from django.db.models import Q, Count, Case, When
+from django.db.models import Q, Count, Case, When, F
 from django.utils import timezone
 from datetime import timedelta
 from django.core.mail import send_mail
@@ -16,16 +16,23 @@ from .serializers import (
     UserSerializer, UserSignupSerializer, UserLoginSerializer,
     PasswordResetRequestSerializer, PasswordResetSerializer
 )
-from .models import User, SearchLog, FoodCategory, PasswordResetToken, GuestSession
+from .models import User, SearchLog, PasswordResetToken, GuestSession
 from rest_framework.filters import SearchFilter
 from .models import LimitConditionCode, PesticideLimit, PesticideDetail
-from .serializers import LimitConditionCodeSerializer, PesticideLimitSerializer
+from .serializers import LimitConditionCodeSerializer, PesticideLimitSerializer, BulkLookupSerializer
+from .serializers import pesticide_limit_values, serialize_pesticide_limits
+from .bulk_lookup import resolve_pairs
+from . import food_categories
+from .signals import notify_external_bulk_search
 from django.http import HttpResponse
 from django.http import JsonResponse
 from django.middleware.csrf import get_token
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-import requests
+from . import metrics
+from .profiling import profile_view
+from .pagination import PesticideLimitCursorPagination, get_stream_format, stream_queryset, wants_pagination
+import decimal
 import logging
 
 # 로거 설정
@@ -308,6 +315,7 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
         
         return guest_session.can_query(), guest_session
 
+    @profile_view('pesticide_list')
     def list(self, request):
         pesticide = request.query_params.get('pesticide', '').strip()
         food = request.query_params.get('food', '').strip()
@@ -338,9 +346,16 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = self.queryset.filter(pesticide_query).select_related('condition_code')
 
         if get_all_foods and pesticide:
-            queryset = queryset.order_by('food_name')
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            rows = pesticide_limit_values(queryset.order_by('food_name', 'id'))
+            # 결과가 많은 농약은 스트리밍(?stream=ndjson|json) 또는 커서 페이지(?page_size=, ?cursor=)로 제공
+            stream_format = get_stream_format(request)
+            if stream_format:
+                return stream_queryset(rows, serialize_pesticide_limits, stream_format)
+            if wants_pagination(request):
+                paginator = PesticideLimitCursorPagination()
+                page = paginator.paginate_queryset(rows, request, view=self)
+                return paginator.get_paginated_response(serialize_pesticide_limits(page))
+            return Response(serialize_pesticide_limits(rows))
 
         if not pesticide or not food:
             raise ValidationError("Both pesticide and food parameters are required")
@@ -356,10 +371,10 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
             'food_name'
         )
 
-        if direct_matches.exists():
-            serializer = self.get_serializer(direct_matches, many=True)
+        direct_rows = list(pesticide_limit_values(direct_matches))
+        if direct_rows:
             # 검색 결과가 있는 경우 로깅
-            self._log_search(pesticide, food, direct_matches.count())
+            self._log_search(pesticide, food, len(direct_rows))
             
             # 게스트 사용자의 쿼리 카운트 증가
             if not request.user.is_authenticated:
@@ -367,18 +382,15 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
                 if guest_session:
                     guest_session.increment_query()
             
-            return Response(serializer.data)
-
-        # 직접 매칭이 없는 경우에만 FoodCategory 확인
-        try:
-            category = FoodCategory.objects.get(food_name__iexact=food)
-            if category.sub_category:
-                sub_matches = queryset.filter(food_name__iexact=category.sub_category)
-                if sub_matches.exists():
-                    for match in sub_matches:
-                        match.matching_type = 'sub'
-                        match.original_food_name = food
-                    serializer = self.get_serializer(sub_matches, many=True)
+            return Response(serialize_pesticide_limits(direct_rows))
+
+        # 직접 매칭이 없는 경우에만 FoodCategory 확인 (메모리 분류 맵, 쿼리 없음)
+        category = food_categories.lookup(food)
+        if category:
+            sub_category, main_category = category
+            if sub_category:
+                sub_matches = list(pesticide_limit_values(queryset.filter(food_name__iexact=sub_category)))
+                if sub_matches:
                     
                     # 게스트 사용자의 쿼리 카운트 증가
                     if not request.user.is_authenticated:
@@ -386,15 +398,11 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
                         if guest_session:
                             guest_session.increment_query()
                     
-                    return Response(serializer.data)
-
-            if category.main_category:
-                main_matches = queryset.filter(food_name__iexact=category.main_category)
-                if main_matches.exists():
-                    for match in main_matches:
-                        match.matching_type = 'main'
-                        match.original_food_name = food
-                    serializer = self.get_serializer(main_matches, many=True)
+                    return Response(serialize_pesticide_limits(sub_matches, 'sub', food))
+
+            if main_category:
+                main_matches = list(pesticide_limit_values(queryset.filter(food_name__iexact=main_category)))
+                if main_matches:
                     
                     # 게스트 사용자의 쿼리 카운트 증가
                     if not request.user.is_authenticated:
@@ -402,10 +410,7 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
                         if guest_session:
                             guest_session.increment_query()
                     
-                    return Response(serializer.data)
-
-        except FoodCategory.DoesNotExist:
-            pass
+                    return Response(serialize_pesticide_limits(main_matches, 'main', food))
 
         # 검색 결과가 없는 경우도 로깅 (results_count=0)
         self._log_search(pesticide, food, 0)
@@ -421,6 +426,161 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
             "searched_food": food
         }, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=False, methods=['POST'])
+    @profile_view('pesticide_bulk_lookup')
+    def bulk_lookup(self, request):
+        """
+        여러 (농약, 식품) 쌍을 한 번에 조회
+        - 요청: {"pairs": [{"pesticide": "...", "food": "..."}, ...]}
+        - 응답: 쌍 순서대로 단건 조회(list)와 같은 결과 + matching_type(direct/sub/main)
+        - 게스트 검색 횟수 차감과 검색 로그 기록은 요청당 한 번에 처리
+        """
+        max_pairs = getattr(settings, 'BULK_LOOKUP_MAX_PAIRS', 100)
+        serializer = BulkLookupSerializer(data=request.data, context={'max_pairs': max_pairs})
+        serializer.is_valid(raise_exception=True)
+        pairs = [(pair['pesticide'], pair['food']) for pair in serializer.validated_data['pairs']]
+
+        user_info = request.user.email if request.user.is_authenticated else f"Guest({get_client_ip(request)})"
+        logger.info(f"Pesticide bulk lookup: user={user_info}, pairs={len(pairs)}")
+
+        # 게스트는 남은 검색 횟수만큼만 결과 제공 (단건 조회와 같이 매칭된 쌍만 차감)
+        can_query, guest_session = self._check_guest_query_limit(request)
+        if not can_query:
+            return Response({
+                'error': 'query_limit_exceeded',
+                'message': '무료 검색 횟수가 초과되었습니다. 회원가입을 통해 무제한 검색을 이용해보세요.',
+                'query_count': guest_session.query_count,
+                'max_queries': 5,
+                'require_signup': True
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        remaining = 5 - guest_session.query_count if guest_session else None
+
+        results = []
+        search_logs = []
+        charged = 0
+        for (pesticide, food), resolved in zip(pairs, resolve_pairs(pairs)):
+            item = {'pesticide': pesticide, 'food': food, 'matching_type': resolved['matching_type']}
+
+            if resolved['matching_type'] is None:
+                info = resolved['pesticide_info']
+                item.update({
+                    'error': 'no_match',
+                    'error_type': 'not_permitted',
+                    'message': f"'{pesticide}'은(는) '{food}'에 사용이 허가되지 않은 농약성분입니다.",
+                    'pesticide_name_kr': info[0] if info else pesticide,
+                    'pesticide_name_en': info[1] if info else pesticide,
+                    'results': [],
+                })
+                search_logs.append(self._build_search_log(pesticide, food, 0))
+                results.append(item)
+                continue
+
+            if remaining is not None:
+                if charged >= remaining:
+                    item.update({'error': 'query_limit_exceeded', 'results': []})
+                    results.append(item)
+                    continue
+                charged += 1
+
+            limits = resolved['limits']
+            if resolved['matching_type'] != 'direct':
+                item['results'] = serialize_pesticide_limits(limits, resolved['matching_type'], food)
+            else:
+                search_logs.append(self._build_search_log(pesticide, food, len(limits)))
+                item['results'] = serialize_pesticide_limits(limits)
+            item['matched_food'] = resolved['matched_food']
+            results.append(item)
+
+        if charged:
+            GuestSession.objects.filter(pk=guest_session.pk).update(
+                query_count=F('query_count') + charged, updated_at=timezone.now()
+            )
+        self._log_searches(search_logs)
+
+        return Response({'count': len(results), 'results': results})
+
+    @action(detail=False, methods=['GET'])
+    @profile_view('pesticide_by_food')
+    def by_food(self, request):
+        """
+        식품별 역조회: 한 식품에 적용되는 모든 농약의 잔류허용기준
+        - 농약마다 직접 기준 → FoodCategory 소분류(sub) → 대분류(main) 순으로 적용 (단건 조회와 같은 규칙)
+        - 메모리의 MRL 행렬(mrl_matrix)에서 계산하므로 기준 테이블을 다시 조회하지 않음
+        - 파라미터: food(필수), page, page_size(최대 BY_FOOD_MAX_PAGE_SIZE), compact=true (열 이름 + 행 배열 형식)
+        """
+        food = request.query_params.get('food', '').strip()
+        if not food:
+            raise ValidationError("food parameter is required")
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            max_page_size = getattr(settings, 'BY_FOOD_MAX_PAGE_SIZE', 500)
+            page_size = min(max(1, int(request.query_params.get('page_size', 100))), max_page_size)
+        except ValueError:
+            raise ValidationError("page and page_size must be integers")
+        compact = request.query_params.get('compact', '').lower() == 'true'
+
+        # 게스트는 페이지마다 검색 1회로 차감 (결과가 있는 경우만, 단건 조회와 같은 규칙)
+        can_query, guest_session = self._check_guest_query_limit(request)
+        if not can_query:
+            return Response({
+                'error': 'query_limit_exceeded',
+                'message': '무료 검색 횟수가 초과되었습니다. 회원가입을 통해 무제한 검색을 이용해보세요.',
+                'query_count': guest_session.query_count,
+                'max_queries': 5,
+                'require_signup': True
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+        candidates = food_categories.candidates(food)
+        _, sub_category, main_category = candidates
+
+        from . import mrl_matrix  # numpy 는 이 기능을 쓸 때만 불러옴
+        matrix = mrl_matrix.get_matrix()
+        pesticide_ids, sources, values, conditions = matrix.food_limits(candidates)
+
+        total = len(pesticide_ids)
+        self._log_search(None, food, total)
+        if total == 0:
+            return Response({
+                'error': 'no_match',
+                'message': f"'{food}'에 대한 잔류허용기준이 없습니다.",
+                'searched_food': food
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        if guest_session:
+            guest_session.increment_query()
+
+        matching_types = ('direct', 'sub', 'main')
+        start = (page - 1) * page_size
+        rows = []
+        for i in range(start, min(start + page_size, total)):
+            p = pesticide_ids[i]
+            code = matrix.condition_codes[conditions[i]] if conditions[i] != mrl_matrix.NO_CONDITION else None
+            rows.append([
+                matrix.pesticides_kr[p],
+                matrix.pesticides[p],
+                f"{decimal.Decimal(int(values[i])) / mrl_matrix.SCALE:.3f}",
+                code,
+                matching_types[sources[i]],
+                candidates[sources[i]],
+            ])
+
+        columns = ['pesticide_name_kr', 'pesticide_name_en', 'max_residue_limit', 'condition_code',
+                   'matching_type', 'source_food']
+        data = {
+            'food': food,
+            'main_category': main_category,
+            'sub_category': sub_category,
+            'count': total,
+            'page': page,
+            'page_size': page_size,
+            'has_next': start + page_size < total,
+        }
+        if compact:
+            data.update(columns=columns, rows=rows)
+        else:
+            data['results'] = [dict(zip(columns, row)) for row in rows]
+        return Response(data)
+
     @action(detail=False, methods=['GET'], url_path='detail')
     def get_detail(self, request):
         try:
@@ -466,6 +626,30 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    def _build_search_log(self, pesticide, food, results_count):
+        """저장하지 않은 SearchLog 객체 생성 (일괄 저장용)"""
+        return SearchLog(
+            search_term=f"농약: {pesticide}, 식품: {food}",
+            pesticide_term=pesticide,
+            food_term=food,
+            results_count=results_count,
+            ip_address=get_client_ip(self.request),
+            user_agent=self.request.META.get('HTTP_USER_AGENT', '')
+        )
+
+    def _log_searches(self, search_logs):
+        """
+        검색 로그 일괄 저장
+        - bulk_create 는 post_save 시그널을 보내지 않으므로 외부 사용자 알림은 요청당 1통으로 따로 발송
+        """
+        if not search_logs:
+            return
+        try:
+            SearchLog.objects.bulk_create(search_logs)
+            notify_external_bulk_search(search_logs)
+        except Exception as e:
+            logger.error(f"Error logging bulk search: {str(e)}")
+
     def _log_search(self, pesticide, food, results_count):
         """검색 로그를 기록하는 내부 메서드"""
         try:
@@ -475,8 +659,8 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
             # User Agent 정보 가져오기
             user_agent = self.request.META.get('HTTP_USER_AGENT', '')
 
-            # 검색어 조합
-            search_term = f"농약: {pesticide}, 식품: {food}"
+            # 검색어 조합 (식품별 역조회는 농약명 없음)
+            search_term = f"농약: {pesticide}, 식품: {food}" if pesticide else f"식품: {food}"
 
             # 검색 로그 저장
             SearchLog.objects.create(
@@ -566,6 +750,7 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(list(results))
 
     @action(detail=False, methods=['GET'])
+    @profile_view()
     def find_similar_foods(self, request):
         """파싱된 품목명과 유사한 DB 품목들을 검색하여 반환"""
         parsed_food = request.query_params.get('food', '').strip()
@@ -653,82 +838,6 @@ class PesticideLimitViewSet(viewsets.ReadOnlyModelViewSet):
             'can_query': can_query
         })
 
-    @action(detail=False, methods=['GET'], permission_classes=[AllowAny])
-    def structure3d(self, request):
-        """농약성분의 3D 구조 데이터를 프록시로 가져오기"""
-        compound_name = request.query_params.get('compound_name', '').strip()
-        
-        if not compound_name:
-            return Response({'error': 'Compound name is required'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        try:
-            # 화합물명을 PubChem API에 맞게 변환
-            # 괄호와 특수문자를 제거하거나 적절히 변환
-            processed_name = compound_name
-            
-            # 일반적인 변환 규칙들
-            name_mappings = {
-                'Glufosinate(ammonium)': 'glufosinate-ammonium',
-                'Glufosinate ammonium': 'glufosinate-ammonium',
-                # 추가적인 매핑을 필요에 따라 추가
-            }
-            
-            if processed_name in name_mappings:
-                processed_name = name_mappings[processed_name]
-            else:
-                # 괄호 내용을 하이픈으로 변환
-                import re
-                processed_name = re.sub(r'\(([^)]+)\)', r'-\1', processed_name).lower()
-            
-            # 개발용 로그 (필요시에만)
-            # print(f"Compound name mapping: {compound_name} -> {processed_name}")
-            
-            # PubChem API를 통해 3D 구조 데이터 가져오기
-            # 먼저 CID 가져오기
-            cid_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/name/{processed_name}/cids/JSON"
-            cid_response = requests.get(cid_url, timeout=10)
-            
-            if cid_response.status_code != 200:
-                return Response({'error': 'Compound not found'}, status=status.HTTP_404_NOT_FOUND)
-            
-            cid_data = cid_response.json()
-            cid = cid_data.get('IdentifierList', {}).get('CID', [None])[0]
-            
-            if not cid:
-                return Response({'error': 'CID not found'}, status=status.HTTP_404_NOT_FOUND)
-            
-            # 3D SDF 구조 데이터 가져오기
-            sdf_url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/SDF?record_type=3d"
-            sdf_response = requests.get(sdf_url, timeout=10)
-            
-            if sdf_response.status_code == 200:
-                return Response({
-                    'structure_data': sdf_response.text,
-                    'cid': cid,
-                    'compound_name': compound_name
-                })
-            else:
-                # 3D 구조가 없는 경우 2D 구조 시도
-                sdf_url_2d = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug/compound/cid/{cid}/SDF"
-                sdf_response_2d = requests.get(sdf_url_2d, timeout=10)
-                
-                if sdf_response_2d.status_code == 200:
-                    return Response({
-                        'structure_data': sdf_response_2d.text,
-                        'cid': cid,
-                        'compound_name': compound_name,
-                        'is_2d': True
-                    })
-                    
-            return Response({'error': 'Structure data not available'}, status=status.HTTP_404_NOT_FOUND)
-            
-        except requests.RequestException as e:
-            print(f"Error fetching 3D structure: {str(e)}")
-            return Response({'error': 'Failed to fetch structure data'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        except Exception as e:
-            print(f"Unexpected error in structure3d: {str(e)}")
-            return Response({'error': 'Internal server error'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
     @action(detail=False, methods=['GET'])
     def search_logs(self, request):
         """검색 로그를 조회하는 엔드포인트"""
@@ -765,6 +874,17 @@ def index(request):
 def health_check(request):
     return JsonResponse({"status": "ok"}, status=200)
 
+def metrics_view(request):
+    """
+    Prometheus 메트릭 엔드포인트 (로컬 수집기 전용)
+    - REMOTE_ADDR 가 METRICS_ALLOWED_IPS 에 있고 프록시를 거치지 않은 요청만 허용
+    - 리버스 프록시를 통해 들어온 외부 요청(X-Forwarded-For 존재)은 404
+    """
+    allowed_ips = getattr(settings, 'METRICS_ALLOWED_IPS', ['127.0.0.1', '::1'])
+    if request.META.get('HTTP_X_FORWARDED_FOR') or request.META.get('REMOTE_ADDR') not in allowed_ips:
+        return HttpResponse(status=404)
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 def csrf_token_view(request):
     """CSRF 토큰을 제공하는 뷰"""
     token = get_token(request)
@@ -0,0 +1,85 @@
+# 검색 / 자동완성 API 벤치마크 (DRF 테스트 클라이언트, 미들웨어 포함 전체 요청 경로)
+# benchmarks/run.py 에서 seed_dataset() 이후 호출
+
+from rest_framework.test import APIClient
+
+from api.models import PesticideLimit, User
+from api.serializers import PesticideLimitSerializer, pesticide_limit_values, serialize_pesticide_limits
+
+from .timing import measure
+
+
+def _make_client():
+    # 게스트 검색 횟수 제한(5회)에 걸리지 않도록 인증된 사용자로 요청
+    user, _ = User.objects.get_or_create(
+        username='bench', defaults={'email': 'bench@example.com', 'organization': 'benchmark'}
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def build_cases(dataset):
+    """(이름, 경로, 파라미터, 기대 상태코드) 목록 - 데이터셋 이름에서 검색어를 고름"""
+    pesticide_kr = dataset['pesticides_kr'][0]
+    pesticide_en = dataset['pesticides'][0]
+    category_food = dataset['category_only_foods'][0]
+    return [
+        ('list.direct', '/api/pesticides/', {'pesticide': pesticide_kr, 'food': '부추'}, 200),
+        ('list.direct_en', '/api/pesticides/', {'pesticide': pesticide_en, 'food': '고추'}, 200),
+        ('list.category_fallback', '/api/pesticides/', {'pesticide': pesticide_kr, 'food': category_food}, 200),
+        ('list.no_match', '/api/pesticides/', {'pesticide': pesticide_kr, 'food': '없는품목'}, 404),
+        ('list.all_foods', '/api/pesticides/', {'pesticide': pesticide_kr, 'getAllFoods': 'true'}, 200),
+        ('list.all_foods.page', '/api/pesticides/',
+         {'pesticide': pesticide_kr, 'getAllFoods': 'true', 'page_size': 100}, 200),
+        ('list.all_foods.ndjson', '/api/pesticides/',
+         {'pesticide': pesticide_kr, 'getAllFoods': 'true', 'stream': 'ndjson'}, 200),
+        ('autocomplete.kr', '/api/pesticides/autocomplete/', {'query': pesticide_kr[:2]}, 200),
+        ('autocomplete.en', '/api/pesticides/autocomplete/', {'query': 'az'}, 200),
+        ('food_autocomplete', '/api/pesticides/food_autocomplete/', {'query': '고'}, 200),
+        ('find_similar_foods.exact', '/api/pesticides/find_similar_foods/', {'food': '부추'}, 200),
+        ('find_similar_foods.fuzzy', '/api/pesticides/find_similar_foods/', {'food': '청양고추가루'}, 200),
+        ('get_detail', '/api/pesticides/detail/', {'pesticide': pesticide_kr, 'food': '고'}, 200),
+        ('by_food.category', '/api/pesticides/by_food/', {'food': category_food}, 200),
+        ('by_food.compact', '/api/pesticides/by_food/', {'food': '고추', 'compact': 'true', 'page_size': 500}, 200),
+    ]
+
+
+def run(dataset, iterations=50, warmup=3, only=None):
+    client = _make_client()
+    results = {}
+    for name, path, params, expected_status in build_cases(dataset):
+        if only and not any(f"api.{name}".startswith(prefix) for prefix in only):
+            continue
+
+        status_codes = set()
+
+        def call():
+            response = client.get(path, params)
+            if response.streaming:
+                b''.join(response.streaming_content)  # 스트리밍 응답은 본문을 끝까지 읽어야 전체 비용
+            status_codes.add(response.status_code)
+
+        result = measure(call, iterations, warmup)
+        result['status'] = sorted(status_codes)
+        if status_codes != {expected_status}:
+            result['unexpected_status'] = True
+        results[f"api.{name}"] = result
+
+    results.update(run_serializers(iterations, warmup, only))
+    return results
+
+
+def run_serializers(iterations=50, warmup=3, only=None):
+    """같은 500행을 ModelSerializer 와 .values() 빠른 경로로 직렬화 (쿼리 포함)"""
+    queryset = PesticideLimit.objects.select_related('condition_code').order_by('food_name', 'id')[:500]
+    cases = [
+        ('serializer.model', lambda: PesticideLimitSerializer(queryset.all(), many=True).data),
+        ('serializer.values', lambda: serialize_pesticide_limits(pesticide_limit_values(queryset.all()))),
+    ]
+    results = {}
+    for name, func in cases:
+        if only and not any(f"api.{name}".startswith(prefix) for prefix in only):
+            continue
+        results[f"api.{name}"] = measure(func, iterations, warmup)
+    return results
@@ -0,0 +1,80 @@
+# DB 연결 관리 벤치마크 (DB_POOL_MODE 별 검색 요청 처리량)
+# - 요청마다 close_old_connections() 로 요청 시작/종료 신호와 같은 연결 정리를 흉내냄
+#   (테스트 클라이언트는 요청 중에 이 신호 처리를 끄므로 직접 호출)
+# - none: 요청마다 새 연결 / persistent: CONN_MAX_AGE + 상태 확인 / pool: 프로세스 내 풀
+# - ENGINE 이 api.db_backend 인 PostgreSQL 설정에서만 의미가 있음
+#   (SQLite 테스트 DB 는 메모리 DB 라 연결을 닫으면 데이터가 사라지므로 건너뜀)
+#   python -m benchmarks.run --settings config.settings.production --only db.
+
+import sys
+import threading
+import time
+
+from django.db import close_old_connections, connection, connections
+
+from api import db_pool
+
+from .bench_api import _make_client
+from .timing import measure
+
+MODES = {
+    'none': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'POOL': None},
+    'persistent': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True, 'POOL': None},
+    'pool': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': True, 'POOL': {'MAX_SIZE': 8, 'TIMEOUT': 5.0}},
+}
+THREADS = 8
+
+
+def _throughput(call, seconds=2.0):
+    """THREADS 개 스레드가 seconds 초 동안 처리한 요청 수 / 초"""
+    counts = [0] * THREADS
+    stop_at = time.perf_counter() + seconds
+
+    def worker(index):
+        try:
+            while time.perf_counter() < stop_at:
+                call()
+                counts[index] += 1
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return round(sum(counts) / seconds, 1)
+
+
+def run(dataset, iterations=50, warmup=3, only=None):
+    if connection.vendor != 'postgresql' or connection.settings_dict['ENGINE'] != 'api.db_backend':
+        print("db.* 벤치마크 건너뜀 (ENGINE 이 api.db_backend 인 PostgreSQL 설정에서만 실행)", file=sys.stderr)
+        return {}
+
+    client = _make_client()
+    params = {'pesticide': dataset['pesticides_kr'][0], 'food': '부추'}
+
+    def call():
+        close_old_connections()
+        client.get('/api/pesticides/', params)
+        close_old_connections()
+
+    original = {key: connection.settings_dict.get(key) for key in MODES['none']}
+    results = {}
+    try:
+        for mode, options in MODES.items():
+            name = f"db.search.{mode}"
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            connection.close()
+            db_pool.close_all_pools()
+            # 다른 스레드의 연결도 같은 settings_dict 로 만들어짐
+            connection.settings_dict.update(options)
+            result = measure(call, iterations, warmup)
+            result['requests_per_second'] = _throughput(call)
+            results[name] = result
+    finally:
+        connection.close()
+        db_pool.close_all_pools()
+        connection.settings_dict.update(original)
+    return results
@@ -0,0 +1,75 @@
+# 핫 쿼리 실행 계획(EXPLAIN) 확인 벤치마크
+# - 검색/검증에서 자주 쓰는 __iexact / __icontains 조회를 뷰와 같은 조건으로 실행해 시간을 재고
+#   EXPLAIN 결과를 결과 JSON 의 plan 에 함께 저장 (PostgreSQL 은 EXPLAIN ANALYZE)
+# - index_used: 대상 테이블 전체를 순차 탐색하지 않았는지 (PostgreSQL 'Seq Scan on', SQLite 'SCAN <table>' 이 없음)
+# - expects_index: 이 DB 에서 인덱스를 써야 하는 쿼리인지 (migrations/0018)
+#   · iexact: PostgreSQL UPPER() 인덱스 / SQLite NOCASE 인덱스
+#   · icontains: PostgreSQL pg_trgm 인덱스만 (검색어 3글자 이상) - SQLite 는 순차 탐색이 정상
+# 실행 (pesticide_project 디렉토리에서):
+#   python -m benchmarks.run --only explain.
+#   python -m benchmarks.run --only explain. --settings config.settings.production --output explain.json
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from api.models import PesticideDetail, PesticideLimit
+
+from .timing import measure
+
+
+def build_queries(dataset):
+    """(이름, queryset, 인덱스를 쓰는 DB 종류) 목록 - 각 queryset 은 해당 뷰/검증 함수와 같은 조건"""
+    pesticide_kr = dataset['pesticides_kr'][0]
+    pesticide_en = dataset['pesticides'][0]
+    both = ('postgresql', 'sqlite')
+    trigram = ('postgresql',)
+    search = Q(pesticide_name_kr__icontains=pesticide_kr) | Q(pesticide_name_en__icontains=pesticide_kr)
+    return [
+        # 업로드 품목 확인 / find_similar_foods 정확 매칭
+        ('limit.food_iexact', PesticideLimit.objects.filter(food_name__iexact='부추'), both),
+        # verify_pesticide_results 표준명 조회 / 기준 직접 매칭
+        ('limit.pesticide_iexact', PesticideLimit.objects.filter(pesticide_name_en__iexact=pesticide_en.upper()), both),
+        ('limit.pesticide_food_iexact',
+         PesticideLimit.objects.filter(pesticide_name_en__iexact=pesticide_en.lower(), food_name__iexact='고추'), both),
+        # 단건 조회(list) 직접 매칭
+        ('limit.search_food', PesticideLimit.objects.filter(search, food_name__iexact='부추'), both),
+        # 자동완성 / 전체 품목 조회
+        ('limit.pesticide_icontains',
+         PesticideLimit.objects.filter(search).values('pesticide_name_kr', 'pesticide_name_en').distinct()[:10], trigram),
+        ('limit.food_icontains',
+         PesticideLimit.objects.filter(food_name__icontains='엽채류').values_list('food_name', flat=True).distinct(),
+         trigram),
+        # 농약 상세(get_detail)
+        ('detail.pesticide_crop_icontains',
+         PesticideDetail.objects.filter(prdlst_kor_nm__icontains=pesticide_kr, crops_nm__icontains='엽채류'), trigram),
+    ]
+
+
+def explain(queryset):
+    if connection.vendor == 'postgresql':
+        return queryset.explain(analyze=True, buffers=True)
+    return queryset.explain()
+
+
+def uses_index(plan, table):
+    """대상 테이블을 순차 탐색하지 않는 실행 계획인지 (SQLite 의 SCAN ... USING COVERING INDEX 도 전체 탐색)"""
+    if connection.vendor == 'postgresql':
+        return f'Seq Scan on {table}' not in plan
+    return not re.search(rf'\bSCAN {re.escape(table)}\b', plan)
+
+
+def run(dataset, iterations=50, warmup=3, only=None):
+    results = {}
+    for name, queryset, index_vendors in build_queries(dataset):
+        name = f"explain.{name}"
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        result = measure(lambda: list(queryset.all()), iterations, warmup)
+        plan = explain(queryset)
+        result['plan'] = plan
+        result['index_used'] = uses_index(plan, queryset.model._meta.db_table)
+        result['expects_index'] = connection.vendor in index_vendors
+        results[name] = result
+    return results
@@ -0,0 +1,116 @@
+# 검정증명서 파서 벤치마크
+# - 텍스트 픽스처(benchmarks/fixtures/certificates/*.txt): 검증/추출/DB 검증/MRL 행렬 판정/저장 단계별 측정
+# - PDF 코퍼스(--pdf-dir, 기본값 certificates/ 가 있으면 사용): pdfplumber 추출을 포함한 전체 파싱 측정
+#   (실제 증명서 PDF 는 개인정보가 있어 저장소에 포함하지 않으므로 없으면 건너뜀)
+
+import glob
+import logging
+import os
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+
+from api import certificate_parser as parser
+from api import mrl_matrix
+
+from .timing import measure
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'certificates')
+
+TEXT_STAGES = [
+    ('validate_structure', parser.validate_certificate_structure),
+    ('validate_issuer', parser.validate_issuer),
+    ('extract_certificate_number', parser.extract_certificate_number),
+    ('extract_applicant_info', parser.extract_applicant_info),
+    ('extract_test_details', parser.extract_certificate_test_details),
+    ('extract_pesticide_results', parser.extract_pesticide_results),
+    ('parse_certificate_text', parser.parse_certificate_text),
+]
+
+
+def load_text_fixtures(directory=FIXTURE_DIR):
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.txt'))):
+        with open(path, encoding='utf-8') as f:
+            fixtures[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return fixtures
+
+
+def _prepare_parsing_result(text):
+    # upload_certificate 와 같은 방식으로 작물체 여부를 설정
+    parsing_result = parser.parse_certificate_text(text)
+    sample_description = parsing_result.get('sample_description') or ''
+    parsing_result['is_plant_material'] = '작물체' in sample_description
+    return parsing_result
+
+
+def _save_rolled_back(parsing_result, verification_result):
+    # 저장 비용만 측정하고 DB 에는 남기지 않음 (증명서 번호 unique 제약 회피)
+    with transaction.atomic():
+        pdf_file = SimpleUploadedFile('bench.pdf', b'%PDF-1.4 benchmark', content_type='application/pdf')
+        parser.save_certificate_data(parsing_result, verification_result, pdf_file)
+        transaction.set_rollback(True)
+
+
+def run(iterations=50, warmup=3, pdf_dir=None, only=None):
+    # 파서는 행마다 INFO 로그를 남기므로 측정 중에는 로그 출력을 끔
+    logging.disable(logging.WARNING)
+    try:
+        return _run(iterations, warmup, pdf_dir, only)
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def _run(iterations, warmup, pdf_dir, only):
+    results = {}
+
+    def wanted(name):
+        return not only or any(name.startswith(prefix) for prefix in only)
+
+    name = 'parser.mrl_matrix.build'
+    if wanted(name):
+        results[name] = measure(mrl_matrix.MRLMatrix.build, max(3, iterations // 10), warmup=1)
+
+    for fixture_name, text in load_text_fixtures().items():
+        for stage_name, func in TEXT_STAGES:
+            name = f"parser.{stage_name}.{fixture_name}"
+            if wanted(name):
+                results[name] = measure(lambda: func(text), iterations, warmup)
+
+        parsing_result = _prepare_parsing_result(text)
+
+        name = f"parser.verify_pesticide_results.{fixture_name}"
+        if wanted(name):
+            results[name] = measure(lambda: parser.verify_pesticide_results(parsing_result), iterations, warmup)
+
+        # 같은 판정을 MRL 행렬로 (증명서 1건 / 100건 묶음)
+        detections = [
+            (row.get('standard_pesticide_name_for_db', row['pesticide_name']), row['detection_value'])
+            for row in parsing_result.get('pesticide_results', [])
+        ]
+        food = parsing_result.get('sample_description') or ''
+        eco_friendly = '친환경' in (parsing_result.get('analytical_purpose') or '')
+        name = f"parser.mrl_matrix.evaluate.{fixture_name}"
+        if wanted(name):
+            mrl_matrix.get_matrix()
+            results[name] = measure(lambda: mrl_matrix.evaluate(detections, food, eco_friendly), iterations, warmup)
+        name = f"parser.mrl_matrix.evaluate_batch100.{fixture_name}"
+        if wanted(name):
+            batch = [(detections, food, eco_friendly)] * 100
+            results[name] = measure(lambda: mrl_matrix.evaluate_batch(batch), iterations, warmup)
+
+        name = f"parser.save_certificate_data.{fixture_name}"
+        if wanted(name):
+            verification_result = parser.verify_pesticide_results(parsing_result)
+            results[name] = measure(
+                lambda: _save_rolled_back(parsing_result, verification_result), iterations, warmup
+            )
+
+    # PDF 는 한 건에 수십~수백 ms 가 걸려 반복 횟수를 줄임
+    pdf_iterations = max(3, iterations // 10)
+    for path in sorted(glob.glob(os.path.join(pdf_dir, '*.pdf'))) if pdf_dir else []:
+        name = f"parser.parse_certificate_pdf.{os.path.splitext(os.path.basename(path))[0]}"
+        if wanted(name):
+            results[name] = measure(lambda: parser.parse_certificate_pdf(path), pdf_iterations, warmup=1)
+
+    return results
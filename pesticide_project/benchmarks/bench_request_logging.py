@@ -0,0 +1,96 @@
+# RequestLoggingMiddleware 요청당 오버헤드 측정
+# 실행 (pesticide_project 디렉토리에서): python -m benchmarks.bench_request_logging --requests 20000
+# - DB/네트워크 없이 미들웨어만 측정 (get_response 는 즉시 응답을 반환)
+# - 출력은 /dev/null 로 보내 터미널 출력 비용은 제외
+
+import argparse
+import logging
+import os
+import time
+
+import django
+from django.conf import settings
+
+if not settings.configured:
+    settings.configure(
+        DEBUG=False,
+        ALLOWED_HOSTS=['*'],
+        REQUEST_LOG_SAMPLE_RATES={},
+    )
+    django.setup()
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api.logging_utils import JsonFormatter, QueueListenerHandler
+from api.middleware import RequestLoggingMiddleware
+
+
+def _reset_logger(handler):
+    request_logger = logging.getLogger('api.requests')
+    for old in list(request_logger.handlers):
+        request_logger.removeHandler(old)
+        if isinstance(old, QueueListenerHandler):
+            old.listener.stop()
+    request_logger.propagate = False
+    request_logger.setLevel(logging.INFO)
+    if handler is not None:
+        request_logger.addHandler(handler)
+
+
+def _run(get_response, requests):
+    start = time.perf_counter()
+    for request in requests:
+        get_response(request)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='요청 로깅 미들웨어 오버헤드 측정')
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    factory = RequestFactory()
+    requests = [factory.get('/api/pesticides/', {'pesticide': '가스가마이신', 'food': '감귤'})
+                for _ in range(args.requests)]
+
+    def view(request):
+        return HttpResponse(b'ok')
+
+    devnull = open(os.devnull, 'w')
+
+    def stream_handler():
+        handler = logging.StreamHandler(devnull)
+        handler.setFormatter(JsonFormatter())
+        return handler
+
+    scenarios = [
+        ('no middleware', None, None),
+        ('sync StreamHandler (JSON)', stream_handler, {}),
+        ('QueueListenerHandler (JSON)', lambda: QueueListenerHandler([stream_handler()]), {}),
+        ('QueueListenerHandler, 5% sampled', lambda: QueueListenerHandler([stream_handler()]),
+         {'/api/pesticides/': 0.05}),
+    ]
+
+    baseline = None
+    print(f"{'scenario':<36}{'total(s)':>10}{'us/req':>10}{'overhead us':>14}")
+    for name, make_handler, sample_rates in scenarios:
+        if make_handler is None:
+            _reset_logger(None)
+            elapsed = _run(view, requests)
+        else:
+            _reset_logger(make_handler())
+            settings.REQUEST_LOG_SAMPLE_RATES = sample_rates
+            middleware = RequestLoggingMiddleware(view)
+            elapsed = _run(middleware, requests)
+        per_request = elapsed / len(requests) * 1e6
+        if baseline is None:
+            baseline = per_request
+        print(f"{name:<36}{elapsed:>10.3f}{per_request:>10.1f}{per_request - baseline:>14.1f}")
+
+    _reset_logger(None)
+    devnull.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# 워커 시작 시간 벤치마크
+# - startup.import_urls: 새 파이썬 프로세스에서 django.setup() + URLconf import 까지 (gunicorn 워커가 앱을 불러오는 비용)
+# - startup.first_request: 새 프로세스에서 WSGI 앱을 만들고 첫 요청(/health/) 응답까지
+# - --importtime: python -X importtime 결과에서 누적 시간이 큰 모듈 목록 출력
+# 실행 (pesticide_project 디렉토리에서):
+#   python -m benchmarks.bench_startup --iterations 10
+#   python -m benchmarks.bench_startup --importtime --top 25
+# benchmarks/run.py 에서도 startup.* 항목으로 실행됨
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from .timing import summarize
+
+# URLconf 를 불러온 뒤에도 import 되어 있으면 안 되는 무거운 모듈 (첫 사용 시 지연 import)
+IMPORT_BUDGET_MODULES = ('pdfplumber', 'PyPDF2', 'pandas', 'numpy', 'httpx', 'api.certificate_parser')
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_URLS = "import django; django.setup(); import config.urls"
+FIRST_REQUEST = """
+from io import BytesIO
+from config.wsgi import application
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': '/health/', 'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+    'SERVER_PORT': '80', 'REMOTE_ADDR': '127.0.0.1', 'HTTP_HOST': 'localhost', 'wsgi.input': BytesIO(),
+    'wsgi.url_scheme': 'http', 'wsgi.errors': BytesIO(),
+}
+statuses = []
+body = b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+assert statuses[0].startswith('200'), statuses
+"""
+LOADED_MODULES = IMPORT_URLS + """
+import json, sys
+print(json.dumps(sorted(name for name in %r if name in sys.modules)))
+""" % (IMPORT_BUDGET_MODULES,)
+
+
+def _python(code, settings, extra_args=()):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings)
+    return subprocess.run(
+        [sys.executable, *extra_args, '-c', code], cwd=PROJECT_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+    )
+
+
+def loaded_heavy_modules(settings='config.settings.test'):
+    """URLconf 를 불러온 새 프로세스에 이미 import 된 IMPORT_BUDGET_MODULES 목록"""
+    import json
+    return json.loads(_python(LOADED_MODULES, settings).stdout.decode().strip().splitlines()[-1])
+
+
+def importtime(settings='config.settings.test', top=20):
+    """python -X importtime 결과 - [(누적 ms, 자체 ms, 모듈)] 누적 시간 순"""
+    stderr = _python(IMPORT_URLS, settings, ('-X', 'importtime')).stderr.decode()
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us = int(parts[0].split(':')[1])
+        rows.append((int(parts[1]) / 1000, self_us / 1000, parts[2].strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def _measure_process(code, settings, iterations, warmup):
+    for _ in range(warmup):
+        _python(code, settings)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        _python(code, settings)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, queries=0)
+
+
+def run(iterations=10, warmup=1, only=None, settings='config.settings.test'):
+    cases = [('startup.import_urls', IMPORT_URLS), ('startup.first_request', FIRST_REQUEST)]
+    results = {}
+    for name, code in cases:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        results[name] = _measure_process(code, settings, iterations, warmup)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='워커 시작 시간 / import 시간 측정')
+    parser.add_argument('--settings', default='config.settings.test')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--importtime', action='store_true', help='누적 import 시간이 큰 모듈 출력')
+    parser.add_argument('--top', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.importtime:
+        print(f"{'cumulative_ms':>13}  {'self_ms':>8}  module")
+        for cumulative, self_ms, module in importtime(args.settings, args.top):
+            print(f"{cumulative:>13.1f}  {self_ms:>8.1f}  {module}")
+        heavy = loaded_heavy_modules(args.settings)
+        print(f"\n시작 시 불러오면 안 되는 모듈: {', '.join(heavy) if heavy else '없음'}")
+        return
+
+    for name, result in run(args.iterations, settings=args.settings).items():
+        print(f"{name:<24} median {result['median_ms']:>8.1f} ms  p95 {result['p95_ms']:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# 벤치마크 결과 비교 (커밋 간 성능 변화 확인)
+# 실행: python -m benchmarks.compare before.json after.json [--threshold 0.15] [--metric median_ms]
+# - 시간은 threshold(기본 15%) 이상 느려졌을 때, 쿼리 수는 1개라도 늘었을 때 회귀로 표시
+# - 회귀가 있으면 종료코드 1 (CI 에서 사용 가능)
+
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(before, after, metric='median_ms', threshold=0.15):
+    """항목별 변화 목록과 회귀 여부 반환"""
+    rows = []
+    regressed = False
+    names = list(before['results']) + [name for name in after['results'] if name not in before['results']]
+    for name in names:
+        old = before['results'].get(name)
+        new = after['results'].get(name)
+        if old is None or new is None:
+            rows.append((name, old and old[metric], new and new[metric], None,
+                         old and old['queries'], new and new['queries'], 'added' if old is None else 'removed'))
+            continue
+
+        change = (new[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+        status = ''
+        if change >= threshold or new['queries'] > old['queries']:
+            status = 'REGRESSION'
+            regressed = True
+        elif change <= -threshold or new['queries'] < old['queries']:
+            status = 'improved'
+        rows.append((name, old[metric], new[metric], change, old['queries'], new['queries'], status))
+    return rows, regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='벤치마크 결과 JSON 비교')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--metric', default='median_ms', choices=['median_ms', 'mean_ms', 'p95_ms', 'min_ms'])
+    parser.add_argument('--threshold', type=float, default=0.15, help='회귀로 판단할 시간 증가율 (0.15 = 15%%)')
+    args = parser.parse_args(argv)
+
+    before, after = _load(args.before), _load(args.after)
+    rows, regressed = compare(before, after, args.metric, args.threshold)
+
+    print(f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}  metric: {args.metric}")
+    if before['meta'].get('dataset') != after['meta'].get('dataset'):
+        print('주의: 두 결과의 데이터셋 규모가 다릅니다.')
+
+    name_width = max((len(row[0]) for row in rows), default=10)
+    print(f"{'name':<{name_width}}  {'before':>10}  {'after':>10}  {'change':>8}  {'queries':>9}")
+    for name, old, new, change, old_queries, new_queries, status in rows:
+        old_text = f"{old:.3f}" if old is not None else '-'
+        new_text = f"{new:.3f}" if new is not None else '-'
+        change_text = f"{change:+.1%}" if change is not None else '-'
+        queries_text = f"{old_queries if old_queries is not None else '-'}→{new_queries if new_queries is not None else '-'}"
+        print(f"{name:<{name_width}}  {old_text:>10}  {new_text:>10}  {change_text:>8}  {queries_text:>9}  {status}")
+
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
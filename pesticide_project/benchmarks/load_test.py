@@ -0,0 +1,170 @@
+# 서버 부하 테스트 - config/gunicorn.py 기본값(워커/스레드, 업로드 분리)의 근거
+# - 검색 클라이언트 스레드들이 자동완성/유사 품목/(토큰이 있으면) 농약 검색을 반복 호출하고
+#   동시에 업로드 클라이언트 스레드들이 검정증명서 PDF 를 계속 올림 (PDF 파싱 부하)
+# - 검색 요청의 p50/p95/p99, 초당 처리량, 업로드 처리량을 출력
+# - 표준 라이브러리만 사용 (실행 중인 서버에 HTTP 로 요청, Django 설정 불필요)
+# 실행 예 (pesticide_project 디렉토리에서):
+#   python -m benchmarks.load_test --url http://127.0.0.1:8000 --duration 30 --search-clients 16
+#   python -m benchmarks.load_test --url http://127.0.0.1:8000 --upload-clients 2 --pdf certificates/a.pdf
+#   (업로드 분리) ... --upload-url http://127.0.0.1:8001 --upload-clients 2 --pdf certificates/a.pdf
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import Request, urlopen
+
+SEARCH_REQUESTS = [
+    ('/api/pesticides/autocomplete/', {'query': '아세'}),
+    ('/api/pesticides/autocomplete/', {'query': 'az'}),
+    ('/api/pesticides/food_autocomplete/', {'query': '고'}),
+    ('/api/pesticides/find_similar_foods/', {'food': '부추'}),
+    ('/api/pesticides/find_similar_foods/', {'food': '청양고추가루'}),
+]
+# 게스트는 검색 5회 제한이 있어 --token 을 준 경우에만 포함
+AUTHENTICATED_SEARCH_REQUESTS = [
+    ('/api/pesticides/', {'pesticide': '아세타미프리드', 'food': '부추'}),
+    ('/api/pesticides/', {'pesticide': '아세타미프리드', 'food': '고추'}),
+]
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(len(sorted_values) * fraction)) - 1))
+    return sorted_values[index]
+
+
+def _multipart(path):
+    boundary = uuid.uuid4().hex
+    with open(path, 'rb') as f:
+        content = f.read()
+    filename = path.rsplit('/', 1)[-1].encode('utf-8')
+    body = b''.join([
+        f"--{boundary}\r\n".encode(),
+        b'Content-Disposition: form-data; name="file"; filename="' + filename + b'"\r\n',
+        b'Content-Type: application/pdf\r\n\r\n', content, b'\r\n',
+        f"--{boundary}\r\n".encode(),
+        b'Content-Disposition: form-data; name="skip_food_validation"\r\n\r\ntrue\r\n',
+        f"--{boundary}--\r\n".encode(),
+    ])
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class Recorder:
+
+    def __init__(self):
+        self.samples = []
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def record(self, seconds, ok):
+        with self.lock:
+            if ok:
+                self.samples.append(seconds)
+            else:
+                self.errors += 1
+
+    def summary(self, duration):
+        samples_ms = sorted(sample * 1000 for sample in self.samples)
+        return {
+            'requests': len(samples_ms),
+            'errors': self.errors,
+            'requests_per_second': round(len(samples_ms) / duration, 1),
+            'p50_ms': round(statistics.median(samples_ms), 1) if samples_ms else 0.0,
+            'p95_ms': round(_percentile(samples_ms, 0.95), 1),
+            'p99_ms': round(_percentile(samples_ms, 0.99), 1),
+        }
+
+
+def _timed(request, recorder, timeout):
+    start = time.perf_counter()
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            response.read()
+            ok = response.status < 500
+    except HTTPError as e:
+        ok = e.code < 500  # 4xx(없는 품목 등)는 정상 응답으로 집계
+    except (URLError, OSError):
+        ok = False
+    recorder.record(time.perf_counter() - start, ok)
+
+
+def _search_client(args, stop_at, recorder, index):
+    requests = SEARCH_REQUESTS + (AUTHENTICATED_SEARCH_REQUESTS if args.token else [])
+    headers = {'Authorization': f"Token {args.token}"} if args.token else {}
+    i = index
+    while time.perf_counter() < stop_at:
+        path, params = requests[i % len(requests)]
+        i += 1
+        _timed(Request(f"{args.url}{path}?{urlencode(params)}", headers=headers), recorder, args.timeout)
+
+
+def _upload_client(args, stop_at, recorder, body, content_type):
+    url = f"{args.upload_url or args.url}/api/certificates/upload/"
+    while time.perf_counter() < stop_at:
+        request = Request(url, data=body, headers={'Content-Type': content_type}, method='POST')
+        _timed(request, recorder, args.timeout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='검색 + 증명서 업로드 혼합 부하 테스트')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='검색 요청을 보낼 서버')
+    parser.add_argument('--upload-url', default=None, help='업로드 요청을 보낼 서버 (기본값: --url)')
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--search-clients', type=int, default=16)
+    parser.add_argument('--upload-clients', type=int, default=0)
+    parser.add_argument('--pdf', default=None, help='업로드할 검정증명서 PDF (--upload-clients 와 함께)')
+    parser.add_argument('--token', default=None, help='인증 토큰 (농약 검색 API 포함)')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+    args.url = args.url.rstrip('/')
+    if args.upload_url:
+        args.upload_url = args.upload_url.rstrip('/')
+    if args.upload_clients and not args.pdf:
+        parser.error('--upload-clients 에는 --pdf 가 필요합니다')
+
+    search, upload = Recorder(), Recorder()
+    stop_at = time.perf_counter() + args.duration
+    threads = [
+        threading.Thread(target=_search_client, args=(args, stop_at, search, index), daemon=True)
+        for index in range(args.search_clients)
+    ]
+    if args.upload_clients:
+        body, content_type = _multipart(args.pdf)
+        threads += [
+            threading.Thread(target=_upload_client, args=(args, stop_at, upload, body, content_type), daemon=True)
+            for _ in range(args.upload_clients)
+        ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    report = {
+        'config': {key: value for key, value in vars(args).items() if key not in ('token', 'output')},
+        'search': search.summary(args.duration),
+    }
+    if args.upload_clients:
+        report['upload'] = upload.summary(args.duration)
+
+    for name in ('search', 'upload'):
+        if name in report:
+            result = report[name]
+            print(f"{name:<7} {result['requests']:>6} req  {result['requests_per_second']:>7} req/s  "
+                  f"p50 {result['p50_ms']:>7} ms  p95 {result['p95_ms']:>7} ms  p99 {result['p99_ms']:>7} ms  "
+                  f"errors {result['errors']}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
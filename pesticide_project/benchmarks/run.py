@@ -0,0 +1,111 @@
+# 오프라인 벤치마크 실행기 (검색/자동완성 API + 검정증명서 파서)
+# 실행 (pesticide_project 디렉토리에서):
+#   python -m benchmarks.run --output benchmarks/results/$(git rev-parse --short HEAD).json
+#   python -m benchmarks.run --only api.list parser.parse_certificate_text --iterations 100
+#   python -m benchmarks.compare before.json after.json
+# - config.settings.test 로 메모리 SQLite 테스트 DB 를 만들고 seed_dataset() 으로 합성 데이터 생성
+# - 외부 API / PostgreSQL 없이 실행 가능 (PostgreSQL 로 측정하려면 --settings 로 다른 설정 지정)
+# - db.* (DB 연결 관리별 처리량)는 PostgreSQL 설정에서만 실행
+# - startup.* (워커 시작 시간)는 새 파이썬 프로세스를 띄워 측정 (--iterations 와 무관하게 최대 10회)
+# - explain.* (핫 쿼리 실행 계획)는 EXPLAIN 결과를 결과 JSON 의 plan 에 저장, 인덱스를 써야 하는데 순차 탐색이면 표시
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='검색/자동완성/증명서 파싱 벤치마크')
+    parser.add_argument('--settings', default='config.settings.test', help='Django 설정 모듈')
+    parser.add_argument('--scale', type=float, default=1.0, help='합성 데이터 규모 배수 (1.0 = 운영 규모)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--only', nargs='*', default=None, help='이 접두어로 시작하는 항목만 실행 (예: api.list parser.)')
+    parser.add_argument('--pdf-dir', default='certificates', help='PDF 코퍼스 경로 (없으면 PDF 측정 생략)')
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = args.settings
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from . import bench_api, bench_db, bench_explain, bench_parser, bench_startup
+    from .seed import seed_dataset
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        start = time.perf_counter()
+        dataset = seed_dataset(scale=args.scale, seed=args.seed)
+        seed_seconds = time.perf_counter() - start
+        print(f"데이터 생성 완료 ({seed_seconds:.1f}s): {dataset['counts']}", file=sys.stderr)
+
+        only = args.only
+        results = {}
+        if not only or any(prefix.startswith('api') for prefix in only):
+            results.update(bench_api.run(dataset, args.iterations, args.warmup, only))
+        if not only or any(prefix.startswith('parser') for prefix in only):
+            pdf_dir = args.pdf_dir if args.pdf_dir and os.path.isdir(args.pdf_dir) else None
+            results.update(bench_parser.run(args.iterations, args.warmup, pdf_dir, only))
+        if not only or any(prefix.startswith('explain') for prefix in only):
+            results.update(bench_explain.run(dataset, args.iterations, args.warmup, only))
+        if not only or any(prefix.startswith('db') for prefix in only):
+            results.update(bench_db.run(dataset, args.iterations, args.warmup, only))
+        if not only or any(prefix.startswith('startup') for prefix in only):
+            results.update(bench_startup.run(min(args.iterations, 10), 1, only, args.settings))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'settings': args.settings,
+            'scale': args.scale,
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'dataset': dataset['counts'],
+        },
+        'results': results,
+    }
+
+    name_width = max((len(name) for name in results), default=10)
+    print(f"{'name':<{name_width}}  {'median_ms':>10}  {'p95_ms':>10}  {'queries':>7}")
+    for name, result in results.items():
+        flag = '  !status' if result.get('unexpected_status') else ''
+        if 'requests_per_second' in result:
+            flag += f"  {result['requests_per_second']} req/s ({bench_db.THREADS} threads)"
+        if result.get('expects_index') and not result['index_used']:
+            flag += '  !seq scan'
+        print(f"{name:<{name_width}}  {result['median_ms']:>10.3f}  {result['p95_ms']:>10.3f}  {result['queries']:>7}{flag}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+# 벤치마크용 합성 데이터 생성
+# - 운영 DB 규모(잔류허용기준 약 2.5만 건, 품목 분류 약 1천 건, 농약 상세 약 3만 건)를 기본값으로 생성
+# - random.Random(seed) 로 생성하므로 같은 seed/scale 이면 커밋이 달라도 같은 데이터가 만들어짐
+# - 픽스처 증명서(benchmarks/fixtures/certificates)에 나오는 농약/품목은 항상 포함
+
+import random
+from decimal import Decimal
+
+from api.models import FoodCategory, LimitConditionCode, PesticideDetail, PesticideLimit
+
+BATCH_SIZE = 2000
+
+# 픽스처 증명서에 나오는 농약 (영문명, 한글명)
+ANCHOR_PESTICIDES = [
+    ('Acetamiprid', '아세타미프리드'),
+    ('Acibenzolar-s-methyl', '아시벤졸라-에스-메틸'),
+    ('Azoxystrobin', '아족시스트로빈'),
+    ('Bifenthrin', '비펜트린'),
+    ('Boscalid', '보스칼리드'),
+    ('Carbendazim', '카벤다짐'),
+    ('Chlorantraniliprole', '클로란트라닐리프롤'),
+    ('Chlorfenapyr', '클로르페나피르'),
+    ('Clothianidin', '클로티아니딘'),
+    ('Cyclaniliprole', '사이클라닐리프롤'),
+    ('Cyhalothrin', '사이할로트린'),
+    ('Deltamethrin', '델타메트린'),
+    ('Difenoconazole', '디페노코나졸'),
+    ('Dinotefuran', '디노테퓨란'),
+    ('Etofenprox', '에토펜프록스'),
+    ('Fenvalerate', '펜발러레이트'),
+    ('Flubendiamide', '플루벤디아마이드'),
+    ('Fluxametamide', '플룩사메타마이드'),
+    ('Imidacloprid', '이미다클로프리드'),
+    ('Indoxacarb', '인독사카브'),
+    ('Lufenuron', '루페뉴론'),
+    ('Methoxyfenozide', '메톡시페노자이드'),
+    ('Novaluron', '노발루론'),
+    ('Oxadiazon', '옥사디아존'),
+    ('Prochloraz', '프로클로라즈'),
+    ('Profenofos', '프로페노포스'),
+    ('Pyraclostrobin', '피라클로스트로빈'),
+    ('Pyridalyl', '피리달릴'),
+    ('Spiromesifen', '스피로메시펜'),
+    ('Spirotetramat', '스피로테트라맷'),
+    ('Sulfoxaflor', '설폭사플로르'),
+    ('Tebuconazole', '테부코나졸'),
+    ('Tebufenozide', '테부페노자이드'),
+    ('Teflubenzuron', '테플루벤주론'),
+    ('Trifloxystrobin', '트리플록시스트로빈'),
+]
+
+# 대분류 → 소분류 (소분류명도 잔류허용기준 food_name 으로 쓰임)
+CATEGORY_TREE = {
+    '곡류': ['쌀류', '맥류', '잡곡류'],
+    '서류': ['감자류', '고구마류'],
+    '두류': ['콩류', '팥류'],
+    '과일류': ['인과류', '핵과류', '감귤류', '장과류', '열대과일류'],
+    '채소류': ['엽채류', '엽경채류', '근채류', '과채류', '박과채소류', '유지종실류'],
+    '버섯류': ['느타리버섯류', '표고버섯류'],
+    '허브류': ['허브(잎)', '허브(뿌리)'],
+    '향신식물류': ['향신료(종자)', '향신료(열매)'],
+    '차류': ['녹차', '허브차'],
+    '인삼류': ['수삼', '건삼'],
+}
+
+# 픽스처 증명서 / 자주 검색되는 품목 (sub_category 는 CATEGORY_TREE 기준)
+ANCHOR_FOODS = [
+    ('부추', '채소류', '엽경채류'),
+    ('고추', '채소류', '과채류'),
+    ('들깻잎', '채소류', '엽채류'),
+    ('감귤', '과일류', '감귤류'),
+    ('사과', '과일류', '인과류'),
+    ('배추', '채소류', '엽채류'),
+    ('무', '채소류', '근채류'),
+    ('열무', '채소류', '엽채류'),
+    ('딸기', '과일류', '장과류'),
+    ('쌀', '곡류', '쌀류'),
+]
+
+CONDITION_CODES = [
+    ('T', '잠정기준'),
+    ('E', '농약 사용 외 비의도적 오염에 의한 기준'),
+    ('†', '수입식품에 한하여 적용'),
+    ('*', '제한적 적용'),
+]
+
+_SYLLABLES = list('가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후기니디리미비시이지치키티피히')
+_EN_PREFIXES = ['ac', 'al', 'az', 'bi', 'bo', 'ca', 'chlo', 'cy', 'di', 'e', 'fe', 'flu', 'ha', 'im', 'me', 'no',
+                'ox', 'pe', 'pro', 'py', 'sp', 'te', 'tri', 'va', 'zo']
+_EN_MIDDLES = ['ben', 'car', 'cla', 'fen', 'lo', 'ma', 'mi', 'na', 'pro', 'ra', 'sto', 'ti', 'to', 'xa']
+_EN_SUFFIXES = ['azole', 'thrin', 'mid', 'fos', 'carb', 'uron', 'amide', 'strobin', 'zine', 'dione', 'fen', 'ate']
+_FOOD_SUFFIXES = ['', '', '', '잎', '순', '뿌리', '(건조)', '(생것)']
+
+
+def _korean_name(rng, length):
+    return ''.join(rng.choice(_SYLLABLES) for _ in range(length))
+
+
+def _unique(rng, generate, existing, count):
+    names = []
+    while len(names) < count:
+        name = generate(rng)
+        if name not in existing:
+            existing.add(name)
+            names.append(name)
+    return names
+
+
+def _bulk_create(model, objects):
+    model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    return len(objects)
+
+
+def seed_dataset(scale=1.0, seed=42):
+    """
+    합성 데이터셋 생성 후 모델별 건수(counts)와 검색어로 쓸 이름 목록 반환
+    - scale 1.0: 농약 550종 x 품목 약 45개, 분류 품목 1,000건, 농약 상세 30,000건
+    """
+    rng = random.Random(seed)
+    n_pesticides = max(int(550 * scale), len(ANCHOR_PESTICIDES))
+    n_foods = max(int(400 * scale), len(ANCHOR_FOODS))
+    n_category_foods = int(1000 * scale)
+    n_details = int(30000 * scale)
+    foods_per_pesticide = 45
+
+    codes = [LimitConditionCode(code=code, description=description) for code, description in CONDITION_CODES]
+    _bulk_create(LimitConditionCode, codes)
+
+    # 농약 이름
+    used_en = {en for en, _ in ANCHOR_PESTICIDES}
+    used_kr = {kr for _, kr in ANCHOR_PESTICIDES}
+    extra = n_pesticides - len(ANCHOR_PESTICIDES)
+    en_names = _unique(
+        rng,
+        lambda r: (r.choice(_EN_PREFIXES) + r.choice(_EN_MIDDLES) + r.choice(_EN_SUFFIXES)).capitalize()
+        + ('' if r.random() < 0.8 else '-' + r.choice(['methyl', 'ethyl', 'sodium'])),
+        used_en, extra,
+    )
+    kr_names = _unique(rng, lambda r: _korean_name(r, r.randint(3, 7)), used_kr, extra)
+    pesticides = ANCHOR_PESTICIDES + list(zip(en_names, kr_names))
+
+    # 품목 이름 (소분류명 포함 - 카테고리 대체 조회 대상)
+    sub_categories = [sub for subs in CATEGORY_TREE.values() for sub in subs]
+    used_foods = {name for name, _, _ in ANCHOR_FOODS} | set(sub_categories) | set(CATEGORY_TREE)
+    food_names = [name for name, _, _ in ANCHOR_FOODS] + sub_categories + _unique(
+        rng, lambda r: _korean_name(r, r.randint(1, 3)) + r.choice(_FOOD_SUFFIXES),
+        used_foods, n_foods - len(ANCHOR_FOODS),
+    )
+
+    # 잔류허용기준 - 픽스처 농약은 픽스처 품목과 모든 소분류에 기준이 있도록 포함
+    anchor_food_names = [name for name, _, _ in ANCHOR_FOODS] + sub_categories
+    limits = []
+    for index, (en, kr) in enumerate(pesticides):
+        foods = set(rng.sample(food_names, min(foods_per_pesticide, len(food_names))))
+        if index < len(ANCHOR_PESTICIDES):
+            foods.update(anchor_food_names)
+        for food in sorted(foods):
+            code = rng.choice(codes) if rng.random() < 0.1 else None
+            limits.append(PesticideLimit(
+                pesticide_name_kr=kr,
+                pesticide_name_en=en,
+                food_name=food,
+                max_residue_limit=Decimal(rng.choice(['0.01', '0.05', '0.1', '0.2', '0.5', '1.0', '2.0', '5.0'])),
+                condition_code=code,
+            ))
+    _bulk_create(PesticideLimit, limits)
+
+    # 품목 분류 - 잔류허용기준에 없는 품목이 섞여 있어야 카테고리 대체 경로가 측정됨
+    categories = [FoodCategory(food_name=name, main_category=main, sub_category=sub) for name, main, sub in ANCHOR_FOODS]
+    category_names = _unique(
+        rng, lambda r: _korean_name(r, r.randint(2, 4)), set(food_names), n_category_foods - len(categories)
+    )
+    for name in category_names:
+        main = rng.choice(list(CATEGORY_TREE))
+        categories.append(FoodCategory(
+            food_name=name, main_category=main, sub_category=rng.choice(CATEGORY_TREE[main])
+        ))
+    _bulk_create(FoodCategory, categories)
+
+    # 농약 상세(등록 제품) - 농약 x 작물 조합
+    details = []
+    for i in range(n_details):
+        en, kr = pesticides[i % len(pesticides)]
+        details.append(PesticideDetail(
+            reg_yn_nm='등록',
+            use_pprtm='수확 7일전까지',
+            prdlst_reg_no=f"{i:06d}",
+            prdlst_reg_dt=f"20{rng.randint(10, 24):02d}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+            prdlst_reg_vald_dt='20301231',
+            mnf_incm_dvs_nm=rng.choice(['제조', '수입']),
+            persn_lvstck_toxcty=rng.choice(['저독성', '보통독성']),
+            use_tmno='3회 이내',
+            cpr_nm=f"테스트농약{i % 40}",
+            prdlst_kor_nm=kr,
+            prdlst_eng_nm=en,
+            mdc_shap_nm=rng.choice(['수화제', '유제', '입제', '액상수화제']),
+            sickns_hlsct_nm_weeds_nm=_korean_name(rng, 3) + '병',
+            brnd_nm=_korean_name(rng, 3),
+            crops_nm=rng.choice(food_names),
+            prpos_dvs_cd_nm=rng.choice(['살균제', '살충제', '제초제']),
+            dilu_drng='1000배',
+            eclgy_toxcty='',
+        ))
+    _bulk_create(PesticideDetail, details)
+
+    return {
+        'counts': {
+            'LimitConditionCode': len(codes),
+            'PesticideLimit': len(limits),
+            'FoodCategory': len(categories),
+            'PesticideDetail': len(details),
+        },
+        'pesticides': [en for en, _ in pesticides],
+        'pesticides_kr': [kr for _, kr in pesticides],
+        'foods': food_names,
+        'category_only_foods': category_names,
+    }
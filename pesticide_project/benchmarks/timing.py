@@ -0,0 +1,46 @@
+# 벤치마크 측정 보조 함수
+# - 워밍업 후 한 번은 쿼리 수를 세고, 나머지 반복에서 시간만 측정 (쿼리 캡처 비용이 측정값에 섞이지 않도록)
+
+import os
+import statistics
+import time
+from contextlib import redirect_stdout
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def summarize(samples, queries):
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    p95_index = min(len(samples_ms) - 1, int(round(len(samples_ms) * 0.95)) - 1)
+    return {
+        'iterations': len(samples_ms),
+        'queries': queries,
+        'mean_ms': round(statistics.mean(samples_ms), 3),
+        'median_ms': round(statistics.median(samples_ms), 3),
+        'p95_ms': round(samples_ms[max(p95_index, 0)], 3),
+        'min_ms': round(samples_ms[0], 3),
+        'stdev_ms': round(statistics.stdev(samples_ms), 3) if len(samples_ms) > 1 else 0.0,
+    }
+
+
+def measure(func, iterations, warmup=3):
+    """
+    func 를 반복 실행하여 시간/쿼리 수 측정
+    - 뷰 안의 print() 출력은 /dev/null 로 보냄 (터미널 출력 비용 제외)
+    """
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        for _ in range(warmup):
+            func()
+
+        with CaptureQueriesContext(connection) as captured:
+            func()
+        queries = len(captured.captured_queries)
+
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+
+    return summarize(samples, queries)
@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
+
+async 뷰(api/async_views.py)가 외부 API 를 기다리는 동안 워커를 점유하지 않으려면 ASGI 로 실행
+command : uvicorn config.asgi:application --host 0.0.0.0 --port 8000 --workers 4 --lifespan off
+(Django 3.2 는 lifespan 프로토콜을 지원하지 않으므로 --lifespan off)
 """
 
 import os
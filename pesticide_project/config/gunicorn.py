@@ -0,0 +1,122 @@
+# path of this code : pesticide_project/config/gunicorn.py
+# gunicorn 운영 설정 (pesticide_project 디렉토리에서 실행)
+# command : gunicorn -c config/gunicorn.py config.wsgi:application
+#           GUNICORN_PROFILE=upload gunicorn -c config/gunicorn.py config.wsgi:application
+#           GUNICORN_PROFILE=asgi gunicorn -c config/gunicorn.py config.asgi:application
+#
+# 프로필 (GUNICORN_PROFILE)
+# - web(기본): 검색/자동완성 등 가벼운 요청 - gthread 워커 (CPU 수 + 1) x 스레드 2
+#   검색은 대부분 GIL 을 잡는 파이썬 처리라 스레드를 늘리면 처리량은 그대로이고 p95 만 늘어남
+#   (스레드 2 개는 DB 왕복과 keep-alive 연결 대기를 겹치기 위한 값)
+# - upload: 검정증명서 업로드(PDF 파싱) 전용 - sync 워커, 긴 timeout, 더 잦은 재시작
+#   pdfplumber 파싱은 CPU 를 오래 쓰고 GIL 을 잡고 있어 같은 프로세스의 검색 스레드를 멈추게 하므로
+#   프록시에서 업로드 경로만 별도 인스턴스로 보냄 (nginx 예)
+#     location /api/certificates/upload/ { proxy_pass http://127.0.0.1:8001; client_max_body_size 20m; }
+#     location / { proxy_pass http://127.0.0.1:8000; }
+# - asgi: uvicorn 워커(uvicorn.workers.UvicornWorker)로 config.asgi 실행 - async 뷰(api/async_views.py)가
+#   PubChem 응답을 기다리는 동안 워커를 점유하지 않음
+#   Django 3.2 는 동기 뷰(DRF 검색 등)를 워커당 스레드 하나(sync_to_async thread_sensitive)에서 차례로 실행하므로
+#   프록시에서 async 경로만 이 인스턴스로 보내는 것을 권장 (nginx 예)
+#     location /api/pesticides/structure3d/ { proxy_pass http://127.0.0.1:8002; }
+# - 기본값 근거: python -m benchmarks.load_test (업로드를 섞었을 때 검색 p95 비교)
+#
+# 서비스가 하나뿐인 환경(Railway: Procfile / railway.json 은 web 프로필)에는 경로별로 나눠 줄 프록시가 없으므로
+# 업로드와 async 뷰도 web 프로필의 같은 gthread 워커에서 처리됨 - 업로드 격리는 upload 인스턴스를 따로 띄울 때만 적용
+#
+# DB 연결 수: persistent 모드에서는 워커 x 스레드 개, pool 모드에서는 워커 x DB_POOL_MAX_SIZE 개까지 사용
+# (asgi 프로필은 워커당 ORM 스레드 하나)
+
+import multiprocessing
+import os
+import resource
+import sys
+
+PROFILE = os.environ.get('GUNICORN_PROFILE', 'web')
+if PROFILE not in ('web', 'upload', 'asgi'):
+    sys.exit(f"GUNICORN_PROFILE 은 web, upload, asgi 중 하나여야 합니다: {PROFILE}")
+
+_cpus = multiprocessing.cpu_count()
+_default_port = {'upload': '8001', 'asgi': '8002'}.get(PROFILE, '8000')
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', _default_port)}")
+proc_name = f"pesticide-{PROFILE}"
+
+if PROFILE == 'web':
+    worker_class = 'gthread'
+    workers = int(os.environ.get('GUNICORN_WORKERS', _cpus + 1))
+    threads = int(os.environ.get('GUNICORN_THREADS', 2))
+    timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+    max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+elif PROFILE == 'asgi':
+    # 앱 인자를 생략하면 config.asgi 사용 (config.wsgi 를 uvicorn 워커로 실행하지 않도록)
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    workers = int(os.environ.get('GUNICORN_WORKERS', _cpus + 1))
+    threads = 1
+    timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+    max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+else:
+    # 한 워커가 PDF 하나를 끝까지 처리 - 동시 파싱 수 = 워커 수 (CPU 의 절반, 검색 인스턴스 몫을 남김)
+    worker_class = 'sync'
+    workers = int(os.environ.get('GUNICORN_WORKERS', max(2, _cpus // 2)))
+    threads = 1
+    timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+    max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 200))
+
+# 같은 시각에 모든 워커가 재시작되지 않도록 분산
+max_requests_jitter = max_requests // 10
+graceful_timeout = 30
+keepalive = 5
+
+# 앱을 마스터에서 한 번 불러온 뒤 fork (워커 시작이 빠르고 코드 페이지를 공유)
+preload_app = True
+
+# 요청 처리 후 워커의 최대 RSS 가 이 값을 넘으면 응답을 마친 뒤 재시작 (max_requests 보다 먼저 메모리 증가 대응)
+MAX_RSS_MB = int(os.environ.get('GUNICORN_MAX_RSS_MB', 768 if PROFILE == 'upload' else 384))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def on_starting(server):
+    """
+    이전 실행에서 남은 메트릭 스냅샷 중 살아 있지 않은 프로세스의 파일을 누적 파일에 합침
+    (강제 종료된 워커의 값 보존, 다른 프로필 인스턴스의 살아 있는 워커 파일은 유지)
+    """
+    directory = os.environ.get('METRICS_MULTIPROC_DIR')
+    if not directory or not os.path.isdir(directory):
+        return
+    from api import metrics
+
+    metrics.retire_dead_processes(directory)
+
+
+def pre_fork(server, worker):
+    # preload 중 마스터에서 열린 DB 연결 / 연결 풀을 fork 전에 닫음 (워커들이 같은 소켓을 나눠 쓰지 않도록)
+    from django.db import connections
+    from api import db_pool
+
+    if PROFILE == 'upload':
+        # 검정증명서 파서는 URLconf 에서 지연 import 되므로 업로드 전용 인스턴스만 마스터에서 미리 불러와 공유
+        import api.certificate_parser  # noqa: F401
+        import pdfplumber  # noqa: F401
+
+    connections.close_all()
+    db_pool.close_all_pools()
+
+
+def worker_exit(server, worker):
+    # max_requests / 메모리 재시작 / 종료 시 마지막 메트릭까지 기록하고 누적 파일에 합침 (워커 프로세스에서 호출)
+    from api import metrics
+
+    metrics.retire_process()
+
+
+def post_request(worker, req, environ, resp):
+    # uvicorn 워커(asgi 프로필)는 이 훅을 호출하지 않음 - max_requests 로만 재시작
+    # ru_maxrss: Linux 는 KB, macOS 는 bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_mb = max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+    if max_rss_mb > MAX_RSS_MB and worker.alive:
+        worker.log.info(f"워커 메모리 {max_rss_mb:.0f}MB > {MAX_RSS_MB}MB - 재시작")
+        worker.alive = False
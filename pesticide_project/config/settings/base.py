@@ -88,6 +88,10 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 
+# 검색 로그 보관주기 (python manage.py archive_search_logs)
+SEARCH_LOG_RETENTION_DAYS = env.int('SEARCH_LOG_RETENTION_DAYS', default=180)
+SEARCH_LOG_ARCHIVE_DIR = env('SEARCH_LOG_ARCHIVE_DIR', default=os.path.join(BASE_DIR, 'backups', 'search_logs'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -1,8 +1,11 @@
 # pesticide_project/config/settings/production.py
 
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
-DEBUG = True
+# 운영에서는 항상 끔 - 로컬에서 운영 설정으로 디버깅할 때만 환경변수 DEBUG=true 로 켬
+DEBUG = env.bool('DEBUG', default=False)
 
 ALLOWED_HOSTS = [
     'findpest.kr',
@@ -50,7 +53,9 @@ CSRF_COOKIE_SAMESITE = 'Lax'
 
 # 미들웨어 설정
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',  # 전체 처리 시간을 재기 위해 가장 앞에 위치
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',  # /static/ 은 여기서 바로 응답 (아래 미들웨어/뷰를 거치지 않음)
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,15 +66,78 @@ MIDDLEWARE = [
     'api.middleware.RequestLoggingMiddleware',  # 요청 로깅 미들웨어 추가
 ]
 
+# 메트릭 설정 (/metrics)
+# gunicorn 등 멀티 워커 환경에서는 공유 디렉토리를 지정하면 워커별 값을 합산하여 노출
+# (서버 시작 시 디렉토리를 비워야 이전 실행의 값이 섞이지 않음)
+METRICS_MULTIPROC_DIR = env('METRICS_MULTIPROC_DIR', default=None)
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=5.0)
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# 요청 프로파일링 (관리자가 X-Profile 헤더 또는 ?_profile=1 로 요청한 경우만)
+# 결과는 MEDIA_ROOT/profiles 에 저장되며 최근 PROFILE_MAX_FILES 개만 유지
+PROFILE_MAX_FILES = env.int('PROFILE_MAX_FILES', default=50)
+PROFILE_SAMPLE_INTERVAL = 0.001  # sample 모드 스택 수집 간격(초)
+
+# MRL 행렬(api/mrl_matrix.py) 재생성 주기(초) - 같은 프로세스의 PesticideLimit 저장/삭제는 즉시 반영
+MRL_MATRIX_TTL = env.int('MRL_MATRIX_TTL', default=300)
+
+# 식품 분류 맵(api/food_categories.py) 재생성 주기(초) - 같은 프로세스의 FoodCategory 저장/삭제/적재는 즉시 반영
+FOOD_CATEGORY_TTL = env.int('FOOD_CATEGORY_TTL', default=300)
+
+# 잔류허용기준 릴리스 (python manage.py import_mrl_spec / mrl_release, api/mrl_release.py)
+# - 적용 시 현재 기준 중 이 비율보다 많이 삭제되는 릴리스는 거부 (--force 로 적용 가능)
+# - 다른 프로세스의 MRL 행렬은 활성 릴리스 id 를 이 주기(초)로 확인해 바뀌면 다시 생성
+MRL_RELEASE_MAX_REMOVED_RATIO = env.float('MRL_RELEASE_MAX_REMOVED_RATIO', default=0.1)
+MRL_RELEASE_CHECK_INTERVAL = env.float('MRL_RELEASE_CHECK_INTERVAL', default=5.0)
+
+# 식품별 역조회 (GET /api/pesticides/by_food/) 페이지당 최대 행 수
+BY_FOOD_MAX_PAGE_SIZE = env.int('BY_FOOD_MAX_PAGE_SIZE', default=500)
+
+# 일괄 조회 (POST /api/pesticides/bulk_lookup/) 요청당 최대 쌍 수
+BULK_LOOKUP_MAX_PAIRS = env.int('BULK_LOOKUP_MAX_PAIRS', default=100)
+
+# 검정증명서 원본 보관 (python manage.py archive_certificate_files)
+# 마지막 업로드가 CERTIFICATE_ARCHIVE_MONTHS 개월보다 오래된 PDF 를 월별 압축 팩으로 옮김
+CERTIFICATE_ARCHIVE_MONTHS = env.int('CERTIFICATE_ARCHIVE_MONTHS', default=12)
+CERTIFICATE_ARCHIVE_CODEC = env('CERTIFICATE_ARCHIVE_CODEC', default='xz')  # xz(표준 라이브러리) 또는 zstd(zstandard 필요)
+CERTIFICATE_ARCHIVE_DIR = env('CERTIFICATE_ARCHIVE_DIR', default=None)  # 기본값: MEDIA_ROOT/certificates/packs
+# 참조가 없어진 원본 파일이라도 최근 이 시간(초) 안에 저장/재사용되었으면 바로 지우지 않음 (커밋 전 업로드 보호)
+# - 남은 파일은 python manage.py gc_certificate_files 가 정리
+CERTIFICATE_RELEASE_MIN_AGE = env.int('CERTIFICATE_RELEASE_MIN_AGE', default=600)
+
+# PubChem 3D 구조 프록시 (api/async_views.py, GET /api/pesticides/structure3d/)
+PUBCHEM_BASE_URL = env('PUBCHEM_BASE_URL', default='https://pubchem.ncbi.nlm.nih.gov/rest/pug')
+PUBCHEM_TIMEOUT = env.float('PUBCHEM_TIMEOUT', default=10.0)
+
+# DB 연결 관리 (DB_POOL_MODE, api/db_backend)
+# - persistent(기본): 스레드별 연결을 DB_CONN_MAX_AGE 초 동안 재사용, 요청마다 첫 쿼리 전에 연결 상태 확인
+# - pool: 워커 프로세스 안의 연결 풀(최대 DB_POOL_MAX_SIZE 개)을 스레드들이 공유, 요청이 끝나면 풀에 반납
+#   (waitress 스레드 수 / gunicorn threads 보다 작으면 DB_POOL_TIMEOUT 초 대기 후 오류)
+# - pgbouncer: PGHOST/PGPORT 가 pgbouncer(pool_mode=transaction)를 가리킬 때
+#   서버 측 커서(.iterator() 스트리밍)는 트랜잭션 단위 풀링과 맞지 않아 끔
+#   pgbouncer 쪽 DB 의 TimeZone 을 UTC 로 맞춰야 Django 가 연결마다 SET TIME ZONE 을 보내지 않음
+# - none: 요청마다 새로 연결 (이전 동작)
+DB_POOL_MODE = env('DB_POOL_MODE', default='persistent')
+if DB_POOL_MODE not in ('persistent', 'pool', 'pgbouncer', 'none'):
+    raise ImproperlyConfigured(f"DB_POOL_MODE 는 persistent, pool, pgbouncer, none 중 하나여야 합니다: {DB_POOL_MODE}")
+
 # PostgreSQL 설정
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'api.db_backend',
         'NAME': env('PGDATABASE', default='pesticide_db'),
         'USER': env('PGUSER', default=''),
         'PASSWORD': env('PGPASSWORD', default=''),
         'HOST': env('PGHOST', default='localhost'),
         'PORT': env('PGPORT', default='5432'),
+        'CONN_MAX_AGE': env.int('DB_CONN_MAX_AGE', default=600) if DB_POOL_MODE in ('persistent', 'pgbouncer') else 0,
+        'CONN_HEALTH_CHECKS': DB_POOL_MODE != 'none',
+        'DISABLE_SERVER_SIDE_CURSORS': DB_POOL_MODE == 'pgbouncer',
+        'POOL': {
+            'MAX_SIZE': env.int('DB_POOL_MAX_SIZE', default=10),
+            'TIMEOUT': env.float('DB_POOL_TIMEOUT', default=5.0),
+            'MAX_LIFETIME': env.int('DB_POOL_MAX_LIFETIME', default=1800),
+        } if DB_POOL_MODE == 'pool' else None,
     }
 }
 
@@ -86,6 +154,20 @@ STATICFILES_DIRS = [
     REACT_BUILD_DIR,  # React 빌드 디렉토리 전체 (images 등 포함)
 ]
 
+# 정적 파일 서빙 (WhiteNoise)
+# - collectstatic 때 파일명에 내용 해시를 붙이고 gzip / brotli(Brotli 패키지) 압축본을 미리 만들어 둠
+#   → 요청 시 압축하지 않고 Accept-Encoding 에 맞는 파일을 그대로 응답
+# - 해시가 붙은 파일(Django 12자리, React 빌드 8자리)은 1년 + immutable, 나머지는 WHITENOISE_MAX_AGE 초 캐시
+# - 운영(DEBUG=False)에서는 STATIC_ROOT 를 시작 시 한 번만 읽음 (배포 후 collectstatic 과 워커 재시작 필요)
+#   DEBUG=true 로 띄운 경우에만 요청마다 파일을 다시 찾고 STATICFILES_DIRS 에서도 바로 응답
+# - index.html 은 api/frontend.py 에서 메모리에 두고 응답
+STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+WHITENOISE_AUTOREFRESH = DEBUG
+WHITENOISE_USE_FINDERS = DEBUG
+WHITENOISE_MAX_AGE = env.int('WHITENOISE_MAX_AGE', default=3600)
+WHITENOISE_IMMUTABLE_FILE_TEST = r'^.+\.[0-9a-f]{8,12}\.'
+REACT_INDEX_FILE = os.path.join(REACT_BUILD_DIR, 'index.html')
+
 # 템플릿 설정
 TEMPLATES = [
     {
@@ -119,6 +201,10 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'api.logging_utils.JsonFormatter',
+            'datefmt': '%Y-%m-%dT%H:%M:%S%z',
+        },
     },
     'filters': {
         'autocomplete_filter': {
@@ -132,6 +218,21 @@ LOGGING = {
             'formatter': 'verbose',
             'filters': ['autocomplete_filter']  # 필터 추가
         },
+        'console_json': {  # 요청 로그 (한 줄 JSON, autocomplete 는 샘플링으로 조절)
+            'class': 'logging.StreamHandler',
+            'stream': 'ext://sys.stdout',
+            'formatter': 'json',
+        },
+        # 요청 스레드에서는 큐에 넣기만 하고 포맷팅/출력은 리스너 스레드에서 처리
+        # (대상 핸들러 이름이 알파벳 순으로 앞서야 함)
+        'queue_console': {
+            '()': 'api.logging_utils.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console'],
+        },
+        'queue_json': {
+            '()': 'api.logging_utils.QueueListenerHandler',
+            'handlers': ['cfg://handlers.console_json'],
+        },
     },
     'root': {
         'handlers': ['console'],
@@ -154,18 +255,30 @@ LOGGING = {
             'propagate': False,
         },
         'api': {
-            'handlers': ['console'],
+            'handlers': ['queue_console'],
             'level': 'INFO',
             'propagate': False,
         },
         'api.certificate_parser': {
-            'handlers': ['console'],
+            'handlers': ['queue_console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'api.requests': {  # RequestLoggingMiddleware 구조화 요청 로그
+            'handlers': ['queue_json'],
             'level': 'INFO',
             'propagate': False,
         },
     },
 }
 
+# 경로별 요청 로그 샘플링 비율 (prefix 매칭, 지정하지 않은 경로는 1.0 = 전부 기록)
+REQUEST_LOG_SAMPLE_RATES = {
+    '/api/pesticides/autocomplete/': 0.05,
+    '/api/pesticides/food_autocomplete/': 0.05,
+    '/health/': 0.0,
+}
+
 ROOT_URLCONF = 'config.urls'
 
 # Email settings
@@ -176,6 +289,10 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@findpest.kr')
+# 외부 사용자 검색 알림 메일 수신자 (api/signals.py, 쉼표로 구분 / 비우면 보내지 않음)
+SEARCH_NOTIFY_RECIPIENTS = [
+    address.strip() for address in env.list('SEARCH_NOTIFY_RECIPIENTS', default=['kingleo.kim@gmail.com'])
+]
 
 # REST Framework settings
 REST_FRAMEWORK = {
@@ -0,0 +1,45 @@
+# path of this code : pesticide_project/config/settings/test.py
+# 테스트 / 벤치마크용 설정 (오프라인 실행, PostgreSQL 없이 SQLite 사용)
+# command : python manage.py test api.tests --settings=config.settings.test
+#           python -m benchmarks.run   (benchmarks/run.py 에서 이 설정을 사용)
+
+import os
+import tempfile
+
+# .env.production 이 없는 환경(CI, 로컬 벤치마크)에서도 설정을 읽을 수 있도록 기본값 지정
+os.environ.setdefault('SECRET_KEY', 'test-secret-key')
+os.environ.setdefault('PESTICIDE_API_KEY', 'test-api-key')
+os.environ.setdefault('EMAIL_HOST_USER', 'test@example.com')
+os.environ.setdefault('EMAIL_HOST_PASSWORD', 'test-password')
+
+from .production import *
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+
+# 테스트 DB 는 Django 가 메모리 SQLite 로 생성
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.test.sqlite3'),
+    }
+}
+
+MEDIA_ROOT = os.path.join(tempfile.gettempdir(), 'pesticide_test_media')
+
+# collectstatic 결과가 없어도 WhiteNoise 가 경고 없이 시작하도록 빈 디렉토리 사용
+STATIC_ROOT = os.path.join(tempfile.gettempdir(), 'pesticide_test_static')
+os.makedirs(STATIC_ROOT, exist_ok=True)
+
+# 외부로 메일을 보내지 않음
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# 비밀번호 해시 계산 시간을 줄여 사용자 생성이 측정값에 섞이지 않도록 함
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# 메트릭 스냅샷 파일을 기록하지 않음 (프로세스 내 레지스트리만 사용)
+METRICS_MULTIPROC_DIR = None
+
+# 파서의 INFO 로그가 결과 출력을 덮지 않도록 경고 이상만 출력
+for _name in ('api', 'api.certificate_parser', 'api.requests', 'django.request'):
+    LOGGING['loggers'][_name]['level'] = 'WARNING'
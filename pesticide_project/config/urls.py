@@ -1,8 +1,8 @@
 # path of this code : pesticide_project/config/urls.py
 
+from django.apps import apps
 from django.contrib import admin
 from django.urls import path, include, re_path
-from django.views.generic import TemplateView
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
 from api.views import (
@@ -11,17 +11,34 @@ from api.views import (
    UserViewSet,
    index,
    health_check,
+   metrics_view,
    csrf_token_view,
    test_cors
 )
 from django.conf import settings
-from api import certificate_parser
+from django.utils.module_loading import import_string
+from api import async_views
+from api import frontend
+from api import profiling
 
 
-# Debug Toolbar import 추가
-if settings.DEBUG:
+# Debug Toolbar 는 DEBUG 이면서 앱이 등록된 경우에만 사용 (local.py)
+DEBUG_TOOLBAR_ENABLED = settings.DEBUG and apps.is_installed('debug_toolbar')
+if DEBUG_TOOLBAR_ENABLED:
     import debug_toolbar
 
+def lazy_view(dotted_path, csrf_exempt=False):
+    """
+    처음 요청될 때 뷰 모듈을 불러오는 뷰
+    - 검정증명서 파서(pdfplumber 등)를 검색만 처리하는 워커의 시작 시간에 포함하지 않기 위함
+    - CsrfViewMiddleware 는 모듈을 불러오기 전에 csrf_exempt 를 확인하므로 여기서 지정
+    """
+    def view(request, *args, **kwargs):
+        return import_string(dotted_path)(request, *args, **kwargs)
+    view.csrf_exempt = csrf_exempt
+    return view
+
+
 # 라우터 설정
 router = DefaultRouter()
 router.register(r'users', UserViewSet)
@@ -32,26 +49,32 @@ router.register(r'pesticides', PesticideLimitViewSet, basename='pesticide')
 
 urlpatterns = [
     path('health/', health_check),
+    path('metrics', metrics_view),  # Prometheus 수집용 (로컬 전용)
     path('api/csrf/', csrf_token_view, name='csrf-token'),  # CSRF 토큰 엔드포인트
     path('api/test-cors/', test_cors, name='test-cors'),  # CORS 테스트 엔드포인트
     path('api/auth/', include('rest_framework.urls')),
     path('admin/', admin.site.urls),
+    path('api/profiles/', profiling.profile_list, name='profile-list'),  # 관리자 전용 프로파일 목록
+    path('api/profiles/<str:name>', profiling.profile_download, name='profile-download'),
+    path('api/pesticides/structure3d/', async_views.structure3d, name='structure3d'),  # async (PubChem 프록시)
     path('api/', include(router.urls)),  # API 라우터 포함
-    path('api/certificates/upload/', certificate_parser.upload_certificate, name='upload-certificate'),
+    path('api/certificates/upload/', lazy_view('api.certificate_parser.upload_certificate', csrf_exempt=True),
+         name='upload-certificate'),
     
     # React 앱 라우팅 (API 경로가 아닌 모든 경로를 React 앱으로 전달)
-    re_path(r'^statistics/?$', TemplateView.as_view(template_name='index.html'), name='statistics'),
-    re_path(r'^certificate-analysis/?$', TemplateView.as_view(template_name='index.html'), name='certificate-analysis'),
+    # (index.html 은 메모리에서 바로 응답 - api/frontend.py)
+    re_path(r'^statistics/?$', frontend.index, name='statistics'),
+    re_path(r'^certificate-analysis/?$', frontend.index, name='certificate-analysis'),
     
     # 기본 루트 경로
-    path('', TemplateView.as_view(template_name='index.html'), name='index'),
+    path('', frontend.index, name='index'),
 ]
 
-# 정적 파일 서빙 (React 빌드 파일)
+# 정적 파일 서빙 (React 빌드 파일) - DEBUG 일 때만 동작, 운영에서는 WhiteNoise 가 먼저 응답
 urlpatterns += static('/static/', document_root=settings.STATIC_ROOT)
 
 # DEBUG 모드에서만 Debug Toolbar 추가
-if settings.DEBUG:
+if DEBUG_TOOLBAR_ENABLED:
     urlpatterns = [
         path('__debug__/', include(debug_toolbar.urls)),
     ] + urlpatterns
\ No newline at end of file
@@ -9,9 +9,12 @@ source pesticide_venv/bin/activate
 # Navigate to project directory
 cd pesticide_project
 
-# Run with production settings
-echo "Running Django server with production settings..."
-python manage.py runserver 0.0.0.0:80 --settings=config.settings.production
-
-# Note: For production, use gunicorn instead:
-# gunicorn config.wsgi:application --bind 0.0.0.0:80 --workers 4
\ No newline at end of file
+# Run with production settings (gunicorn, config/gunicorn.py)
+# - 업로드(PDF 파싱)를 별도 인스턴스로 나누려면 프록시에서 /api/certificates/upload/ 를 8001 로 보내고
+#   GUNICORN_PROFILE=upload gunicorn -c config/gunicorn.py config.wsgi:application 을 함께 실행
+# - async 뷰(/api/pesticides/structure3d/)를 uvicorn 워커로 처리하려면 그 경로를 8002 로 보내고
+#   GUNICORN_PROFILE=asgi gunicorn -c config/gunicorn.py config.asgi:application 을 함께 실행
+# - 프록시 없이 이 명령만 실행하면 업로드/async 뷰도 같은 web 워커에서 처리됨 (Railway 와 동일)
+echo "Running gunicorn with production settings..."
+export DJANGO_SETTINGS_MODULE=config.settings.production
+GUNICORN_BIND=0.0.0.0:80 gunicorn -c config/gunicorn.py config.wsgi:application
\ No newline at end of file